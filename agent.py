@@ -17,11 +17,23 @@ if os.getenv("AUTO_CONFIGURE_DATABRICKS_TRACING", "").lower() in ("1", "true", "
             exc,
         )
 
+from config import load_config
 from observability.adk_defaults import apply_adk_telemetry_defaults
 from observability.otel_sdk import configure_otel_from_env
 
+_config = load_config()
 apply_adk_telemetry_defaults()
-configure_otel_from_env()
+configure_otel_from_env(
+    span_export=_config.span_export,
+    log_export=_config.log_export,
+    spool=_config.otlp_spool,
+    compression=_config.otlp_compression,
+    tail_sampling=_config.tail_sampling,
+    blob_offload=_config.blob_offload,
+    metrics_export=_config.metrics_export,
+    parquet_sink=_config.parquet_sink,
+    shutdown_timeout_millis=_config.telemetry_flush.shutdown_timeout_millis,
+)
 
 from google.adk.apps import App
 
@@ -30,6 +42,20 @@ try:
 except ImportError:
     from workflow import root_agent
 
-app = App(name="SE_workflow_test", root_agent=root_agent)
+_plugins = []
+if _config.profiling is not None:
+    from observability.profiling import InvocationProfilerPlugin
+
+    _plugins.append(InvocationProfilerPlugin(_config.profiling))
+if _config.memory_trace.enabled:
+    from observability.memory import MemoryTracePlugin
+
+    _plugins.append(MemoryTracePlugin(_config.memory_trace))
+if _config.telemetry_flush.mode == "invocation":
+    from observability.telemetry_flush import TelemetryFlushPlugin
+
+    _plugins.append(TelemetryFlushPlugin(_config.telemetry_flush))
+
+app = App(name="SE_workflow_test", root_agent=root_agent, plugins=_plugins)
 
 __all__ = ["root_agent", "app"]
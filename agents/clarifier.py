@@ -1,19 +1,37 @@
 from adk_templates import instrumented_llm_agent
 
+from agents.schemas import Clarification, render_clarification, store_rendered_state
 
-def build_clarifier_agent(model_name: str):
+
+def build_clarifier_agent(model_name: str, structured_output: bool = True):
+    context = (
+        "You are Agent 1. The user asked: {user_question?}\n"
+        "The documentation directory is {documents_dir?}. "
+        "Do not ask for the folder location or file names.\n"
+        "If you need clarification to begin, ask concise questions "
+        "about the question itself, not file locations. "
+        "If clarification answers exist in {clarification_answers?}, use them.\n"
+    )
+    if structured_output:
+        return instrumented_llm_agent(
+            name="Agent1_Clarifier",
+            model=model_name,
+            output_key="clarification",
+            output_schema=Clarification,
+            after_agent_callback=store_rendered_state(
+                "clarification", "clarification_text", render_clarification
+            ),
+            instruction=context + "Keep every field brief.",
+        )
     return instrumented_llm_agent(
         name="Agent1_Clarifier",
         model=model_name,
         output_key="clarification",
+        after_agent_callback=store_rendered_state(
+            "clarification", "clarification_text", render_clarification
+        ),
         instruction=(
-            "You are Agent 1. The user asked: {user_question?}\n"
-            "The documentation directory is {documents_dir?}. "
-            "Do not ask for the folder location or file names.\n"
-            "If you need clarification to begin, ask concise questions "
-            "about the question itself, not file locations. "
-            "If clarification answers exist in {clarification_answers?}, use them.\n"
-            "Return JSON with fields: "
+            context + "Return JSON with fields: "
             "clarifying_questions (list of strings), "
             "refined_question (string), "
             "notes (string).\n"
@@ -1,12 +1,15 @@
 import json
 import os
-from typing import AsyncGenerator, Iterable
+import time
+from typing import Any, AsyncGenerator, Iterable, Literal
 
 from google.adk.agents import BaseAgent
 from google.adk.agents.invocation_context import InvocationContext
 from google.adk.events import Event
-from pypdf import PdfReader
+from opentelemetry import trace
 
+from observability.metrics import agent_metrics
+from observability.reader_spans import FileRead, reader_pass_trace
 from observability.session_logs import log_agent_step
 
 DEFAULT_ALLOWED_EXTENSIONS = (
@@ -30,16 +33,29 @@ class DocumentReaderAgent(BaseAgent):
     max_file_chars: int = 12000
     preview_chars: int = 500
     prefer_previews: bool = False
+    # Pre-extracted state from ``load_corpus()``; set to reuse one reader pass
+    # across many invocations (batch runs, services).
+    corpus: dict[str, Any] | None = None
+    # Per-file spans (see ``observability.reader_spans``); checked when the agent is built.
+    trace_files: Literal["off", "slow", "all"] = "off"
+    trace_slow_ms: float = 250.0
+    trace_max_file_spans: int = 50
 
     @staticmethod
-    def _read_pdf(path: str) -> str:
+    def _extract_pdf(path: str) -> tuple[str, int]:
+        from pypdf import PdfReader  # imported on the first PDF, not at startup
+
         reader = PdfReader(path)
         chunks: list[str] = []
         for page in reader.pages:
             text = page.extract_text() or ""
             if text:
                 chunks.append(text)
-        return "\n".join(chunks).strip()
+        return "\n".join(chunks).strip(), len(reader.pages)
+
+    @classmethod
+    def _read_pdf(cls, path: str) -> str:
+        return cls._extract_pdf(path)[0]
 
     def _iter_document_paths(self) -> Iterable[str]:
         if not os.path.isdir(self.documents_dir):
@@ -51,59 +67,78 @@ class DocumentReaderAgent(BaseAgent):
                 paths.append(os.path.join(root, filename))
         return sorted(paths)
 
-    async def _run_async_impl(
-        self, ctx: InvocationContext
-    ) -> AsyncGenerator[Event, None]:
+    def read_documents(self) -> list[dict[str, object]]:
+        """Read every file under ``documents_dir`` into document records."""
         documents: list[dict[str, object]] = []
-        for path in self._iter_document_paths():
-            rel_path = os.path.relpath(path, self.documents_dir)
-            _, ext = os.path.splitext(path.lower())
-            if ext and ext not in self.allowed_extensions:
-                documents.append(
-                    {
-                        "path": rel_path,
-                        "content": "",
-                        "truncated": False,
-                        "content_available": False,
-                        "note": f"Unsupported file type: {ext}",
-                    }
-                )
-                continue
-            try:
-                if ext == ".pdf":
-                    content = self._read_pdf(path)
-                else:
-                    with open(
-                        path, "r", encoding="utf-8", errors="replace"
-                    ) as handle:
-                        content = handle.read()
-            except Exception as exc:
+        started = time.perf_counter()
+        n_bytes = 0
+        with reader_pass_trace(
+            self.trace_files, self.trace_slow_ms, self.trace_max_file_spans
+        ) as pass_trace:
+            for path in self._iter_document_paths():
+                rel_path = os.path.relpath(path, self.documents_dir)
+                _, ext = os.path.splitext(path.lower())
+                if ext and ext not in self.allowed_extensions:
+                    documents.append(
+                        {
+                            "path": rel_path,
+                            "content": "",
+                            "truncated": False,
+                            "content_available": False,
+                            "note": f"Unsupported file type: {ext}",
+                        }
+                    )
+                    continue
+                read = FileRead(rel_path, ext, time.time_ns(), 0)
+                try:
+                    if ext == ".pdf":
+                        content, read.pages = self._extract_pdf(path)
+                    else:
+                        with open(
+                            path, "r", encoding="utf-8", errors="replace"
+                        ) as handle:
+                            content = handle.read()
+                except Exception as exc:
+                    read.end_ns = time.time_ns()
+                    read.error = type(exc).__name__
+                    pass_trace.record(read)
+                    documents.append(
+                        {
+                            "path": rel_path,
+                            "error": f"Failed to read: {exc}",
+                            "content": "",
+                            "truncated": False,
+                            "content_available": False,
+                        }
+                    )
+                    continue
+
+                read.end_ns = time.time_ns()
+                read.bytes_read = os.path.getsize(path)
+                read.chars = len(content)
+                n_bytes += read.bytes_read
+                truncated = read.truncated = len(content) > self.max_file_chars
+                if truncated:
+                    content = content[: self.max_file_chars]
+                pass_trace.record(read)
+
                 documents.append(
                     {
                         "path": rel_path,
-                        "error": f"Failed to read: {exc}",
-                        "content": "",
-                        "truncated": False,
-                        "content_available": False,
+                        "content": content,
+                        "truncated": truncated,
+                        "content_available": True,
                     }
                 )
-                continue
-
-            truncated = len(content) > self.max_file_chars
-            if truncated:
-                content = content[: self.max_file_chars]
-
-            documents.append(
-                {
-                    "path": rel_path,
-                    "content": content,
-                    "truncated": truncated,
-                    "content_available": True,
-                }
-            )
+        agent_metrics().record_reader_pass(
+            len(documents), n_bytes, time.perf_counter() - started
+        )
+        return documents
 
-        ctx.session.state["documents"] = documents
-        ctx.session.state["document_paths"] = [doc["path"] for doc in documents]
+    def build_corpus_state(
+        self, documents: list[dict[str, object]]
+    ) -> dict[str, object]:
+        """Derive the session state keys (manifest, previews, JSON) from documents."""
         manifest = []
         previews = []
         for doc in documents:
@@ -120,26 +155,41 @@ class DocumentReaderAgent(BaseAgent):
             )
             if preview:
                 previews.append({"path": path, "preview": preview})
-        ctx.session.state["documents_manifest"] = json.dumps(
-            manifest, ensure_ascii=True
-        )
-        ctx.session.state["documents_preview"] = json.dumps(
-            previews, ensure_ascii=True
-        )
+        documents_preview = json.dumps(previews, ensure_ascii=True)
         if self.prefer_previews:
-            ctx.session.state["documents_json"] = ctx.session.state[
-                "documents_preview"
-            ]
+            documents_json = documents_preview
         else:
-            ctx.session.state["documents_json"] = json.dumps(
-                documents, ensure_ascii=True
-            )
+            documents_json = json.dumps(documents, ensure_ascii=True)
+        return {
+            "documents": documents,
+            "document_paths": [doc["path"] for doc in documents],
+            "documents_manifest": json.dumps(manifest, ensure_ascii=True),
+            "documents_preview": documents_preview,
+            "documents_json": documents_json,
+        }
+
+    def load_corpus(self) -> dict[str, object]:
+        """One full reader pass; the result can be assigned to ``corpus`` and shared."""
+        return self.build_corpus_state(self.read_documents())
+
+    async def _run_async_impl(
+        self, ctx: InvocationContext
+    ) -> AsyncGenerator[Event, None]:
+        shared = self.corpus is not None
+        agent_metrics().record_cache("corpus", shared)
+        trace.get_current_span().set_attribute(
+            "reader.corpus_cache", "hit" if shared else "miss"
+        )
+        corpus = self.corpus if shared else self.load_corpus()
+        ctx.session.state.update(corpus)
 
+        documents = corpus["documents"]
         n = len(documents)
         n_ok = sum(1 for d in documents if d.get("content_available"))
         log_agent_step(
             "document_reader",
             ctx,
             f"DocumentReader indexed {n} files ({n_ok} with readable content) from {self.documents_dir}",
+            shared_corpus=shared,
         )
         yield Event(author=self.name)
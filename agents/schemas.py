@@ -0,0 +1,105 @@
+"""Compact response schemas for the clarifier and summarizer (ADK ``output_schema``).
+
+Field names are deliberately short: they are emitted by the model on every
+turn, and output tokens dominate step latency. ``Field`` descriptions carry
+the meaning into the provider's response schema so prompts need not repeat it.
+"""
+
+from __future__ import annotations
+
+import json
+from typing import Any, Callable
+
+from google.adk.agents.callback_context import CallbackContext
+from pydantic import BaseModel, Field, ValidationError
+
+
+class Clarification(BaseModel):
+    q: list[str] = Field(
+        default_factory=list,
+        description="Clarifying questions for the user; empty if none are needed.",
+    )
+    rq: str = Field(description="Refined question to answer from the documents.")
+    n: str = Field(default="", description="Short notes on scope or assumptions.")
+
+
+class FileSummary(BaseModel):
+    f: str = Field(description="Document path exactly as listed in the manifest.")
+    s: str = Field(default="", description="Summary relevant to the question.")
+    k: list[str] = Field(default_factory=list, description="Key points.")
+    u: bool = Field(
+        default=False, description="True when the document content is unavailable."
+    )
+
+
+class FileSummaries(BaseModel):
+    # OpenAI-compatible ``response_format`` requires an object at the top level.
+    d: list[FileSummary] = Field(
+        default_factory=list,
+        description="One entry per document, in manifest order.",
+    )
+
+
+def parse_clarification(value: Any) -> Clarification | None:
+    """Validate a ``clarification`` state value (dict or JSON text); None if unusable."""
+    try:
+        if isinstance(value, str):
+            return Clarification.model_validate_json(value)
+        return Clarification.model_validate(value)
+    except ValidationError:
+        return None
+
+
+def parse_file_summaries(value: Any) -> FileSummaries | None:
+    """Validate a ``file_summaries`` state value (dict or JSON text); None if unusable."""
+    try:
+        if isinstance(value, str):
+            return FileSummaries.model_validate_json(value)
+        return FileSummaries.model_validate(value)
+    except ValidationError:
+        return None
+
+
+def render_clarification(value: Any) -> str:
+    """Minimal prompt rendering of the clarifier output (free text passes through)."""
+    parsed = parse_clarification(value)
+    if parsed is None:
+        return value if isinstance(value, str) else json.dumps(value, ensure_ascii=True)
+    lines = [f"Refined question: {parsed.rq}"]
+    if parsed.q:
+        lines.append("Open questions: " + " | ".join(parsed.q))
+    if parsed.n:
+        lines.append(f"Notes: {parsed.n}")
+    return "\n".join(lines)
+
+
+def render_file_summaries(value: Any) -> str:
+    """Minimal prompt rendering of summarizer output: one block per file."""
+    parsed = parse_file_summaries(value)
+    if parsed is None:
+        return value if isinstance(value, str) else json.dumps(value, ensure_ascii=True)
+    blocks: list[str] = []
+    for item in parsed.d:
+        if item.u:
+            blocks.append(f"[{item.f}] (content unavailable)")
+            continue
+        block = f"[{item.f}] {item.s}".rstrip()
+        if item.k:
+            block += "\n" + "\n".join(f"- {point}" for point in item.k)
+        blocks.append(block)
+    return "\n".join(blocks)
+
+
+def store_rendered_state(
+    source_key: str,
+    target_key: str,
+    render: Callable[[Any], str],
+) -> Callable[..., None]:
+    """Return an ADK ``after_agent_callback`` that writes ``render(state[source_key])``."""
+
+    def _cb(*, callback_context: CallbackContext) -> None:
+        value = callback_context.state.get(source_key)
+        callback_context.state[target_key] = "" if value is None else render(value)
+        return None
+
+    return _cb
@@ -1,20 +1,40 @@
 from adk_templates import instrumented_llm_agent
 
+from agents.schemas import FileSummaries, render_file_summaries, store_rendered_state
 
-def build_summarizer_agent(model_name: str):
+
+def build_summarizer_agent(model_name: str, structured_output: bool = True):
+    context = (
+        "You are Agent 1. Summarize each file for the user's question.\n"
+        "User question: {user_question?}\n"
+        "Clarification output: {clarification_text}\n"
+        "Documents JSON: {documents_json}\n"
+        "Documents manifest: {documents_manifest}\n"
+        "Documents preview: {documents_preview}\n"
+        "Process all files in the documents JSON without asking for file "
+        "names or paths.\n"
+    )
+    if structured_output:
+        return instrumented_llm_agent(
+            name="Agent1_FileSummarizer",
+            model=model_name,
+            output_key="file_summaries",
+            output_schema=FileSummaries,
+            after_agent_callback=store_rendered_state(
+                "file_summaries", "file_summaries_text", render_file_summaries
+            ),
+            instruction=context
+            + "Keep summaries to one or two sentences and at most five key points.",
+        )
     return instrumented_llm_agent(
         name="Agent1_FileSummarizer",
         model=model_name,
         output_key="file_summaries",
+        after_agent_callback=store_rendered_state(
+            "file_summaries", "file_summaries_text", render_file_summaries
+        ),
         instruction=(
-            "You are Agent 1. Summarize each file for the user's question.\n"
-            "User question: {user_question?}\n"
-            "Clarification output: {clarification}\n"
-            "Documents JSON: {documents_json}\n"
-            "Documents manifest: {documents_manifest}\n"
-            "Documents preview: {documents_preview}\n"
-            "Process all files in the documents JSON without asking for file "
-            "names or paths. For each document, provide: file, summary, "
+            context + "For each document, provide: file, summary, "
             "key_points, and note if content is unavailable.\n"
             "Return JSON list of objects in the same order as documents_json."
         ),
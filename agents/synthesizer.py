@@ -9,8 +9,8 @@ def build_synthesizer_agent(model_name: str):
         instruction=(
             "You are Agent 3. Create the final response using the inputs.\n"
             "User question: {user_question?}\n"
-            "Clarification output: {clarification}\n"
-            "File summaries: {file_summaries}\n"
+            "Clarification output: {clarification_text}\n"
+            "File summaries: {file_summaries_text}\n"
             "Documents manifest: {documents_manifest}\n"
             "Output three sections:\n"
             "1) Executive summary answering the question.\n"
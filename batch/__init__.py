@@ -0,0 +1,23 @@
+"""Run many workflow questions in one process over a shared document corpus."""
+
+from batch.runner import (
+    BatchQuestion,
+    BatchResult,
+    format_batch_report,
+    load_questions,
+    percentile,
+    run_batch,
+    run_question,
+    share_corpus,
+)
+
+__all__ = [
+    "BatchQuestion",
+    "BatchResult",
+    "format_batch_report",
+    "load_questions",
+    "percentile",
+    "run_batch",
+    "run_question",
+    "share_corpus",
+]
@@ -0,0 +1,69 @@
+"""Run: ``python -m batch questions.jsonl -o results.jsonl`` from the repo root.
+
+Imports ``agent`` for the same startup path as ``adk run`` (``.env``, optional
+Databricks init, OTLP), reads the document corpus once, then answers every
+question concurrently in this process.
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import sys
+import time
+
+from batch.runner import format_batch_report, load_questions, run_batch, share_corpus
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Run many questions over one corpus")
+    parser.add_argument("input", help="JSONL of questions ('-' for stdin).")
+    parser.add_argument(
+        "-o",
+        "--output",
+        default="-",
+        help="JSONL results, streamed as questions finish ('-' for stdout).",
+    )
+    parser.add_argument(
+        "-p",
+        "--parallelism",
+        type=int,
+        default=int(os.environ.get("BATCH_PARALLELISM", "4")),
+        help="Questions in flight at once (default: BATCH_PARALLELISM or 4).",
+    )
+    parser.add_argument(
+        "--no-shared-corpus",
+        action="store_true",
+        help="Re-read documents for every question (as adk run does).",
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING, format="%(levelname)s %(name)s: %(message)s")
+
+    if args.input == "-":
+        questions = load_questions(sys.stdin)
+    else:
+        with open(args.input, encoding="utf-8") as handle:
+            questions = load_questions(handle)
+
+    import agent
+
+    if not args.no_shared_corpus:
+        n_docs = share_corpus(agent.root_agent)
+        print(f"✓ Shared corpus: {n_docs} documents read once", file=sys.stderr)
+
+    out = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+    start = time.perf_counter()
+    try:
+        results = asyncio.run(
+            run_batch(agent.app, questions, parallelism=args.parallelism, output=out)
+        )
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    print(format_batch_report(results, time.perf_counter() - start), file=sys.stderr)
+    return 0 if all(r.error is None for r in results) else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,194 @@
+"""Concurrent batch execution of the workflow through an in-process ADK runner."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import math
+import time
+from dataclasses import asdict, dataclass
+from typing import IO, Iterable, Iterator
+
+from google.adk.agents import BaseAgent
+from google.adk.apps import App
+from google.adk.runners import InMemoryRunner, Runner
+from google.genai import types
+
+from agents.reader import DocumentReaderAgent
+
+logger = logging.getLogger(__name__)
+
+BATCH_USER_ID = "batch"
+
+
+@dataclass(frozen=True)
+class BatchQuestion:
+    id: str
+    question: str
+
+
+@dataclass(frozen=True)
+class BatchResult:
+    id: str
+    question: str
+    session_id: str
+    final_answer: str | None
+    latency_ms: float
+    input_tokens: int
+    output_tokens: int
+    reasoning_tokens: int
+    error: str | None = None
+
+
+def load_questions(lines: Iterable[str]) -> list[BatchQuestion]:
+    """Parse JSONL: objects with ``question`` (optional ``id``) or bare JSON strings."""
+    questions: list[BatchQuestion] = []
+    for lineno, line in enumerate(lines, 1):
+        line = line.strip()
+        if not line:
+            continue
+        obj = json.loads(line)
+        if isinstance(obj, str):
+            qid, question = str(lineno), obj
+        elif isinstance(obj, dict):
+            qid, question = str(obj.get("id", lineno)), obj.get("question")
+        else:
+            qid, question = str(lineno), None
+        if not isinstance(question, str) or not question.strip():
+            raise ValueError(f"line {lineno}: expected a 'question' string")
+        questions.append(BatchQuestion(id=qid, question=question))
+    return questions
+
+
+def _iter_agents(agent: BaseAgent) -> Iterator[BaseAgent]:
+    yield agent
+    for sub in agent.sub_agents:
+        yield from _iter_agents(sub)
+
+
+def share_corpus(root_agent: BaseAgent) -> int:
+    """Run one reader pass and pin it on every reader in the tree; returns document count."""
+    count = 0
+    for agent in _iter_agents(root_agent):
+        if isinstance(agent, DocumentReaderAgent):
+            agent.corpus = agent.load_corpus()
+            count = len(agent.corpus["documents"])
+    return count
+
+
+async def run_question(
+    runner: Runner,
+    question: BatchQuestion,
+    *,
+    user_id: str = BATCH_USER_ID,
+    session_id: str | None = None,
+) -> BatchResult:
+    """Run one workflow turn; creates the session unless ``session_id`` already exists."""
+    session = None
+    if session_id is not None:
+        session = await runner.session_service.get_session(
+            app_name=runner.app_name, user_id=user_id, session_id=session_id
+        )
+    if session is None:
+        session = await runner.session_service.create_session(
+            app_name=runner.app_name, user_id=user_id, session_id=session_id
+        )
+    message = types.Content(role="user", parts=[types.Part(text=question.question)])
+    in_tok = out_tok = reasoning_tok = 0
+    error: str | None = None
+    start = time.perf_counter()
+    try:
+        async for event in runner.run_async(
+            user_id=user_id, session_id=session.id, new_message=message
+        ):
+            um = event.usage_metadata
+            if um is None:
+                continue
+            in_tok += um.prompt_token_count or 0
+            out_tok += um.candidates_token_count or 0
+            reasoning_tok += um.thoughts_token_count or 0
+    except Exception as exc:
+        error = f"{type(exc).__name__}: {exc}"
+        logger.warning("Batch question %s failed: %s", question.id, error)
+    latency_ms = (time.perf_counter() - start) * 1000.0
+
+    final = await runner.session_service.get_session(
+        app_name=runner.app_name, user_id=user_id, session_id=session.id
+    )
+    answer = final.state.get("final_answer") if final else None
+    return BatchResult(
+        id=question.id,
+        question=question.question,
+        session_id=session.id,
+        final_answer=None if answer is None else str(answer),
+        latency_ms=round(latency_ms, 3),
+        input_tokens=in_tok,
+        output_tokens=out_tok,
+        reasoning_tokens=reasoning_tok,
+        error=error,
+    )
+
+
+async def run_batch(
+    app: App,
+    questions: list[BatchQuestion],
+    *,
+    parallelism: int = 4,
+    output: IO[str] | None = None,
+) -> list[BatchResult]:
+    """Run ``questions`` with at most ``parallelism`` in flight; stream JSONL to ``output``.
+
+    Results are written in completion order and returned in input order.
+    """
+    runner = InMemoryRunner(app=app)
+    semaphore = asyncio.Semaphore(max(1, parallelism))
+
+    async def _bounded(idx: int, question: BatchQuestion) -> tuple[int, BatchResult]:
+        async with semaphore:
+            return idx, await run_question(runner, question)
+
+    results: dict[int, BatchResult] = {}
+    pending = [_bounded(idx, q) for idx, q in enumerate(questions)]
+    try:
+        for done in asyncio.as_completed(pending):
+            idx, result = await done
+            if output is not None:
+                output.write(json.dumps(asdict(result), ensure_ascii=False) + "\n")
+                output.flush()
+            results[idx] = result
+    finally:
+        await runner.close()
+    return [results[idx] for idx in sorted(results)]
+
+
+def percentile(values: list[float], pct: float) -> float:
+    """Nearest-rank ``pct`` percentile of ``values`` (0.0 when empty)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = min(len(ordered), max(1, math.ceil(pct / 100.0 * len(ordered)))) - 1
+    return ordered[rank]
+
+
+def format_batch_report(results: list[BatchResult], wall_seconds: float | None = None) -> str:
+    """Human-readable per-question latency/token table plus totals."""
+    lines = [f"{'id':<16} {'latency_ms':>12} {'in_tok':>8} {'out_tok':>8} {'rsn_tok':>8}  status"]
+    for r in results:
+        status = "ok" if r.error is None else f"error: {r.error}"
+        lines.append(
+            f"{r.id[:16]:<16} {r.latency_ms:>12.1f} {r.input_tokens:>8} "
+            f"{r.output_tokens:>8} {r.reasoning_tokens:>8}  {status}"
+        )
+    latencies = [r.latency_ms for r in results]
+    failed = sum(1 for r in results if r.error is not None)
+    lines.append(
+        f"questions={len(results)} failed={failed} "
+        f"p50_ms={percentile(latencies, 50):.1f} p95_ms={percentile(latencies, 95):.1f} "
+        f"input_tokens={sum(r.input_tokens for r in results)} "
+        f"output_tokens={sum(r.output_tokens for r in results)} "
+        f"reasoning_tokens={sum(r.reasoning_tokens for r in results)}"
+    )
+    if wall_seconds is not None:
+        lines.append(f"wall_seconds={wall_seconds:.2f}")
+    return "\n".join(lines)
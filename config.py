@@ -1,6 +1,20 @@
 import os
 from dataclasses import dataclass
 
+from observability.blob_offload import BlobOffloadSettings
+from observability.env_settings import env_choice
+from observability.export_pipeline import BatchExportSettings, otlp_compression_from_env
+from observability.metrics import MetricsSettings
+from observability.parquet_sink import ParquetSinkSettings
+from observability.plugin_settings import (
+    MemoryTraceSettings,
+    ProfilingSettings,
+    TelemetryFlushSettings,
+)
+from observability.reader_spans import TRACE_MODES
+from observability.spool import SpoolSettings
+from observability.tail_sampling import TailSamplingSettings
+
 
 @dataclass(frozen=True)
 class AppConfig:
@@ -10,6 +24,21 @@ class AppConfig:
     max_file_chars: int
     preview_chars: int
     prefer_previews: bool
+    structured_output: bool
+    reader_trace_files: str
+    reader_trace_slow_ms: float
+    reader_trace_max_file_spans: int
+    span_export: BatchExportSettings
+    log_export: BatchExportSettings
+    otlp_spool: SpoolSettings | None
+    otlp_compression: str
+    tail_sampling: TailSamplingSettings | None
+    blob_offload: BlobOffloadSettings | None
+    metrics_export: MetricsSettings | None
+    parquet_sink: ParquetSinkSettings | None
+    profiling: ProfilingSettings | None
+    memory_trace: MemoryTraceSettings
+    telemetry_flush: TelemetryFlushSettings
 
 
 def load_config() -> AppConfig:
@@ -22,6 +51,11 @@ def load_config() -> AppConfig:
     max_file_chars = int(os.environ.get("MAX_FILE_CHARS", "12000"))
     preview_chars = int(os.environ.get("PREVIEW_CHARS", "500"))
     prefer_previews = model_name.startswith("openai/")
+    structured_output = os.environ.get("STRUCTURED_OUTPUT", "true").lower() in (
+        "1",
+        "true",
+        "yes",
+    )
 
     return AppConfig(
         base_dir=base_dir,
@@ -30,4 +64,19 @@ def load_config() -> AppConfig:
         max_file_chars=max_file_chars,
         preview_chars=preview_chars,
         prefer_previews=prefer_previews,
+        structured_output=structured_output,
+        reader_trace_files=env_choice("READER_TRACE_FILES", "off", TRACE_MODES),
+        reader_trace_slow_ms=float(os.environ.get("READER_TRACE_SLOW_MS", "250")),
+        reader_trace_max_file_spans=int(os.environ.get("READER_TRACE_MAX_FILE_SPANS", "50")),
+        span_export=BatchExportSettings.from_env("spans"),
+        log_export=BatchExportSettings.from_env("logs"),
+        otlp_spool=SpoolSettings.from_env(),
+        otlp_compression=otlp_compression_from_env(),
+        tail_sampling=TailSamplingSettings.from_env(),
+        blob_offload=BlobOffloadSettings.from_env(),
+        metrics_export=MetricsSettings.from_env(),
+        parquet_sink=ParquetSinkSettings.from_env(),
+        profiling=ProfilingSettings.from_env(),
+        memory_trace=MemoryTraceSettings.from_env(),
+        telemetry_flush=TelemetryFlushSettings.from_env(),
     )
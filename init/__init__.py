@@ -1,5 +1,6 @@
 """Bootstrap Databricks Unity Catalog trace tables + MLflow experiment + OTEL env."""
 
+from init.cache import TraceInfraCache, TraceInfraCacheSettings
 from init.databricks import (
     TraceInfrastructureResult,
     apply_otel_environment,
@@ -11,6 +12,8 @@ from init.databricks import (
 )
 
 __all__ = [
+    "TraceInfraCache",
+    "TraceInfraCacheSettings",
     "TraceInfrastructureResult",
     "apply_otel_environment",
     "apply_trace_configuration",
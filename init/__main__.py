@@ -13,6 +13,11 @@ def main() -> int:
         action="store_true",
         help="Run MLflow ensure steps but only print planned os.environ updates (no apply).",
     )
+    parser.add_argument(
+        "--refresh",
+        action="store_true",
+        help="Ignore the cached trace infrastructure, re-run the MLflow steps and re-cache.",
+    )
     parser.add_argument(
         "--quiet",
         action="store_true",
@@ -27,7 +32,7 @@ def main() -> int:
 
     load_env_from_project_root()
     try:
-        init_and_connect(verbose=not args.quiet, dry_run=args.dry_run)
+        init_and_connect(verbose=not args.quiet, dry_run=args.dry_run, refresh=args.refresh)
         return 0
     except Exception as exc:
         logging.getLogger(__name__).error("%s", exc)
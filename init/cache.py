@@ -0,0 +1,143 @@
+"""
+Local cache of ``TraceInfrastructureResult`` so warm starts skip MLflow round trips.
+
+Entries are keyed by Databricks host, UC catalog, UC schema and experiment (the
+explicit ``MLFLOW_EXPERIMENT_ID`` when set, else the experiment name) and expire
+after ``TRACE_INFRA_CACHE_TTL_SECONDS`` (default 86400; ``0`` disables the
+cache). The file lives at ``TRACE_INFRA_CACHE`` (default
+``$XDG_CACHE_HOME/se-workflow-test/trace_infrastructure.json``) and holds only
+ids and table names, never tokens.
+
+With ``TRACE_INFRA_CACHE_REVALIDATE=true`` a cache hit also re-runs the MLflow
+steps on a daemon thread and rewrites the entry, so the next start sees any
+change; the running process keeps the cached values.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Callable
+
+from init.databricks import TraceInfrastructureResult
+
+logger = logging.getLogger(__name__)
+
+_CACHE_VERSION = 1
+
+
+def _default_cache_path() -> Path:
+    base = os.environ.get("XDG_CACHE_HOME", "").strip() or os.path.join(
+        os.path.expanduser("~"), ".cache"
+    )
+    return Path(base) / "se-workflow-test" / "trace_infrastructure.json"
+
+
+@dataclass(frozen=True)
+class TraceInfraCacheSettings:
+    path: Path
+    ttl_seconds: float = 86400.0
+    revalidate: bool = False
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_seconds > 0
+
+    @classmethod
+    def from_env(cls) -> "TraceInfraCacheSettings":
+        raw_path = os.environ.get("TRACE_INFRA_CACHE", "").strip()
+        return cls(
+            path=Path(raw_path).expanduser() if raw_path else _default_cache_path(),
+            ttl_seconds=float(os.environ.get("TRACE_INFRA_CACHE_TTL_SECONDS", "86400")),
+            revalidate=os.environ.get("TRACE_INFRA_CACHE_REVALIDATE", "false").lower()
+            in ("1", "true", "yes"),
+        )
+
+
+def trace_infrastructure_cache_key(
+    host: str, catalog: str, schema: str, experiment: str
+) -> str:
+    return "|".join((host.strip().rstrip("/"), catalog, schema, experiment))
+
+
+class TraceInfraCache:
+    """JSON file of results by key; unreadable or stale entries count as misses."""
+
+    def __init__(self, path: Path, ttl_seconds: float) -> None:
+        self.path = Path(path)
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+
+    def _load(self) -> dict[str, dict]:
+        try:
+            with open(self.path, encoding="utf-8") as handle:
+                data = json.load(handle)
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(data, dict) or data.get("version") != _CACHE_VERSION:
+            return {}
+        entries = data.get("entries")
+        return entries if isinstance(entries, dict) else {}
+
+    def get(self, key: str, now: float | None = None) -> TraceInfrastructureResult | None:
+        entry = self._load().get(key)
+        if not isinstance(entry, dict):
+            return None
+        now = time.time() if now is None else now
+        try:
+            if now - float(entry["stored_at"]) > self.ttl_seconds:
+                return None
+            return TraceInfrastructureResult(**entry["result"])
+        except (KeyError, TypeError, ValueError):
+            return None
+
+    def put(self, key: str, result: TraceInfrastructureResult, now: float | None = None) -> None:
+        """Store ``result`` (atomic rewrite; failures are logged, not raised)."""
+        with self._lock:
+            entries = self._load()
+            entries[key] = {
+                "stored_at": time.time() if now is None else now,
+                "result": asdict(result),
+            }
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                fd, tmp = tempfile.mkstemp(dir=self.path.parent, suffix=".tmp")
+                with os.fdopen(fd, "w", encoding="utf-8") as handle:
+                    json.dump({"version": _CACHE_VERSION, "entries": entries}, handle, indent=2)
+                os.replace(tmp, self.path)
+            except OSError as exc:
+                logger.warning("Could not write trace infrastructure cache %s: %s", self.path, exc)
+
+
+def revalidate_in_background(
+    cache: TraceInfraCache,
+    key: str,
+    cached: TraceInfrastructureResult,
+    resolve: Callable[[], TraceInfrastructureResult],
+) -> threading.Thread:
+    """Re-run ``resolve`` on a daemon thread and refresh the cache entry."""
+
+    def _run() -> None:
+        try:
+            fresh = resolve()
+        except Exception as exc:
+            logger.warning("Trace infrastructure revalidation failed: %s", exc)
+            return
+        cache.put(key, fresh)
+        if fresh != cached:
+            logger.warning(
+                "Trace infrastructure changed since it was cached (experiment %s -> %s); "
+                "restart to use the new values",
+                cached.experiment_id,
+                fresh.experiment_id,
+            )
+
+    thread = threading.Thread(target=_run, name="trace-infra-revalidate", daemon=True)
+    thread.start()
+    return thread
@@ -56,6 +56,22 @@ def _resolve_token(
     return None
 
 
+def _resolve_trace_location(
+    catalog: str | None,
+    schema: str | None,
+    experiment_name: str | None,
+    experiment_id: str | None,
+) -> tuple[str, str, str, str | None]:
+    """Apply env defaults: ``(catalog, schema, experiment_name, experiment_id)``."""
+    catalog = (catalog or os.getenv("DATABRICKS_CATALOG", "main")).strip()
+    schema = (schema or os.getenv("DATABRICKS_SCHEMA", "mlflow_traces")).strip()
+    experiment_id = (experiment_id or os.getenv("MLFLOW_EXPERIMENT_ID", "") or "").strip() or None
+    experiment_name = (
+        experiment_name or os.getenv("MLFLOW_EXPERIMENT_NAME", "/Shared/agent_traces").strip()
+    )
+    return catalog, schema, experiment_name, experiment_id
+
+
 def build_trace_configuration_updates(
     result: TraceInfrastructureResult,
     *,
@@ -144,6 +160,25 @@ def apply_trace_configuration(
     return updates
 
 
+def _connect_mlflow(warehouse_id: str | None) -> str:
+    """Point MLflow at Databricks and export the SQL warehouse id; returns the id."""
+    warehouse_id = warehouse_id or os.getenv("MLFLOW_TRACING_SQL_WAREHOUSE_ID", "").strip()
+    if not warehouse_id:
+        raise ValueError(
+            "MLFLOW_TRACING_SQL_WAREHOUSE_ID is required (SQL warehouse id from Databricks URL)."
+        )
+    try:
+        import mlflow
+    except ImportError as e:
+        raise ImportError(
+            "Install mlflow for Databricks tracing: uv sync (see mlflow in pyproject.toml)"
+        ) from e
+
+    mlflow.set_tracking_uri("databricks")
+    os.environ["MLFLOW_TRACING_SQL_WAREHOUSE_ID"] = warehouse_id
+    return warehouse_id
+
+
 def ensure_trace_infrastructure(
     *,
     warehouse_id: str | None = None,
@@ -159,30 +194,15 @@ def ensure_trace_infrastructure(
     Calls MLflow ``set_experiment_trace_location`` (Databricks), which creates
     Unity Catalog tables when needed.
     """
-    warehouse_id = warehouse_id or os.getenv("MLFLOW_TRACING_SQL_WAREHOUSE_ID", "").strip()
-    if not warehouse_id:
-        raise ValueError(
-            "MLFLOW_TRACING_SQL_WAREHOUSE_ID is required (SQL warehouse id from Databricks URL)."
-        )
+    warehouse_id = _connect_mlflow(warehouse_id)
 
-    catalog = (catalog or os.getenv("DATABRICKS_CATALOG", "main")).strip()
-    schema = (schema or os.getenv("DATABRICKS_SCHEMA", "mlflow_traces")).strip()
-    experiment_id = (experiment_id or os.getenv("MLFLOW_EXPERIMENT_ID", "") or "").strip() or None
-    experiment_name = (
-        experiment_name or os.getenv("MLFLOW_EXPERIMENT_NAME", "/Shared/agent_traces").strip()
+    catalog, schema, experiment_name, experiment_id = _resolve_trace_location(
+        catalog, schema, experiment_name, experiment_id
     )
 
-    try:
-        import mlflow
-        from mlflow.entities import UCSchemaLocation
-        from mlflow.tracing.enablement import set_experiment_trace_location
-    except ImportError as e:
-        raise ImportError(
-            "Install mlflow for Databricks tracing: uv sync (see mlflow in pyproject.toml)"
-        ) from e
-
-    mlflow.set_tracking_uri("databricks")
-    os.environ["MLFLOW_TRACING_SQL_WAREHOUSE_ID"] = warehouse_id
+    import mlflow  # installed: _connect_mlflow raised with the install hint otherwise
+    from mlflow.entities import UCSchemaLocation
+    from mlflow.tracing.enablement import set_experiment_trace_location
 
     if experiment_id:
         if verbose:
@@ -256,21 +276,60 @@ def init_and_connect(
     verbose: bool = True,
     update_environ: bool = True,
     dry_run: bool = False,
+    refresh: bool = False,
 ) -> TraceInfrastructureResult:
     """
     One-shot: UC tables (if needed) + experiment + OTEL env for the agent.
 
-    With ``dry_run=True``, runs MLflow ensure steps then only logs planned
-    ``os.environ`` updates without applying them.
+    The MLflow steps are skipped when ``init.cache`` holds a fresh result for
+    this host, catalog, schema and experiment (MLflow is still pointed at
+    Databricks and the warehouse id exported); ``refresh=True`` bypasses the
+    cached entry and rewrites it. With ``dry_run=True``, resolves the result
+    then only logs planned ``os.environ`` updates without applying them.
     """
-    result = ensure_trace_infrastructure(
-        warehouse_id=warehouse_id,
-        catalog=catalog,
-        schema=schema,
-        experiment_name=experiment_name,
-        experiment_id=experiment_id,
-        verbose=verbose,
+    from init.cache import (
+        TraceInfraCache,
+        TraceInfraCacheSettings,
+        revalidate_in_background,
+        trace_infrastructure_cache_key,
     )
+
+    def resolve(quiet: bool = False) -> TraceInfrastructureResult:
+        return ensure_trace_infrastructure(
+            warehouse_id=warehouse_id,
+            catalog=catalog,
+            schema=schema,
+            experiment_name=experiment_name,
+            experiment_id=experiment_id,
+            verbose=verbose and not quiet,
+        )
+
+    settings = TraceInfraCacheSettings.from_env()
+    cache = TraceInfraCache(settings.path, settings.ttl_seconds)
+    location = _resolve_trace_location(catalog, schema, experiment_name, experiment_id)
+    key = trace_infrastructure_cache_key(
+        databricks_host or os.environ.get("DATABRICKS_HOST", ""),
+        location[0],
+        location[1],
+        location[3] or location[2],
+    )
+    cached = cache.get(key) if settings.enabled and not refresh else None
+    if cached is None:
+        result = resolve()
+        if settings.enabled:
+            cache.put(key, result)
+    else:
+        # Skipped with the MLflow steps, but later MLflow calls in this process need it.
+        _connect_mlflow(warehouse_id)
+        result = cached
+        if verbose:
+            logger.info(
+                "Using cached trace infrastructure (experiment %s) from %s",
+                result.experiment_id,
+                settings.path,
+            )
+        if settings.revalidate:
+            revalidate_in_background(cache, key, cached, lambda: resolve(quiet=True))
     if dry_run:
         updates = build_trace_configuration_updates(
             result,
@@ -0,0 +1,14 @@
+"""Local model backend for offline runs: synthetic responses and record/replay cassettes."""
+
+from mock_llm.cassette import Cassette, request_key, schema_name
+from mock_llm.model import MockLlm, get_cassette, parse_distribution, register_mock_llm
+
+__all__ = [
+    "Cassette",
+    "MockLlm",
+    "get_cassette",
+    "parse_distribution",
+    "register_mock_llm",
+    "request_key",
+    "schema_name",
+]
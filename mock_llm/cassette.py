@@ -0,0 +1,118 @@
+"""Record/replay cassettes: JSONL files of model responses keyed by request content."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+from collections import defaultdict
+from typing import Any
+
+from google.adk.models.llm_request import LlmRequest
+from google.adk.models.llm_response import LlmResponse
+
+
+def schema_name(llm_request: LlmRequest) -> str:
+    """Name of the requested response schema ("" for free text); the replay fallback route."""
+    schema = llm_request.config.response_schema if llm_request.config else None
+    if schema is None:
+        return ""
+    if isinstance(schema, type):
+        return schema.__name__
+    if isinstance(schema, dict):
+        return str(schema.get("title", "dict"))
+    return type(schema).__name__
+
+
+def request_text(llm_request: LlmRequest) -> str:
+    """System instruction plus every text part of the conversation, in order."""
+    chunks: list[str] = []
+    config = llm_request.config
+    if config is not None and config.system_instruction:
+        chunks.append(str(config.system_instruction))
+    for content in llm_request.contents:
+        for part in content.parts or []:
+            if part.text:
+                chunks.append(f"{content.role}:{part.text}")
+    return "\n".join(chunks)
+
+
+def request_key(llm_request: LlmRequest) -> str:
+    """Deterministic cassette key; independent of model name and session ids."""
+    digest = hashlib.sha256()
+    digest.update(schema_name(llm_request).encode("utf-8"))
+    digest.update(b"\0")
+    digest.update(request_text(llm_request).encode("utf-8"))
+    return digest.hexdigest()
+
+
+class Cassette:
+    """Append-only JSONL cassette.
+
+    Each line: ``{"key", "schema", "latency_ms", "response"}`` where
+    ``response`` is ``LlmResponse.model_dump(mode="json", exclude_none=True)``
+    and so includes ``usage_metadata`` and ``finish_reason``.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        self._by_key: dict[str, dict[str, Any]] = {}
+        self._by_schema: dict[str, list[dict[str, Any]]] = defaultdict(list)
+        self._cursor: dict[str, int] = defaultdict(int)
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as handle:
+                for line in handle:
+                    if line.strip():
+                        self._index(json.loads(line))
+
+    def __len__(self) -> int:
+        return sum(len(entries) for entries in self._by_schema.values())
+
+    def _index(self, entry: dict[str, Any]) -> None:
+        self._by_key.setdefault(entry["key"], entry)
+        self._by_schema[entry.get("schema", "")].append(entry)
+
+    def lookup(
+        self, llm_request: LlmRequest, *, strict: bool = True
+    ) -> tuple[LlmResponse, float] | None:
+        """Return ``(response, recorded_latency_ms)`` for the request, or None.
+
+        Without ``strict``, a key miss falls back to the entries recorded for
+        the same response schema, cycled in recording order, so a cassette from
+        one question set can drive another.
+        """
+        with self._lock:
+            entry = self._by_key.get(request_key(llm_request))
+            if entry is None and not strict:
+                route = schema_name(llm_request)
+                candidates = self._by_schema.get(route) or []
+                if candidates:
+                    entry = candidates[self._cursor[route] % len(candidates)]
+                    self._cursor[route] += 1
+        if entry is None:
+            return None
+        return (
+            LlmResponse.model_validate(entry["response"]),
+            float(entry.get("latency_ms", 0.0)),
+        )
+
+    def record(
+        self, key: str, schema: str, response: LlmResponse, latency_ms: float
+    ) -> None:
+        """Append one entry; ``key``/``schema`` must be taken before the real model runs."""
+        entry = {
+            "key": key,
+            "schema": schema,
+            "latency_ms": round(latency_ms, 3),
+            "response": response.model_dump(mode="json", exclude_none=True),
+        }
+        line = json.dumps(entry, ensure_ascii=False)
+        with self._lock:
+            self._index(entry)
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as handle:
+                handle.write(line + "\n")
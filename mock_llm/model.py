@@ -0,0 +1,239 @@
+"""``MockLlm``: a local ADK model for offline runs and benchmarks (``MODEL=mock/...``).
+
+Model names:
+
+- ``mock/synthetic`` — deterministic filler responses (valid JSON when the agent
+  has an ``output_schema``) with configurable latency and token counts.
+- ``mock/replay`` — responses from the cassette at ``MOCK_LLM_CASSETTE``.
+- ``mock/record/<model>`` — call ``<model>`` for real and append every final
+  response to ``MOCK_LLM_CASSETTE``.
+
+Distributions (``MOCK_LLM_LATENCY_MS``, ``MOCK_LLM_OUTPUT_TOKENS``,
+``MOCK_LLM_REASONING_TOKENS``) are ``<n>``, ``uniform:<lo>:<hi>``,
+``normal:<mean>:<stddev>`` or ``lognormal:<median>:<sigma>``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import math
+import os
+import random
+import threading
+import time
+from typing import Any, AsyncGenerator, Callable
+
+from google.adk.models.base_llm import BaseLlm
+from google.adk.models.llm_request import LlmRequest
+from google.adk.models.llm_response import LlmResponse
+from google.adk.models.registry import LLMRegistry
+from google.genai import types
+from pydantic import Field, field_validator
+
+from mock_llm.cassette import Cassette, request_key, request_text, schema_name
+
+try:
+    from google.adk.models._capabilities import LlmCapabilities
+except ImportError:  # older google-adk without declared capabilities
+    LlmCapabilities = None
+
+_FILLER_WORDS = (
+    "lesson project risk scope budget timeline team vendor migration "
+    "testing rollout data pipeline latency cost review outcome action"
+).split()
+
+_cassettes: dict[str, Cassette] = {}
+_cassettes_lock = threading.Lock()
+
+
+def get_cassette(path: str) -> Cassette:
+    """One shared ``Cassette`` per path (agents each resolve their own model)."""
+    with _cassettes_lock:
+        cassette = _cassettes.get(path)
+        if cassette is None:
+            cassette = _cassettes[path] = Cassette(path)
+        return cassette
+
+
+def parse_distribution(spec: str) -> Callable[[random.Random], float]:
+    """Parse a distribution spec into a sampler (values are clamped at 0)."""
+    kind, _, rest = spec.strip().partition(":")
+    if not rest:
+        value = float(kind)
+        return lambda rng: max(0.0, value)
+    args = [float(a) for a in rest.split(":")]
+    if kind == "uniform" and len(args) == 2:
+        return lambda rng: max(0.0, rng.uniform(args[0], args[1]))
+    if kind == "normal" and len(args) == 2:
+        return lambda rng: max(0.0, rng.gauss(args[0], args[1]))
+    if kind == "lognormal" and len(args) == 2:
+        mu = math.log(args[0]) if args[0] > 0 else 0.0
+        return lambda rng: rng.lognormvariate(mu, args[1])
+    raise ValueError(f"Unsupported distribution spec: {spec!r}")
+
+
+def _env_bool(name: str, default: str) -> bool:
+    return os.environ.get(name, default).lower() in ("1", "true", "yes")
+
+
+def _json_schema(schema: Any) -> dict[str, Any] | None:
+    if isinstance(schema, dict):
+        return schema
+    if hasattr(schema, "model_json_schema"):
+        return schema.model_json_schema()
+    return None
+
+
+def _fill(schema: dict[str, Any], defs: dict[str, Any], words: Callable[[], str]) -> Any:
+    if "$ref" in schema:
+        return _fill(defs[schema["$ref"].rsplit("/", 1)[-1]], defs, words)
+    for key in ("anyOf", "oneOf"):
+        if key in schema:
+            options = [s for s in schema[key] if s.get("type") != "null"]
+            return _fill(options[0], defs, words) if options else None
+    kind = schema.get("type")
+    if kind == "object":
+        return {
+            name: _fill(prop, defs, words)
+            for name, prop in schema.get("properties", {}).items()
+        }
+    if kind == "array":
+        return [_fill(schema.get("items", {}), defs, words) for _ in range(2)]
+    if kind == "string":
+        return words()
+    if kind == "boolean":
+        return False
+    if kind in ("integer", "number"):
+        return 0
+    return None
+
+
+class MockLlm(BaseLlm):
+    """Deterministic stand-in for a real model; see module docstring for modes."""
+
+    cassette_path: str = Field(
+        default_factory=lambda: os.environ.get("MOCK_LLM_CASSETTE", "")
+    )
+    latency_ms: str = Field(
+        default_factory=lambda: os.environ.get("MOCK_LLM_LATENCY_MS", "0")
+    )
+    output_tokens: str = Field(
+        default_factory=lambda: os.environ.get("MOCK_LLM_OUTPUT_TOKENS", "200")
+    )
+    reasoning_tokens: str = Field(
+        default_factory=lambda: os.environ.get("MOCK_LLM_REASONING_TOKENS", "0")
+    )
+    seed: int = Field(default_factory=lambda: int(os.environ.get("MOCK_LLM_SEED", "0")))
+    strict: bool = Field(default_factory=lambda: _env_bool("MOCK_LLM_STRICT", "true"))
+    replay_latency: bool = Field(
+        default_factory=lambda: _env_bool("MOCK_LLM_REPLAY_LATENCY", "false")
+    )
+
+    @classmethod
+    def supported_models(cls) -> list[str]:
+        return [r"mock/.*"]
+
+    @field_validator("model")
+    @classmethod
+    def _check_record_model(cls, model: str) -> str:
+        parts = model.split("/", 2)
+        if parts[1:2] == ["record"] and not "".join(parts[2:]).strip():
+            raise ValueError(f"{model!r} names no model to record; use mock/record/<model>")
+        return model
+
+    if LlmCapabilities is not None:
+
+        @property
+        def capabilities(self) -> LlmCapabilities:
+            return LlmCapabilities(output_schema_and_tools=False)
+
+    @property
+    def mode(self) -> str:
+        return self.model.split("/", 2)[1] if "/" in self.model else "synthetic"
+
+    def _require_cassette(self) -> Cassette:
+        if not self.cassette_path:
+            raise ValueError(f"MOCK_LLM_CASSETTE is required for {self.model}")
+        return get_cassette(self.cassette_path)
+
+    async def generate_content_async(
+        self, llm_request: LlmRequest, stream: bool = False
+    ) -> AsyncGenerator[LlmResponse, None]:
+        if self.mode == "replay":
+            yield await self._replay(llm_request)
+        elif self.mode == "record":
+            async for response in self._record(llm_request, stream):
+                yield response
+        else:
+            yield await self._synthesize(llm_request)
+
+    async def _replay(self, llm_request: LlmRequest) -> LlmResponse:
+        hit = self._require_cassette().lookup(llm_request, strict=self.strict)
+        if hit is None:
+            raise LookupError(
+                f"No cassette entry in {self.cassette_path} for request "
+                f"{request_key(llm_request)[:12]} (schema={schema_name(llm_request)!r})"
+            )
+        response, recorded_ms = hit
+        if self.replay_latency and recorded_ms > 0:
+            await asyncio.sleep(recorded_ms / 1000.0)
+        return response
+
+    async def _record(
+        self, llm_request: LlmRequest, stream: bool
+    ) -> AsyncGenerator[LlmResponse, None]:
+        cassette = self._require_cassette()
+        inner_model = self.model.split("/", 2)[2]
+        key, route = request_key(llm_request), schema_name(llm_request)
+        inner = LLMRegistry.new_llm(inner_model)
+        start = time.perf_counter()
+        final: LlmResponse | None = None
+        async for response in inner.generate_content_async(llm_request, stream):
+            if not response.partial:
+                final = response
+            yield response
+        if final is not None:
+            cassette.record(key, route, final, (time.perf_counter() - start) * 1000.0)
+
+    async def _synthesize(self, llm_request: LlmRequest) -> LlmResponse:
+        key = request_key(llm_request)
+        rng = random.Random(f"{self.seed}:{key}")
+        delay_ms = parse_distribution(self.latency_ms)(rng)
+        n_out = max(1, int(parse_distribution(self.output_tokens)(rng)))
+        n_reasoning = int(parse_distribution(self.reasoning_tokens)(rng))
+
+        def words(n: int) -> str:
+            return " ".join(rng.choice(_FILLER_WORDS) for _ in range(n))
+
+        schema = _json_schema(llm_request.config.response_schema)
+        if schema is not None:
+            per_field = max(3, n_out // 8)
+            text = json.dumps(
+                _fill(schema, schema.get("$defs", {}), lambda: words(per_field))
+            )
+        else:
+            text = words(n_out)
+        parts = [types.Part(text=text)]
+        if n_reasoning > 0:
+            parts.insert(0, types.Part(text=words(n_reasoning), thought=True))
+
+        if delay_ms > 0:
+            await asyncio.sleep(delay_ms / 1000.0)
+        prompt_tokens = max(1, len(request_text(llm_request)) // 4)
+        return LlmResponse(
+            content=types.Content(role="model", parts=parts),
+            usage_metadata=types.GenerateContentResponseUsageMetadata(
+                prompt_token_count=prompt_tokens,
+                candidates_token_count=n_out,
+                thoughts_token_count=n_reasoning or None,
+                total_token_count=prompt_tokens + n_out + n_reasoning,
+            ),
+            finish_reason=types.FinishReason.STOP,
+            model_version=self.model,
+        )
+
+
+def register_mock_llm() -> None:
+    """Register ``MockLlm`` for ``mock/...`` model names (idempotent)."""
+    LLMRegistry.register(MockLlm)
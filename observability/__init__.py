@@ -1,36 +1,138 @@
-"""Reusable session / OTLP logging helpers for ADK workflows."""
-
-from observability.adk_defaults import apply_adk_telemetry_defaults
-from observability.llm_callbacks import (
-    after_model_logging,
-    build_instrumented_llm_agent,
-    merge_after_model_callbacks,
-)
-from observability.otel_sdk import configure_otel_from_env, otlp_export_initialized
-from observability.otlp_headers import (
-    format_otel_headers,
-    merge_otel_header_string,
-    parse_otel_headers,
-)
-from observability.session_logs import (
-    log_agent_step,
-    log_custom_agent_step,
-    log_llm_step_completed,
-    split_model_visible_and_reasoning_text,
-)
+"""Reusable session / OTLP logging helpers for ADK workflows.
+
+Names are imported on first access (PEP 562), so ``import observability.x``
+loads only ``x``: CLI entry points such as ``python -m init`` and modules that
+need one helper do not pay for google-adk and the OTLP exporters.
+"""
+
+from __future__ import annotations
+
+import importlib
+from typing import TYPE_CHECKING, Any
+
+_EXPORTS = {
+    "BatchExportSettings": "observability.export_pipeline",
+    "BlobOffloadSettings": "observability.blob_offload",
+    "BlobStore": "observability.blob_offload",
+    "InvocationProfilerPlugin": "observability.profiling",
+    "MemoryTracePlugin": "observability.memory",
+    "MemoryTraceSettings": "observability.plugin_settings",
+    "MetricsSettings": "observability.metrics",
+    "ParquetSinkSettings": "observability.parquet_sink",
+    "ProfilingSettings": "observability.plugin_settings",
+    "SpoolExporter": "observability.spool",
+    "SpoolSettings": "observability.spool",
+    "TailSamplingSettings": "observability.tail_sampling",
+    "TelemetryFlushPlugin": "observability.telemetry_flush",
+    "TelemetryFlushSettings": "observability.plugin_settings",
+    "after_model_logging": "observability.llm_callbacks",
+    "agent_metrics": "observability.metrics",
+    "apply_adk_telemetry_defaults": "observability.adk_defaults",
+    "build_instrumented_llm_agent": "observability.llm_callbacks",
+    "configure_otel_from_env": "observability.otel_sdk",
+    "flush_step_logs": "observability.session_logs",
+    "flush_telemetry": "observability.otel_sdk",
+    "format_otel_headers": "observability.otlp_headers",
+    "log_agent_step": "observability.session_logs",
+    "log_custom_agent_step": "observability.session_logs",
+    "log_llm_step_completed": "observability.session_logs",
+    "merge_after_model_callbacks": "observability.llm_callbacks",
+    "merge_otel_header_string": "observability.otlp_headers",
+    "otlp_export_diagnostics": "observability.otel_sdk",
+    "otlp_export_initialized": "observability.otel_sdk",
+    "parse_otel_headers": "observability.otlp_headers",
+    "shutdown_telemetry": "observability.otel_sdk",
+    "split_model_visible_and_reasoning_text": "observability.session_logs",
+    "step_log_queue_stats": "observability.session_logs",
+}
+
+if TYPE_CHECKING:
+    from observability.adk_defaults import apply_adk_telemetry_defaults
+    from observability.blob_offload import BlobOffloadSettings, BlobStore
+    from observability.export_pipeline import BatchExportSettings
+    from observability.llm_callbacks import (
+        after_model_logging,
+        build_instrumented_llm_agent,
+        merge_after_model_callbacks,
+    )
+    from observability.memory import MemoryTracePlugin
+    from observability.metrics import MetricsSettings, agent_metrics
+    from observability.otel_sdk import (
+        configure_otel_from_env,
+        flush_telemetry,
+        otlp_export_diagnostics,
+        otlp_export_initialized,
+        shutdown_telemetry,
+    )
+    from observability.otlp_headers import (
+        format_otel_headers,
+        merge_otel_header_string,
+        parse_otel_headers,
+    )
+    from observability.parquet_sink import ParquetSinkSettings
+    from observability.plugin_settings import (
+        MemoryTraceSettings,
+        ProfilingSettings,
+        TelemetryFlushSettings,
+    )
+    from observability.profiling import InvocationProfilerPlugin
+    from observability.session_logs import (
+        flush_step_logs,
+        log_agent_step,
+        log_custom_agent_step,
+        log_llm_step_completed,
+        split_model_visible_and_reasoning_text,
+        step_log_queue_stats,
+    )
+    from observability.spool import SpoolExporter, SpoolSettings
+    from observability.tail_sampling import TailSamplingSettings
+    from observability.telemetry_flush import TelemetryFlushPlugin
 
 __all__ = [
+    "BatchExportSettings",
+    "BlobOffloadSettings",
+    "BlobStore",
+    "InvocationProfilerPlugin",
+    "MemoryTracePlugin",
+    "MemoryTraceSettings",
+    "MetricsSettings",
+    "ParquetSinkSettings",
+    "ProfilingSettings",
+    "SpoolExporter",
+    "SpoolSettings",
+    "TailSamplingSettings",
+    "TelemetryFlushPlugin",
+    "TelemetryFlushSettings",
     "after_model_logging",
+    "agent_metrics",
     "apply_adk_telemetry_defaults",
     "build_instrumented_llm_agent",
     "configure_otel_from_env",
+    "flush_step_logs",
+    "flush_telemetry",
     "format_otel_headers",
     "log_agent_step",
     "log_custom_agent_step",
     "log_llm_step_completed",
     "merge_after_model_callbacks",
     "merge_otel_header_string",
+    "otlp_export_diagnostics",
     "otlp_export_initialized",
     "parse_otel_headers",
+    "shutdown_telemetry",
     "split_model_visible_and_reasoning_text",
+    "step_log_queue_stats",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,211 @@
+"""Content-addressed offload of large text attributes from spans and log records.
+
+``BlobOffloadExporter`` wraps a span or log exporter. Before each batch is
+exported, every string attribute (and string log body) of at least
+``min_chars`` characters is written once to a ``BlobStore`` under its SHA-256
+and replaced in the exported record by a short preview, with
+``<key>.sha256`` and ``<key>.size`` (UTF-8 bytes) attributes next to it.
+Identical payloads, such as the same ``documents_json`` prompt across
+sessions, are stored once no matter how often they are logged.
+
+The work runs on the batch processor's export thread, not the request path.
+Enabled by ``TELEMETRY_BLOB_DIR`` (a local directory or mounted volume);
+``TELEMETRY_BLOB_MIN_CHARS`` (default 8192) and
+``TELEMETRY_BLOB_PREVIEW_CHARS`` (default 256) tune it. Retrieve content with
+``BlobStore(dir).get(sha256)`` or ``scripts/get_telemetry_blob.py``.
+"""
+
+from __future__ import annotations
+
+import copy
+import gzip
+import hashlib
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Mapping, Sequence
+
+from opentelemetry.sdk._logs import LogData
+from opentelemetry.sdk.trace import ReadableSpan
+
+from observability.env_settings import env_int
+
+_KNOWN_CACHE = 50_000
+
+
+@dataclass(frozen=True)
+class BlobOffloadSettings:
+    directory: str
+    min_chars: int = 8192
+    preview_chars: int = 256
+
+    @classmethod
+    def from_env(cls) -> "BlobOffloadSettings | None":
+        """None unless ``TELEMETRY_BLOB_DIR`` is set; bad values fall back to defaults (warned)."""
+        directory = os.environ.get("TELEMETRY_BLOB_DIR", "").strip()
+        if not directory:
+            return None
+        return cls(
+            directory=directory,
+            min_chars=env_int("TELEMETRY_BLOB_MIN_CHARS", cls.min_chars),
+            preview_chars=env_int("TELEMETRY_BLOB_PREVIEW_CHARS", cls.preview_chars),
+        )
+
+
+class BlobStore:
+    """Write-once gzip blobs at ``<root>/<h[:2]>/<h>.gz``; safe across threads and processes."""
+
+    def __init__(self, root: str) -> None:
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+        self._lock = threading.Lock()
+        self._known: OrderedDict[str, None] = OrderedDict()
+        self.written = 0
+        self.deduplicated = 0
+        self.bytes_written = 0
+
+    def path(self, digest: str) -> str:
+        return os.path.join(self.root, digest[:2], f"{digest}.gz")
+
+    def put(self, data: bytes) -> str:
+        """Store ``data`` unless already present; returns its SHA-256 hex digest."""
+        digest = hashlib.sha256(data).hexdigest()
+        with self._lock:
+            if digest in self._known:
+                self._known.move_to_end(digest)
+                self.deduplicated += 1
+                return digest
+        path = self.path(digest)
+        if os.path.exists(path):
+            with self._lock:
+                self.deduplicated += 1
+        else:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            compressed = gzip.compress(data, compresslevel=6)
+            fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+            with os.fdopen(fd, "wb") as handle:
+                handle.write(compressed)
+            os.replace(tmp, path)
+            with self._lock:
+                self.written += 1
+                self.bytes_written += len(compressed)
+        with self._lock:
+            self._known[digest] = None
+            while len(self._known) > _KNOWN_CACHE:
+                self._known.popitem(last=False)
+        return digest
+
+    def get(self, digest: str) -> str:
+        with open(self.path(digest), "rb") as handle:
+            return gzip.decompress(handle.read()).decode("utf-8")
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "directory": self.root,
+                "written": self.written,
+                "deduplicated": self.deduplicated,
+                "bytes_written": self.bytes_written,
+            }
+
+
+class BlobOffloader:
+    """Rewrites attribute mappings, offloading long strings to a ``BlobStore``."""
+
+    def __init__(self, store: BlobStore, settings: BlobOffloadSettings) -> None:
+        self.store = store
+        self.settings = settings
+        self._lock = threading.Lock()
+        self.offloaded = 0
+        self.offloaded_chars = 0
+
+    def _preview(self, text: str) -> str:
+        n = self.settings.preview_chars
+        return text if len(text) <= n else text[:n] + "…"
+
+    def offload(self, key: str, text: str, out: dict[str, Any]) -> None:
+        data = text.encode("utf-8")
+        out[key] = self._preview(text)
+        out[f"{key}.sha256"] = self.store.put(data)
+        out[f"{key}.size"] = len(data)
+        with self._lock:
+            self.offloaded += 1
+            self.offloaded_chars += len(text)
+
+    def rewrite(self, attributes: Mapping[str, Any] | None) -> dict[str, Any] | None:
+        """New attributes with long strings offloaded, or None if nothing qualified."""
+        if not attributes:
+            return None
+        limit = self.settings.min_chars
+        if not any(isinstance(v, str) and len(v) >= limit for v in attributes.values()):
+            return None
+        out: dict[str, Any] = {}
+        for key, value in attributes.items():
+            if isinstance(value, str) and len(value) >= limit:
+                self.offload(key, value, out)
+            else:
+                out[key] = value
+        return out
+
+    def span(self, span: ReadableSpan) -> ReadableSpan:
+        attributes = self.rewrite(span.attributes)
+        if attributes is None:
+            return span
+        return ReadableSpan(
+            name=span.name,
+            context=span.context,
+            parent=span.parent,
+            resource=span.resource,
+            attributes=attributes,
+            events=span.events,
+            links=span.links,
+            kind=span.kind,
+            status=span.status,
+            start_time=span.start_time,
+            end_time=span.end_time,
+            instrumentation_scope=span.instrumentation_scope,
+        )
+
+    def log(self, log_data: LogData) -> LogData:
+        record = log_data.log_record
+        attributes = self.rewrite(record.attributes)
+        body = record.body
+        long_body = isinstance(body, str) and len(body) >= self.settings.min_chars
+        if attributes is None and not long_body:
+            return log_data
+        record = copy.copy(record)
+        attributes = attributes if attributes is not None else dict(record.attributes or {})
+        if long_body:
+            self.offload("log.body", body, attributes)
+            record.body = attributes.pop("log.body")
+        record.attributes = attributes
+        return LogData(log_record=record, instrumentation_scope=log_data.instrumentation_scope)
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            counters = {"offloaded": self.offloaded, "offloaded_chars": self.offloaded_chars}
+        return {**counters, **self.store.stats()}
+
+
+class BlobOffloadExporter:
+    """Span or log exporter wrapper applying a ``BlobOffloader`` to every batch."""
+
+    def __init__(self, exporter: Any, offloader: BlobOffloader) -> None:
+        self.exporter = exporter
+        self.offloader = offloader
+
+    def export(self, batch: Sequence[Any]) -> Any:
+        rewritten = [
+            self.offloader.span(item) if isinstance(item, ReadableSpan) else self.offloader.log(item)
+            for item in batch
+        ]
+        return self.exporter.export(rewritten)
+
+    def force_flush(self, timeout_millis: int = 30000) -> bool:
+        flush = getattr(self.exporter, "force_flush", None)
+        return flush(timeout_millis) if flush is not None else True
+
+    def shutdown(self, **kwargs: Any) -> None:
+        return self.exporter.shutdown(**kwargs)
@@ -0,0 +1,222 @@
+"""Databricks workspace REST client shared by the scripts and ``trace_fetch``.
+
+One ``requests.Session`` per client, with a connection pool sized to the
+worker pool, so every call reuses a kept-alive HTTPS connection. ``map`` runs
+independent calls (for example one table listing per schema) on a bounded
+thread pool. ``paginate`` follows ``next_page_token``. Failed calls are retried
+with exponential backoff, honouring ``Retry-After``:
+
+- GET / HEAD / PUT / DELETE on connection errors, 429 and 5xx
+- POST on 429 and 503 only (the workspace rejected it before doing anything),
+  so a statement is never submitted twice
+
+The workspace comes from ``DATABRICKS_HOST`` and the token from
+``DATABRICKS_TOKEN`` or the bearer token in ``OTEL_EXPORTER_OTLP_HEADERS``.
+``tests/databricks_fake.py`` is an in-process stand-in for the session.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Iterable, Iterator, TypeVar
+
+from observability.otlp_headers import parse_otel_headers
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+POST_RETRY_STATUSES = frozenset({429, 503})
+_IDEMPOTENT = frozenset({"GET", "HEAD", "PUT", "DELETE"})
+
+
+class DatabricksApiError(RuntimeError):
+    """A workspace API call failed after retries."""
+
+    def __init__(self, method: str, url: str, status: int | None, message: str) -> None:
+        super().__init__(f"{method} {url}: {status or 'no response'} {message}".rstrip())
+        self.status = status
+
+
+def databricks_token_from_env() -> str | None:
+    """``DATABRICKS_TOKEN``, else the bearer token in ``OTEL_EXPORTER_OTLP_HEADERS``."""
+    token = os.environ.get("DATABRICKS_TOKEN", "").strip()
+    if token:
+        return token
+    auth = parse_otel_headers(os.environ.get("OTEL_EXPORTER_OTLP_HEADERS", "")).get(
+        "Authorization", ""
+    )
+    if auth.lower().startswith("bearer "):
+        return auth.split(None, 1)[1].strip()
+    return None
+
+
+def _new_session(pool_size: int) -> Any:
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+class DatabricksRestClient:
+    """Pooled, retrying client for ``<host>/api/...`` calls."""
+
+    def __init__(
+        self,
+        host: str,
+        token: str,
+        *,
+        session: Any = None,
+        max_workers: int = 8,
+        retries: int = 4,
+        backoff_s: float = 0.5,
+        max_backoff_s: float = 30.0,
+        timeout_s: float = 60.0,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        self.host = host.strip().rstrip("/")
+        if not self.host.startswith(("https://", "http://")):
+            self.host = f"https://{self.host}"
+        self.session = session if session is not None else _new_session(max_workers)
+        self.max_workers = max_workers
+        self.retries = retries
+        self.backoff_s = backoff_s
+        self.max_backoff_s = max_backoff_s
+        self.timeout_s = timeout_s
+        self._sleep = sleep
+        self._auth = {"Authorization": f"Bearer {token}"}
+        self._pool: ThreadPoolExecutor | None = None
+        self._pool_lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls, **kwargs: Any) -> "DatabricksRestClient":
+        host = os.environ.get("DATABRICKS_HOST", "").strip()
+        token = databricks_token_from_env()
+        missing = [n for n, v in (("DATABRICKS_HOST", host), ("DATABRICKS_TOKEN", token)) if not v]
+        if missing:
+            raise ValueError(f"set {', '.join(missing)} to call the Databricks API")
+        assert token is not None
+        return cls(host, token, **kwargs)
+
+    def _delay(self, attempt: int, response: Any) -> float:
+        retry_after = response.headers.get("Retry-After") if response is not None else None
+        if retry_after:
+            try:
+                return min(float(retry_after), self.max_backoff_s)
+            except ValueError:
+                pass
+        return min(self.backoff_s * 2**attempt, self.max_backoff_s)
+
+    def request(self, method: str, path_or_url: str, **kwargs: Any) -> Any:
+        """The response to ``method`` on an API path (authenticated) or a full URL (not).
+
+        Retries as described in the module docstring and returns the last
+        response whatever its status; ``api`` raises on errors instead.
+        """
+        import requests
+
+        method = method.upper()
+        if path_or_url.startswith(("https://", "http://")):
+            url, headers = path_or_url, dict(kwargs.pop("headers", None) or {})
+        else:
+            url = f"{self.host}{path_or_url}"
+            headers = {**(kwargs.pop("headers", None) or {}), **self._auth}
+        kwargs.setdefault("timeout", self.timeout_s)
+        retry_statuses = RETRY_STATUSES if method in _IDEMPOTENT else POST_RETRY_STATUSES
+        attempt = 0
+        while True:
+            response = None
+            try:
+                response = self.session.request(method, url, headers=headers, **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as exc:
+                if method not in _IDEMPOTENT or attempt >= self.retries:
+                    raise DatabricksApiError(method, url, None, str(exc)) from exc
+            else:
+                if response.status_code not in retry_statuses or attempt >= self.retries:
+                    return response
+                response.close()
+            self._sleep(self._delay(attempt, response))
+            attempt += 1
+
+    def api(self, method: str, path: str, **kwargs: Any) -> dict[str, Any]:
+        """JSON body of a successful call; ``DatabricksApiError`` otherwise."""
+        response = self.request(method, path, **kwargs)
+        if response.status_code >= 400:
+            text = getattr(response, "text", "") or ""
+            raise DatabricksApiError(method.upper(), path, response.status_code, text[:300])
+        return response.json()
+
+    def get(self, path: str, **params: Any) -> dict[str, Any]:
+        return self.api("GET", path, params=params or None)
+
+    def paginate(self, path: str, items_key: str, **params: Any) -> Iterator[dict[str, Any]]:
+        """Items of every page of a list endpoint (``page_token`` / ``next_page_token``)."""
+        while True:
+            page = self.get(path, **params)
+            yield from page.get(items_key) or []
+            token = page.get("next_page_token")
+            if not token:
+                return
+            params = {**params, "page_token": token}
+
+    def map(self, fn: Callable[[T], R], items: Iterable[T]) -> list[R]:
+        """``[fn(item) for item in items]``, run on the client's bounded thread pool."""
+        items = list(items)
+        if len(items) <= 1 or self.max_workers <= 1:
+            return [fn(item) for item in items]
+        with self._pool_lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="databricks-rest"
+                )
+        return list(self._pool.map(fn, items))
+
+    def close(self) -> None:
+        with self._pool_lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=True)
+                self._pool = None
+        self.session.close()
+
+    def __enter__(self) -> "DatabricksRestClient":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+
+UNITY_CATALOG_API = "/api/2.1/unity-catalog"
+
+
+def list_catalogs(client: DatabricksRestClient) -> list[str]:
+    return [c["name"] for c in client.paginate(f"{UNITY_CATALOG_API}/catalogs", "catalogs")]
+
+
+def list_schema_tables(client: DatabricksRestClient, catalog: str) -> dict[str, list[str]]:
+    """``{schema: [table, ...]}`` for ``catalog``: one listing per schema, run concurrently."""
+    schemas = [
+        s["name"]
+        for s in client.paginate(f"{UNITY_CATALOG_API}/schemas", "schemas", catalog_name=catalog)
+    ]
+
+    def tables(schema: str) -> list[str]:
+        return [
+            t["name"]
+            for t in client.paginate(
+                f"{UNITY_CATALOG_API}/tables",
+                "tables",
+                catalog_name=catalog,
+                schema_name=schema,
+                omit_columns="true",
+                omit_properties="true",
+            )
+        ]
+
+    return dict(zip(schemas, client.map(tables, schemas)))
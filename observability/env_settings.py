@@ -0,0 +1,55 @@
+"""Lenient parsing of the ``from_env`` settings knobs.
+
+``load_config`` reads most settings when ``workflow`` is imported, and some are
+read again on the hot path (``session_logs``), so a malformed value is logged
+and replaced by its default instead of stopping the app. A combination the
+settings class rejects is handled by its ``from_env`` the same way: it logs the
+error and falls back to its defaults.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+from typing import Sequence
+
+logger = logging.getLogger(__name__)
+
+
+def env_float(name: str, default: float) -> float:
+    """``float(os.environ[name])``; ``default`` when unset, blank or not a number (warned)."""
+    raw = os.environ.get(name, "").strip()
+    if not raw:
+        return default
+    try:
+        return float(raw)
+    except ValueError:
+        logger.warning("Ignoring %s=%r (not a number)", name, raw)
+        return default
+
+
+def env_int(name: str, default: int) -> int:
+    """Like ``env_float``, truncated to an int (``"1.5"`` reads as 1)."""
+    return int(env_float(name, default))
+
+
+def env_choice(name: str, default: str, choices: Sequence[str]) -> str:
+    """Lowercased value of ``name`` if it is one of ``choices``, else ``default`` (warned)."""
+    value = os.environ.get(name, "").strip().lower()
+    if not value:
+        return default
+    if value not in choices:
+        logger.warning(
+            "Ignoring %s=%r (expected one of %s); using %s",
+            name,
+            value,
+            ", ".join(choices),
+            default,
+        )
+        return default
+    return value
+
+
+def warn_invalid(prefix: str, exc: ValueError) -> None:
+    """Log that the ``<prefix>_*`` settings were rejected as a whole."""
+    logger.warning("Ignoring %s_* settings (%s); using the defaults", prefix, exc)
@@ -0,0 +1,239 @@
+"""Tunable OTLP batch export with live queue/export/drop counters.
+
+Spans and logs are configured separately from the standard SDK variables
+(``OTEL_BSP_*`` for spans, ``OTEL_BLRP_*`` for logs) or from ``AppConfig``:
+
+- ``*_MAX_QUEUE_SIZE`` — records buffered before new ones evict the oldest
+- ``*_MAX_EXPORT_BATCH_SIZE`` — records per export request
+- ``*_SCHEDULE_DELAY`` — ms between exports when the batch is not full
+- ``*_EXPORT_TIMEOUT`` — ms per export request (applied to the HTTP exporter)
+
+The processors count every record they accept, every record that reaches the
+exporter (exported or failed) and every record evicted from a full queue.
+
+``load_config`` reads these at import time (``workflow``), so a malformed
+value is logged and replaced by its default instead of stopping the app.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+from dataclasses import asdict, dataclass
+from typing import Any, Sequence
+
+from opentelemetry.exporter.otlp.proto.http import Compression
+from opentelemetry.sdk._logs import LogData
+from opentelemetry.sdk._logs.export import BatchLogRecordProcessor, LogExportResult
+from opentelemetry.sdk.trace import ReadableSpan
+from opentelemetry.sdk.trace.export import BatchSpanProcessor, SpanExportResult
+
+from observability.env_settings import env_float, env_int, warn_invalid
+
+_ENV_PREFIX = {"spans": "OTEL_BSP", "logs": "OTEL_BLRP"}
+_DEFAULT_SCHEDULE_DELAY_MS = {"spans": 5000.0, "logs": 1000.0}
+_SUCCESS = (SpanExportResult.SUCCESS, LogExportResult.SUCCESS)
+
+logger = logging.getLogger(__name__)
+
+
+def otlp_compression_from_env() -> str:
+    """Compression name from ``OTEL_EXPORTER_OTLP_COMPRESSION``; ``none`` if unknown (warned)."""
+    value = os.environ.get("OTEL_EXPORTER_OTLP_COMPRESSION", "none").strip().lower() or "none"
+    try:
+        return Compression(value).value
+    except ValueError:
+        logger.warning(
+            "Ignoring OTEL_EXPORTER_OTLP_COMPRESSION=%r (expected one of %s); using none",
+            value,
+            ", ".join(c.value for c in Compression),
+        )
+        return Compression.NoCompression.value
+
+
+@dataclass(frozen=True)
+class BatchExportSettings:
+    max_queue_size: int = 2048
+    max_export_batch_size: int = 512
+    schedule_delay_millis: float = 5000.0
+    export_timeout_millis: float = 30000.0
+
+    def __post_init__(self) -> None:
+        if self.max_queue_size <= 0 or self.max_export_batch_size <= 0:
+            raise ValueError("max_queue_size and max_export_batch_size must be positive")
+        if self.max_export_batch_size > self.max_queue_size:
+            raise ValueError("max_export_batch_size must not exceed max_queue_size")
+        if self.schedule_delay_millis <= 0 or self.export_timeout_millis <= 0:
+            raise ValueError("schedule_delay_millis and export_timeout_millis must be positive")
+
+    @classmethod
+    def from_env(cls, signal: str) -> "BatchExportSettings":
+        """Settings for ``"spans"`` or ``"logs"`` from ``OTEL_BSP_*`` / ``OTEL_BLRP_*``.
+
+        A value that is not a number is ignored, and a combination the
+        processor rejects falls back to the defaults; both are logged.
+        """
+        prefix = _ENV_PREFIX[signal]
+        defaults = cls(schedule_delay_millis=_DEFAULT_SCHEDULE_DELAY_MS[signal])
+        try:
+            return cls(
+                max_queue_size=env_int(f"{prefix}_MAX_QUEUE_SIZE", defaults.max_queue_size),
+                max_export_batch_size=env_int(
+                    f"{prefix}_MAX_EXPORT_BATCH_SIZE", defaults.max_export_batch_size
+                ),
+                schedule_delay_millis=env_float(
+                    f"{prefix}_SCHEDULE_DELAY", defaults.schedule_delay_millis
+                ),
+                export_timeout_millis=env_float(
+                    f"{prefix}_EXPORT_TIMEOUT", defaults.export_timeout_millis
+                ),
+            )
+        except ValueError as exc:
+            warn_invalid(prefix, exc)
+            return defaults
+
+
+class ExportStats:
+    """Thread-safe counters for one signal's batch export pipeline."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.queued = 0
+        self.exported = 0
+        self.dropped = 0
+        self.failed = 0
+        self.batches = 0
+        self.failed_batches = 0
+        self.in_queue = 0
+        self.export_ms_total = 0.0
+        self.export_ms_max = 0.0
+        self.export_ms_last = 0.0
+
+    def record_enqueue(self, max_queue_size: int) -> None:
+        with self._lock:
+            self.queued += 1
+            if self.in_queue >= max_queue_size:
+                # The SDK queue evicts its oldest record to make room.
+                self.dropped += 1
+            else:
+                self.in_queue += 1
+
+    def record_dequeue(self, n: int) -> None:
+        with self._lock:
+            self.in_queue = max(0, self.in_queue - n)
+
+    def record_export(self, n: int, elapsed_ms: float, ok: bool) -> None:
+        with self._lock:
+            self.batches += 1
+            if ok:
+                self.exported += n
+            else:
+                self.failed += n
+                self.failed_batches += 1
+            self.export_ms_total += elapsed_ms
+            self.export_ms_max = max(self.export_ms_max, elapsed_ms)
+            self.export_ms_last = elapsed_ms
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "queued": self.queued,
+                "exported": self.exported,
+                "dropped": self.dropped,
+                "failed": self.failed,
+                "in_queue": self.in_queue,
+                "batches": self.batches,
+                "failed_batches": self.failed_batches,
+                "export_ms_mean": self.export_ms_total / self.batches if self.batches else 0.0,
+                "export_ms_max": self.export_ms_max,
+                "export_ms_last": self.export_ms_last,
+            }
+
+
+class CountingExporter:
+    """Wraps a span or log exporter; times each batch and counts its outcome."""
+
+    def __init__(self, exporter: Any, stats: ExportStats) -> None:
+        self.exporter = exporter
+        self.stats = stats
+
+    def export(self, batch: Sequence[Any]) -> Any:
+        self.stats.record_dequeue(len(batch))
+        start = time.perf_counter()
+        try:
+            result = self.exporter.export(batch)
+        except Exception:
+            self.stats.record_export(len(batch), (time.perf_counter() - start) * 1000.0, False)
+            raise
+        self.stats.record_export(
+            len(batch), (time.perf_counter() - start) * 1000.0, result in _SUCCESS
+        )
+        return result
+
+    def force_flush(self, timeout_millis: int = 30000) -> bool:
+        flush = getattr(self.exporter, "force_flush", None)
+        return flush(timeout_millis) if flush is not None else True
+
+    def shutdown(self, **kwargs: Any) -> None:
+        return self.exporter.shutdown(**kwargs)
+
+
+def _processor_kwargs(settings: BatchExportSettings) -> dict[str, Any]:
+    return {
+        "max_queue_size": settings.max_queue_size,
+        "max_export_batch_size": settings.max_export_batch_size,
+        "schedule_delay_millis": settings.schedule_delay_millis,
+        "export_timeout_millis": settings.export_timeout_millis,
+    }
+
+
+def abandon_batch_processor(processor: Any) -> None:
+    """Forked child: stop an inherited batch processor without exporting what it holds.
+
+    The SDK's own fork hook restarts the worker thread of every batch
+    processor in the child. For processors the child replaces, this marks them
+    shut down and wakes the worker so it exits; the queue was the parent's.
+    Anything else (no ``_batch_processor``) is left alone.
+    """
+    batch = getattr(processor, "_batch_processor", None)
+    if batch is None:
+        return
+    batch._shutdown = True  # emit and force_flush become no-ops
+    batch._shutdown_timeout_exceeded = True  # the worker's final export finds nothing to send
+    batch._queue.clear()
+    batch._worker_awaken.set()
+
+
+class InstrumentedBatchSpanProcessor(BatchSpanProcessor):
+    """``BatchSpanProcessor`` with explicit settings and ``ExportStats``."""
+
+    def __init__(self, exporter: Any, settings: BatchExportSettings) -> None:
+        self.settings = settings
+        self.stats = ExportStats()
+        super().__init__(CountingExporter(exporter, self.stats), **_processor_kwargs(settings))
+
+    def on_end(self, span: ReadableSpan) -> None:
+        if span.context.trace_flags.sampled:
+            self.stats.record_enqueue(self.settings.max_queue_size)
+        super().on_end(span)
+
+    def diagnostics(self) -> dict[str, Any]:
+        return {"settings": asdict(self.settings), **self.stats.snapshot()}
+
+
+class InstrumentedBatchLogRecordProcessor(BatchLogRecordProcessor):
+    """``BatchLogRecordProcessor`` with explicit settings and ``ExportStats``."""
+
+    def __init__(self, exporter: Any, settings: BatchExportSettings) -> None:
+        self.settings = settings
+        self.stats = ExportStats()
+        super().__init__(CountingExporter(exporter, self.stats), **_processor_kwargs(settings))
+
+    def on_emit(self, log_data: LogData) -> None:
+        self.stats.record_enqueue(self.settings.max_queue_size)
+        super().on_emit(log_data)
+
+    def diagnostics(self) -> dict[str, Any]:
+        return {"settings": asdict(self.settings), **self.stats.snapshot()}
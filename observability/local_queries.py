@@ -0,0 +1,111 @@
+"""Run the bundled Databricks trace queries over local Parquet files with DuckDB.
+
+``translate_query`` rewrites a query from ``sql/mlflow_trace_tables/queries``
+into DuckDB SQL:
+
+- catalog-qualified ``mlflow_experiment_trace_otel_spans`` / ``_logs`` names
+  (any catalog and schema, backticked or not) become the ``otel_spans`` /
+  ``otel_logs`` views over ``TELEMETRY_PARQUET_DIR`` (see ``parquet_sink``)
+- ``mlflow_experiment_trace_rollup_*`` names become local ``rollup_*`` tables
+  (see ``observability.rollups``), kept in the DuckDB database file
+- backtick identifiers become double-quoted ones, ``:name`` parameters ``$name``
+- ``approx_percentile`` → ``approx_quantile``, ``TIMESTAMP_MILLIS`` → ``epoch_ms``,
+  ``get_json_object`` → ``json_extract_string``, ``COLLECT_LIST`` → ``array_agg``,
+  ``STRUCT(...)`` → ``row(...)`` and ``MAP<STRING, STRING>`` (also as a
+  ``FROM_JSON`` schema) to the DuckDB map type
+
+Queries on tables the sink does not write (the metrics table, the
+``mlflow_experiment_trace_unified`` / ``_metadata`` views) raise ``ValueError``;
+every bundled query on the spans, logs and rollup tables runs unchanged.
+Requires ``duckdb`` (``uv sync --extra local-traces``).
+"""
+
+from __future__ import annotations
+
+import os
+import re
+from pathlib import Path
+from typing import Any
+
+QUERIES_DIR = Path(__file__).resolve().parent.parent / "sql" / "mlflow_trace_tables" / "queries"
+
+LOCAL_TABLES = {
+    "mlflow_experiment_trace_otel_spans": ("otel_spans", "spans"),
+    "mlflow_experiment_trace_otel_logs": ("otel_logs", "logs"),
+}
+
+# An ``mlflow_experiment_trace_*`` name with optional catalog / schema; group 1 is the table.
+TRACE_TABLE_PATTERN = re.compile(
+    r"(?:`?[\w-]+`?\s*\.\s*){0,2}`?(mlflow_experiment_trace_\w+)`?", re.IGNORECASE
+)
+_FUNCTIONS = (
+    (re.compile(r"\bapprox_percentile\s*\(", re.IGNORECASE), "approx_quantile("),
+    (re.compile(r"\bTIMESTAMP_MILLIS\s*\(", re.IGNORECASE), "epoch_ms("),
+    (re.compile(r"\bget_json_object\s*\(", re.IGNORECASE), "json_extract_string("),
+    (re.compile(r"\bCOLLECT_LIST\s*\(", re.IGNORECASE), "array_agg("),
+    (re.compile(r"\bSTRUCT\s*\(", re.IGNORECASE), "row("),
+    # FROM_JSON schema string, then the column type.
+    (re.compile(r"'MAP<\s*STRING\s*,\s*STRING\s*>'", re.IGNORECASE), "'\"MAP(VARCHAR, VARCHAR)\"'"),
+    (re.compile(r"\bMAP<\s*STRING\s*,\s*STRING\s*>", re.IGNORECASE), "MAP(VARCHAR, VARCHAR)"),
+)
+_LINE_COMMENT = re.compile(r"--[^\n]*")
+# ``:name`` statement parameters, but not ``::type`` casts or ``col:path`` JSON lookups.
+_PARAMETER = re.compile(r"(?<![:\w)\]]):([A-Za-z_]\w*)")
+ROLLUP_PREFIX = "mlflow_experiment_trace_rollup_"
+
+
+def translate_query(sql: str) -> str:
+    """Databricks SQL over the UC trace tables → DuckDB SQL over the local views."""
+    sql = _LINE_COMMENT.sub("", sql)
+
+    def table(match: re.Match[str]) -> str:
+        name = match.group(1).lower()
+        if name.startswith(ROLLUP_PREFIX):
+            return name[len("mlflow_experiment_trace_") :]
+        if name not in LOCAL_TABLES:
+            raise ValueError(
+                f"{name} is not available locally "
+                f"(only {', '.join(LOCAL_TABLES)} and {ROLLUP_PREFIX}*)"
+            )
+        return LOCAL_TABLES[name][0]
+
+    sql = TRACE_TABLE_PATTERN.sub(table, sql)
+    for pattern, replacement in _FUNCTIONS:
+        sql = pattern.sub(replacement, sql)
+    sql = _PARAMETER.sub(r"$\1", sql)
+    return sql.replace("`", '"')
+
+
+def resolve_query(name_or_path: str) -> Path:
+    """A path as given, else ``<name>`` / ``<name>.sql`` under ``QUERIES_DIR``."""
+    path = Path(name_or_path)
+    if path.exists():
+        return path
+    for candidate in (QUERIES_DIR / name_or_path, QUERIES_DIR / f"{name_or_path}.sql"):
+        if candidate.exists():
+            return candidate
+    raise FileNotFoundError(f"no query {name_or_path!r} (looked in {QUERIES_DIR})")
+
+
+def connect(parquet_dir: str, database: str = ":memory:") -> Any:
+    """DuckDB connection with ``otel_spans`` / ``otel_logs`` views over ``parquet_dir``."""
+    try:
+        import duckdb
+    except ImportError as e:
+        raise ImportError("Local trace queries need duckdb: uv sync --extra local-traces") from e
+    con = duckdb.connect(database)
+    for view, subdir in LOCAL_TABLES.values():
+        root = os.path.join(parquet_dir, subdir)
+        if not os.path.isdir(root):
+            continue
+        pattern = os.path.join(root, "**", "*.parquet").replace("'", "''")
+        con.execute(
+            f"CREATE OR REPLACE VIEW {view} AS SELECT * FROM "
+            f"read_parquet('{pattern}', hive_partitioning = true, union_by_name = true)"
+        )
+    return con
+
+
+def run_query(con: Any, sql: str, parameters: dict[str, Any] | None = None) -> Any:
+    """Translate and run ``sql``; returns the DuckDB relation."""
+    return con.sql(translate_query(sql), params=parameters)
@@ -0,0 +1,197 @@
+"""Pre-aggregated OTLP metrics: agent step latency, LLM tokens, reader throughput, cache hits.
+
+Instruments (histograms use the explicit buckets below, installed as views):
+
+- ``agent.step.duration`` (s) — every ADK ``invoke_agent`` span, by
+  ``gen_ai.agent.name`` and ``error``
+- ``gen_ai.client.operation.duration`` (s) — every ``call_llm`` span, by
+  ``gen_ai.request.model``
+- ``gen_ai.client.token.usage`` ({token}) — per LLM step, by
+  ``gen_ai.agent.name`` and ``gen_ai.token.type`` (``input`` / ``output`` /
+  ``reasoning`` / ``cached``)
+- ``reader.files`` / ``reader.bytes`` (counters) and ``reader.throughput``
+  (By/s) — per reader pass
+- ``agent.cache.requests`` (counter) — by ``cache`` and ``result``
+  (``hit`` / ``miss``); the hit ratio is ``hit / (hit + miss)``
+
+Instruments come from the global meter, so they cost nothing until
+``configure_otel_from_env`` installs a ``MeterProvider``. That happens when
+``OTEL_METRICS_EXPORTER=otlp``; ``OTEL_METRIC_EXPORT_INTERVAL`` (ms, default
+60000) and ``OTEL_METRIC_EXPORT_TIMEOUT`` (ms, default 30000) tune the
+periodic reader. Export uses delta temporality, so each row of the metrics
+table covers one interval.
+"""
+
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+from opentelemetry import metrics
+from opentelemetry.context import Context
+from opentelemetry.metrics import Meter
+from opentelemetry.sdk.trace import ReadableSpan, Span, SpanProcessor
+from opentelemetry.trace import StatusCode
+
+if TYPE_CHECKING:
+    from opentelemetry.sdk.metrics.view import View
+
+DURATION_BUCKETS_S = (
+    0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 60.0, 120.0, 300.0,
+)
+TOKEN_BUCKETS = (
+    1, 16, 64, 256, 1024, 4096, 16384, 32768, 65536, 131072, 262144, 524288, 1048576,
+)
+THROUGHPUT_BUCKETS_BPS = (
+    2**16, 2**18, 2**20, 2**22, 2**24, 2**26, 2**28, 2**30,
+)
+
+_HISTOGRAM_BUCKETS = {
+    "agent.step.duration": DURATION_BUCKETS_S,
+    "gen_ai.client.operation.duration": DURATION_BUCKETS_S,
+    "gen_ai.client.token.usage": TOKEN_BUCKETS,
+    "reader.throughput": THROUGHPUT_BUCKETS_BPS,
+}
+
+
+@dataclass(frozen=True)
+class MetricsSettings:
+    export_interval_millis: float = 60_000.0
+    export_timeout_millis: float = 30_000.0
+
+    @classmethod
+    def from_env(cls) -> "MetricsSettings | None":
+        """None unless ``OTEL_METRICS_EXPORTER`` is ``otlp``."""
+        if os.environ.get("OTEL_METRICS_EXPORTER", "none").strip().lower() != "otlp":
+            return None
+        return cls(
+            export_interval_millis=float(os.environ.get("OTEL_METRIC_EXPORT_INTERVAL", "60000")),
+            export_timeout_millis=float(os.environ.get("OTEL_METRIC_EXPORT_TIMEOUT", "30000")),
+        )
+
+
+def delta_temporality() -> dict[type, Any]:
+    """Exporter temporality: one row per export interval, so SQL can simply SUM."""
+    from opentelemetry.sdk.metrics import Counter, Histogram
+    from opentelemetry.sdk.metrics.export import AggregationTemporality
+
+    return {Counter: AggregationTemporality.DELTA, Histogram: AggregationTemporality.DELTA}
+
+
+def metric_views() -> list[View]:
+    """Views pinning the explicit bucket boundaries of every histogram."""
+    from opentelemetry.sdk.metrics.view import ExplicitBucketHistogramAggregation, View
+
+    return [
+        View(
+            instrument_name=name,
+            aggregation=ExplicitBucketHistogramAggregation(boundaries=list(bounds)),
+        )
+        for name, bounds in _HISTOGRAM_BUCKETS.items()
+    ]
+
+
+class AgentMetrics:
+    """The workflow's instruments on one meter."""
+
+    def __init__(self, meter: Meter) -> None:
+        self.step_duration = meter.create_histogram(
+            "agent.step.duration", unit="s", description="ADK invoke_agent span duration"
+        )
+        self.llm_duration = meter.create_histogram(
+            "gen_ai.client.operation.duration", unit="s", description="ADK call_llm span duration"
+        )
+        self.token_usage = meter.create_histogram(
+            "gen_ai.client.token.usage", unit="{token}", description="Tokens per LLM step"
+        )
+        self.reader_files = meter.create_counter(
+            "reader.files", unit="{file}", description="Files read by the document reader"
+        )
+        self.reader_bytes = meter.create_counter(
+            "reader.bytes", unit="By", description="Bytes read by the document reader"
+        )
+        self.reader_throughput = meter.create_histogram(
+            "reader.throughput", unit="By/s", description="Bytes per second of one reader pass"
+        )
+        self.cache_requests = meter.create_counter(
+            "agent.cache.requests", unit="{request}", description="Cache lookups by result"
+        )
+
+    def record_llm_tokens(
+        self,
+        agent_name: str,
+        *,
+        input_tokens: int | None = None,
+        output_tokens: int | None = None,
+        reasoning_tokens: int | None = None,
+        cached_tokens: int | None = None,
+    ) -> None:
+        for token_type, value in (
+            ("input", input_tokens),
+            ("output", output_tokens),
+            ("reasoning", reasoning_tokens),
+            ("cached", cached_tokens),
+        ):
+            if value is not None:
+                self.token_usage.record(
+                    value, {"gen_ai.agent.name": agent_name, "gen_ai.token.type": token_type}
+                )
+
+    def record_reader_pass(self, files: int, n_bytes: int, seconds: float) -> None:
+        self.reader_files.add(files)
+        self.reader_bytes.add(n_bytes)
+        if seconds > 0:
+            self.reader_throughput.record(n_bytes / seconds)
+
+    def record_cache(self, cache: str, hit: bool) -> None:
+        self.cache_requests.add(1, {"cache": cache, "result": "hit" if hit else "miss"})
+
+    def record_span(self, span: ReadableSpan) -> None:
+        if not span.end_time or not span.start_time:
+            return
+        attrs = span.attributes or {}
+        seconds = (span.end_time - span.start_time) / 1e9
+        operation = attrs.get("gen_ai.operation.name")
+        if operation == "invoke_agent":
+            self.step_duration.record(
+                seconds,
+                {
+                    "gen_ai.agent.name": str(attrs.get("gen_ai.agent.name", "")),
+                    "error": span.status.status_code is StatusCode.ERROR,
+                },
+            )
+        elif span.name == "call_llm":
+            self.llm_duration.record(
+                seconds, {"gen_ai.request.model": str(attrs.get("gen_ai.request.model", ""))}
+            )
+
+
+_agent_metrics: AgentMetrics | None = None
+
+
+def agent_metrics() -> AgentMetrics:
+    """Shared instruments on the global meter (no-op until a provider is set)."""
+    global _agent_metrics
+    if _agent_metrics is None:
+        _agent_metrics = AgentMetrics(metrics.get_meter(__name__))
+    return _agent_metrics
+
+
+class MetricsSpanProcessor(SpanProcessor):
+    """Records span-derived durations; sits beside (not behind) tail sampling."""
+
+    def __init__(self, instruments: AgentMetrics | None = None) -> None:
+        self.instruments = instruments
+
+    def on_start(self, span: Span, parent_context: Context | None = None) -> None:
+        pass
+
+    def on_end(self, span: ReadableSpan) -> None:
+        (self.instruments or agent_metrics()).record_span(span)
+
+    def shutdown(self) -> None:
+        pass
+
+    def force_flush(self, timeout_millis: int = 30000) -> bool:
+        return True
@@ -5,20 +5,53 @@ from __future__ import annotations
 import atexit
 import logging
 import os
+import sys
+import threading
+import time
+from typing import TYPE_CHECKING, Any
 
-from opentelemetry import _logs, trace
-from opentelemetry.exporter.otlp.proto.http._log_exporter import OTLPLogExporter
-from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
-from opentelemetry.sdk._logs import LoggerProvider, LoggingHandler
-from opentelemetry.sdk._logs.export import BatchLogRecordProcessor
-from opentelemetry.sdk.resources import Resource
+from opentelemetry import trace
 from opentelemetry.sdk.trace import TracerProvider
-from opentelemetry.sdk.trace.export import BatchSpanProcessor
 
 from observability.otlp_headers import parse_otel_headers
 
+if TYPE_CHECKING:
+    from observability.blob_offload import BlobOffloader, BlobOffloadSettings
+    from observability.export_pipeline import (
+        BatchExportSettings,
+        InstrumentedBatchLogRecordProcessor,
+        InstrumentedBatchSpanProcessor,
+    )
+    from observability.metrics import MetricsSettings
+    from observability.otlp_exporters import AccountingOTLPLogExporter, AccountingOTLPSpanExporter
+    from observability.parquet_sink import ParquetSinkSettings
+    from observability.process_telemetry import ProcessLogProcessor, ProcessSpanProcessor
+    from observability.spool import SpoolExporter, SpoolSettings
+    from observability.tail_sampling import TailSampler, TailSamplingSettings
+
 _export_otel_configured: bool = False
 _noop_otel_configured: bool = False
+_span_processor: InstrumentedBatchSpanProcessor | None = None
+_log_processor: InstrumentedBatchLogRecordProcessor | None = None
+_span_spool: SpoolExporter | None = None
+_log_spool: SpoolExporter | None = None
+_span_http: AccountingOTLPSpanExporter | None = None
+_log_http: AccountingOTLPLogExporter | None = None
+_tail_sampler: TailSampler | None = None
+_blob_offloader: BlobOffloader | None = None
+_parquet_sink: ParquetSinkSettings | None = None
+# Fork handling: the per-process processor slots and the arguments their
+# pipeline was built from (rebuilt in forked children).
+_span_slot: ProcessSpanProcessor | None = None
+_log_slot: ProcessLogProcessor | None = None
+_pipeline_args: dict[str, Any] | None = None
+_fork_hook_registered: bool = False
+# Flush / shutdown coordination: the configured providers by signal.
+DEFAULT_SHUTDOWN_TIMEOUT_MILLIS = 5000.0
+_providers: dict[str, Any] = {}
+_shutdown_timeout_millis: float = DEFAULT_SHUTDOWN_TIMEOUT_MILLIS
+_shutdown_started: bool = False
+_shutdown_lock = threading.Lock()
 
 
 def otlp_export_initialized() -> bool:
@@ -26,22 +59,362 @@ def otlp_export_initialized() -> bool:
     return _export_otel_configured
 
 
-def _logs_headers_for_databricks(headers: dict[str, str]) -> dict[str, str]:
-    logs_headers = headers.copy()
-    if "X-Databricks-UC-Table-Name" in logs_headers:
-        logs_headers["X-Databricks-UC-Table-Name"] = logs_headers[
+def otlp_export_diagnostics() -> dict[str, Any]:
+    """Settings and live counters of the span and log export pipelines.
+
+    ``spans`` / ``logs`` are None until OTLP export is configured; otherwise
+    they hold ``settings`` plus ``queued``, ``exported``, ``dropped``,
+    ``failed``, ``in_queue``, batch counts and export latency (ms). With
+    ``OTLP_SPOOL_DIR`` set, each also has a ``spool`` entry (pending segments
+    and bytes, records sent, send failures, evictions). ``payload`` counts
+    HTTP requests with serialized (``raw_bytes``) and sent (``wire_bytes``,
+    after compression) sizes. ``tail_sampling`` holds kept/dropped trace,
+    span and log counts when tail sampling is on. ``blob_offload`` counts
+    offloaded attributes and unique blobs written when ``TELEMETRY_BLOB_DIR``
+    is set. ``parquet_sink`` is the local Parquet directory, if any.
+    ``process`` holds the ``process.*`` / ``service.instance.id`` resource
+    attributes of the current process (re-stamped in forked children).
+    """
+
+    def signal(processor: Any, spool: Any, http: Any) -> dict[str, Any] | None:
+        if processor is None:
+            return None
+        out = processor.diagnostics()
+        if spool is not None:
+            out["spool"] = spool.diagnostics()
+        if http is not None:
+            out["payload"] = http.payload_stats.snapshot()
+        return out
+
+    return {
+        "initialized": _export_otel_configured,
+        "spans": signal(_span_processor, _span_spool, _span_http),
+        "logs": signal(_log_processor, _log_spool, _log_http),
+        "tail_sampling": _tail_sampler.diagnostics() if _tail_sampler else None,
+        "blob_offload": _blob_offloader.stats() if _blob_offloader else None,
+        "parquet_sink": _parquet_sink.directory if _parquet_sink else None,
+        "process": _process_attributes(),
+    }
+
+
+def _process_attributes() -> dict[str, Any] | None:
+    if _span_slot is None:
+        return None
+    attributes = _span_slot.resource.attributes
+    return {
+        key: attributes[key]
+        for key in ("process.pid", "process.parent_pid", "service.instance.id")
+        if key in attributes
+    }
+
+
+def flush_providers(
+    providers: dict[str, Any], timeout_millis: float, *, shutdown: bool = False
+) -> bool:
+    """``force_flush`` (then ``shutdown``) every provider in parallel, within one deadline.
+
+    Each provider runs on its own daemon thread: the SDK batch processors
+    export on the calling thread and ignore the flush timeout, so a slow
+    endpoint can only hold up that thread. True if every provider finished
+    in time and reported success; stragglers are abandoned at the deadline.
+    """
+    if not providers:
+        return True
+    deadline = time.monotonic() + timeout_millis / 1000.0
+    results: dict[str, bool] = {}
+
+    def run(name: str, provider: Any) -> None:
+        try:
+            remaining = max(0.0, (deadline - time.monotonic()) * 1000.0)
+            ok = provider.force_flush(timeout_millis=int(remaining)) is not False
+            if shutdown:
+                provider.shutdown()
+        except Exception:
+            logging.getLogger(__name__).exception("Telemetry %s flush failed", name)
+            ok = False
+        results[name] = ok
+
+    threads = [
+        threading.Thread(target=run, args=item, name=f"telemetry-flush-{item[0]}", daemon=True)
+        for item in providers.items()
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(max(0.0, deadline - time.monotonic()))
+    late = sorted(set(providers) - set(results))
+    if late:
+        logging.getLogger(__name__).warning(
+            "Telemetry %s did not finish within %.0f ms", ", ".join(late), timeout_millis
+        )
+    return not late and all(results.values())
+
+
+def flush_telemetry(timeout_millis: float | None = None) -> bool:
+    """Export spans, logs and metrics buffered so far, without shutting down.
+
+    For invocation boundaries in batch jobs and short-lived workers (see
+    ``telemetry_flush``). Bounded by ``timeout_millis`` overall (default: the
+    shutdown timeout given to ``configure_otel_from_env``). True if everything
+    was handed to the exporters in time.
+    """
+    if _shutdown_started:
+        return False
+    timeout = _shutdown_timeout_millis if timeout_millis is None else timeout_millis
+    return flush_providers(dict(_providers), timeout)
+
+
+def shutdown_telemetry(timeout_millis: float | None = None) -> bool:
+    """Flush and shut down every provider in parallel within one deadline (once).
+
+    Registered with ``atexit`` by ``configure_otel_from_env``; later calls
+    return True without doing anything. With a slow or unreachable endpoint a
+    process exits after at most the timeout instead of one timeout per signal.
+    Traces the tail sampler still holds are kept first, on this thread: it
+    releases a trace's spans and logs together, so it must not run from one
+    provider's shutdown while the other provider is already shutting down.
+    """
+    global _shutdown_started
+    with _shutdown_lock:
+        if _shutdown_started:
+            return True
+        _shutdown_started = True
+    timeout = _shutdown_timeout_millis if timeout_millis is None else timeout_millis
+    if _tail_sampler is not None:
+        _tail_sampler.flush_pending()
+    return flush_providers(dict(_providers), timeout, shutdown=True)
+
+
+def _headers_for_databricks_table(headers: dict[str, str], table: str) -> dict[str, str]:
+    table_headers = headers.copy()
+    if "X-Databricks-UC-Table-Name" in table_headers:
+        table_headers["X-Databricks-UC-Table-Name"] = table_headers[
             "X-Databricks-UC-Table-Name"
         ].replace(
             "mlflow_experiment_trace_otel_spans",
-            "mlflow_experiment_trace_otel_logs",
+            f"mlflow_experiment_trace_otel_{table}",
         )
-    return logs_headers
+    return table_headers
+
+
+def _parquet_processors(settings: ParquetSinkSettings) -> tuple[Any, Any]:
+    """Batch processors writing every span and log record to ``settings.directory``."""
+    global _parquet_sink
+    from opentelemetry.sdk._logs.export import BatchLogRecordProcessor
+    from opentelemetry.sdk.trace.export import BatchSpanProcessor
+
+    from observability.parquet_sink import ParquetLogExporter, ParquetSpanExporter
+
+    _parquet_sink = settings
+    return (
+        BatchSpanProcessor(ParquetSpanExporter(settings)),
+        BatchLogRecordProcessor(ParquetLogExporter(settings)),
+    )
+
+
+def _attach_logging_handler(logger_provider: Any, log_level: int) -> None:
+    from opentelemetry.sdk._logs import LoggingHandler
+
+    handler = LoggingHandler(level=log_level, logger_provider=logger_provider)
+    root = logging.getLogger()
+    root.addHandler(handler)
+    root.setLevel(log_level)
+
+
+def _build_export_pipeline(
+    *,
+    endpoint: str,
+    headers: dict[str, str],
+    span_export: BatchExportSettings | None,
+    log_export: BatchExportSettings | None,
+    spool: SpoolSettings | None,
+    compression: str,
+    tail_sampling: TailSamplingSettings | None,
+    blob_offload: BlobOffloadSettings | None,
+    parquet_sink: ParquetSinkSettings | None,
+) -> tuple[list[Any], list[Any]]:
+    """Span and log processors of this process's export pipeline.
+
+    OTLP export (batch processors, spool, blob offload, tail sampling) when
+    ``endpoint`` is set, plus the Parquet sink. Replaces the module-level
+    pipeline objects that ``otlp_export_diagnostics`` reports on.
+    """
+    global _span_processor, _log_processor, _span_spool, _log_spool, _span_http, _log_http
+    global _tail_sampler, _blob_offloader, _parquet_sink
+
+    _span_processor = _log_processor = None
+    _span_spool = _log_spool = _span_http = _log_http = None
+    _tail_sampler = _blob_offloader = _parquet_sink = None
+    span_processors: list[Any] = []
+    log_processors: list[Any] = []
+
+    if endpoint:
+        assert span_export is not None and log_export is not None
+        from opentelemetry.exporter.otlp.proto.common._log_encoder import encode_logs
+        from opentelemetry.exporter.otlp.proto.common.trace_encoder import encode_spans
+        from opentelemetry.sdk._logs.export import LogExportResult
+        from opentelemetry.sdk.trace.export import SpanExportResult
+
+        from observability.blob_offload import BlobOffloader, BlobOffloadExporter, BlobStore
+        from observability.export_pipeline import (
+            InstrumentedBatchLogRecordProcessor,
+            InstrumentedBatchSpanProcessor,
+        )
+        from observability.otlp_exporters import (
+            AccountingOTLPLogExporter,
+            AccountingOTLPSpanExporter,
+        )
+        from observability.spool import SpoolExporter, otlp_http_sender, serialize_request
+        from observability.tail_sampling import (
+            TailSampler,
+            TailSamplingLogProcessor,
+            TailSamplingSpanProcessor,
+        )
+
+        if blob_offload is not None:
+            _blob_offloader = BlobOffloader(BlobStore(blob_offload.directory), blob_offload)
+
+        span_exporter = _span_http = AccountingOTLPSpanExporter(
+            endpoint=endpoint,
+            headers=headers,
+            timeout=span_export.export_timeout_millis / 1000.0,
+            compression=compression,
+        )
+        if spool is not None:
+            span_exporter = _span_spool = SpoolExporter(
+                encode=lambda batch: serialize_request(encode_spans(batch)),
+                send=otlp_http_sender(span_exporter),
+                settings=spool,
+                name="spans",
+                result_type=SpanExportResult,
+                on_shutdown=span_exporter.shutdown,
+            )
+        if _blob_offloader is not None:
+            span_exporter = BlobOffloadExporter(span_exporter, _blob_offloader)
+        _span_processor = InstrumentedBatchSpanProcessor(span_exporter, span_export)
+
+        log_exporter = _log_http = AccountingOTLPLogExporter(
+            endpoint=endpoint.replace("/traces", "/logs"),
+            headers=_headers_for_databricks_table(headers, "logs"),
+            timeout=log_export.export_timeout_millis / 1000.0,
+            compression=compression,
+        )
+        if spool is not None:
+            log_exporter = _log_spool = SpoolExporter(
+                encode=lambda batch: serialize_request(encode_logs(batch)),
+                send=otlp_http_sender(log_exporter),
+                settings=spool,
+                name="logs",
+                result_type=LogExportResult,
+                on_shutdown=log_exporter.shutdown,
+            )
+        if _blob_offloader is not None:
+            log_exporter = BlobOffloadExporter(log_exporter, _blob_offloader)
+        _log_processor = InstrumentedBatchLogRecordProcessor(log_exporter, log_export)
+
+        span_entry: Any = _span_processor
+        log_entry: Any = _log_processor
+        if tail_sampling is not None:
+            _tail_sampler = TailSampler(tail_sampling, _span_processor, _log_processor)
+            span_entry = TailSamplingSpanProcessor(_tail_sampler)
+            log_entry = TailSamplingLogProcessor(_tail_sampler)
+        span_processors.append(span_entry)
+        log_processors.append(log_entry)
+
+    if parquet_sink is not None:
+        parquet_spans, parquet_logs = _parquet_processors(parquet_sink)
+        span_processors.append(parquet_spans)
+        log_processors.append(parquet_logs)
+    return span_processors, log_processors
+
+
+def _install_pipeline(
+    tracer_provider: TracerProvider, logger_provider: Any, resource: Any, args: dict[str, Any]
+) -> None:
+    """Build the export pipeline behind per-process slots on both providers."""
+    global _span_slot, _log_slot, _pipeline_args
+    from observability.process_telemetry import ProcessLogProcessor, ProcessSpanProcessor
+
+    span_processors, log_processors = _build_export_pipeline(**args)
+    _span_slot = ProcessSpanProcessor(resource, span_processors)
+    _log_slot = ProcessLogProcessor(resource, log_processors)
+    tracer_provider.add_span_processor(_span_slot)
+    logger_provider.add_log_record_processor(_log_slot)
+    _pipeline_args = args
+    _register_fork_hook()
+
+
+def _register_fork_hook() -> None:
+    global _fork_hook_registered
+    if _fork_hook_registered or not hasattr(os, "register_at_fork"):
+        return
+    os.register_at_fork(after_in_child=_reinit_after_fork)
+    _fork_hook_registered = True
+
+
+def _reinit_after_fork() -> None:
+    """Child side of ``fork``: rebuild the export pipeline for this process.
+
+    The parent's batch, spool and tail-sampling threads did not survive the
+    fork and what they had queued is the parent's to send, so the child
+    abandons them (shutting them down would drain the parent's spool) and
+    builds its own from the same arguments, with a child resource. The SDK's
+    fork hooks, which run first, restarted the old batch processors' workers;
+    those are stopped without exporting. The new spool claims a lane of its
+    own (see ``spool``); the parent keeps its lane.
+    """
+    global _shutdown_lock
+    _shutdown_lock = threading.Lock()  # a parent thread may have held it at fork time
+    if _span_slot is None or _log_slot is None or _pipeline_args is None:
+        return
+    try:
+        from observability.export_pipeline import abandon_batch_processor
+        from observability.process_telemetry import child_resource
+
+        inherited = {*_span_slot.processors, *_log_slot.processors}
+        inherited.update(p for p in (_span_processor, _log_processor) if p is not None)
+        for processor in inherited:
+            abandon_batch_processor(processor)
+        for spool in (_span_spool, _log_spool):
+            if spool is not None:
+                spool.abandon()
+        resource = child_resource(_span_slot.resource)
+        span_processors, log_processors = _build_export_pipeline(**_pipeline_args)
+        _span_slot.replace(resource, span_processors)
+        _log_slot.replace(resource, log_processors)
+        _flush_at_multiprocessing_exit()
+    except Exception:
+        logging.getLogger(__name__).exception("Telemetry re-initialization after fork failed")
+
+
+def _flush_at_multiprocessing_exit() -> None:
+    """Run the at-exit flush in ``multiprocessing`` children, which skip ``atexit``.
+
+    They leave through ``os._exit``. Their bootstrap clears inherited
+    finalizers after this fork hook, then runs the after-fork callbacks, so
+    the finalizer is registered from one of those.
+    """
+    mp_util = sys.modules.get("multiprocessing.util")
+    if mp_util is None or _span_slot is None:
+        return
+    mp_util.register_after_fork(
+        _span_slot, lambda _slot: mp_util.Finalize(None, shutdown_telemetry, exitpriority=0)
+    )
 
 
 def configure_otel_from_env(
     *,
     log: logging.Logger | None = None,
     use_print_status: bool = True,
+    span_export: BatchExportSettings | None = None,
+    log_export: BatchExportSettings | None = None,
+    spool: SpoolSettings | None = None,
+    compression: str | None = None,
+    tail_sampling: TailSamplingSettings | None = None,
+    blob_offload: BlobOffloadSettings | None = None,
+    metrics_export: MetricsSettings | None = None,
+    parquet_sink: ParquetSinkSettings | None = None,
+    shutdown_timeout_millis: float | None = None,
 ) -> bool:
     """
     Configure global tracer and logger providers from ``os.environ``.
@@ -51,8 +424,35 @@ def configure_otel_from_env(
 
     If the first call had no endpoint (noop tracer only) and ``OTEL_EXPORTER_OTLP_ENDPOINT``
     is set later, the next call performs full OTLP setup. Prefer setting env before import.
+
+    ``span_export`` / ``log_export`` tune the batch processors; when omitted
+    they come from ``OTEL_BSP_*`` / ``OTEL_BLRP_*`` (see ``export_pipeline``).
+    ``spool`` (default: ``OTLP_SPOOL_DIR`` and friends) puts a disk spool
+    between the batch processors and the HTTP exporters (see ``spool``).
+    ``compression`` (``none`` / ``gzip`` / ``deflate``; default
+    ``OTEL_EXPORTER_OTLP_COMPRESSION``) applies to both exporters, whatever
+    headers ``init`` merged into ``OTEL_EXPORTER_OTLP_HEADERS``.
+    ``tail_sampling`` (default: ``TAIL_SAMPLING_RATE`` and friends) buffers
+    each trace and its logs until the root span ends (see ``tail_sampling``).
+    ``blob_offload`` (default: ``TELEMETRY_BLOB_DIR`` and friends) moves large
+    text attributes into a content-addressed store before export (see
+    ``blob_offload``).
+    ``metrics_export`` (default: set when ``OTEL_METRICS_EXPORTER=otlp``)
+    installs a ``MeterProvider`` exporting the histograms and counters of
+    ``observability.metrics`` to the ``otel_metrics`` table.
+    ``parquet_sink`` (default: ``TELEMETRY_PARQUET_DIR``) also writes every
+    span and log record to local Parquet files, with or without an endpoint
+    (see ``parquet_sink``).
+    ``shutdown_timeout_millis`` (default 5000) bounds the ``atexit`` flush
+    of all providers together (see ``shutdown_telemetry``) and is the default
+    budget of ``flush_telemetry``.
+
+    The resource carries ``process.pid`` and ``service.instance.id``. Forked
+    children (pre-fork servers, ``fork`` process pools) rebuild the span and
+    log pipelines behind the same providers with their own resource (see
+    ``process_telemetry``).
     """
-    global _export_otel_configured, _noop_otel_configured
+    global _export_otel_configured, _noop_otel_configured, _shutdown_timeout_millis
 
     log = log or logging.getLogger(__name__)
 
@@ -68,47 +468,145 @@ def configure_otel_from_env(
     if _export_otel_configured:
         log.debug("configure_otel_from_env: OTLP export already initialized; skipping")
         return True
+    if shutdown_timeout_millis is not None:
+        _shutdown_timeout_millis = shutdown_timeout_millis
 
     if not endpoint:
         if _noop_otel_configured:
             log.debug("configure_otel_from_env: noop tracer already initialized; skipping")
             return False
-        tracer_provider = TracerProvider()
+        if parquet_sink is None and os.getenv("TELEMETRY_PARQUET_DIR", "").strip():
+            from observability.parquet_sink import ParquetSinkSettings
+
+            parquet_sink = ParquetSinkSettings.from_env()
+        if parquet_sink is None:
+            tracer_provider = TracerProvider()
+        else:
+            from opentelemetry import _logs
+            from opentelemetry.sdk._logs import LoggerProvider
+            from opentelemetry.sdk.resources import Resource
+
+            from observability.process_telemetry import process_resource_attributes
+
+            resource = Resource.create(
+                {"service.name": service_name, **process_resource_attributes()}
+            )
+            # shutdown_telemetry is the only exit hook (one deadline for both).
+            tracer_provider = TracerProvider(resource=resource, shutdown_on_exit=False)
+            local_logger_provider = LoggerProvider(resource=resource, shutdown_on_exit=False)
+            _install_pipeline(
+                tracer_provider,
+                local_logger_provider,
+                resource,
+                dict(
+                    endpoint="",
+                    headers={},
+                    span_export=None,
+                    log_export=None,
+                    spool=None,
+                    compression="none",
+                    tail_sampling=None,
+                    blob_offload=None,
+                    parquet_sink=parquet_sink,
+                ),
+            )
+            _logs.set_logger_provider(local_logger_provider)
+            _attach_logging_handler(local_logger_provider, log_level)
+            _providers.update(traces=tracer_provider, logs=local_logger_provider)
+            atexit.register(shutdown_telemetry)
         trace.set_tracer_provider(tracer_provider)
         _noop_otel_configured = True
         if use_print_status:
             print("⚠️  OpenTelemetry tracing enabled but no OTLP endpoint configured")
+            if parquet_sink is not None:
+                print(f"✓ Spans and logs written locally to {parquet_sink.directory}")
         return False
 
-    headers = parse_otel_headers(headers_str)
-    resource = Resource.create({"service.name": service_name})
+    # Exporters, encoders and the logs/metrics SDKs load only when exporting
+    # (keeps ``import agent`` and no-endpoint runs fast).
+    from opentelemetry import _logs, metrics
+    from opentelemetry.exporter.otlp.proto.http import Compression
+    from opentelemetry.exporter.otlp.proto.http.metric_exporter import OTLPMetricExporter
+    from opentelemetry.sdk._logs import LoggerProvider
+    from opentelemetry.sdk.metrics import MeterProvider
+    from opentelemetry.sdk.metrics.export import PeriodicExportingMetricReader
+    from opentelemetry.sdk.resources import Resource
 
-    tracer_provider = TracerProvider(resource=resource)
-    tracer_provider.add_span_processor(
-        BatchSpanProcessor(OTLPSpanExporter(endpoint=endpoint, headers=headers))
+    from observability.blob_offload import BlobOffloadSettings
+    from observability.export_pipeline import BatchExportSettings, otlp_compression_from_env
+    from observability.metrics import (
+        MetricsSettings,
+        MetricsSpanProcessor,
+        delta_temporality,
+        metric_views,
     )
-    trace.set_tracer_provider(tracer_provider)
+    from observability.parquet_sink import ParquetSinkSettings
+    from observability.process_telemetry import process_resource_attributes
+    from observability.spool import SpoolSettings
+    from observability.tail_sampling import TailSamplingSettings
 
+    headers = parse_otel_headers(headers_str)
+    resource = Resource.create({"service.name": service_name, **process_resource_attributes()})
+
+    span_export = span_export or BatchExportSettings.from_env("spans")
+    log_export = log_export or BatchExportSettings.from_env("logs")
+    spool = spool or SpoolSettings.from_env()
+    compression = compression or otlp_compression_from_env()
+    tail_sampling = tail_sampling or TailSamplingSettings.from_env()
+    blob_offload = blob_offload or BlobOffloadSettings.from_env()
+    metrics_export = metrics_export or MetricsSettings.from_env()
+    parquet_sink = parquet_sink or ParquetSinkSettings.from_env()
+
+    # shutdown_telemetry is the only exit hook (one deadline for all providers).
+    tracer_provider = TracerProvider(resource=resource, shutdown_on_exit=False)
+    logger_provider = LoggerProvider(resource=resource, shutdown_on_exit=False)
     logs_endpoint = endpoint.replace("/traces", "/logs")
-    log_exporter = OTLPLogExporter(
-        endpoint=logs_endpoint,
-        headers=_logs_headers_for_databricks(headers),
+    _install_pipeline(
+        tracer_provider,
+        logger_provider,
+        resource,
+        dict(
+            endpoint=endpoint,
+            headers=headers,
+            span_export=span_export,
+            log_export=log_export,
+            spool=spool,
+            compression=compression,
+            tail_sampling=tail_sampling,
+            blob_offload=blob_offload,
+            parquet_sink=parquet_sink,
+        ),
     )
-    logger_provider = LoggerProvider(resource=resource)
-    logger_provider.add_log_record_processor(BatchLogRecordProcessor(log_exporter))
+    meter_provider: MeterProvider | None = None
+    metrics_endpoint = endpoint.replace("/traces", "/metrics")
+    if metrics_export is not None:
+        metric_reader = PeriodicExportingMetricReader(
+            OTLPMetricExporter(
+                endpoint=metrics_endpoint,
+                headers=_headers_for_databricks_table(headers, "metrics"),
+                timeout=metrics_export.export_timeout_millis / 1000.0,
+                compression=Compression(compression),
+                preferred_temporality=delta_temporality(),
+            ),
+            export_interval_millis=metrics_export.export_interval_millis,
+            export_timeout_millis=metrics_export.export_timeout_millis,
+        )
+        meter_provider = MeterProvider(
+            resource=resource,
+            metric_readers=[metric_reader],
+            views=metric_views(),
+            shutdown_on_exit=False,
+        )
+        metrics.set_meter_provider(meter_provider)
+        tracer_provider.add_span_processor(MetricsSpanProcessor())
+    trace.set_tracer_provider(tracer_provider)
     _logs.set_logger_provider(logger_provider)
+    _attach_logging_handler(logger_provider, log_level)
 
-    handler = LoggingHandler(level=log_level, logger_provider=logger_provider)
-    root = logging.getLogger()
-    root.addHandler(handler)
-    root.setLevel(log_level)
-
-    def shutdown_telemetry():
-        logger_provider.force_flush(timeout_millis=5000)
-        logger_provider.shutdown()
-        tracer_provider.force_flush(timeout_millis=5000)
-        tracer_provider.shutdown()
-
+    _providers.clear()
+    _providers.update(traces=tracer_provider, logs=logger_provider)
+    if meter_provider is not None:
+        _providers["metrics"] = meter_provider
     atexit.register(shutdown_telemetry)
 
     try:
@@ -126,6 +624,18 @@ def configure_otel_from_env(
     if use_print_status:
         print(f"✓ OpenTelemetry tracing enabled: {service_name} -> {endpoint}")
         print(f"✓ OpenTelemetry logging enabled: {service_name} -> {logs_endpoint}")
+        if spool is not None:
+            print(f"✓ OTLP export spooled via {spool.directory}")
+        if compression != "none":
+            print(f"✓ OTLP export compression: {compression}")
+        if tail_sampling is not None:
+            print(f"✓ Tail sampling: keep rate {tail_sampling.rate:g} (+ errors/slow)")
+        if blob_offload is not None:
+            print(f"✓ Large telemetry payloads offloaded to {blob_offload.directory}")
+        if parquet_sink is not None:
+            print(f"✓ Spans and logs also written locally to {parquet_sink.directory}")
+        if metrics_export is not None:
+            print(f"✓ OpenTelemetry metrics enabled: {service_name} -> {metrics_endpoint}")
     log.info(
         "OpenTelemetry initialized: service=%s, traces=%s, logs=%s",
         service_name,
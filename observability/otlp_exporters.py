@@ -0,0 +1,101 @@
+"""OTLP HTTP exporters with optional compression and payload byte accounting.
+
+Compression comes from ``OTEL_EXPORTER_OTLP_COMPRESSION`` (``none``, ``gzip``
+or ``deflate``; default ``none``; read by
+``export_pipeline.otlp_compression_from_env``) or ``AppConfig.otlp_compression``. Every
+HTTP request records its serialized (raw) size and the size actually sent
+(after compression), so egress and the compression ratio can be read from
+``otlp_export_diagnostics()``.
+"""
+
+from __future__ import annotations
+
+import threading
+from typing import Any
+
+import requests
+from opentelemetry.exporter.otlp.proto.http import Compression
+from opentelemetry.exporter.otlp.proto.http._log_exporter import OTLPLogExporter
+from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+
+from observability.export_pipeline import otlp_compression_from_env  # noqa: F401 (re-export)
+
+
+class PayloadStats:
+    """Thread-safe raw vs. on-the-wire byte counters for one exporter."""
+
+    def __init__(self, compression: str) -> None:
+        self.compression = compression
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.raw_bytes = 0
+        self.wire_bytes = 0
+        self.raw_max = 0
+        self.raw_last = 0
+        self.wire_last = 0
+
+    def record(self, raw: int, wire: int) -> None:
+        with self._lock:
+            self.requests += 1
+            self.raw_bytes += raw
+            self.wire_bytes += wire
+            self.raw_max = max(self.raw_max, raw)
+            self.raw_last = raw
+            self.wire_last = wire
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "compression": self.compression,
+                "requests": self.requests,
+                "raw_bytes": self.raw_bytes,
+                "wire_bytes": self.wire_bytes,
+                "compression_ratio": (
+                    self.wire_bytes / self.raw_bytes if self.raw_bytes else 1.0
+                ),
+                "raw_max": self.raw_max,
+                "raw_last": self.raw_last,
+                "wire_last": self.wire_last,
+            }
+
+
+class _WireCountingSession(requests.Session):
+    """Remembers, per thread, how many bytes the last ``post`` put on the wire."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.last_post = threading.local()
+
+    def post(self, url: Any, data: Any = None, **kwargs: Any) -> requests.Response:
+        self.last_post.size = len(data) if isinstance(data, (bytes, bytearray)) else 0
+        return super().post(url, data=data, **kwargs)
+
+
+class _PayloadAccounting:
+    """Mixin over an OTLP HTTP exporter; ``_export`` is the per-request hook
+    (the SDK calls it once per attempt, after serializing and before compressing)."""
+
+    payload_stats: PayloadStats
+    _session: _WireCountingSession
+
+    def _export(self, serialized_data: bytes, timeout_sec: float | None = None) -> Any:
+        self._session.last_post.size = len(serialized_data)
+        response = super()._export(serialized_data, timeout_sec)  # type: ignore[misc]
+        self.payload_stats.record(len(serialized_data), self._session.last_post.size)
+        return response
+
+
+class AccountingOTLPSpanExporter(_PayloadAccounting, OTLPSpanExporter):
+    def __init__(self, *, compression: str = "none", **kwargs: Any) -> None:
+        self.payload_stats = PayloadStats(compression)
+        super().__init__(
+            compression=Compression(compression), session=_WireCountingSession(), **kwargs
+        )
+
+
+class AccountingOTLPLogExporter(_PayloadAccounting, OTLPLogExporter):
+    def __init__(self, *, compression: str = "none", **kwargs: Any) -> None:
+        self.payload_stats = PayloadStats(compression)
+        super().__init__(
+            compression=Compression(compression), session=_WireCountingSession(), **kwargs
+        )
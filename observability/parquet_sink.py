@@ -0,0 +1,353 @@
+"""Local Parquet copy of exported spans and logs, in the Unity Catalog column layout.
+
+With ``TELEMETRY_PARQUET_DIR`` set, every span and log record is also written
+to day-partitioned Parquet files (UTC day of the start / log time)::
+
+    <dir>/spans/date=2026-02-01/part-<uuid>.parquet
+    <dir>/logs/date=2026-02-01/part-<uuid>.parquet
+
+The columns match ``sql/mlflow_trace_tables/mlflow_experiment_trace_otel_spans.sql``
+and ``..._otel_logs.sql``: hex ids, ``STATUS_CODE_*`` (NULL when unset) / ``SPAN_KIND_*`` /
+``SEVERITY_NUMBER_*`` strings and ``MAP<STRING, STRING>`` attributes (non-string
+values JSON-encoded). ``scripts/query_local_traces.py`` runs the bundled
+queries over these files with DuckDB (see ``observability.local_queries``).
+
+The sink is independent of OTLP export: it runs without an endpoint, and it
+sees every span before tail sampling. Each export batch becomes one file per
+day, so long runs produce many small files; DuckDB reads them as one table.
+Requires ``pyarrow`` (``uv sync --extra local-traces``).
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Sequence
+
+from opentelemetry.sdk._logs import LogData
+from opentelemetry.sdk._logs.export import LogExporter, LogExportResult
+from opentelemetry.sdk.trace import ReadableSpan
+from opentelemetry.sdk.trace.export import SpanExporter, SpanExportResult
+from opentelemetry.trace import SpanKind, StatusCode
+
+
+@dataclass(frozen=True)
+class ParquetSinkSettings:
+    directory: str
+    compression: str = "zstd"
+
+    @classmethod
+    def from_env(cls) -> "ParquetSinkSettings | None":
+        """None unless ``TELEMETRY_PARQUET_DIR`` is set."""
+        directory = os.environ.get("TELEMETRY_PARQUET_DIR", "").strip()
+        if not directory:
+            return None
+        return cls(
+            directory=directory,
+            compression=os.environ.get("TELEMETRY_PARQUET_COMPRESSION", "zstd").strip().lower(),
+        )
+
+
+def _import_pyarrow() -> Any:
+    try:
+        import pyarrow
+        import pyarrow.parquet  # noqa: F401
+    except ImportError as e:
+        raise ImportError(
+            "TELEMETRY_PARQUET_DIR needs pyarrow: uv sync --extra local-traces"
+        ) from e
+    return pyarrow
+
+
+def _attribute_value(value: Any) -> str:
+    if isinstance(value, str):
+        return value
+    return json.dumps(list(value) if isinstance(value, tuple) else value, default=str)
+
+
+def _attribute_map(attributes: Any) -> list[tuple[str, str]]:
+    if not attributes:
+        return []
+    return [(key, _attribute_value(value)) for key, value in attributes.items()]
+
+
+def _trace_state(context: Any) -> str:
+    return context.trace_state.to_header() if context.trace_state else ""
+
+
+def _hex_id(value: int | None, width: int) -> str | None:
+    return format(value, f"0{width}x") if value else None
+
+
+def _day(time_unix_nano: int | None) -> str:
+    seconds = (time_unix_nano or 0) / 1e9
+    return datetime.fromtimestamp(seconds, tz=timezone.utc).strftime("%Y-%m-%d")
+
+
+def _resource(resource: Any) -> dict[str, Any]:
+    return {
+        "attributes": _attribute_map(resource.attributes if resource else None),
+        "dropped_attributes_count": 0,
+    }
+
+
+def _scope(scope: Any) -> dict[str, Any] | None:
+    if scope is None:
+        return None
+    return {
+        "name": scope.name,
+        "version": scope.version,
+        "attributes": _attribute_map(getattr(scope, "attributes", None)),
+        "dropped_attributes_count": 0,
+    }
+
+
+def span_row(span: ReadableSpan) -> dict[str, Any]:
+    """One ``mlflow_experiment_trace_otel_spans`` row."""
+    context = span.context
+    kind = span.kind if isinstance(span.kind, SpanKind) else SpanKind.INTERNAL
+    status_code = span.status.status_code if span.status else StatusCode.UNSET
+    return {
+        "trace_id": _hex_id(context.trace_id, 32),
+        "span_id": _hex_id(context.span_id, 16),
+        "trace_state": _trace_state(context),
+        "parent_span_id": _hex_id(span.parent.span_id, 16) if span.parent else "",
+        "flags": int(context.trace_flags),
+        "name": span.name,
+        "kind": f"SPAN_KIND_{kind.name}",
+        "start_time_unix_nano": span.start_time,
+        "end_time_unix_nano": span.end_time,
+        "attributes": _attribute_map(span.attributes),
+        "dropped_attributes_count": span.dropped_attributes,
+        "events": [
+            {
+                "time_unix_nano": event.timestamp,
+                "name": event.name,
+                "attributes": _attribute_map(event.attributes),
+                "dropped_attributes_count": 0,
+            }
+            for event in span.events
+        ],
+        "dropped_events_count": span.dropped_events,
+        "links": [
+            {
+                "trace_id": _hex_id(link.context.trace_id, 32),
+                "span_id": _hex_id(link.context.span_id, 16),
+                "trace_state": _trace_state(link.context),
+                "attributes": _attribute_map(link.attributes),
+                "dropped_attributes_count": 0,
+                "flags": int(link.context.trace_flags),
+            }
+            for link in span.links
+        ],
+        "dropped_links_count": span.dropped_links,
+        "status": {
+            "message": span.status.description if span.status else None,
+            # UNSET is stored as NULL: the bundled queries treat NULL and OK as success.
+            "code": None if status_code is StatusCode.UNSET else f"STATUS_CODE_{status_code.name}",
+        },
+        "resource": _resource(span.resource),
+        "resource_schema_url": span.resource.schema_url if span.resource else "",
+        "instrumentation_scope": _scope(span.instrumentation_scope),
+        "span_schema_url": getattr(span.instrumentation_scope, "schema_url", "") or "",
+    }
+
+
+def log_row(log_data: LogData) -> dict[str, Any]:
+    """One ``mlflow_experiment_trace_otel_logs`` row."""
+    record = log_data.log_record
+    body = record.body
+    severity = record.severity_number
+    return {
+        "event_name": getattr(record, "event_name", None),
+        "trace_id": _hex_id(record.trace_id, 32),
+        "span_id": _hex_id(record.span_id, 16),
+        "time_unix_nano": record.timestamp or record.observed_timestamp,
+        "observed_time_unix_nano": record.observed_timestamp,
+        "severity_number": f"SEVERITY_NUMBER_{severity.name}" if severity is not None else None,
+        "severity_text": record.severity_text,
+        "body": body if isinstance(body, str) or body is None else json.dumps(body, default=str),
+        "attributes": _attribute_map(record.attributes),
+        "dropped_attributes_count": record.dropped_attributes,
+        "flags": int(record.trace_flags) if record.trace_flags is not None else None,
+        "resource": _resource(record.resource),
+        "resource_schema_url": record.resource.schema_url if record.resource else "",
+        "instrumentation_scope": _scope(log_data.instrumentation_scope),
+        "log_schema_url": getattr(log_data.instrumentation_scope, "schema_url", "") or "",
+    }
+
+
+def span_schema(pa: Any) -> Any:
+    attrs = pa.map_(pa.string(), pa.string())
+    return pa.schema(
+        [
+            ("trace_id", pa.string()),
+            ("span_id", pa.string()),
+            ("trace_state", pa.string()),
+            ("parent_span_id", pa.string()),
+            ("flags", pa.int32()),
+            ("name", pa.string()),
+            ("kind", pa.string()),
+            ("start_time_unix_nano", pa.int64()),
+            ("end_time_unix_nano", pa.int64()),
+            ("attributes", attrs),
+            ("dropped_attributes_count", pa.int32()),
+            (
+                "events",
+                pa.list_(
+                    pa.struct(
+                        [
+                            ("time_unix_nano", pa.int64()),
+                            ("name", pa.string()),
+                            ("attributes", attrs),
+                            ("dropped_attributes_count", pa.int32()),
+                        ]
+                    )
+                ),
+            ),
+            ("dropped_events_count", pa.int32()),
+            (
+                "links",
+                pa.list_(
+                    pa.struct(
+                        [
+                            ("trace_id", pa.string()),
+                            ("span_id", pa.string()),
+                            ("trace_state", pa.string()),
+                            ("attributes", attrs),
+                            ("dropped_attributes_count", pa.int32()),
+                            ("flags", pa.int32()),
+                        ]
+                    )
+                ),
+            ),
+            ("dropped_links_count", pa.int32()),
+            ("status", pa.struct([("message", pa.string()), ("code", pa.string())])),
+            ("resource", _resource_type(pa)),
+            ("resource_schema_url", pa.string()),
+            ("instrumentation_scope", _scope_type(pa)),
+            ("span_schema_url", pa.string()),
+        ]
+    )
+
+
+def log_schema(pa: Any) -> Any:
+    return pa.schema(
+        [
+            ("event_name", pa.string()),
+            ("trace_id", pa.string()),
+            ("span_id", pa.string()),
+            ("time_unix_nano", pa.int64()),
+            ("observed_time_unix_nano", pa.int64()),
+            ("severity_number", pa.string()),
+            ("severity_text", pa.string()),
+            ("body", pa.string()),
+            ("attributes", pa.map_(pa.string(), pa.string())),
+            ("dropped_attributes_count", pa.int32()),
+            ("flags", pa.int32()),
+            ("resource", _resource_type(pa)),
+            ("resource_schema_url", pa.string()),
+            ("instrumentation_scope", _scope_type(pa)),
+            ("log_schema_url", pa.string()),
+        ]
+    )
+
+
+def _resource_type(pa: Any) -> Any:
+    return pa.struct(
+        [
+            ("attributes", pa.map_(pa.string(), pa.string())),
+            ("dropped_attributes_count", pa.int32()),
+        ]
+    )
+
+
+def _scope_type(pa: Any) -> Any:
+    return pa.struct(
+        [
+            ("name", pa.string()),
+            ("version", pa.string()),
+            ("attributes", pa.map_(pa.string(), pa.string())),
+            ("dropped_attributes_count", pa.int32()),
+        ]
+    )
+
+
+class ParquetWriter:
+    """Writes row batches of one table as day-partitioned Parquet files."""
+
+    def __init__(
+        self, directory: str, table: str, schema: Any, time_column: str, compression: str
+    ) -> None:
+        self.pa = _import_pyarrow()
+        self.root = os.path.join(directory, table)
+        self.schema = schema
+        self.time_column = time_column
+        self.compression = compression
+        self._lock = threading.Lock()
+        self.files_written = 0
+        self.rows_written = 0
+
+    def write(self, rows: list[dict[str, Any]]) -> None:
+        by_day: dict[str, list[dict[str, Any]]] = {}
+        for row in rows:
+            by_day.setdefault(_day(row[self.time_column]), []).append(row)
+        for day, day_rows in by_day.items():
+            partition = os.path.join(self.root, f"date={day}")
+            os.makedirs(partition, exist_ok=True)
+            path = os.path.join(partition, f"part-{uuid.uuid4().hex}.parquet")
+            table = self.pa.Table.from_pylist(day_rows, schema=self.schema)
+            # Write beside the target, then rename: readers never see partial files.
+            tmp = f"{path}.tmp"
+            self.pa.parquet.write_table(table, tmp, compression=self.compression)
+            os.replace(tmp, path)
+            with self._lock:
+                self.files_written += 1
+                self.rows_written += len(day_rows)
+
+
+class ParquetSpanExporter(SpanExporter):
+    def __init__(self, settings: ParquetSinkSettings) -> None:
+        pa = _import_pyarrow()
+        self.writer = ParquetWriter(
+            settings.directory,
+            "spans",
+            span_schema(pa),
+            "start_time_unix_nano",
+            settings.compression,
+        )
+
+    def export(self, spans: Sequence[ReadableSpan]) -> SpanExportResult:
+        try:
+            self.writer.write([span_row(span) for span in spans])
+        except Exception:
+            return SpanExportResult.FAILURE
+        return SpanExportResult.SUCCESS
+
+    def shutdown(self) -> None:
+        pass
+
+    def force_flush(self, timeout_millis: int = 30000) -> bool:
+        return True
+
+
+class ParquetLogExporter(LogExporter):
+    def __init__(self, settings: ParquetSinkSettings) -> None:
+        pa = _import_pyarrow()
+        self.writer = ParquetWriter(
+            settings.directory, "logs", log_schema(pa), "time_unix_nano", settings.compression
+        )
+
+    def export(self, batch: Sequence[LogData]) -> LogExportResult:
+        try:
+            self.writer.write([log_row(log_data) for log_data in batch])
+        except Exception:
+            return LogExportResult.FAILURE
+        return LogExportResult.SUCCESS
+
+    def shutdown(self) -> None:
+        pass
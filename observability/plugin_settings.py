@@ -0,0 +1,83 @@
+"""Settings of the ADK plugins, importable without google-adk.
+
+``config.load_config`` reads them when ``workflow`` is imported; the plugins
+themselves (``profiling``, ``memory``, ``telemetry_flush``) import ADK and are
+only loaded by ``agent`` when enabled. Each plugin module re-exports its
+settings class.
+"""
+
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass
+
+from observability.otel_sdk import DEFAULT_SHUTDOWN_TIMEOUT_MILLIS
+
+PROFILE_MODES = ("sample", "cprofile")
+FLUSH_MODES = ("exit", "invocation")
+
+
+@dataclass(frozen=True)
+class ProfilingSettings:
+    rate: float = 1.0
+    mode: str = "sample"
+    directory: str = "./profiles"
+    interval_ms: float = 5.0
+    top_n: int = 15
+    max_seconds: float = 600.0
+
+    def __post_init__(self) -> None:
+        if self.mode not in PROFILE_MODES:
+            raise ValueError(f"mode must be one of {PROFILE_MODES}, got {self.mode!r}")
+
+    @classmethod
+    def from_env(cls) -> "ProfilingSettings | None":
+        """None unless ``PROFILE_INVOCATIONS`` is set."""
+        raw = os.environ.get("PROFILE_INVOCATIONS", "").strip()
+        if not raw:
+            return None
+        return cls(
+            rate=float(raw),
+            mode=os.environ.get("PROFILE_MODE", "sample").strip().lower(),
+            directory=os.environ.get("PROFILE_DIR", "./profiles"),
+            interval_ms=float(os.environ.get("PROFILE_INTERVAL_MS", "5")),
+            top_n=int(os.environ.get("PROFILE_TOP_N", "15")),
+            max_seconds=float(os.environ.get("PROFILE_MAX_SECONDS", "600")),
+        )
+
+
+@dataclass(frozen=True)
+class MemoryTraceSettings:
+    enabled: bool = False
+    frames: int = 1
+
+    @classmethod
+    def from_env(cls) -> "MemoryTraceSettings":
+        return cls(
+            enabled=os.environ.get("AGENT_MEMORY_TRACE", "false").lower() in ("1", "true", "yes"),
+            frames=int(os.environ.get("AGENT_MEMORY_TRACE_FRAMES", "1")),
+        )
+
+
+@dataclass(frozen=True)
+class TelemetryFlushSettings:
+    mode: str = "exit"
+    invocation_timeout_millis: float = 2000.0
+    shutdown_timeout_millis: float = DEFAULT_SHUTDOWN_TIMEOUT_MILLIS
+
+    def __post_init__(self) -> None:
+        if self.mode not in FLUSH_MODES:
+            raise ValueError(f"mode must be one of {FLUSH_MODES}, got {self.mode!r}")
+
+    @classmethod
+    def from_env(cls) -> "TelemetryFlushSettings":
+        return cls(
+            mode=os.environ.get("TELEMETRY_FLUSH_MODE", "exit").strip().lower(),
+            invocation_timeout_millis=float(os.environ.get("TELEMETRY_FLUSH_TIMEOUT_MS", "2000")),
+            shutdown_timeout_millis=float(
+                os.environ.get(
+                    "TELEMETRY_SHUTDOWN_TIMEOUT_MS",
+                    str(DEFAULT_SHUTDOWN_TIMEOUT_MILLIS),
+                )
+            ),
+        )
@@ -0,0 +1,141 @@
+"""Per-process telemetry: resource attributes and fork-aware processor slots.
+
+``configure_otel_from_env`` adds one ``ProcessSpanProcessor`` and one
+``ProcessLogProcessor`` to the global providers and builds the export
+pipeline (batch processors, spool, tail sampler, Parquet sink) behind them.
+The OpenTelemetry API sets the global providers once, and tracers created at
+import time (ADK's among them) hold on to theirs, so a forked child keeps the
+provider objects: its ``os.register_at_fork`` hook (see ``otel_sdk``) swaps a
+freshly built pipeline and a child resource into the slots instead.
+
+Spans and log records carry the resource of the tracer or logger that made
+them. When that is not the slot's resource (objects created before the fork),
+the slot restamps them, so every exported record names the process that
+produced it: ``process.pid``, ``process.parent_pid`` in forked children, and
+``service.instance.id`` (``TELEMETRY_WORKER_ID``, else ``<hostname>-<pid>``;
+a forked child appends its pid to the inherited id).
+"""
+
+from __future__ import annotations
+
+import os
+import socket
+import time
+from typing import TYPE_CHECKING, Any, Sequence
+
+from opentelemetry.sdk._logs import LogRecordProcessor
+from opentelemetry.sdk.resources import Resource
+from opentelemetry.sdk.trace import ReadableSpan, SpanProcessor
+
+if TYPE_CHECKING:
+    from opentelemetry.context import Context
+    from opentelemetry.sdk._logs import LogData
+    from opentelemetry.sdk.trace import Span
+
+
+def process_resource_attributes() -> dict[str, Any]:
+    """``process.pid`` and ``service.instance.id`` of the configuring process."""
+    pid = os.getpid()
+    worker_id = os.environ.get("TELEMETRY_WORKER_ID", "").strip()
+    return {
+        "process.pid": pid,
+        "service.instance.id": worker_id or f"{socket.gethostname()}-{pid}",
+    }
+
+
+def child_resource(parent: Resource) -> Resource:
+    """``parent`` with the pid, parent pid and instance id of this forked child."""
+    pid = os.getpid()
+    parent_id = parent.attributes.get("service.instance.id") or socket.gethostname()
+    return parent.merge(
+        Resource(
+            {
+                "process.pid": pid,
+                "process.parent_pid": os.getppid(),
+                "service.instance.id": f"{parent_id}-{pid}",
+            }
+        )
+    )
+
+
+def _with_resource(span: ReadableSpan, resource: Resource) -> ReadableSpan:
+    return ReadableSpan(
+        name=span.name,
+        context=span.context,
+        parent=span.parent,
+        resource=resource,
+        attributes=span.attributes,
+        events=span.events,
+        links=span.links,
+        kind=span.kind,
+        status=span.status,
+        start_time=span.start_time,
+        end_time=span.end_time,
+        instrumentation_scope=span.instrumentation_scope,
+    )
+
+
+def _flush_all(processors: Sequence[Any], timeout_millis: int) -> bool:
+    deadline = time.monotonic() + timeout_millis / 1000.0
+    ok = True
+    for processor in processors:
+        remaining = int((deadline - time.monotonic()) * 1000)
+        if remaining <= 0:
+            return False
+        ok = processor.force_flush(remaining) and ok
+    return ok
+
+
+class ProcessSpanProcessor(SpanProcessor):
+    """Fans spans out to this process's pipeline; ``replace`` swaps it after a fork."""
+
+    def __init__(self, resource: Resource, processors: Sequence[SpanProcessor]) -> None:
+        self.resource = resource
+        self.processors: tuple[SpanProcessor, ...] = tuple(processors)
+
+    def replace(self, resource: Resource, processors: Sequence[SpanProcessor]) -> None:
+        self.resource = resource
+        self.processors = tuple(processors)
+
+    def on_start(self, span: Span, parent_context: Context | None = None) -> None:
+        for processor in self.processors:
+            processor.on_start(span, parent_context=parent_context)
+
+    def on_end(self, span: ReadableSpan) -> None:
+        if span.resource is not self.resource:
+            span = _with_resource(span, self.resource)
+        for processor in self.processors:
+            processor.on_end(span)
+
+    def shutdown(self) -> None:
+        for processor in self.processors:
+            processor.shutdown()
+
+    def force_flush(self, timeout_millis: int = 30000) -> bool:
+        return _flush_all(self.processors, timeout_millis)
+
+
+class ProcessLogProcessor(LogRecordProcessor):
+    """Log-record counterpart of ``ProcessSpanProcessor``."""
+
+    def __init__(self, resource: Resource, processors: Sequence[Any]) -> None:
+        self.resource = resource
+        self.processors: tuple[Any, ...] = tuple(processors)
+
+    def replace(self, resource: Resource, processors: Sequence[Any]) -> None:
+        self.resource = resource
+        self.processors = tuple(processors)
+
+    def on_emit(self, log_data: LogData) -> None:
+        record = log_data.log_record
+        if record.resource is not self.resource:
+            record.resource = self.resource
+        for processor in self.processors:
+            processor.on_emit(log_data)
+
+    def shutdown(self) -> None:
+        for processor in self.processors:
+            processor.shutdown()
+
+    def force_flush(self, timeout_millis: int = 30000) -> bool:
+        return _flush_all(self.processors, timeout_millis)
@@ -0,0 +1,196 @@
+"""Opt-in profiling of whole workflow invocations, summarized on the trace.
+
+``InvocationProfilerPlugin`` is an ADK plugin: ``before_run_callback`` starts a
+profiler for a sampled invocation and ``after_run_callback`` stops it, writes
+the profile under ``PROFILE_DIR`` and adds a ``profile`` event with the top-N
+functions to the ADK ``invocation`` span (with ``invocation_id`` and
+``session_id``).
+
+Enabled by ``PROFILE_INVOCATIONS`` (fraction of invocations to profile, 0..1,
+deterministic in the invocation id). ``PROFILE_MODE`` picks the profiler:
+
+- ``sample`` (default) — a daemon thread samples the event-loop thread's stack
+  every ``PROFILE_INTERVAL_MS`` (default 5) and writes ``<invocation_id>.folded``
+  (collapsed stacks, for flamegraph.pl / speedscope)
+- ``cprofile`` — ``cProfile`` on the event-loop thread, written as
+  ``<invocation_id>.pstats``; exact but slows the profiled invocation down
+
+Only one invocation is profiled at a time; both profilers see everything the
+event-loop thread runs, including other concurrent invocations. A profile
+whose invocation never finished (it raised, so ``after_run_callback`` did not
+run) is discarded once it is older than ``PROFILE_MAX_SECONDS`` (default
+600). ``PROFILE_TOP_N`` (default 15) sizes the summary.
+"""
+
+from __future__ import annotations
+
+import cProfile
+import hashlib
+import os
+import pstats
+import sys
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass
+from typing import Any, Optional
+
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.plugins.base_plugin import BasePlugin
+from google.genai import types
+from opentelemetry import trace
+
+from observability.plugin_settings import ProfilingSettings
+
+def _sampled(invocation_id: str, rate: float) -> bool:
+    if rate >= 1.0:
+        return True
+    if rate <= 0.0:
+        return False
+    digest = hashlib.sha256(invocation_id.encode("utf-8")).digest()
+    return int.from_bytes(digest[:8], "big") < rate * 2**64
+
+
+def _frame_label(code: Any) -> str:
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+class StackSampler:
+    """Counts collapsed stacks of one thread, sampled from a daemon thread."""
+
+    def __init__(self, thread_id: int, interval_s: float) -> None:
+        self.thread_id = thread_id
+        self.interval_s = interval_s
+        self.stacks: Counter[str] = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval_s):
+            frame = sys._current_frames().get(self.thread_id)
+            labels: list[str] = []
+            while frame is not None:
+                labels.append(_frame_label(frame.f_code))
+                frame = frame.f_back
+            if labels:
+                self.stacks[";".join(reversed(labels))] += 1
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    @property
+    def samples(self) -> int:
+        return sum(self.stacks.values())
+
+    def write(self, path: str) -> None:
+        with open(path, "w", encoding="utf-8") as handle:
+            for stack, count in self.stacks.most_common():
+                handle.write(f"{stack} {count}\n")
+
+    def top(self, n: int) -> list[str]:
+        """Functions by self samples (leaf frame), as ``label pct%``."""
+        total = self.samples or 1
+        leaves: Counter[str] = Counter()
+        for stack, count in self.stacks.items():
+            leaves[stack.rsplit(";", 1)[-1]] += count
+        return [f"{label} {100.0 * count / total:.1f}%" for label, count in leaves.most_common(n)]
+
+
+def _pstats_top(profile: cProfile.Profile, n: int) -> list[str]:
+    """Functions by internal time, as ``label tottime_ms``."""
+    stats = pstats.Stats(profile)
+    rows = sorted(stats.stats.items(), key=lambda item: item[1][2], reverse=True)  # type: ignore[attr-defined]
+    return [
+        f"{func} ({os.path.basename(filename)}:{line}) {tottime * 1000:.1f}ms"
+        for (filename, line, func), (_, _, tottime, _, _) in rows[:n]
+    ]
+
+
+@dataclass
+class _ActiveProfile:
+    invocation_id: str
+    started: float
+    sampler: StackSampler | None = None
+    profile: cProfile.Profile | None = None
+
+    def stop(self) -> None:
+        if self.profile is not None:
+            self.profile.disable()
+        if self.sampler is not None:
+            self.sampler.stop()
+
+
+class InvocationProfilerPlugin(BasePlugin):
+    """Profiles sampled invocations; see the module docstring."""
+
+    def __init__(self, settings: ProfilingSettings, name: str = "invocation_profiler") -> None:
+        super().__init__(name=name)
+        self.settings = settings
+        self._lock = threading.Lock()
+        self._active: _ActiveProfile | None = None
+        self.profiled = 0
+        self.skipped_busy = 0
+        self.abandoned = 0
+
+    async def before_run_callback(
+        self, *, invocation_context: InvocationContext
+    ) -> Optional[types.Content]:
+        invocation_id = invocation_context.invocation_id
+        if not _sampled(invocation_id, self.settings.rate):
+            return None
+        now = time.perf_counter()
+        with self._lock:
+            stale = self._active
+            if stale is not None and now - stale.started < self.settings.max_seconds:
+                self.skipped_busy += 1
+                return None
+            if stale is not None:
+                self.abandoned += 1
+            active = self._active = _ActiveProfile(invocation_id, now)
+        if stale is not None:
+            stale.stop()
+        if self.settings.mode == "cprofile":
+            active.profile = cProfile.Profile()
+            active.profile.enable()
+        else:
+            active.sampler = StackSampler(
+                threading.get_ident(), self.settings.interval_ms / 1000.0
+            )
+            active.sampler.start()
+        return None
+
+    async def after_run_callback(self, *, invocation_context: InvocationContext) -> None:
+        with self._lock:
+            active = self._active
+            if active is None or active.invocation_id != invocation_context.invocation_id:
+                return
+            self._active = None
+        duration_ms = (time.perf_counter() - active.started) * 1000.0
+        os.makedirs(self.settings.directory, exist_ok=True)
+        base = os.path.join(self.settings.directory, active.invocation_id)
+        attributes: dict[str, Any] = {
+            "invocation_id": active.invocation_id,
+            "session_id": invocation_context.session.id,
+            "profile.mode": self.settings.mode,
+            "profile.duration_ms": round(duration_ms, 3),
+        }
+        active.stop()
+        if active.profile is not None:
+            path = f"{base}.pstats"
+            active.profile.dump_stats(path)
+            top = _pstats_top(active.profile, self.settings.top_n)
+        else:
+            assert active.sampler is not None
+            path = f"{base}.folded"
+            active.sampler.write(path)
+            attributes["profile.samples"] = active.sampler.samples
+            top = active.sampler.top(self.settings.top_n)
+        attributes["profile.path"] = os.path.abspath(path)
+        attributes["profile.top"] = top
+        trace.get_current_span().add_event("profile", attributes=attributes)
+        with self._lock:
+            self.profiled += 1
@@ -0,0 +1,151 @@
+"""Per-file spans for ``DocumentReaderAgent`` with bounded cardinality.
+
+Modes (``READER_TRACE_FILES``):
+
+- ``off`` (default) — no spans beyond ADK's ``invoke_agent``
+- ``slow`` — a ``reader.read_documents`` span per pass, with a ``reader.file``
+  child for each file whose read + extraction took at least
+  ``READER_TRACE_SLOW_MS`` (default 250)
+- ``all`` — a ``reader.file`` child for every file
+
+At most ``READER_TRACE_MAX_FILE_SPANS`` (default 50) file spans are created per
+pass. Every other file is folded into per-extension totals on the pass span,
+so a corpus of 100k small files still yields one span with a fixed set of
+attributes. Paths appear only as a short SHA-256 of the relative path.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Iterator
+
+from opentelemetry import trace
+
+TRACE_MODES = ("off", "slow", "all")
+
+_tracer = trace.get_tracer(__name__)
+
+
+def path_hash(rel_path: str) -> str:
+    return hashlib.sha256(rel_path.encode("utf-8")).hexdigest()[:16]
+
+
+@dataclass
+class FileRead:
+    """Cost of reading one file."""
+
+    rel_path: str
+    extension: str
+    start_ns: int
+    end_ns: int
+    bytes_read: int = 0
+    chars: int = 0
+    pages: int | None = None
+    truncated: bool = False
+    error: str | None = None
+
+    @property
+    def duration_ms(self) -> float:
+        return (self.end_ns - self.start_ns) / 1e6
+
+
+@dataclass
+class _Totals:
+    files: int = 0
+    bytes: int = 0
+    chars: int = 0
+    duration_ms: float = 0.0
+
+    def add(self, read: FileRead) -> None:
+        self.files += 1
+        self.bytes += read.bytes_read
+        self.chars += read.chars
+        self.duration_ms += read.duration_ms
+
+
+@dataclass
+class ReaderPassTrace:
+    """Collects ``FileRead`` records for one pass; no-op when ``mode`` is ``off``."""
+
+    mode: str = "off"
+    slow_ms: float = 250.0
+    max_file_spans: int = 50
+    file_spans: int = 0
+    totals: _Totals = field(default_factory=_Totals)
+    aggregated: dict[str, _Totals] = field(default_factory=dict)
+    slowest: FileRead | None = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.mode != "off"
+
+    def _wants_span(self, read: FileRead) -> bool:
+        if self.file_spans >= self.max_file_spans:
+            return False
+        return self.mode == "all" or read.duration_ms >= self.slow_ms
+
+    def record(self, read: FileRead) -> None:
+        if not self.enabled:
+            return
+        self.totals.add(read)
+        if self.slowest is None or read.duration_ms > self.slowest.duration_ms:
+            self.slowest = read
+        if not self._wants_span(read):
+            self.aggregated.setdefault(read.extension or "none", _Totals()).add(read)
+            return
+        self.file_spans += 1
+        attributes: dict[str, str | int | float | bool] = {
+            "reader.file.path_sha256": path_hash(read.rel_path),
+            "reader.file.extension": read.extension or "none",
+            "reader.file.bytes": read.bytes_read,
+            "reader.file.chars": read.chars,
+            "reader.file.duration_ms": round(read.duration_ms, 3),
+            "reader.file.truncated": read.truncated,
+        }
+        if read.pages is not None:
+            attributes["reader.file.pages"] = read.pages
+        if read.error is not None:
+            attributes["error.type"] = read.error
+        span = _tracer.start_span("reader.file", start_time=read.start_ns, attributes=attributes)
+        span.end(end_time=read.end_ns)
+
+    def summary_attributes(self) -> dict[str, str | int | float]:
+        attributes: dict[str, str | int | float] = {
+            "reader.files": self.totals.files,
+            "reader.bytes": self.totals.bytes,
+            "reader.chars": self.totals.chars,
+            "reader.file_spans": self.file_spans,
+            "reader.aggregated_files": sum(t.files for t in self.aggregated.values()),
+            "reader.aggregated_by_extension": json.dumps(
+                {
+                    ext: {"files": t.files, "bytes": t.bytes, "ms": round(t.duration_ms, 1)}
+                    for ext, t in sorted(self.aggregated.items())
+                },
+                separators=(",", ":"),
+            ),
+        }
+        if self.slowest is not None:
+            attributes["reader.slowest.path_sha256"] = path_hash(self.slowest.rel_path)
+            attributes["reader.slowest.duration_ms"] = round(self.slowest.duration_ms, 3)
+        return attributes
+
+
+@contextmanager
+def reader_pass_trace(
+    mode: str = "off", slow_ms: float = 250.0, max_file_spans: int = 50
+) -> Iterator[ReaderPassTrace]:
+    """Yield a ``ReaderPassTrace``; unless ``off``, inside a ``reader.read_documents`` span."""
+    if mode not in TRACE_MODES:
+        raise ValueError(f"reader trace mode must be one of {TRACE_MODES}, got {mode!r}")
+    pass_trace = ReaderPassTrace(mode=mode, slow_ms=slow_ms, max_file_spans=max_file_spans)
+    if not pass_trace.enabled:
+        yield pass_trace
+        return
+    with _tracer.start_as_current_span("reader.read_documents") as span:
+        try:
+            yield pass_trace
+        finally:
+            span.set_attributes(pass_trace.summary_attributes())
@@ -0,0 +1,188 @@
+"""Incrementally refreshed rollups of the UC trace tables.
+
+The definitions live in ``sql/mlflow_trace_tables/rollups``:
+
+- ``rollup_invocation_tokens``: LLM step and token totals per invocation
+  (``merge_invocation_tokens.sql``, from the logs table)
+- ``rollup_span_latency_daily`` / ``rollup_span_latency_buckets``: per span
+  name and day, exact count / sum / min / max plus log-scale latency buckets
+  that ``span_latency_percentiles_by_name.sql`` reads p50 / p95 from
+- ``rollup_trace_events``: MLflow trace metadata and tag events with the JSON
+  body parsed once (``merge_trace_events.sql``), the latest per trace and tag
+  key; ``mlflow_experiment_trace_rollup_unified.sql`` is the unified view on it
+
+``refresh_rollups`` folds the rows between a rollup's watermark and the
+current ingestion watermark (``trace_ingestion_max_timestamps.sql``) minus
+``allowed_lateness_seconds`` into its tables with MERGE. Rows are ingested
+out of timestamp order (the root ``invocation`` span is exported after its
+children, the spool replays batches), so the window stops that far behind the
+newest row; the default, ``trace_fetch.DEFAULT_ALLOWED_LATENESS_SECONDS``, is
+well above the export batching and spool backoff delays. The window end is
+recorded as pending before the first MERGE and becomes the watermark after
+the last one. A refresh that fails part-way is re-run over the same window,
+and every MERGE skips target rows already stamped with that window end
+(``refreshed_through_nano``), so no row is counted twice. Rows that arrive
+later than the margin, with a timestamp at or below a rollup's watermark, are
+not picked up.
+
+The same SQL runs on a Databricks SQL warehouse (``StatementRunner``) and on
+local Parquet files with DuckDB (``DuckDBRunner``, via ``local_queries``);
+``scripts/refresh_trace_rollups.py`` is the CLI.
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Mapping, Protocol
+
+from observability.local_queries import translate_query
+from observability.trace_fetch import (
+    DEFAULT_ALLOWED_LATENESS_SECONDS,
+    WATERMARK_COLUMNS,
+    WATERMARK_QUERY,
+    qualify_query,
+    settled_watermark,
+)
+
+ROLLUPS_DIR = Path(__file__).resolve().parent.parent / "sql" / "mlflow_trace_tables" / "rollups"
+
+# Rollup name → (source table, MERGE files run in order).
+ROLLUPS = {
+    "invocation_tokens": ("logs", ("merge_invocation_tokens.sql",)),
+    "span_latency": ("spans", ("merge_span_latency_daily.sql", "merge_span_latency_buckets.sql")),
+    "trace_events": ("logs", ("merge_trace_events.sql",)),
+}
+
+_LINE_COMMENT = re.compile(r"--[^\n]*")
+
+
+class RollupRunner(Protocol):
+    """Runs rollup SQL (Databricks dialect, ``:name`` parameters) somewhere."""
+
+    def rows(self, sql: str, parameters: Mapping[str, Any] | None = None) -> list[dict[str, Any]]:
+        ...
+
+    def execute(self, sql: str, parameters: Mapping[str, Any] | None = None) -> None:
+        ...
+
+
+class DuckDBRunner:
+    """Runs on a ``local_queries.connect`` connection; rollup tables live in its database."""
+
+    def __init__(self, con: Any) -> None:
+        self.con = con
+
+    def _run(self, sql: str, parameters: Mapping[str, Any] | None) -> Any:
+        sql = translate_query(sql)
+        # DuckDB rejects parameters the statement does not use.
+        used = {k: v for k, v in (parameters or {}).items() if f"${k}" in sql}
+        return self.con.execute(sql, used)
+
+    def rows(self, sql: str, parameters: Mapping[str, Any] | None = None) -> list[dict[str, Any]]:
+        cursor = self._run(sql, parameters)
+        columns = [d[0] for d in cursor.description]
+        return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+    def execute(self, sql: str, parameters: Mapping[str, Any] | None = None) -> None:
+        self._run(sql, parameters)
+
+
+class StatementRunner:
+    """Runs on a SQL warehouse through ``trace_fetch.SqlStatementClient``."""
+
+    def __init__(self, client: Any, catalog: str, schema: str) -> None:
+        self.client = client
+        self.catalog = catalog
+        self.schema = schema
+
+    def _statement(
+        self, sql: str, parameters: Mapping[str, Any] | None
+    ) -> tuple[str, list[dict[str, str]]]:
+        typed = [
+            {
+                "name": name,
+                "value": str(value),
+                "type": "BIGINT" if isinstance(value, int) else "STRING",
+            }
+            for name, value in (parameters or {}).items()
+            if f":{name}" in sql
+        ]
+        return qualify_query(sql, self.catalog, self.schema), typed
+
+    def rows(self, sql: str, parameters: Mapping[str, Any] | None = None) -> list[dict[str, Any]]:
+        result: list[dict[str, Any]] = []
+        for batch in self.client.arrow_batches(*self._statement(sql, parameters)):
+            result.extend(batch.to_pylist())
+        return result
+
+    def execute(self, sql: str, parameters: Mapping[str, Any] | None = None) -> None:
+        self.client.execute(*self._statement(sql, parameters))
+
+
+@dataclass(frozen=True)
+class RefreshResult:
+    """One rollup's refresh: the ``(since_ns, until_ns]`` window folded in, or None if idle."""
+
+    rollup: str
+    since_ns: int | None
+    until_ns: int | None
+    resumed: bool = False
+
+    @property
+    def refreshed(self) -> bool:
+        return self.until_ns is not None
+
+
+def _sql(filename: str) -> str:
+    return (ROLLUPS_DIR / filename).read_text(encoding="utf-8")
+
+
+def create_rollup_tables(runner: RollupRunner) -> None:
+    """Run ``create_rollup_tables.sql`` (``CREATE TABLE IF NOT EXISTS``, safe to repeat)."""
+    for statement in _LINE_COMMENT.sub("", _sql("create_rollup_tables.sql")).split(";"):
+        if statement.strip():
+            runner.execute(statement)
+
+
+def refresh_rollup(
+    runner: RollupRunner,
+    rollup: str,
+    ingestion_watermarks: Mapping[str, int | None],
+    *,
+    allowed_lateness_seconds: float = DEFAULT_ALLOWED_LATENESS_SECONDS,
+) -> RefreshResult:
+    """Fold the rows since ``rollup``'s watermark into its tables (see module docstring)."""
+    table, merges = ROLLUPS[rollup]
+    state = runner.rows(_sql("read_watermark.sql"), {"rollup": rollup})
+    since = state[0]["watermark_unix_nano"] if state else None
+    until = state[0]["pending_until_unix_nano"] if state else None
+    resumed = until is not None
+    if not resumed:
+        until = settled_watermark(ingestion_watermarks.get(table), allowed_lateness_seconds)
+        if until is None or (since is not None and until <= since):
+            return RefreshResult(rollup, since, None)
+        runner.execute(_sql("begin_refresh.sql"), {"rollup": rollup, "until_ns": until})
+    window = {"since_ns": -1 if since is None else since, "until_ns": until}
+    for filename in merges:
+        runner.execute(_sql(filename), window)
+    runner.execute(_sql("finish_refresh.sql"), {"rollup": rollup})
+    return RefreshResult(rollup, since, until, resumed)
+
+
+def refresh_rollups(
+    runner: RollupRunner,
+    rollups: tuple[str, ...] | None = None,
+    *,
+    allowed_lateness_seconds: float = DEFAULT_ALLOWED_LATENESS_SECONDS,
+) -> list[RefreshResult]:
+    """Create missing rollup tables, then refresh ``rollups`` (default: all) in order."""
+    create_rollup_tables(runner)
+    watermark_rows = runner.rows(WATERMARK_QUERY.read_text(encoding="utf-8"))
+    row = watermark_rows[0] if watermark_rows else {}
+    ingestion = {table: row.get(column) for table, column in WATERMARK_COLUMNS.items()}
+    return [
+        refresh_rollup(runner, name, ingestion, allowed_lateness_seconds=allowed_lateness_seconds)
+        for name in rollups or tuple(ROLLUPS)
+    ]
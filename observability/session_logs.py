@@ -4,12 +4,21 @@ from __future__ import annotations
 
 import logging
 import os
-from typing import TypeAlias
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, TypeAlias
 
 from google.adk.agents.callback_context import CallbackContext
 from google.adk.agents.invocation_context import InvocationContext
 from google.adk.models.llm_response import LlmResponse
 from google.genai import types
+from opentelemetry import context as otel_context
+from opentelemetry import trace
+
+from observability.memory import active_memory_tracker
+from observability.metrics import agent_metrics
+from observability.step_log_queue import StepLogQueue, StepLogQueueSettings
 
 logger = logging.getLogger(__name__)
 
@@ -51,43 +60,166 @@ def split_model_visible_and_reasoning_text(
     return "\n".join(visible).strip(), "\n".join(reasoning).strip()
 
 
-def log_llm_step_completed(
-    output_state_key: str,
-    ctx: CallbackContext,
-    response: LlmResponse,
-) -> None:
-    """Log one LLM turn with session/invocation ids and optional reasoning text."""
-    visible, reasoning = split_model_visible_and_reasoning_text(response.content)
+@dataclass(frozen=True)
+class _LlmStep:
+    """What the callback captures: ids, scalars and a reference to the content."""
+
+    output_state_key: str
+    session_id: str
+    invocation_id: str
+    agent_name: str
+    content: types.Content | None
+    finish_reason: str | None
+    input_tokens: int | None
+    output_tokens: int | None
+    reasoning_token_count: int | None
+    cached_tokens: int | None
+    created: float
+    span_context: trace.SpanContext
+    memory: dict[str, int] = field(default_factory=dict)
+
+
+def _capture_llm_step(
+    output_state_key: str, ctx: CallbackContext, response: LlmResponse
+) -> _LlmStep:
+    um = response.usage_metadata
+    tracker = active_memory_tracker()
+    return _LlmStep(
+        output_state_key=output_state_key,
+        session_id=ctx.session.id,
+        invocation_id=ctx.invocation_id,
+        agent_name=ctx.agent_name,
+        content=response.content,
+        finish_reason=(
+            str(response.finish_reason) if response.finish_reason is not None else None
+        ),
+        input_tokens=getattr(um, "prompt_token_count", None) if um else None,
+        output_tokens=getattr(um, "candidates_token_count", None) if um else None,
+        reasoning_token_count=getattr(um, "thoughts_token_count", None) if um else None,
+        cached_tokens=getattr(um, "cached_content_token_count", None) if um else None,
+        created=time.time(),
+        span_context=trace.get_current_span().get_span_context(),
+        memory=tracker.snapshot(ctx.invocation_id, ctx.agent_name) if tracker else {},
+    )
+
+
+def _llm_step_extra(step: _LlmStep) -> dict[str, OtlpExtraValue]:
+    visible, reasoning = split_model_visible_and_reasoning_text(step.content)
     limit = max_response_log_chars()
     visible_logged = _maybe_truncate(visible, limit)
     reasoning_logged = _maybe_truncate(reasoning, limit) if reasoning else ""
+    return {
+        "event_type": "agent.llm_step",
+        "session_id": step.session_id,
+        "invocation_id": step.invocation_id,
+        "agent_name": step.agent_name,
+        "output_state_key": step.output_state_key,
+        "finish_reason": step.finish_reason,
+        "input_tokens": step.input_tokens,
+        "output_tokens": step.output_tokens,
+        "reasoning_token_count": step.reasoning_token_count,
+        "response_char_count": len(visible),
+        "reasoning_char_count": len(reasoning),
+        "model_response_text": visible_logged,
+        "model_reasoning_text": reasoning_logged or None,
+        **step.memory,
+    }
 
-    um = response.usage_metadata
-    in_tok = getattr(um, "prompt_token_count", None) if um else None
-    out_tok = getattr(um, "candidates_token_count", None) if um else None
-    reasoning_tok = getattr(um, "thoughts_token_count", None) if um else None
-    finish = (
-        str(response.finish_reason) if response.finish_reason is not None else None
-    )
 
-    logger.info(
+def _emit_llm_step(step: _LlmStep) -> None:
+    """Worker side: build and handle the record under the callback's span and time."""
+    if not logger.isEnabledFor(logging.INFO):
+        return
+    record = logger.makeRecord(
+        logger.name,
+        logging.INFO,
+        __file__,
+        0,
         "LLM step completed",
-        extra={
-            "event_type": "agent.llm_step",
-            "session_id": ctx.session.id,
-            "invocation_id": ctx.invocation_id,
-            "agent_name": ctx.agent_name,
-            "output_state_key": output_state_key,
-            "finish_reason": finish,
-            "input_tokens": in_tok,
-            "output_tokens": out_tok,
-            "reasoning_token_count": reasoning_tok,
-            "response_char_count": len(visible),
-            "reasoning_char_count": len(reasoning),
-            "model_response_text": visible_logged,
-            "model_reasoning_text": reasoning_logged or None,
-        },
+        (),
+        None,
+        extra=_llm_step_extra(step),
+    )
+    record.created = step.created
+    record.msecs = (step.created - int(step.created)) * 1000.0
+    token = otel_context.attach(
+        trace.set_span_in_context(trace.NonRecordingSpan(step.span_context))
+    )
+    try:
+        logger.handle(record)
+    finally:
+        otel_context.detach(token)
+
+
+_step_queue: StepLogQueue | None = None
+_step_queue_settings: StepLogQueueSettings | None = None
+_step_queue_lock = threading.Lock()
+
+
+def _get_step_queue() -> StepLogQueue | None:
+    """The shared queue when ``AGENT_LOG_ASYNC`` is on (settings read once)."""
+    global _step_queue, _step_queue_settings
+    if _step_queue is not None or _step_queue_settings is not None:
+        return _step_queue
+    with _step_queue_lock:
+        if _step_queue_settings is None:
+            settings = StepLogQueueSettings.from_env()
+            if settings.enabled:
+                _step_queue = StepLogQueue(_emit_llm_step, settings)
+            _step_queue_settings = settings
+    return _step_queue
+
+
+def _reset_step_queue_after_fork() -> None:
+    """Child side of ``fork``: the next step builds a queue with a live worker."""
+    global _step_queue, _step_queue_settings, _step_queue_lock
+    if _step_queue is not None:
+        _step_queue.abandon()  # the parent's items; keeps its atexit flush from waiting
+    _step_queue = None
+    _step_queue_settings = None
+    _step_queue_lock = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_step_queue_after_fork)
+
+
+def step_log_queue_stats() -> dict[str, Any] | None:
+    """Counters of the async step-log queue, or None when it is off."""
+    queue = _get_step_queue()
+    return queue.stats() if queue is not None else None
+
+
+def flush_step_logs(timeout: float = 5.0) -> bool:
+    """Wait for queued LLM step records to be handed to the log handlers."""
+    queue = _get_step_queue()
+    return queue.flush(timeout) if queue is not None else True
+
+
+def log_llm_step_completed(
+    output_state_key: str,
+    ctx: CallbackContext,
+    response: LlmResponse,
+) -> None:
+    """Log one LLM turn with session/invocation ids and optional reasoning text.
+
+    With ``AGENT_LOG_ASYNC`` the text work happens on a worker thread (see
+    ``observability.step_log_queue``); the record keeps this call's span and
+    timestamp.
+    """
+    step = _capture_llm_step(output_state_key, ctx, response)
+    agent_metrics().record_llm_tokens(
+        step.agent_name,
+        input_tokens=step.input_tokens,
+        output_tokens=step.output_tokens,
+        reasoning_tokens=step.reasoning_token_count,
+        cached_tokens=step.cached_tokens,
     )
+    queue = _get_step_queue()
+    if queue is not None:
+        queue.submit(step)
+        return
+    logger.info("LLM step completed", extra=_llm_step_extra(step))
 
 
 def log_agent_step(
@@ -0,0 +1,570 @@
+"""Durable disk spool for OTLP exports with background replay.
+
+``SpoolExporter`` sits where the OTLP HTTP exporter would: ``export`` only
+serializes the batch and appends it to a local segment file, so the batch
+processor never waits on the network. A sender thread seals segments, replays
+them oldest-first to the real endpoint with bounded concurrency, and deletes
+each segment once every record in it was accepted. Segments left on disk by a
+previous process are replayed on the next start (delivery is at-least-once).
+
+Only throttling (429), server errors (5xx) and connection errors are retried,
+with exponential backoff. Any other status (400, 401, 403, 413, ...) will not
+succeed on a retry: the record is dropped and counted in ``rejected_records``
+so one bad record cannot block every segment behind it.
+
+Segment files are ``<seq>.seg`` holding length-prefixed serialized OTLP
+requests. Every process writes to its own lane, ``<dir>/<signal>/lane-*``,
+held with an exclusive ``flock`` for as long as it runs, so workers sharing
+``OTLP_SPOOL_DIR`` (forked, spawned or separate) never write the same segment
+file. A lane whose lock is free belongs to a process that is gone: a starting
+process takes one over, and the senders of running ones adopt the segments of
+the rest, so they are replayed by whichever process is still there.
+
+The spool is capped at ``max_bytes`` across all lanes of a signal; when full,
+a process evicts its own oldest segments to make room. Each live lane may keep
+at least an even share of ``max_bytes`` whatever the others hold, so a worker
+that starts after its peers filled the spool keeps more than its newest
+segment; the peers shrink to their share as they notice it.
+
+Enabled by ``OTLP_SPOOL_DIR``; tuned by ``OTLP_SPOOL_MAX_MB`` (default 256),
+``OTLP_SPOOL_SEGMENT_MB`` (4), ``OTLP_SPOOL_CONCURRENCY`` (2),
+``OTLP_SPOOL_FLUSH_SECONDS`` (1), ``OTLP_SPOOL_MAX_BACKOFF_SECONDS`` (60) and
+``OTLP_SPOOL_DRAIN_SECONDS`` (5, how long shutdown keeps sending).
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import struct
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Sequence
+
+try:
+    import fcntl
+except ImportError:  # no flock: every process starts a new lane and nothing is adopted
+    fcntl = None  # type: ignore[assignment]
+
+from observability.env_settings import env_float, env_int, warn_invalid
+
+logger = logging.getLogger(__name__)
+
+_LEN = struct.Struct(">I")
+_SUFFIX = ".seg"
+_LANE_PREFIX = "lane-"
+_CLAIM_PREFIX = ".claim-"
+_LOCK = ".lock"
+
+
+def retryable_status(status: int | None) -> bool:
+    """True for no response (connection error), 429 and 5xx."""
+    return status is None or status == 429 or status >= 500
+
+
+@dataclass(frozen=True)
+class SpoolSettings:
+    directory: str
+    max_bytes: int = 256 * 1024 * 1024
+    segment_bytes: int = 4 * 1024 * 1024
+    concurrency: int = 2
+    flush_seconds: float = 1.0
+    max_backoff_seconds: float = 60.0
+    drain_seconds: float = 5.0
+
+    def __post_init__(self) -> None:
+        if self.segment_bytes <= 0 or self.segment_bytes > self.max_bytes:
+            raise ValueError("segment_bytes must be positive and not exceed max_bytes")
+        if self.concurrency <= 0:
+            raise ValueError("concurrency must be positive")
+
+    @classmethod
+    def from_env(cls) -> "SpoolSettings | None":
+        """None unless ``OTLP_SPOOL_DIR`` is set; bad values fall back to defaults (warned)."""
+        directory = os.environ.get("OTLP_SPOOL_DIR", "").strip()
+        if not directory:
+            return None
+        defaults = cls(directory=directory)
+        mb = 1024 * 1024
+        try:
+            return cls(
+                directory=directory,
+                max_bytes=int(env_float("OTLP_SPOOL_MAX_MB", defaults.max_bytes / mb) * mb),
+                segment_bytes=int(
+                    env_float("OTLP_SPOOL_SEGMENT_MB", defaults.segment_bytes / mb) * mb
+                ),
+                concurrency=env_int("OTLP_SPOOL_CONCURRENCY", defaults.concurrency),
+                flush_seconds=env_float("OTLP_SPOOL_FLUSH_SECONDS", defaults.flush_seconds),
+                max_backoff_seconds=env_float(
+                    "OTLP_SPOOL_MAX_BACKOFF_SECONDS", defaults.max_backoff_seconds
+                ),
+                drain_seconds=env_float("OTLP_SPOOL_DRAIN_SECONDS", defaults.drain_seconds),
+            )
+        except ValueError as exc:
+            warn_invalid("OTLP_SPOOL", exc)
+            return defaults
+
+
+class SegmentSpool:
+    """Append-only segment files in one directory; thread-safe."""
+
+    def __init__(self, directory: str, *, max_bytes: int, segment_bytes: int) -> None:
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.segment_bytes = segment_bytes
+        os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._sealed: dict[int, int] = {}
+        for name in sorted(os.listdir(directory)):
+            if name.endswith(_SUFFIX) and name[: -len(_SUFFIX)].isdigit():
+                path = os.path.join(directory, name)
+                self._sealed[int(name[: -len(_SUFFIX)])] = os.path.getsize(path)
+        self._next_seq = max(self._sealed, default=0) + 1
+        self._active: Any = None
+        self._active_seq = 0
+        self._active_bytes = 0
+        self._leased: set[int] = set()
+        self._progress: dict[int, int] = {}
+        self.shared_bytes = 0  # other processes' lanes, counted toward max_bytes
+        self.shared_lanes = 0
+        self.evicted_segments = 0
+        self.evicted_bytes = 0
+        self.dropped_oversize = 0
+        self.corrupt_segments = 0
+
+    def _path(self, seq: int) -> str:
+        return os.path.join(self.directory, f"{seq:012d}{_SUFFIX}")
+
+    @property
+    def pending_bytes(self) -> int:
+        with self._lock:
+            return sum(self._sealed.values()) + self._active_bytes
+
+    @property
+    def pending_segments(self) -> int:
+        with self._lock:
+            return len(self._sealed) + (1 if self._active_bytes else 0)
+
+    def _budget_locked(self) -> int:
+        """What the other lanes leave of ``max_bytes``, but at least an even share of it."""
+        return max(self.max_bytes - self.shared_bytes, self.max_bytes // (self.shared_lanes + 1))
+
+    def append(self, payload: bytes) -> bool:
+        """Append one record; False if it alone exceeds this lane's share of ``max_bytes``."""
+        record = _LEN.pack(len(payload)) + payload
+        with self._lock:
+            if len(record) > self._budget_locked():
+                self.dropped_oversize += 1
+                return False
+            self._evict_locked(len(record))
+            if self._active is None:
+                self._active_seq = self._next_seq
+                self._next_seq += 1
+                self._active = open(self._path(self._active_seq), "ab")
+            self._active.write(record)
+            self._active.flush()
+            self._active_bytes += len(record)
+            if self._active_bytes >= self.segment_bytes:
+                self._seal_locked()
+        return True
+
+    def _evict_locked(self, incoming: int) -> None:
+        budget = self._budget_locked()
+        while sum(self._sealed.values()) + self._active_bytes + incoming > budget:
+            if not self._sealed:
+                self._seal_locked()
+                if not self._sealed:
+                    return
+            oldest = min(self._sealed)
+            self.evicted_bytes += self._sealed.pop(oldest)
+            self.evicted_segments += 1
+            self._leased.discard(oldest)
+            self._progress.pop(oldest, None)
+            try:
+                os.remove(self._path(oldest))
+            except FileNotFoundError:
+                pass
+            logger.warning("OTLP spool full; evicted oldest segment %d", oldest)
+
+    def _seal_locked(self) -> None:
+        if self._active is None:
+            return
+        self._active.flush()
+        os.fsync(self._active.fileno())
+        self._active.close()
+        if self._active_bytes:
+            self._sealed[self._active_seq] = self._active_bytes
+        else:
+            os.remove(self._path(self._active_seq))
+        self._active = None
+        self._active_bytes = 0
+
+    def seal(self) -> None:
+        """Close the active segment so the sender can pick it up."""
+        with self._lock:
+            self._seal_locked()
+
+    def adopt(self, path: str) -> bool:
+        """Move another spool's segment file in as this spool's newest sealed segment."""
+        with self._lock:
+            seq = self._next_seq
+            try:
+                size = os.path.getsize(path)
+                os.rename(path, self._path(seq))
+            except FileNotFoundError:
+                return False  # another process adopted it first
+            self._next_seq += 1
+            if size:
+                self._sealed[seq] = size
+            else:
+                os.remove(self._path(seq))
+            self._evict_locked(0)
+        return True
+
+    def lease(self, limit: int) -> list[int]:
+        """Up to ``limit`` oldest sealed segments not already being sent."""
+        with self._lock:
+            free = [seq for seq in sorted(self._sealed) if seq not in self._leased][:limit]
+            self._leased.update(free)
+            return free
+
+    def read(self, seq: int) -> list[bytes]:
+        """Records of a sealed segment; a torn trailing record is ignored."""
+        try:
+            with open(self._path(seq), "rb") as handle:
+                data = handle.read()
+        except FileNotFoundError:
+            return []
+        records: list[bytes] = []
+        offset = 0
+        while offset + _LEN.size <= len(data):
+            (size,) = _LEN.unpack_from(data, offset)
+            end = offset + _LEN.size + size
+            if end > len(data):
+                self.corrupt_segments += 1
+                break
+            records.append(data[offset + _LEN.size : end])
+            offset = end
+        return records
+
+    def progress(self, seq: int) -> int:
+        with self._lock:
+            return self._progress.get(seq, 0)
+
+    def release(self, seq: int, sent: int) -> None:
+        """Return a partly sent segment; ``sent`` records will not be resent by this process."""
+        with self._lock:
+            self._leased.discard(seq)
+            if seq in self._sealed:
+                self._progress[seq] = sent
+
+    def complete(self, seq: int) -> None:
+        with self._lock:
+            self._leased.discard(seq)
+            self._progress.pop(seq, None)
+            if self._sealed.pop(seq, None) is not None:
+                try:
+                    os.remove(self._path(seq))
+                except FileNotFoundError:
+                    pass
+
+    def close(self) -> None:
+        self.seal()
+
+
+class SpoolExporter:
+    """Span or log exporter that spools to disk and replays in the background.
+
+    ``encode`` turns a batch into serialized OTLP request bytes; ``send``
+    delivers those bytes and returns the HTTP status code (None, or raising,
+    when there was no response). ``result_type`` is ``SpanExportResult`` or
+    ``LogExportResult``.
+    """
+
+    def __init__(
+        self,
+        *,
+        encode: Callable[[Sequence[Any]], bytes],
+        send: Callable[[bytes], int | None],
+        settings: SpoolSettings,
+        name: str,
+        result_type: Any,
+        on_shutdown: Callable[[], None] | None = None,
+    ) -> None:
+        self.settings = settings
+        self.name = name
+        self.root = os.path.join(settings.directory, name)
+        lane, self._lane_lock = _claim_lane(self.root)
+        self.spool = SegmentSpool(
+            lane, max_bytes=settings.max_bytes, segment_bytes=settings.segment_bytes
+        )
+        self._encode = encode
+        self._send = send
+        self._result_type = result_type
+        self._on_shutdown = on_shutdown
+        self._stats_lock = threading.Lock()
+        self.spooled_batches = 0
+        self.sent_records = 0
+        self.send_failures = 0
+        self.rejected_records = 0
+        self.last_rejected_status: int | None = None
+        self.adopted_segments = 0
+        self._backoff = 0.0
+        self.adopt_orphans()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._pool = ThreadPoolExecutor(
+            max_workers=settings.concurrency, thread_name_prefix=f"otlp-spool-{name}"
+        )
+        self._thread = threading.Thread(
+            target=self._run, name=f"otlp-spool-{name}", daemon=True
+        )
+        self._thread.start()
+
+    def export(self, batch: Sequence[Any]) -> Any:
+        try:
+            payload = self._encode(batch)
+        except Exception:
+            logger.exception("OTLP spool %s: failed to encode batch", self.name)
+            return self._result_type.FAILURE
+        if not self.spool.append(payload):
+            return self._result_type.FAILURE
+        with self._stats_lock:
+            self.spooled_batches += 1
+        return self._result_type.SUCCESS
+
+    def adopt_orphans(self) -> None:
+        """Adopt the segments of lanes whose process is gone; count live ones toward the cap."""
+        adopted = sum(self.spool.adopt(path) for path in _segment_files(self.root))
+        shared = shared_lanes = 0
+        for lane in _lanes(self.root):
+            if lane == self.spool.directory:
+                continue
+            fd = _try_lock(lane)
+            if fd is None:
+                shared += sum(_size(path) for path in _segment_files(lane))
+                shared_lanes += 1
+                continue
+            try:
+                adopted += sum(self.spool.adopt(path) for path in _segment_files(lane))
+                os.remove(os.path.join(lane, _LOCK))
+                os.rmdir(lane)
+            except OSError as exc:
+                logger.debug("OTLP spool %s: could not remove lane %s: %s", self.name, lane, exc)
+            finally:
+                os.close(fd)
+        self.spool.shared_bytes, self.spool.shared_lanes = shared, shared_lanes
+        if adopted:
+            logger.info(
+                "OTLP spool %s: adopted %d segment(s) of exited processes", self.name, adopted
+            )
+            with self._stats_lock:
+                self.adopted_segments += adopted
+
+    def _deliver(self, seq: int) -> bool:
+        records = self.spool.read(seq)
+        sent = self.spool.progress(seq)
+        while sent < len(records):
+            try:
+                status = self._send(records[sent])
+            except Exception as exc:
+                logger.debug("OTLP spool %s: send failed: %s", self.name, exc)
+                status = None
+            if status is not None and 200 <= status < 300:
+                with self._stats_lock:
+                    self.sent_records += 1
+            elif retryable_status(status):
+                with self._stats_lock:
+                    self.send_failures += 1
+                self.spool.release(seq, sent)
+                return False
+            else:
+                logger.warning(
+                    "OTLP spool %s: endpoint rejected a record with HTTP %s; dropped",
+                    self.name,
+                    status,
+                )
+                with self._stats_lock:
+                    self.rejected_records += 1
+                    self.last_rejected_status = status
+            sent += 1
+        self.spool.complete(seq)
+        return True
+
+    def drain_once(self, *, parallel: bool = True) -> bool:
+        """Seal the active segment and send what is pending; True if all of it went out."""
+        self.spool.seal()
+        while True:
+            leased = self.spool.lease(self.settings.concurrency)
+            if not leased:
+                return True
+            deliver = self._pool.map if parallel else map
+            if not all(list(deliver(self._deliver, leased))):
+                return False
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self._wake.wait(self._backoff or self.settings.flush_seconds)
+            self._wake.clear()
+            if self._stop.is_set():
+                break
+            try:
+                self.adopt_orphans()
+            except OSError:
+                logger.exception("OTLP spool %s: scanning other lanes failed", self.name)
+            if self.drain_once():
+                self._backoff = 0.0
+            else:
+                self._backoff = min(
+                    self.settings.max_backoff_seconds, max(1.0, self._backoff * 2)
+                )
+
+    def force_flush(self, timeout_millis: int = 30000) -> bool:
+        """Make spooled data durable and wake the sender; does not wait on the network."""
+        self.spool.seal()
+        self._wake.set()
+        return True
+
+    def shutdown(self) -> None:
+        """Send for up to ``drain_seconds``; anything left stays on disk for the next start.
+
+        The final drain runs on the calling thread because executors refuse
+        new work once the interpreter is exiting (``atexit``).
+        """
+        if self._stop.is_set():
+            return
+        self._stop.set()
+        self._wake.set()
+        deadline = time.monotonic() + self.settings.drain_seconds
+        self._thread.join(self.settings.drain_seconds)
+        while self.spool.pending_segments and time.monotonic() < deadline:
+            if not self.drain_once(parallel=False):
+                break
+        self._pool.shutdown(wait=False, cancel_futures=True)
+        self.spool.close()
+        self._release_lane(remove=not self.spool.pending_segments)
+        if self._on_shutdown is not None:
+            self._on_shutdown()
+
+    def abandon(self) -> None:
+        """Forked child: let go of the parent's lane; its data stays with the parent."""
+        self._stop.set()
+        self._release_lane(remove=False)
+
+    def _release_lane(self, *, remove: bool) -> None:
+        if self._lane_lock is None:
+            return
+        if remove:
+            try:
+                os.remove(os.path.join(self.spool.directory, _LOCK))
+                os.rmdir(self.spool.directory)
+            except OSError:
+                pass
+        os.close(self._lane_lock)
+        self._lane_lock = None
+
+    def diagnostics(self) -> dict[str, Any]:
+        with self._stats_lock:
+            counters = {
+                "spooled_batches": self.spooled_batches,
+                "sent_records": self.sent_records,
+                "send_failures": self.send_failures,
+                "rejected_records": self.rejected_records,
+                "last_rejected_status": self.last_rejected_status,
+                "adopted_segments": self.adopted_segments,
+            }
+        return {
+            **counters,
+            "directory": self.spool.directory,
+            "pending_segments": self.spool.pending_segments,
+            "pending_bytes": self.spool.pending_bytes,
+            "shared_bytes": self.spool.shared_bytes,
+            "evicted_segments": self.spool.evicted_segments,
+            "evicted_bytes": self.spool.evicted_bytes,
+            "dropped_oversize": self.spool.dropped_oversize,
+            "corrupt_segments": self.spool.corrupt_segments,
+            "backoff_seconds": self._backoff,
+        }
+
+
+def _size(path: str) -> int:
+    try:
+        return os.path.getsize(path)
+    except FileNotFoundError:
+        return 0
+
+
+def _segment_files(directory: str) -> list[str]:
+    """Segment files directly in ``directory``, oldest first."""
+    try:
+        names = sorted(os.listdir(directory))
+    except FileNotFoundError:
+        return []
+    return [
+        os.path.join(directory, name)
+        for name in names
+        if name.endswith(_SUFFIX) and name[: -len(_SUFFIX)].isdigit()
+    ]
+
+
+def _lanes(root: str) -> list[str]:
+    names = sorted(os.listdir(root))
+    return [os.path.join(root, name) for name in names if name.startswith(_LANE_PREFIX)]
+
+
+def _try_lock(lane: str) -> int | None:
+    """A descriptor holding ``lane``'s lock, or None while its process is alive."""
+    if fcntl is None:
+        return None
+    try:
+        fd = os.open(os.path.join(lane, _LOCK), os.O_RDWR)
+    except OSError:
+        return None  # being removed by the process that adopted it
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        os.close(fd)
+        return None
+    return fd
+
+
+def _claim_lane(root: str) -> tuple[str, int]:
+    """Lock a free lane under ``root`` (segments left by an exited process), else a new one.
+
+    New lanes are locked under a hidden name and then renamed, so no other
+    process sees one before it is locked.
+    """
+    os.makedirs(root, exist_ok=True)
+    for lane in _lanes(root):
+        fd = _try_lock(lane)
+        if fd is not None:
+            return lane, fd
+    staging = tempfile.mkdtemp(prefix=_CLAIM_PREFIX, dir=root)
+    fd = os.open(os.path.join(staging, _LOCK), os.O_RDWR | os.O_CREAT, 0o644)
+    if fcntl is not None:
+        fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    lane = os.path.join(root, _LANE_PREFIX + os.path.basename(staging)[len(_CLAIM_PREFIX) :])
+    os.rename(staging, lane)
+    return lane, fd
+
+
+def otlp_http_sender(exporter: Any) -> Callable[[bytes], int | None]:
+    """Send pre-serialized requests through an OTLP HTTP exporter's session.
+
+    Uses the exporter's ``_export`` so endpoint, headers, TLS and compression
+    settings match the direct (unspooled) path; retries are left to the spool.
+    Returns the response status code; connection errors propagate.
+    """
+
+    def send(payload: bytes) -> int | None:
+        return exporter._export(payload).status_code
+
+    return send
+
+
+def serialize_request(request: Any) -> bytes:
+    """Wire bytes of an OTLP export request message (spans and logs alike)."""
+    return request.SerializeToString()
@@ -0,0 +1,166 @@
+"""Bounded queue + worker thread that takes log formatting off the event loop.
+
+``log_llm_step_completed`` uses this when ``AGENT_LOG_ASYNC`` is true: the ADK
+callback only enqueues references and scalars, and the worker does the text
+splitting, truncation and OTLP record construction.
+
+Settings: ``AGENT_LOG_QUEUE_SIZE`` (default 1000) and ``AGENT_LOG_OVERFLOW``,
+what to do when the queue is full:
+
+- ``drop_newest`` (default) — discard the new record
+- ``drop_oldest`` — discard the oldest queued record to make room
+- ``block`` — wait up to ``AGENT_LOG_BLOCK_MS`` (default 50), then discard
+- ``inline`` — process the record on the caller's thread
+
+The queue knobs are only read when ``AGENT_LOG_ASYNC`` is on; a malformed one
+is logged and replaced by its default, since it is read on the first LLM step.
+"""
+
+from __future__ import annotations
+
+import atexit
+import logging
+import os
+import queue
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable
+
+from observability.env_settings import env_choice, env_float, env_int, warn_invalid
+
+OVERFLOW_POLICIES = ("drop_newest", "drop_oldest", "block", "inline")
+
+_internal_logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class StepLogQueueSettings:
+    enabled: bool = False
+    max_size: int = 1000
+    overflow: str = "drop_newest"
+    block_ms: float = 50.0
+
+    def __post_init__(self) -> None:
+        if self.overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"overflow must be one of {OVERFLOW_POLICIES}, got {self.overflow!r}")
+        if self.max_size <= 0:
+            raise ValueError("max_size must be positive")
+
+    @classmethod
+    def from_env(cls) -> "StepLogQueueSettings":
+        """Disabled unless ``AGENT_LOG_ASYNC`` is true; bad queue knobs fall back (warned)."""
+        if os.environ.get("AGENT_LOG_ASYNC", "false").lower() not in ("1", "true", "yes"):
+            return cls()
+        defaults = cls(enabled=True)
+        try:
+            return cls(
+                enabled=True,
+                max_size=env_int("AGENT_LOG_QUEUE_SIZE", defaults.max_size),
+                overflow=env_choice("AGENT_LOG_OVERFLOW", defaults.overflow, OVERFLOW_POLICIES),
+                block_ms=env_float("AGENT_LOG_BLOCK_MS", defaults.block_ms),
+            )
+        except ValueError as exc:
+            warn_invalid("AGENT_LOG", exc)
+            return defaults
+
+
+class StepLogQueue:
+    """Runs ``process(item)`` on a daemon worker for every submitted item."""
+
+    def __init__(self, process: Callable[[Any], None], settings: StepLogQueueSettings) -> None:
+        self.settings = settings
+        self._process = process
+        self._queue: queue.Queue[Any] = queue.Queue(maxsize=settings.max_size)
+        self._lock = threading.Lock()
+        self.submitted = 0
+        self.processed = 0
+        self.failed = 0
+        self.dropped = 0
+        self.inline = 0
+        self._worker = threading.Thread(target=self._run, name="step-log-queue", daemon=True)
+        self._worker.start()
+        atexit.register(self.flush, 5.0)
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def _handle(self, item: Any) -> None:
+        try:
+            self._process(item)
+            self._count("processed")
+        except Exception:
+            self._count("failed")
+            _internal_logger.debug("step log processing failed", exc_info=True)
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            try:
+                self._handle(item)
+            finally:
+                self._queue.task_done()
+
+    def submit(self, item: Any) -> bool:
+        """Enqueue ``item``; returns False if it was dropped by the overflow policy."""
+        self._count("submitted")
+        try:
+            self._queue.put_nowait(item)
+            return True
+        except queue.Full:
+            pass
+        policy = self.settings.overflow
+        if policy == "inline":
+            self._count("inline")
+            self._handle(item)
+            return True
+        if policy == "block":
+            try:
+                self._queue.put(item, timeout=self.settings.block_ms / 1000.0)
+                return True
+            except queue.Full:
+                self._count("dropped")
+                return False
+        if policy == "drop_oldest":
+            try:
+                self._queue.get_nowait()
+                self._queue.task_done()
+                self._count("dropped")
+            except queue.Empty:
+                pass
+            try:
+                self._queue.put_nowait(item)
+                return True
+            except queue.Full:
+                pass
+        self._count("dropped")
+        return False
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Wait until every queued item was processed; False on timeout."""
+        deadline = time.monotonic() + timeout
+        with self._queue.all_tasks_done:
+            while self._queue.unfinished_tasks:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._queue.all_tasks_done.wait(remaining)
+        return True
+
+    def abandon(self) -> None:
+        """Forget queued items: in a forked child the worker thread did not survive."""
+        self._queue = queue.Queue(maxsize=self.settings.max_size)
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "overflow": self.settings.overflow,
+                "max_size": self.settings.max_size,
+                "queued": self._queue.qsize(),
+                "submitted": self.submitted,
+                "processed": self.processed,
+                "failed": self.failed,
+                "dropped": self.dropped,
+                "inline": self.inline,
+            }
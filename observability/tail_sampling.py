@@ -0,0 +1,296 @@
+"""Tail-based sampling of whole traces, with trace-correlated logs following the decision.
+
+Spans are buffered per trace until the trace's local root span (ADK's
+``invocation`` span around the root ``invoke_agent``) ends. The trace is then
+kept when any span has an error status or ``error.type``, any
+``gen_ai.response.finish_reasons`` value other than ``stop``, or the root
+took at least the latency threshold; otherwise it is kept at the sampling
+rate of its outermost ``invoke_agent`` agent. Sampling is deterministic in
+the trace id, so every process makes the same call for a trace.
+
+Log records carrying a trace id (``observability.session_logs`` records are
+emitted inside ADK spans) wait for the same decision, so the spans and logs
+tables stay joinable.
+
+Enabled by ``TAIL_SAMPLING_RATE`` (default keep rate, 0..1). Tuned by
+``TAIL_SAMPLING_AGENT_RATES`` (``Agent=rate,...``),
+``TAIL_SAMPLING_LATENCY_MS`` (default 30000), ``TAIL_SAMPLING_MAX_TRACES``
+(traces buffered at once, default 1000) and
+``TAIL_SAMPLING_DECISION_WAIT_SECONDS`` (default 300). Traces that overflow
+the buffer or never see their root end are kept rather than lost.
+
+``force_flush`` (run after every invocation with
+``TELEMETRY_FLUSH_MODE=invocation``) releases only traces past the decision
+wait, then flushes downstream; traces still in flight wait for their root, so
+frequent flushes do not defeat sampling. ``shutdown`` keeps every undecided trace (``flush_pending``).
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any
+
+from opentelemetry.context import Context
+from opentelemetry.sdk._logs import LogData, LogRecordProcessor
+from opentelemetry.sdk.trace import ReadableSpan, Span, SpanProcessor
+from opentelemetry.trace import StatusCode
+
+from observability.env_settings import env_float, env_int
+
+_INVOKE_AGENT = "invoke_agent "
+_DECISION_CACHE = 10_000
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class TailSamplingSettings:
+    rate: float = 1.0
+    agent_rates: dict[str, float] = field(default_factory=dict)
+    latency_threshold_ms: float = 30_000.0
+    max_traces: int = 1000
+    decision_wait_seconds: float = 300.0
+
+    @classmethod
+    def from_env(cls) -> "TailSamplingSettings | None":
+        """None unless ``TAIL_SAMPLING_RATE`` is set; bad values fall back to defaults (warned)."""
+        if not os.environ.get("TAIL_SAMPLING_RATE", "").strip():
+            return None
+        defaults = cls()
+        agent_rates: dict[str, float] = {}
+        for item in os.environ.get("TAIL_SAMPLING_AGENT_RATES", "").split(","):
+            name, sep, value = item.partition("=")
+            if not (sep and name.strip()):
+                continue
+            try:
+                agent_rates[name.strip()] = float(value)
+            except ValueError:
+                logger.warning("Ignoring TAIL_SAMPLING_AGENT_RATES entry %r (not a number)", item)
+        return cls(
+            rate=env_float("TAIL_SAMPLING_RATE", defaults.rate),
+            agent_rates=agent_rates,
+            latency_threshold_ms=env_float(
+                "TAIL_SAMPLING_LATENCY_MS", defaults.latency_threshold_ms
+            ),
+            max_traces=env_int("TAIL_SAMPLING_MAX_TRACES", defaults.max_traces),
+            decision_wait_seconds=env_float(
+                "TAIL_SAMPLING_DECISION_WAIT_SECONDS", defaults.decision_wait_seconds
+            ),
+        )
+
+
+@dataclass
+class _PendingTrace:
+    started: float
+    spans: list[ReadableSpan] = field(default_factory=list)
+    logs: list[LogData] = field(default_factory=list)
+
+
+def _is_local_root(span: ReadableSpan) -> bool:
+    return span.parent is None or span.parent.is_remote
+
+
+def _keep_reason(spans: list[ReadableSpan], root: ReadableSpan | None, threshold_ms: float) -> str | None:
+    for span in spans:
+        attrs = span.attributes or {}
+        if span.status.status_code is StatusCode.ERROR or "error.type" in attrs:
+            return "error"
+        reasons = attrs.get("gen_ai.response.finish_reasons") or ()
+        if any(str(r).lower() != "stop" for r in reasons):
+            return "finish_reason"
+    if root is not None and root.end_time and root.start_time:
+        if (root.end_time - root.start_time) / 1e6 >= threshold_ms:
+            return "slow"
+    return None
+
+
+def _agent_name(spans: list[ReadableSpan]) -> str:
+    agents = [s for s in spans if s.name.startswith(_INVOKE_AGENT)]
+    if not agents:
+        return ""
+    outermost = min(agents, key=lambda s: s.start_time or 0)
+    return outermost.name[len(_INVOKE_AGENT) :]
+
+
+def _sampled(trace_id: int, rate: float) -> bool:
+    if rate >= 1.0:
+        return True
+    if rate <= 0.0:
+        return False
+    return (trace_id & 0xFFFFFFFFFFFFFFFF) < rate * 2**64
+
+
+class TailSampler:
+    """Shared buffers and decisions for the span and log processors."""
+
+    def __init__(
+        self,
+        settings: TailSamplingSettings,
+        span_downstream: SpanProcessor,
+        log_downstream: LogRecordProcessor | None = None,
+    ) -> None:
+        self.settings = settings
+        self.span_downstream = span_downstream
+        self.log_downstream = log_downstream
+        self._lock = threading.Lock()
+        self._pending: OrderedDict[int, _PendingTrace] = OrderedDict()
+        self._decisions: OrderedDict[int, bool] = OrderedDict()
+        self.kept: dict[str, int] = {}
+        self.dropped_traces = 0
+        self.dropped_spans = 0
+        self.dropped_logs = 0
+
+    def _pending_for(self, trace_id: int) -> _PendingTrace:
+        pending = self._pending.get(trace_id)
+        if pending is None:
+            pending = self._pending[trace_id] = _PendingTrace(started=time.monotonic())
+        return pending
+
+    def _decide_locked(
+        self, trace_id: int, root: ReadableSpan | None, forced: str | None = None
+    ) -> tuple[bool, _PendingTrace]:
+        pending = self._pending.pop(trace_id, None) or _PendingTrace(started=0.0)
+        reason = forced or _keep_reason(pending.spans, root, self.settings.latency_threshold_ms)
+        if reason is None:
+            agent = _agent_name(pending.spans)
+            rate = self.settings.agent_rates.get(agent, self.settings.rate)
+            reason = "sampled" if _sampled(trace_id, rate) else None
+        keep = reason is not None
+        if keep:
+            self.kept[reason] = self.kept.get(reason, 0) + 1
+        else:
+            self.dropped_traces += 1
+            self.dropped_spans += len(pending.spans)
+            self.dropped_logs += len(pending.logs)
+        self._decisions[trace_id] = keep
+        while len(self._decisions) > _DECISION_CACHE:
+            self._decisions.popitem(last=False)
+        return keep, pending
+
+    def _expire_locked(self) -> list[_PendingTrace]:
+        """Force ``keep`` on traces past the wait or beyond ``max_traces``."""
+        released: list[_PendingTrace] = []
+        deadline = time.monotonic() - self.settings.decision_wait_seconds
+        while self._pending:
+            trace_id, oldest = next(iter(self._pending.items()))
+            if len(self._pending) <= self.settings.max_traces and oldest.started > deadline:
+                break
+            _, pending = self._decide_locked(trace_id, None, forced="incomplete")
+            released.append(pending)
+        return released
+
+    def _release(self, traces: list[_PendingTrace]) -> None:
+        for pending in traces:
+            for span in pending.spans:
+                self.span_downstream.on_end(span)
+            if self.log_downstream is not None:
+                for log_data in pending.logs:
+                    self.log_downstream.on_emit(log_data)
+
+    def on_span_end(self, span: ReadableSpan) -> None:
+        trace_id = span.context.trace_id
+        released: list[_PendingTrace] = []
+        with self._lock:
+            decided = self._decisions.get(trace_id)
+            if decided is not None:
+                if decided:
+                    released.append(_PendingTrace(started=0.0, spans=[span]))
+                else:
+                    self.dropped_spans += 1
+            else:
+                self._pending_for(trace_id).spans.append(span)
+                if _is_local_root(span):
+                    keep, pending = self._decide_locked(trace_id, span)
+                    if keep:
+                        released.append(pending)
+            released.extend(self._expire_locked())
+        self._release(released)
+
+    def on_log(self, log_data: LogData) -> None:
+        trace_id = log_data.log_record.trace_id or 0
+        if not trace_id:
+            if self.log_downstream is not None:
+                self.log_downstream.on_emit(log_data)
+            return
+        with self._lock:
+            decided = self._decisions.get(trace_id)
+            if decided is None:
+                self._pending_for(trace_id).logs.append(log_data)
+                return
+            if not decided:
+                self.dropped_logs += 1
+                return
+        if self.log_downstream is not None:
+            self.log_downstream.on_emit(log_data)
+
+    def release_expired(self) -> None:
+        """Keep the traces past the decision wait or beyond ``max_traces`` (on ``force_flush``)."""
+        with self._lock:
+            released = self._expire_locked()
+        self._release(released)
+
+    def flush_pending(self) -> None:
+        """Keep every undecided trace; for shutdown only, ``force_flush`` leaves them buffered."""
+        with self._lock:
+            released = [
+                self._decide_locked(trace_id, None, forced="incomplete")[1]
+                for trace_id in list(self._pending)
+            ]
+        self._release(released)
+
+    def diagnostics(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "pending_traces": len(self._pending),
+                "kept_traces": dict(self.kept),
+                "dropped_traces": self.dropped_traces,
+                "dropped_spans": self.dropped_spans,
+                "dropped_logs": self.dropped_logs,
+            }
+
+
+class TailSamplingSpanProcessor(SpanProcessor):
+    """Buffers ended spans in a ``TailSampler``; kept traces go to its span downstream."""
+
+    def __init__(self, sampler: TailSampler) -> None:
+        self.sampler = sampler
+
+    def on_start(self, span: Span, parent_context: Context | None = None) -> None:
+        self.sampler.span_downstream.on_start(span, parent_context=parent_context)
+
+    def on_end(self, span: ReadableSpan) -> None:
+        self.sampler.on_span_end(span)
+
+    def shutdown(self) -> None:
+        self.sampler.flush_pending()
+        self.sampler.span_downstream.shutdown()
+
+    def force_flush(self, timeout_millis: int = 30000) -> bool:
+        self.sampler.release_expired()
+        return self.sampler.span_downstream.force_flush(timeout_millis)
+
+
+class TailSamplingLogProcessor(LogRecordProcessor):
+    """Holds trace-correlated log records until their trace is decided."""
+
+    def __init__(self, sampler: TailSampler) -> None:
+        self.sampler = sampler
+
+    def on_emit(self, log_data: LogData) -> None:
+        self.sampler.on_log(log_data)
+
+    def shutdown(self) -> None:
+        self.sampler.flush_pending()
+        if self.sampler.log_downstream is not None:
+            self.sampler.log_downstream.shutdown()
+
+    def force_flush(self, timeout_millis: int = 30000) -> bool:
+        self.sampler.release_expired()
+        if self.sampler.log_downstream is None:
+            return True
+        return self.sampler.log_downstream.force_flush(timeout_millis)
@@ -0,0 +1,76 @@
+"""When buffered telemetry is exported: at exit only, or after every invocation.
+
+``TELEMETRY_FLUSH_MODE`` picks the mode:
+
+- ``exit`` (default) — the batch processors export on their schedule and the
+  ``atexit`` hook flushes the rest (``otel_sdk.shutdown_telemetry``)
+- ``invocation`` — ``TelemetryFlushPlugin`` also flushes spans, logs and
+  metrics after every invocation (``otel_sdk.flush_telemetry``), without
+  shutting the providers down, so batch jobs and short-lived workers ship each
+  invocation's telemetry as soon as it finishes
+
+The plugin's ``after_run_callback`` runs inside ADK's ``invocation`` span, so
+it only schedules the flush: it runs on a worker thread once the span has
+ended, off the event loop. Invocations that finish while a flush is running
+share one follow-up flush. ``close`` (``Runner.close``) waits for it.
+
+``TELEMETRY_FLUSH_TIMEOUT_MS`` (default 2000) bounds each invocation flush.
+``TELEMETRY_SHUTDOWN_TIMEOUT_MS`` (default 5000) bounds the exit flush of all
+providers together; they are flushed in parallel.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Any
+
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.plugins.base_plugin import BasePlugin
+
+from observability import otel_sdk
+from observability.plugin_settings import TelemetryFlushSettings
+
+logger = logging.getLogger(__name__)
+
+
+class TelemetryFlushPlugin(BasePlugin):
+    """Flushes telemetry after every invocation; see the module docstring."""
+
+    def __init__(self, settings: TelemetryFlushSettings, name: str = "telemetry_flush") -> None:
+        super().__init__(name=name)
+        self.settings = settings
+        self._task: asyncio.Task[None] | None = None
+        self._again = False
+        self.flushes = 0
+        self.late_flushes = 0
+
+    async def after_run_callback(self, *, invocation_context: InvocationContext) -> None:
+        if self._task is not None and not self._task.done():
+            self._again = True
+            return None
+        self._task = asyncio.get_running_loop().create_task(self._flush())
+        return None
+
+    async def _flush(self) -> None:
+        while True:
+            self._again = False
+            ok = await asyncio.to_thread(
+                otel_sdk.flush_telemetry, self.settings.invocation_timeout_millis
+            )
+            self.flushes += 1
+            if not ok:
+                self.late_flushes += 1
+                logger.debug(
+                    "Telemetry flush did not finish within %.0f ms",
+                    self.settings.invocation_timeout_millis,
+                )
+            if not self._again:
+                return
+
+    def stats(self) -> dict[str, Any]:
+        return {"flushes": self.flushes, "late_flushes": self.late_flushes}
+
+    async def close(self) -> None:
+        if self._task is not None:
+            await self._task
@@ -0,0 +1,398 @@
+"""Stream rows of the Unity Catalog trace tables to Parquet or JSONL as Arrow batches.
+
+Queries run through the Databricks SQL Statement Execution API
+(``/api/2.0/sql/statements``) with ``ARROW_STREAM`` results and
+``EXTERNAL_LINKS`` disposition. Each result chunk is an Arrow IPC stream read
+batch by batch from its download link, so memory stays at about one batch
+whatever the result size. All calls go through one
+``databricks_rest.DatabricksRestClient``, which keeps connections alive across
+polls and chunk downloads and retries throttled or failed calls.
+
+``TraceFilter`` selects rows by session, invocation, span name and a time
+window. Values are sent as named statement parameters and never formatted
+into the SQL. ``incremental_pull`` fetches the rows between the last saved
+watermark and the current one from ``trace_ingestion_max_timestamps.sql``,
+less ``allowed_lateness_seconds`` so rows still arriving out of order (see
+``DEFAULT_ALLOWED_LATENESS_SECONDS``) fall into the next pull. The new
+watermark is saved only after the output file is complete, so a failed or
+interrupted pull is simply repeated. Rows that arrive later than the margin,
+with a timestamp at or below a pull's watermark, are not picked up.
+
+Requires ``requests`` and ``pyarrow``; ``scripts/query_traces.py`` is the CLI.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import tempfile
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Iterator, Sequence
+
+from observability.databricks_rest import DatabricksApiError, DatabricksRestClient
+from observability.local_queries import QUERIES_DIR, TRACE_TABLE_PATTERN
+
+TABLES = {
+    "spans": "mlflow_experiment_trace_otel_spans",
+    "logs": "mlflow_experiment_trace_otel_logs",
+}
+TIME_COLUMNS = {"spans": "start_time_unix_nano", "logs": "time_unix_nano"}
+WATERMARK_COLUMNS = {"spans": "latest_span_start_unix_nano", "logs": "latest_log_unix_nano"}
+WATERMARK_QUERY = QUERIES_DIR / "trace_ingestion_max_timestamps.sql"
+# Rows reach the tables out of timestamp order: the root ``invocation`` span is
+# exported after its children, batches wait up to OTEL_BSP_SCHEDULE_DELAY, and
+# the spool retries with up to a minute of backoff. Incremental reads stop this
+# far behind the newest timestamp (``TRACE_ALLOWED_LATENESS_SECONDS``).
+DEFAULT_ALLOWED_LATENESS_SECONDS = 900.0
+
+_FILTER_COLUMNS = {
+    "spans": {
+        "session_id": "attributes['gen_ai.conversation.id']",
+        "invocation_id": "attributes['gcp.vertex.agent.invocation_id']",
+        "span_name": "name",
+    },
+    "logs": {
+        "session_id": "attributes['session_id']",
+        "invocation_id": "attributes['invocation_id']",
+    },
+}
+_TERMINAL_STATES = ("SUCCEEDED", "FAILED", "CANCELED", "CLOSED")
+
+
+class StatementExecutionError(RuntimeError):
+    """A SQL statement failed, was canceled or timed out."""
+
+
+@dataclass(frozen=True)
+class TraceFilter:
+    """Row filter; ``since_ns`` is exclusive and ``until_ns`` inclusive."""
+
+    table: str = "spans"
+    session_id: str | None = None
+    invocation_id: str | None = None
+    span_name: str | None = None
+    since_ns: int | None = None
+    until_ns: int | None = None
+    limit: int | None = None
+
+    def __post_init__(self) -> None:
+        if self.table not in TABLES:
+            raise ValueError(f"table must be one of {tuple(TABLES)}, got {self.table!r}")
+        if self.span_name is not None and self.table != "spans":
+            raise ValueError("span_name filters the spans table only")
+
+
+def qualified_table(table: str, catalog: str, schema: str) -> str:
+    return f"`{catalog}`.`{schema}`.`{TABLES[table]}`"
+
+
+def qualify_query(sql: str, catalog: str, schema: str) -> str:
+    """Point every ``mlflow_experiment_trace_*`` name in ``sql`` at ``catalog.schema``."""
+    return TRACE_TABLE_PATTERN.sub(lambda m: f"`{catalog}`.`{schema}`.`{m.group(1)}`", sql)
+
+
+def build_fetch_query(
+    flt: TraceFilter, catalog: str, schema: str, columns: Sequence[str] | None = None
+) -> tuple[str, list[dict[str, str]]]:
+    """``(sql, parameters)`` for the Statement Execution API, ordered by time."""
+    time_column = TIME_COLUMNS[flt.table]
+    where: list[str] = []
+    parameters: list[dict[str, str]] = []
+    for name, column in _FILTER_COLUMNS[flt.table].items():
+        value = getattr(flt, name)
+        if value is not None:
+            where.append(f"{column} = :{name}")
+            parameters.append({"name": name, "value": value, "type": "STRING"})
+    for name, op in (("since_ns", ">"), ("until_ns", "<=")):
+        value = getattr(flt, name)
+        if value is not None:
+            where.append(f"{time_column} {op} :{name}")
+            parameters.append({"name": name, "value": str(int(value)), "type": "BIGINT"})
+    select = ", ".join(columns) if columns else "*"
+    sql = f"SELECT {select} FROM {qualified_table(flt.table, catalog, schema)}"
+    if where:
+        sql += " WHERE " + " AND ".join(where)
+    sql += f" ORDER BY {time_column}"
+    if flt.limit is not None:
+        sql += f" LIMIT {int(flt.limit)}"
+    return sql, parameters
+
+
+class SqlStatementClient:
+    """Runs statements on one SQL warehouse and streams ``ARROW_STREAM`` results."""
+
+    def __init__(
+        self,
+        rest: DatabricksRestClient,
+        warehouse_id: str,
+        *,
+        poll_interval_s: float = 1.0,
+        timeout_s: float = 900.0,
+    ) -> None:
+        self.rest = rest
+        self.warehouse_id = warehouse_id
+        self.poll_interval_s = poll_interval_s
+        self.timeout_s = timeout_s
+
+    @classmethod
+    def from_env(cls, **kwargs: Any) -> "SqlStatementClient":
+        warehouse_id = (
+            os.environ.get("DATABRICKS_WAREHOUSE_ID", "").strip()
+            or os.environ.get("MLFLOW_TRACING_SQL_WAREHOUSE_ID", "").strip()
+        )
+        if not warehouse_id:
+            raise ValueError("set MLFLOW_TRACING_SQL_WAREHOUSE_ID to query trace tables")
+        return cls(DatabricksRestClient.from_env(), warehouse_id, **kwargs)
+
+    def _api(self, method: str, path: str, **kwargs: Any) -> dict[str, Any]:
+        return self.rest.api(method, path, **kwargs)
+
+    def execute(self, sql: str, parameters: Sequence[dict[str, str]] = ()) -> dict[str, Any]:
+        """Submit ``sql`` and poll until it finishes; returns the final statement response."""
+        body = {
+            "warehouse_id": self.warehouse_id,
+            "statement": sql,
+            "parameters": list(parameters),
+            "format": "ARROW_STREAM",
+            "disposition": "EXTERNAL_LINKS",
+            "wait_timeout": "30s",
+            "on_wait_timeout": "CONTINUE",
+        }
+        statement = self._api("POST", "/api/2.0/sql/statements", json=body)
+        deadline = time.monotonic() + self.timeout_s
+        while statement["status"]["state"] not in _TERMINAL_STATES:
+            if time.monotonic() > deadline:
+                self._api("POST", f"/api/2.0/sql/statements/{statement['statement_id']}/cancel")
+                raise StatementExecutionError(f"statement timed out after {self.timeout_s:g}s")
+            time.sleep(self.poll_interval_s)
+            statement = self._api("GET", f"/api/2.0/sql/statements/{statement['statement_id']}")
+        status = statement["status"]
+        if status["state"] != "SUCCEEDED":
+            message = (status.get("error") or {}).get("message", "")
+            raise StatementExecutionError(f"statement {status['state']}: {message}")
+        return statement
+
+    def arrow_batches(
+        self, sql: str, parameters: Sequence[dict[str, str]] = ()
+    ) -> Iterator[Any]:
+        """Run ``sql`` and yield its result as ``pyarrow.RecordBatch`` objects, in order."""
+        import pyarrow as pa
+
+        statement = self.execute(sql, parameters)
+        links = (statement.get("result") or {}).get("external_links") or []
+        while links:
+            next_link = None
+            for link in links:
+                # Presigned cloud-storage URLs: no workspace token, only the headers given.
+                url = link["external_link"]
+                response = self.rest.request(
+                    "GET", url, headers=link.get("http_headers") or {}, stream=True, timeout=300
+                )
+                if response.status_code >= 400:
+                    raise DatabricksApiError("GET", url, response.status_code, "chunk download")
+                response.raw.decode_content = True
+                yield from pa.ipc.open_stream(response.raw)
+                next_link = link.get("next_chunk_internal_link")
+            links = []
+            if next_link:
+                links = self._api("GET", next_link).get("external_links") or []
+
+    def close(self) -> None:
+        self.rest.close()
+
+
+def _jsonable(value: Any) -> Any:
+    # Arrow maps come out of to_pylist() as lists of (key, value) tuples.
+    if isinstance(value, list):
+        if value and all(isinstance(item, tuple) and len(item) == 2 for item in value):
+            return {k: _jsonable(v) for k, v in value}
+        return [_jsonable(item) for item in value]
+    if isinstance(value, dict):
+        return {k: _jsonable(v) for k, v in value.items()}
+    return value
+
+
+class BatchFileWriter:
+    """Writes record batches to ``.parquet`` or ``.jsonl``; the file appears on ``close``."""
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        if self.path.suffix not in (".parquet", ".jsonl"):
+            raise ValueError(f"output must end in .parquet or .jsonl, got {self.path.name}")
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, self._tmp = tempfile.mkstemp(dir=self.path.parent, suffix=".tmp")
+        os.close(fd)
+        self._parquet: Any = None
+        self._jsonl: Any = None
+        self.rows = 0
+        self.batches = 0
+
+    def write(self, batch: Any) -> None:
+        if self.path.suffix == ".parquet":
+            if self._parquet is None:
+                import pyarrow.parquet as pq
+
+                self._parquet = pq.ParquetWriter(self._tmp, batch.schema, compression="zstd")
+            self._parquet.write_batch(batch)
+        else:
+            if self._jsonl is None:
+                self._jsonl = open(self._tmp, "w", encoding="utf-8")
+            for row in batch.to_pylist():
+                self._jsonl.write(json.dumps(_jsonable(row), ensure_ascii=False, default=str))
+                self._jsonl.write("\n")
+        self.rows += batch.num_rows
+        self.batches += 1
+
+    def close(self) -> None:
+        """Move the finished file into place (an empty result writes no Parquet file)."""
+        if self._parquet is not None:
+            self._parquet.close()
+        if self._jsonl is not None:
+            self._jsonl.close()
+        if self._parquet is None and self.path.suffix == ".parquet":
+            os.unlink(self._tmp)
+            return
+        os.replace(self._tmp, self.path)
+
+    def abort(self) -> None:
+        for handle in (self._parquet, self._jsonl):
+            if handle is not None:
+                handle.close()
+        if os.path.exists(self._tmp):
+            os.unlink(self._tmp)
+
+
+@dataclass(frozen=True)
+class PullResult:
+    path: Path
+    rows: int
+    batches: int
+    since_ns: int | None = None
+    until_ns: int | None = None
+
+
+def fetch_to_file(
+    client: SqlStatementClient,
+    flt: TraceFilter,
+    path: str | Path,
+    *,
+    catalog: str,
+    schema: str,
+    columns: Sequence[str] | None = None,
+) -> PullResult:
+    """Stream the rows matching ``flt`` into ``path`` (``.parquet`` or ``.jsonl``)."""
+    sql, parameters = build_fetch_query(flt, catalog, schema, columns)
+    writer = BatchFileWriter(path)
+    try:
+        for batch in client.arrow_batches(sql, parameters):
+            writer.write(batch)
+    except BaseException:
+        writer.abort()
+        raise
+    writer.close()
+    return PullResult(writer.path, writer.rows, writer.batches, flt.since_ns, flt.until_ns)
+
+
+def settled_watermark(latest_ns: int | None, allowed_lateness_seconds: float) -> int | None:
+    """End of the window that late rows can no longer land in; None if there are no rows."""
+    if latest_ns is None:
+        return None
+    return latest_ns - round(allowed_lateness_seconds * 1_000_000_000)
+
+
+def current_watermarks(
+    client: SqlStatementClient, catalog: str, schema: str
+) -> dict[str, int | None]:
+    """Latest span start / log time (ns) per table, from ``trace_ingestion_max_timestamps.sql``."""
+    sql = qualify_query(WATERMARK_QUERY.read_text(encoding="utf-8"), catalog, schema)
+    rows: list[dict[str, Any]] = []
+    for batch in client.arrow_batches(sql):
+        rows.extend(batch.to_pylist())
+    row = rows[0] if rows else {}
+    return {table: row.get(column) for table, column in WATERMARK_COLUMNS.items()}
+
+
+class PullState:
+    """Last pulled watermark per table (and filter), as JSON at ``path``."""
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+
+    def load(self) -> dict[str, int]:
+        try:
+            with open(self.path, encoding="utf-8") as handle:
+                return {k: int(v) for k, v in json.load(handle).items()}
+        except FileNotFoundError:
+            return {}
+
+    def save(self, key: str, watermark_ns: int) -> None:
+        state = self.load()
+        state[key] = watermark_ns
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.path.parent, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as handle:
+            json.dump(state, handle, indent=2, sort_keys=True)
+        os.replace(tmp, self.path)
+
+
+def state_key(flt: TraceFilter) -> str:
+    """Watermark key: the table plus any session / invocation / span-name filter."""
+    parts = [flt.table] + [
+        f"{name}={getattr(flt, name)}"
+        for name in ("session_id", "invocation_id", "span_name")
+        if getattr(flt, name) is not None
+    ]
+    return ",".join(parts)
+
+
+def _pull_file_name(flt: TraceFilter, since: int | None, until: int, fmt: str) -> str:
+    key = state_key(flt)
+    if key == flt.table:
+        return f"{flt.table}-{since or 0}-{until}.{fmt}"
+    digest = hashlib.sha256(key.encode()).hexdigest()[:12]
+    return f"{flt.table}-{digest}-{since or 0}-{until}.{fmt}"
+
+
+def incremental_pull(
+    client: SqlStatementClient,
+    flt: TraceFilter,
+    state: PullState,
+    output_dir: str | Path,
+    *,
+    catalog: str,
+    schema: str,
+    fmt: str = "parquet",
+    columns: Sequence[str] | None = None,
+    allowed_lateness_seconds: float = DEFAULT_ALLOWED_LATENESS_SECONDS,
+) -> PullResult | None:
+    """Pull rows newer than the saved watermark up to the settled one; None if up to date.
+
+    Writes ``<output_dir>/<table>/<table>-<since>-<until>.<fmt>``, the layout
+    ``observability.local_queries`` reads; a filtered pull also puts a short hash
+    of its ``state_key`` after the table name, so differently filtered pulls
+    never share a file. The file name is deterministic, so rerunning after a
+    failure overwrites the partial pull.
+    """
+    key = state_key(flt)
+    since = state.load().get(key, flt.since_ns)
+    latest = current_watermarks(client, catalog, schema)[flt.table]
+    until = settled_watermark(latest, allowed_lateness_seconds)
+    if flt.until_ns is not None and until is not None:
+        until = min(until, flt.until_ns)
+    if until is None or (since is not None and until <= since):
+        return None
+    window = TraceFilter(
+        table=flt.table,
+        session_id=flt.session_id,
+        invocation_id=flt.invocation_id,
+        span_name=flt.span_name,
+        since_ns=since,
+        until_ns=until,
+    )
+    path = Path(output_dir) / flt.table / _pull_file_name(flt, since, until, fmt)
+    result = fetch_to_file(client, window, path, catalog=catalog, schema=schema, columns=columns)
+    state.save(key, until)
+    return result
@@ -7,6 +7,9 @@ Default table matches MLflow GenAI trace OTEL spans
 
 Legacy table ``agent_traces.otel_traces`` is not used by this project; override with env vars below.
 
+Uses ``DATABRICKS_HOST`` and ``DATABRICKS_TOKEN`` (or the bearer token in
+``OTEL_EXPORTER_OTLP_HEADERS``); see ``observability/databricks_rest.py``.
+
 Requires: uv sync (see pyproject.toml); run via uv run
 """
 import os
@@ -22,7 +25,7 @@ try:
 except ImportError:
     pass
 
-import requests
+from observability.databricks_rest import DatabricksApiError, DatabricksRestClient
 
 # Config (align with init / MLflow UC trace storage)
 CATALOG = os.getenv("DATABRICKS_CATALOG", "dev_ai")
@@ -31,30 +34,25 @@ TABLE = os.getenv(
     "DATABRICKS_OTEL_SPANS_TABLE",
     "mlflow_experiment_trace_otel_spans",
 )
-WORKSPACE_URL = os.getenv(
-    "DATABRICKS_HOST", "https://adb-957977613266276.16.azuredatabricks.net"
-).rstrip("/")
 
 
 def main():
-    token = None
-    headers_str = os.getenv("OTEL_EXPORTER_OTLP_HEADERS", "")
-    for part in headers_str.split(","):
-        if "Authorization=Bearer" in part:
-            token = part.split("Bearer ")[1].strip()
-            break
-
-    if not token:
-        print("❌ No token found in OTEL_EXPORTER_OTLP_HEADERS")
+    try:
+        client = DatabricksRestClient.from_env()
+    except ValueError as exc:
+        print(f"❌ {exc}")
         sys.exit(1)
 
     full_table = f"{CATALOG}.{SCHEMA}.{TABLE}"
     print(f"Checking if {full_table} exists...")
     print("=" * 80)
 
-    headers = {"Authorization": f"Bearer {token}", "Content-Type": "application/json"}
-    table_url = f"{WORKSPACE_URL}/api/2.1/unity-catalog/tables/{full_table}"
-    response = requests.get(table_url, headers=headers)
+    with client:
+        try:
+            response = client.request("GET", f"/api/2.1/unity-catalog/tables/{full_table}")
+        except DatabricksApiError as exc:
+            print(f"❌ {exc}")
+            sys.exit(1)
 
     print(f"Status Code: {response.status_code}")
     print(f"Response: {response.text[:500]}")
@@ -0,0 +1,32 @@
+#!/usr/bin/env python3
+"""Print a telemetry payload offloaded by observability/blob_offload.
+
+Usage: python scripts/get_telemetry_blob.py <sha256> [--dir TELEMETRY_BLOB_DIR]
+"""
+
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from observability.blob_offload import BlobStore
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("sha256", help="value of a <key>.sha256 span/log attribute")
+    parser.add_argument("--dir", default=os.environ.get("TELEMETRY_BLOB_DIR", ""))
+    args = parser.parse_args()
+    if not args.dir:
+        parser.error("set TELEMETRY_BLOB_DIR or pass --dir")
+    try:
+        sys.stdout.write(BlobStore(args.dir).get(args.sha256))
+    except FileNotFoundError:
+        print(f"blob {args.sha256} not found under {args.dir}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,8 +1,13 @@
 #!/usr/bin/env python3
 """
 List available Databricks Unity Catalog schemas and tables.
+
+Schemas are listed concurrently over one pooled connection (see
+``observability/databricks_rest.py``). Uses ``DATABRICKS_HOST`` and
+``DATABRICKS_TOKEN`` (or the bearer token in ``OTEL_EXPORTER_OTLP_HEADERS``).
 Requires: uv sync (see pyproject.toml); run via uv run
 """
+import argparse
 import os
 import sys
 from pathlib import Path
@@ -15,62 +20,51 @@ try:
 except ImportError:
     pass
 
-import requests
-
-CATALOG = os.getenv("DATABRICKS_CATALOG", "dev_ai")
-WORKSPACE_URL = os.getenv("DATABRICKS_HOST", "https://adb-957977613266276.16.azuredatabricks.net").rstrip("/")
+from observability.databricks_rest import (
+    DatabricksApiError,
+    DatabricksRestClient,
+    list_catalogs,
+    list_schema_tables,
+)
 
 
 def main():
-    token = None
-    headers_str = os.getenv("OTEL_EXPORTER_OTLP_HEADERS", "")
-    for part in headers_str.split(","):
-        if "Authorization=Bearer" in part:
-            token = part.split("Bearer ")[1].strip()
-            break
+    parser = argparse.ArgumentParser(description="List Unity Catalog catalogs, schemas and tables")
+    parser.add_argument("--catalog", default=os.getenv("DATABRICKS_CATALOG", "dev_ai"))
+    parser.add_argument("--workers", type=int, default=8, help="concurrent schema listings")
+    args = parser.parse_args()
 
-    if not token:
-        print("❌ No token found in OTEL_EXPORTER_OTLP_HEADERS")
+    try:
+        client = DatabricksRestClient.from_env(max_workers=args.workers)
+    except ValueError as exc:
+        print(f"❌ {exc}")
         sys.exit(1)
 
-    headers = {"Authorization": f"Bearer {token}", "Content-Type": "application/json"}
-
-    print("Available Catalogs:")
-    print("=" * 80)
-    catalogs_url = f"{WORKSPACE_URL}/api/2.1/unity-catalog/catalogs"
-    response = requests.get(catalogs_url, headers=headers)
-    if response.status_code == 200:
-        catalogs = response.json().get("catalogs", [])
-        for cat in catalogs:
-            print(f"  - {cat['name']}")
-    else:
-        print(f"Error listing catalogs: {response.status_code}")
-        print(response.text[:300])
+    with client:
+        print("Available Catalogs:")
+        print("=" * 80)
+        try:
+            for name in list_catalogs(client):
+                print(f"  - {name}")
+        except DatabricksApiError as exc:
+            print(f"Error listing catalogs: {exc}")
 
-    print()
-    print(f"Schemas in {CATALOG} catalog:")
-    print("=" * 80)
-    schemas_url = f"{WORKSPACE_URL}/api/2.1/unity-catalog/schemas?catalog_name={CATALOG}"
-    response = requests.get(schemas_url, headers=headers)
-    if response.status_code == 200:
-        schemas = response.json().get("schemas", [])
-        if schemas:
-            for schema in schemas:
-                print(f"  - {schema['name']}")
-                tables_url = f"{WORKSPACE_URL}/api/2.1/unity-catalog/tables?catalog_name={CATALOG}&schema_name={schema['name']}"
-                tables_response = requests.get(tables_url, headers=headers)
-                if tables_response.status_code == 200:
-                    tables = tables_response.json().get("tables", [])
-                    if tables:
-                        for table in tables:
-                            print(f"      └─ {table['name']}")
-                    else:
-                        print(f"      └─ (no tables)")
-        else:
+        print()
+        print(f"Schemas in {args.catalog} catalog:")
+        print("=" * 80)
+        try:
+            schemas = list_schema_tables(client, args.catalog)
+        except DatabricksApiError as exc:
+            print(f"Error listing schemas: {exc}")
+            sys.exit(1)
+        if not schemas:
             print("  (no schemas found)")
-    else:
-        print(f"Error listing schemas: {response.status_code}")
-        print(response.text[:300])
+        for schema, tables in schemas.items():
+            print(f"  - {schema}")
+            for table in tables:
+                print(f"      └─ {table}")
+            if not tables:
+                print("      └─ (no tables)")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""Run a bundled trace query against local Parquet files with DuckDB.
+
+Usage: python scripts/query_local_traces.py <query> [--dir TELEMETRY_PARQUET_DIR]
+
+``<query>`` is a file path or a name in sql/mlflow_trace_tables/queries
+(e.g. ``per_invocation_llm_tokens_raw``, ``error_spans``). ``--list`` shows the
+bundled queries. Queries on the rollup tables (``per_invocation_llm_tokens``,
+``span_latency_percentiles_by_name``) need ``--database`` pointing at the DuckDB
+file that scripts/refresh_trace_rollups.py --local-dir maintains.
+"""
+
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from observability.local_queries import QUERIES_DIR, connect, resolve_query, translate_query
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("query", nargs="?", help="query name or .sql path")
+    parser.add_argument("--dir", default=os.environ.get("TELEMETRY_PARQUET_DIR", ""))
+    parser.add_argument("--database", default=":memory:", help="DuckDB file with rollup tables")
+    parser.add_argument("--list", action="store_true", help="list bundled queries")
+    parser.add_argument("--show-sql", action="store_true", help="print the translated SQL")
+    parser.add_argument("--csv", help="write the result to this CSV file instead of printing")
+    parser.add_argument("--max-rows", type=int, default=50, help="rows to print")
+    args = parser.parse_args()
+
+    if args.list:
+        for path in sorted(QUERIES_DIR.glob("*.sql")):
+            print(path.stem)
+        return 0
+    if not args.query:
+        parser.error("query is required (or --list)")
+    if not args.dir:
+        parser.error("set TELEMETRY_PARQUET_DIR or pass --dir")
+    try:
+        sql = translate_query(resolve_query(args.query).read_text(encoding="utf-8"))
+    except (FileNotFoundError, ValueError) as exc:
+        print(f"ERROR: {exc}", file=sys.stderr)
+        return 1
+    if args.show_sql:
+        print(sql, file=sys.stderr)
+    try:
+        relation = connect(args.dir, args.database).sql(sql)
+        if args.csv:
+            relation.write_csv(args.csv)
+        else:
+            relation.show(max_rows=args.max_rows)
+    except Exception as exc:  # ImportError or a duckdb error
+        print(f"ERROR: {exc}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,17 +1,27 @@
 #!/usr/bin/env python3
-"""
-Check access to the MLflow GenAI OTEL spans table in Unity Catalog.
+"""Fetch rows of the Unity Catalog trace tables to Parquet or JSONL.
+
+One-off pull with filters:
+
+    python scripts/query_traces.py -o spans.parquet --session-id <id> --since 2026-02-01
+    python scripts/query_traces.py --table logs -o logs.jsonl --invocation-id <id>
+
+Incremental pull from the last saved watermark (rerun to continue):
 
-Table resolution matches ``scripts/check_databricks_table.py``:
-``DATABRICKS_CATALOG``, ``DATABRICKS_SCHEMA``, ``DATABRICKS_OTEL_SPANS_TABLE``.
+    python scripts/query_traces.py --incremental --output-dir pulls/ --table spans
 
-Requires: uv sync (see pyproject.toml); run via uv run
+Uses ``DATABRICKS_HOST``, ``DATABRICKS_TOKEN`` (or the bearer token in
+``OTEL_EXPORTER_OTLP_HEADERS``), ``MLFLOW_TRACING_SQL_WAREHOUSE_ID``,
+``DATABRICKS_CATALOG`` (default: main) and ``DATABRICKS_SCHEMA`` (default:
+mlflow_traces). See ``observability/trace_fetch.py``.
 """
+
+import argparse
 import os
 import sys
+from datetime import datetime, timezone
 from pathlib import Path
 
-# Load .env from project root
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 try:
     from dotenv import load_dotenv
@@ -20,57 +30,99 @@ try:
 except ImportError:
     pass
 
-import requests
-
-CATALOG = os.getenv("DATABRICKS_CATALOG", "dev_ai")
-SCHEMA = os.getenv("DATABRICKS_SCHEMA", "mlflow_traces")
-TABLE = os.getenv(
-    "DATABRICKS_OTEL_SPANS_TABLE",
-    "mlflow_experiment_trace_otel_spans",
+from observability.trace_fetch import (
+    DEFAULT_ALLOWED_LATENESS_SECONDS,
+    PullState,
+    SqlStatementClient,
+    TraceFilter,
+    fetch_to_file,
+    incremental_pull,
 )
-WORKSPACE_URL = os.getenv(
-    "DATABRICKS_HOST", "https://adb-957977613266276.16.azuredatabricks.net"
-).rstrip("/")
-
-
-def main():
-    token = None
-    headers_str = os.getenv("OTEL_EXPORTER_OTLP_HEADERS", "")
-    for part in headers_str.split(","):
-        if "Authorization=Bearer" in part:
-            token = part.split("Bearer ")[1].strip()
-            break
-
-    if not token:
-        print("❌ No token found in OTEL_EXPORTER_OTLP_HEADERS")
-        sys.exit(1)
-
-    headers = {"Authorization": f"Bearer {token}", "Content-Type": "application/json"}
-    full_table = f"{CATALOG}.{SCHEMA}.{TABLE}"
-
-    print(f"Checking for traces table {full_table}...")
-    print("=" * 80)
-
-    table_url = f"{WORKSPACE_URL}/api/2.1/unity-catalog/tables/{full_table}"
-    response = requests.get(table_url, headers=headers)
-
-    print(f"Table access status: {response.status_code}")
-    if response.status_code == 200:
-        print("✅ Table accessible")
-        table_info = response.json()
-        print(f"   Table type: {table_info.get('table_type')}")
-        print(f"   Data source: {table_info.get('data_source_format')}")
-    else:
-        print(f"❌ Cannot access table: {response.text[:200]}")
-
-    print()
-    print("=" * 80)
-    print("To query traces, use Databricks SQL or Notebook:")
-    print(f"   SELECT * FROM {full_table}")
-    print("   ORDER BY start_time DESC LIMIT 10;")
-    print()
-    print("Or check the MLflow UI in your Databricks workspace.")
+
+
+def parse_time_ns(value: str) -> int:
+    """Nanoseconds since the epoch, or an ISO date/time (UTC unless it has an offset)."""
+    if value.isdigit():
+        return int(value)
+    parsed = datetime.fromisoformat(value)
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return int(parsed.timestamp()) * 1_000_000_000 + parsed.microsecond * 1000
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--table", choices=("spans", "logs"), default="spans")
+    parser.add_argument("--session-id")
+    parser.add_argument("--invocation-id")
+    parser.add_argument("--span-name", help="spans table only")
+    parser.add_argument("--since", type=parse_time_ns, help="exclusive; ISO time or ns")
+    parser.add_argument("--until", type=parse_time_ns, help="inclusive; ISO time or ns")
+    parser.add_argument("--limit", type=int)
+    parser.add_argument("--columns", help="comma-separated column list (default: all)")
+    parser.add_argument("-o", "--output", help=".parquet or .jsonl file")
+    parser.add_argument("--incremental", action="store_true")
+    parser.add_argument("--output-dir", default="trace_pulls", help="for --incremental")
+    parser.add_argument("--format", choices=("parquet", "jsonl"), default="parquet")
+    parser.add_argument("--state-file", default=None, help="default: <output-dir>/state.json")
+    parser.add_argument(
+        "--allowed-lateness-seconds",
+        type=float,
+        default=float(
+            os.getenv("TRACE_ALLOWED_LATENESS_SECONDS", str(DEFAULT_ALLOWED_LATENESS_SECONDS))
+        ),
+        help="for --incremental: stop this far behind the newest row",
+    )
+    parser.add_argument("--catalog", default=os.getenv("DATABRICKS_CATALOG", "main"))
+    parser.add_argument("--schema", default=os.getenv("DATABRICKS_SCHEMA", "mlflow_traces"))
+    args = parser.parse_args()
+
+    if not args.incremental and not args.output:
+        parser.error("pass -o/--output, or --incremental")
+    try:
+        flt = TraceFilter(
+            table=args.table,
+            session_id=args.session_id,
+            invocation_id=args.invocation_id,
+            span_name=args.span_name,
+            since_ns=args.since,
+            until_ns=args.until,
+            limit=None if args.incremental else args.limit,
+        )
+        client = SqlStatementClient.from_env()
+    except ValueError as exc:
+        print(f"ERROR: {exc}", file=sys.stderr)
+        return 1
+    columns = [c.strip() for c in args.columns.split(",")] if args.columns else None
+    try:
+        if args.incremental:
+            state = PullState(args.state_file or os.path.join(args.output_dir, "state.json"))
+            result = incremental_pull(
+                client,
+                flt,
+                state,
+                args.output_dir,
+                catalog=args.catalog,
+                schema=args.schema,
+                fmt=args.format,
+                columns=columns,
+                allowed_lateness_seconds=args.allowed_lateness_seconds,
+            )
+            if result is None:
+                print(f"{args.table}: up to date")
+                return 0
+        else:
+            result = fetch_to_file(
+                client, flt, args.output, catalog=args.catalog, schema=args.schema, columns=columns
+            )
+    except Exception as exc:
+        print(f"ERROR: {exc}", file=sys.stderr)
+        return 1
+    finally:
+        client.close()
+    print(f"{result.rows} rows in {result.batches} batches -> {result.path}")
+    return 0
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""Refresh the trace rollup tables from the ingestion watermark (MERGE, idempotent).
+
+On a Databricks SQL warehouse (same environment as scripts/query_traces.py):
+
+    python scripts/refresh_trace_rollups.py --catalog main --schema mlflow_traces
+
+Locally with DuckDB over TELEMETRY_PARQUET_DIR files; the rollup tables persist
+in the --database file, which the rollup queries then read:
+
+    python scripts/refresh_trace_rollups.py --local-dir traces/ --database rollups.duckdb
+    python scripts/query_local_traces.py per_invocation_llm_tokens \\
+        --dir traces/ --database rollups.duckdb
+
+See ``observability/rollups.py`` and sql/mlflow_trace_tables/rollups/README.md.
+"""
+
+import argparse
+import os
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+try:
+    from dotenv import load_dotenv
+
+    load_dotenv(Path(__file__).resolve().parent.parent / ".env")
+except ImportError:
+    pass
+
+from observability.rollups import ROLLUPS, DuckDBRunner, StatementRunner, refresh_rollups
+from observability.trace_fetch import DEFAULT_ALLOWED_LATENESS_SECONDS
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--rollup", action="append", choices=tuple(ROLLUPS), help="repeatable (default: all)"
+    )
+    parser.add_argument("--local-dir", help="refresh locally with DuckDB over this Parquet dir")
+    parser.add_argument("--database", default="rollups.duckdb", help="DuckDB file (--local-dir)")
+    parser.add_argument("--catalog", default=os.getenv("DATABRICKS_CATALOG", "main"))
+    parser.add_argument("--schema", default=os.getenv("DATABRICKS_SCHEMA", "mlflow_traces"))
+    parser.add_argument(
+        "--allowed-lateness-seconds",
+        type=float,
+        default=float(
+            os.getenv("TRACE_ALLOWED_LATENESS_SECONDS", str(DEFAULT_ALLOWED_LATENESS_SECONDS))
+        ),
+        help="stop this far behind the newest row, which may still be followed by late ones",
+    )
+    args = parser.parse_args()
+
+    rollups = tuple(args.rollup) if args.rollup else None
+    lateness = args.allowed_lateness_seconds
+    try:
+        if args.local_dir:
+            from observability.local_queries import connect
+
+            con = connect(args.local_dir, args.database)
+            try:
+                results = refresh_rollups(
+                    DuckDBRunner(con), rollups, allowed_lateness_seconds=lateness
+                )
+            finally:
+                con.close()
+        else:
+            from observability.trace_fetch import SqlStatementClient
+
+            client = SqlStatementClient.from_env()
+            try:
+                runner = StatementRunner(client, args.catalog, args.schema)
+                results = refresh_rollups(runner, rollups, allowed_lateness_seconds=lateness)
+            finally:
+                client.close()
+    except Exception as exc:  # missing config, ImportError, or a SQL error
+        print(f"ERROR: {exc}", file=sys.stderr)
+        return 1
+    for result in results:
+        if not result.refreshed:
+            print(f"{result.rollup}: up to date")
+            continue
+        note = " (resumed)" if result.resumed else ""
+        print(f"{result.rollup}: folded in ({result.since_ns or 0}, {result.until_ns}]{note}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
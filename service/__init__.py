@@ -0,0 +1,11 @@
+"""Long-running HTTP service mode: warm agents, pooled model clients, graceful drain."""
+
+from service.app import RunRequest, build_service
+from service.clients import close_pooled_model_clients, configure_pooled_model_clients
+
+__all__ = [
+    "RunRequest",
+    "build_service",
+    "close_pooled_model_clients",
+    "configure_pooled_model_clients",
+]
@@ -0,0 +1,56 @@
+"""Run: ``python -m service --port 8080`` from the repo root.
+
+Imports ``agent`` once (``.env``, optional Databricks init, OTLP, agent graph)
+and serves ``POST /run`` and ``GET /healthz`` until SIGINT/SIGTERM. It then
+drains (503 on both, in-flight turns finish) before closing the listener.
+"""
+
+import argparse
+import logging
+import os
+import sys
+
+import uvicorn
+
+from batch.runner import share_corpus
+from service.app import DrainingServer, build_service
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Serve the workflow over HTTP")
+    parser.add_argument("--host", default=os.environ.get("SERVICE_HOST", "127.0.0.1"))
+    parser.add_argument(
+        "--port", type=int, default=int(os.environ.get("SERVICE_PORT", "8080"))
+    )
+    parser.add_argument(
+        "--shared-corpus",
+        action="store_true",
+        help="Read documents once at startup and reuse them for every session.",
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s %(name)s: %(message)s")
+
+    import agent
+
+    if args.shared_corpus:
+        n_docs = share_corpus(agent.root_agent)
+        print(f"✓ Shared corpus: {n_docs} documents read once", file=sys.stderr)
+
+    api = build_service(agent.app)
+    config = uvicorn.Config(
+        api,
+        host=args.host,
+        port=args.port,
+        timeout_keep_alive=int(os.environ.get("SERVICE_KEEPALIVE_SECONDS", "75")),
+        # DrainingServer has waited for in-flight turns (SERVICE_DRAIN_SECONDS)
+        # before uvicorn's shutdown starts; this only bounds closing connections.
+        timeout_graceful_shutdown=1,
+        log_level="info",
+    )
+    DrainingServer(config, api).run()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,180 @@
+"""HTTP service wrapping one warm ADK ``Runner`` (health, run, graceful drain)."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import socket
+from contextlib import asynccontextmanager
+from dataclasses import asdict
+from types import FrameType
+from typing import AsyncIterator
+
+import uvicorn
+from fastapi import FastAPI, HTTPException
+from fastapi.responses import JSONResponse
+from google.adk.apps import App
+from google.adk.runners import InMemoryRunner
+from pydantic import BaseModel
+
+from batch.runner import BatchQuestion, run_question
+from service.clients import close_pooled_model_clients, configure_pooled_model_clients
+
+logger = logging.getLogger(__name__)
+
+SERVICE_USER_ID = "service"
+
+
+class RunRequest(BaseModel):
+    question: str
+    session_id: str | None = None
+    user_id: str = SERVICE_USER_ID
+    request_id: str | None = None
+
+
+class _InFlight:
+    """Counts running requests so shutdown can wait for them."""
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.draining = False
+        self._idle = asyncio.Event()
+        self._idle.set()
+
+    def enter(self) -> None:
+        self.count += 1
+        self._idle.clear()
+
+    def exit(self) -> None:
+        self.count -= 1
+        if self.count == 0:
+            self._idle.set()
+
+    async def wait_idle(self, timeout: float) -> bool:
+        try:
+            await asyncio.wait_for(self._idle.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+
+def build_service(
+    app: App,
+    *,
+    max_concurrency: int | None = None,
+    drain_seconds: float | None = None,
+    pool_model_clients: bool = True,
+) -> FastAPI:
+    """Return a FastAPI app serving ``app`` from one runner built at startup.
+
+    ``max_concurrency`` (``SERVICE_MAX_CONCURRENCY``, default 32) bounds
+    concurrent workflow turns; extra requests wait. Draining stops admitting
+    work (503) and waits up to ``drain_seconds`` (``SERVICE_DRAIN_SECONDS``,
+    default 30) for in-flight turns. Served by ``DrainingServer`` it starts on
+    SIGINT/SIGTERM while the listener is still open; otherwise lifespan
+    shutdown does it. Then the runner and pooled model clients are closed.
+    """
+    max_concurrency = max_concurrency or int(
+        os.environ.get("SERVICE_MAX_CONCURRENCY", "32")
+    )
+    drain_seconds = (
+        drain_seconds
+        if drain_seconds is not None
+        else float(os.environ.get("SERVICE_DRAIN_SECONDS", "30"))
+    )
+    runner = InMemoryRunner(app=app)
+    in_flight = _InFlight()
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    @asynccontextmanager
+    async def lifespan(_: FastAPI) -> AsyncIterator[None]:
+        if pool_model_clients:
+            configure_pooled_model_clients()
+        yield
+        if not in_flight.draining:  # not drained by DrainingServer
+            in_flight.draining = True
+            await _drain(in_flight, drain_seconds)
+        await runner.close()
+        if pool_model_clients:
+            await close_pooled_model_clients()
+
+    api = FastAPI(title=app.name, lifespan=lifespan)
+
+    @api.get("/healthz")
+    async def healthz() -> JSONResponse:
+        body = {
+            "status": "draining" if in_flight.draining else "ok",
+            "app": app.name,
+            "in_flight": in_flight.count,
+            "max_concurrency": max_concurrency,
+        }
+        return JSONResponse(body, status_code=503 if in_flight.draining else 200)
+
+    @api.post("/run")
+    async def run(request: RunRequest) -> dict[str, object]:
+        if in_flight.draining:
+            raise HTTPException(status_code=503, detail="service is draining")
+        in_flight.enter()
+        try:
+            async with semaphore:
+                result = await run_question(
+                    runner,
+                    BatchQuestion(id=request.request_id or "", question=request.question),
+                    user_id=request.user_id,
+                    session_id=request.session_id,
+                )
+        finally:
+            in_flight.exit()
+        return asdict(result)
+
+    api.state.in_flight = in_flight
+    api.state.drain_seconds = drain_seconds
+    api.state.runner = runner
+    return api
+
+
+async def _drain(in_flight: _InFlight, drain_seconds: float) -> None:
+    if not await in_flight.wait_idle(drain_seconds):
+        logger.warning(
+            "Service drain timed out after %.1fs with %d request(s) in flight",
+            drain_seconds,
+            in_flight.count,
+        )
+
+
+class DrainingServer(uvicorn.Server):
+    """``uvicorn.Server`` that drains a ``build_service`` app before it stops listening.
+
+    Plain uvicorn closes the listener on SIGINT/SIGTERM and only then runs
+    lifespan shutdown, so clients and load balancers never see the 503s. Here
+    the first signal marks the app as draining and waits for in-flight turns;
+    uvicorn's own shutdown starts after that. A second signal stops at once.
+    """
+
+    def __init__(self, config: uvicorn.Config, api: FastAPI) -> None:
+        super().__init__(config)
+        self.in_flight: _InFlight = api.state.in_flight
+        self.drain_seconds: float = api.state.drain_seconds
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._drain_task: asyncio.Task[None] | None = None
+
+    async def serve(self, sockets: list[socket.socket] | None = None) -> None:
+        self._loop = asyncio.get_running_loop()
+        await super().serve(sockets)
+
+    def handle_exit(self, sig: int, frame: FrameType | None) -> None:
+        if self.in_flight.draining or self._loop is None:
+            super().handle_exit(sig, frame)
+            return
+        self.in_flight.draining = True
+        logger.info("Draining: waiting up to %.1fs for in-flight requests", self.drain_seconds)
+        self._loop.call_soon_threadsafe(self._start_drain, sig, frame)
+
+    def _start_drain(self, sig: int, frame: FrameType | None) -> None:
+        self._drain_task = asyncio.ensure_future(self._drain_then_exit(sig, frame))
+
+    async def _drain_then_exit(self, sig: int, frame: FrameType | None) -> None:
+        await _drain(self.in_flight, self.drain_seconds)
+        if not self.should_exit:
+            super().handle_exit(sig, frame)
@@ -0,0 +1,72 @@
+"""Shared keep-alive HTTP pool for LiteLLM / OpenAI-compatible model endpoints."""
+
+from __future__ import annotations
+
+import logging
+import os
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+_pooled_client: httpx.AsyncClient | None = None
+
+
+def configure_pooled_model_clients(
+    *,
+    max_connections: int | None = None,
+    max_keepalive_connections: int | None = None,
+    keepalive_expiry: float | None = None,
+    timeout: float | None = None,
+) -> httpx.AsyncClient:
+    """Install one pooled ``httpx.AsyncClient`` as ``litellm.aclient_session``.
+
+    LiteLLM otherwise opens a client per call path; a long-running service
+    keeps TCP/TLS connections to the provider warm across sessions. Gemini
+    models keep their own ``google.genai`` client on the (warm) agent.
+    Defaults come from ``MODEL_HTTP_MAX_CONNECTIONS`` (100),
+    ``MODEL_HTTP_MAX_KEEPALIVE`` (20), ``MODEL_HTTP_KEEPALIVE_EXPIRY`` (60s)
+    and ``MODEL_HTTP_TIMEOUT`` (600s).
+    """
+    global _pooled_client
+
+    if _pooled_client is not None:
+        return _pooled_client
+
+    limits = httpx.Limits(
+        max_connections=max_connections
+        or int(os.environ.get("MODEL_HTTP_MAX_CONNECTIONS", "100")),
+        max_keepalive_connections=max_keepalive_connections
+        or int(os.environ.get("MODEL_HTTP_MAX_KEEPALIVE", "20")),
+        keepalive_expiry=keepalive_expiry
+        or float(os.environ.get("MODEL_HTTP_KEEPALIVE_EXPIRY", "60")),
+    )
+    client = httpx.AsyncClient(
+        limits=limits,
+        timeout=timeout or float(os.environ.get("MODEL_HTTP_TIMEOUT", "600")),
+    )
+    try:
+        import litellm
+
+        litellm.aclient_session = client
+    except ImportError:
+        logger.warning("litellm not installed; pooled model client not installed")
+    _pooled_client = client
+    return client
+
+
+async def close_pooled_model_clients() -> None:
+    """Close the pooled client (if any) and detach it from LiteLLM."""
+    global _pooled_client
+
+    client, _pooled_client = _pooled_client, None
+    if client is None:
+        return
+    try:
+        import litellm
+
+        if litellm.aclient_session is client:
+            litellm.aclient_session = None
+    except ImportError:
+        pass
+    await client.aclose()
@@ -0,0 +1,31 @@
+-- Per-agent step latency and LLM token usage by day, from pre-aggregated OTLP metrics.
+-- Requires OTEL_METRICS_EXPORTER=otlp (see observability/metrics.py). Histograms are
+-- exported with delta temporality, so counts and sums of rows can be added up.
+-- Cheaper than span_latency_percentiles_by_name.sql: one row per agent per export interval.
+
+WITH points AS (
+  SELECT
+    name,
+    DATE_TRUNC('DAY', TIMESTAMP_MILLIS(CAST(histogram.time_unix_nano / 1000000 AS BIGINT))) AS day,
+    COALESCE(histogram.attributes['gen_ai.agent.name'], '') AS agent_name,
+    COALESCE(histogram.attributes['gen_ai.token.type'], '') AS token_type,
+    histogram.count AS n,
+    histogram.sum AS total,
+    histogram.max AS max_value
+  FROM `dev_ai`.`agent_traces`.`mlflow_experiment_trace_otel_metrics`
+  WHERE histogram IS NOT NULL
+    AND name IN ('agent.step.duration', 'gen_ai.client.token.usage')
+)
+
+SELECT
+  day,
+  agent_name,
+  name AS metric,
+  token_type,
+  SUM(n) AS samples,
+  ROUND(SUM(total) / NULLIF(SUM(n), 0), 3) AS avg_value,
+  ROUND(MAX(max_value), 3) AS max_value,
+  SUM(total) AS total_value
+FROM points
+GROUP BY day, agent_name, name, token_type
+ORDER BY day DESC, agent_name, metric, token_type;
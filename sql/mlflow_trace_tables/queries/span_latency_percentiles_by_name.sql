@@ -1,26 +1,42 @@
--- Latency distribution by span name and day (milliseconds).
--- Databricks / Spark: approx_percentile; tune accuracy if needed.
+-- Latency distribution by span name and day (milliseconds), from the rollup tables.
+-- Refresh the rollups first: scripts/refresh_trace_rollups.py (see ../rollups/README.md).
+-- p50/p95 come from log-scale buckets (growth 1.05), so they are within ~2.5% of exact;
+-- span_latency_percentiles_by_name_raw.sql computes them from the raw spans table.
 
-WITH span_durations AS (
+WITH cumulative AS (
   SELECT
-    name AS span_name,
-    DATE_TRUNC('DAY', TIMESTAMP_MILLIS(CAST(start_time_unix_nano / 1000000 AS BIGINT))) AS day,
-    (end_time_unix_nano - start_time_unix_nano) / 1000000.0 AS duration_ms
-  FROM `dev_ai`.`agent_traces`.`mlflow_experiment_trace_otel_spans`
-  WHERE end_time_unix_nano >= start_time_unix_nano
-    AND end_time_unix_nano IS NOT NULL
-    AND start_time_unix_nano IS NOT NULL
+    day,
+    span_name,
+    bucket,
+    SUM(span_count) OVER (
+      PARTITION BY day, span_name ORDER BY bucket ROWS BETWEEN UNBOUNDED PRECEDING AND CURRENT ROW
+    ) AS cumulative_count
+  FROM `dev_ai`.`agent_traces`.`mlflow_experiment_trace_rollup_span_latency_buckets`
+),
+
+percentile_buckets AS (
+  SELECT
+    c.day,
+    c.span_name,
+    MIN(CASE WHEN c.cumulative_count >= 0.5 * d.span_count THEN c.bucket END) AS p50_bucket,
+    MIN(CASE WHEN c.cumulative_count >= 0.95 * d.span_count THEN c.bucket END) AS p95_bucket
+  FROM cumulative c
+  JOIN `dev_ai`.`agent_traces`.`mlflow_experiment_trace_rollup_span_latency_daily` d
+    ON c.day = d.day AND c.span_name IS NOT DISTINCT FROM d.span_name
+  GROUP BY c.day, c.span_name
 )
 
 SELECT
-  day,
-  span_name,
-  COUNT(*) AS span_count,
-  ROUND(AVG(duration_ms), 3) AS avg_ms,
-  ROUND(MIN(duration_ms), 3) AS min_ms,
-  ROUND(MAX(duration_ms), 3) AS max_ms,
-  ROUND(approx_percentile(duration_ms, 0.5), 3) AS p50_ms,
-  ROUND(approx_percentile(duration_ms, 0.95), 3) AS p95_ms
-FROM span_durations
-GROUP BY day, span_name
-ORDER BY day DESC, span_count DESC;
+  d.day,
+  d.span_name,
+  d.span_count,
+  ROUND(d.sum_ms / d.span_count, 3) AS avg_ms,
+  ROUND(d.min_ms, 3) AS min_ms,
+  ROUND(d.max_ms, 3) AS max_ms,
+  -- Bucket midpoint in log space, clamped to the observed range.
+  ROUND(LEAST(GREATEST(EXP((p.p50_bucket + 0.5) * LN(1.05)), d.min_ms), d.max_ms), 3) AS p50_ms,
+  ROUND(LEAST(GREATEST(EXP((p.p95_bucket + 0.5) * LN(1.05)), d.min_ms), d.max_ms), 3) AS p95_ms
+FROM `dev_ai`.`agent_traces`.`mlflow_experiment_trace_rollup_span_latency_daily` d
+JOIN percentile_buckets p
+  ON d.day = p.day AND d.span_name IS NOT DISTINCT FROM p.span_name
+ORDER BY d.day DESC, d.span_count DESC;
@@ -1,5 +1,6 @@
 -- Latest timestamps in OTEL span and log tables (ingestion freshness).
 -- Pair with trace_ingestion_volume_freshness.sql.
+-- The *_unix_nano columns are the exact watermarks used by scripts/query_traces.py --incremental.
 
 SELECT
   TIMESTAMP_MILLIS(
@@ -7,4 +8,6 @@ SELECT
   ) AS latest_span_start_time,
   TIMESTAMP_MILLIS(
     CAST((SELECT MAX(time_unix_nano) FROM `dev_ai`.`agent_traces`.`mlflow_experiment_trace_otel_logs`) / 1000000 AS BIGINT)
-  ) AS latest_log_time;
+  ) AS latest_log_time,
+  (SELECT MAX(start_time_unix_nano) FROM `dev_ai`.`agent_traces`.`mlflow_experiment_trace_otel_spans`) AS latest_span_start_unix_nano,
+  (SELECT MAX(time_unix_nano) FROM `dev_ai`.`agent_traces`.`mlflow_experiment_trace_otel_logs`) AS latest_log_unix_nano;
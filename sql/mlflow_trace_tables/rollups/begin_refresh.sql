@@ -0,0 +1,9 @@
+-- Record the window end of a refresh before any MERGE runs, so an interrupted
+-- refresh is re-run over the same window.
+
+MERGE INTO `dev_ai`.`agent_traces`.`mlflow_experiment_trace_rollup_watermarks` t
+USING (SELECT :rollup AS rollup) s
+ON t.rollup = s.rollup
+WHEN MATCHED THEN UPDATE SET pending_until_unix_nano = :until_ns
+WHEN NOT MATCHED THEN INSERT (rollup, watermark_unix_nano, pending_until_unix_nano)
+VALUES (s.rollup, NULL, :until_ns);
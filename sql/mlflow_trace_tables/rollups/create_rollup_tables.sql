@@ -0,0 +1,59 @@
+-- Rollup tables maintained by observability/rollups.py (scripts/refresh_trace_rollups.py).
+-- Create once in the trace schema; replace `dev_ai`.`agent_traces` with your catalog/schema.
+-- refreshed_through_nano makes each MERGE idempotent: a row already merged for a
+-- window end is skipped if the same refresh is re-run.
+
+CREATE TABLE IF NOT EXISTS `dev_ai`.`agent_traces`.`mlflow_experiment_trace_rollup_invocation_tokens` (
+  session_id STRING,
+  invocation_id STRING,
+  agent_name STRING,
+  llm_step_count BIGINT,
+  sum_input_tokens BIGINT,
+  sum_output_tokens BIGINT,
+  sum_reasoning_tokens BIGINT,
+  first_log_nano BIGINT,
+  last_log_nano BIGINT,
+  sample_trace_id STRING,
+  refreshed_through_nano BIGINT
+);
+
+-- Per span name and UTC day: exact count / sum / min / max.
+CREATE TABLE IF NOT EXISTS `dev_ai`.`agent_traces`.`mlflow_experiment_trace_rollup_span_latency_daily` (
+  day DATE,
+  span_name STRING,
+  span_count BIGINT,
+  sum_ms DOUBLE,
+  min_ms DOUBLE,
+  max_ms DOUBLE,
+  refreshed_through_nano BIGINT
+);
+
+-- Latency sketch: span counts per log-scale bucket, bucket = FLOOR(LN(duration_ms) / LN(1.05)).
+-- Buckets add up across refreshes; percentiles read from them are within ~2.5%.
+CREATE TABLE IF NOT EXISTS `dev_ai`.`agent_traces`.`mlflow_experiment_trace_rollup_span_latency_buckets` (
+  day DATE,
+  span_name STRING,
+  bucket INT,
+  span_count BIGINT,
+  refreshed_through_nano BIGINT
+);
+
+-- Refresh bookkeeping: last completed window end, and the end of a refresh in progress.
+CREATE TABLE IF NOT EXISTS `dev_ai`.`agent_traces`.`mlflow_experiment_trace_rollup_watermarks` (
+  rollup STRING,
+  watermark_unix_nano BIGINT,
+  pending_until_unix_nano BIGINT
+);
+
+-- MLflow trace metadata and tag log events with the JSON body parsed once: one row per trace
+-- for genai.trace.metadata (tag_key NULL) and per trace and tag key for genai.trace.tag,
+-- holding the latest event. mlflow_experiment_trace_rollup_unified.sql reads it.
+CREATE TABLE IF NOT EXISTS `dev_ai`.`agent_traces`.`mlflow_experiment_trace_rollup_trace_events` (
+  trace_id STRING,
+  event_name STRING,
+  tag_key STRING,
+  tag_value STRING,
+  client_request_id STRING,
+  trace_metadata MAP<STRING, STRING>,
+  time_unix_nano BIGINT
+);
@@ -0,0 +1,5 @@
+-- All MERGEs of the refresh are done: the pending window end becomes the watermark.
+
+UPDATE `dev_ai`.`agent_traces`.`mlflow_experiment_trace_rollup_watermarks`
+SET watermark_unix_nano = pending_until_unix_nano, pending_until_unix_nano = NULL
+WHERE rollup = :rollup AND pending_until_unix_nano IS NOT NULL;
@@ -0,0 +1,54 @@
+-- Fold agent.llm_step logs with :since_ns < time_unix_nano <= :until_ns into per-invocation totals.
+
+MERGE INTO `dev_ai`.`agent_traces`.`mlflow_experiment_trace_rollup_invocation_tokens` t
+USING (
+  SELECT
+    session_id,
+    invocation_id,
+    agent_name,
+    COUNT(*) AS llm_step_count,
+    SUM(COALESCE(input_tokens, 0)) AS sum_input_tokens,
+    SUM(COALESCE(output_tokens, 0)) AS sum_output_tokens,
+    SUM(COALESCE(reasoning_tokens, 0)) AS sum_reasoning_tokens,
+    MIN(time_unix_nano) AS first_log_nano,
+    MAX(time_unix_nano) AS last_log_nano,
+    MAX(trace_id) AS sample_trace_id
+  FROM (
+    SELECT
+      attributes['session_id'] AS session_id,
+      attributes['invocation_id'] AS invocation_id,
+      attributes['agent_name'] AS agent_name,
+      TRY_CAST(NULLIF(TRIM(attributes['input_tokens']), '') AS BIGINT) AS input_tokens,
+      TRY_CAST(NULLIF(TRIM(attributes['output_tokens']), '') AS BIGINT) AS output_tokens,
+      TRY_CAST(NULLIF(TRIM(attributes['reasoning_token_count']), '') AS BIGINT) AS reasoning_tokens,
+      time_unix_nano,
+      trace_id
+    FROM `dev_ai`.`agent_traces`.`mlflow_experiment_trace_otel_logs`
+    WHERE attributes['event_type'] = 'agent.llm_step'
+      AND attributes['session_id'] IS NOT NULL
+      AND TRIM(attributes['session_id']) != ''
+      AND time_unix_nano > :since_ns
+      AND time_unix_nano <= :until_ns
+  ) log_rows
+  GROUP BY session_id, invocation_id, agent_name
+) s
+ON t.session_id = s.session_id
+  AND t.invocation_id IS NOT DISTINCT FROM s.invocation_id
+  AND t.agent_name IS NOT DISTINCT FROM s.agent_name
+WHEN MATCHED AND t.refreshed_through_nano < :until_ns THEN UPDATE SET
+  llm_step_count = t.llm_step_count + s.llm_step_count,
+  sum_input_tokens = t.sum_input_tokens + s.sum_input_tokens,
+  sum_output_tokens = t.sum_output_tokens + s.sum_output_tokens,
+  sum_reasoning_tokens = t.sum_reasoning_tokens + s.sum_reasoning_tokens,
+  first_log_nano = LEAST(t.first_log_nano, s.first_log_nano),
+  last_log_nano = GREATEST(t.last_log_nano, s.last_log_nano),
+  sample_trace_id = GREATEST(t.sample_trace_id, s.sample_trace_id),
+  refreshed_through_nano = :until_ns
+WHEN NOT MATCHED THEN INSERT (
+  session_id, invocation_id, agent_name, llm_step_count, sum_input_tokens, sum_output_tokens,
+  sum_reasoning_tokens, first_log_nano, last_log_nano, sample_trace_id, refreshed_through_nano
+) VALUES (
+  s.session_id, s.invocation_id, s.agent_name, s.llm_step_count, s.sum_input_tokens,
+  s.sum_output_tokens, s.sum_reasoning_tokens, s.first_log_nano, s.last_log_nano,
+  s.sample_trace_id, :until_ns
+);
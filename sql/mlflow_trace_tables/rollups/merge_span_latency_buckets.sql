@@ -0,0 +1,22 @@
+-- Add spans with :since_ns < start_time_unix_nano <= :until_ns to the log-scale latency buckets
+-- (growth 1.05; durations under 1 microsecond share the lowest bucket).
+
+MERGE INTO `dev_ai`.`agent_traces`.`mlflow_experiment_trace_rollup_span_latency_buckets` t
+USING (
+  SELECT
+    CAST(DATE_TRUNC('DAY', TIMESTAMP_MILLIS(CAST(start_time_unix_nano / 1000000 AS BIGINT))) AS DATE) AS day,
+    name AS span_name,
+    CAST(FLOOR(LN(GREATEST((end_time_unix_nano - start_time_unix_nano) / 1000000.0, 0.001)) / LN(1.05)) AS INT) AS bucket,
+    COUNT(*) AS span_count
+  FROM `dev_ai`.`agent_traces`.`mlflow_experiment_trace_otel_spans`
+  WHERE end_time_unix_nano >= start_time_unix_nano
+    AND start_time_unix_nano > :since_ns
+    AND start_time_unix_nano <= :until_ns
+  GROUP BY 1, 2, 3
+) s
+ON t.day = s.day AND t.span_name IS NOT DISTINCT FROM s.span_name AND t.bucket = s.bucket
+WHEN MATCHED AND t.refreshed_through_nano < :until_ns THEN UPDATE SET
+  span_count = t.span_count + s.span_count,
+  refreshed_through_nano = :until_ns
+WHEN NOT MATCHED THEN INSERT (day, span_name, bucket, span_count, refreshed_through_nano)
+VALUES (s.day, s.span_name, s.bucket, s.span_count, :until_ns);
@@ -0,0 +1,26 @@
+-- Fold spans with :since_ns < start_time_unix_nano <= :until_ns into per-name/day totals.
+
+MERGE INTO `dev_ai`.`agent_traces`.`mlflow_experiment_trace_rollup_span_latency_daily` t
+USING (
+  SELECT
+    CAST(DATE_TRUNC('DAY', TIMESTAMP_MILLIS(CAST(start_time_unix_nano / 1000000 AS BIGINT))) AS DATE) AS day,
+    name AS span_name,
+    COUNT(*) AS span_count,
+    SUM((end_time_unix_nano - start_time_unix_nano) / 1000000.0) AS sum_ms,
+    MIN((end_time_unix_nano - start_time_unix_nano) / 1000000.0) AS min_ms,
+    MAX((end_time_unix_nano - start_time_unix_nano) / 1000000.0) AS max_ms
+  FROM `dev_ai`.`agent_traces`.`mlflow_experiment_trace_otel_spans`
+  WHERE end_time_unix_nano >= start_time_unix_nano
+    AND start_time_unix_nano > :since_ns
+    AND start_time_unix_nano <= :until_ns
+  GROUP BY 1, 2
+) s
+ON t.day = s.day AND t.span_name IS NOT DISTINCT FROM s.span_name
+WHEN MATCHED AND t.refreshed_through_nano < :until_ns THEN UPDATE SET
+  span_count = t.span_count + s.span_count,
+  sum_ms = t.sum_ms + s.sum_ms,
+  min_ms = LEAST(t.min_ms, s.min_ms),
+  max_ms = GREATEST(t.max_ms, s.max_ms),
+  refreshed_through_nano = :until_ns
+WHEN NOT MATCHED THEN INSERT (day, span_name, span_count, sum_ms, min_ms, max_ms, refreshed_through_nano)
+VALUES (s.day, s.span_name, s.span_count, s.sum_ms, s.min_ms, s.max_ms, :until_ns);
@@ -0,0 +1,47 @@
+-- Parse genai.trace.metadata / genai.trace.tag logs with :since_ns < time_unix_nano <= :until_ns
+-- once and keep the latest event per trace (metadata) or per trace and tag key (tags).
+-- Latest-wins is idempotent, so no refreshed_through_nano guard is needed.
+
+MERGE INTO `dev_ai`.`agent_traces`.`mlflow_experiment_trace_rollup_trace_events` t
+USING (
+  SELECT
+    trace_id,
+    event_name,
+    tag_key,
+    MAX_BY(tag_value, time_unix_nano) AS tag_value,
+    MAX_BY(client_request_id, time_unix_nano) AS client_request_id,
+    FROM_JSON(MAX_BY(trace_metadata_json, time_unix_nano), 'MAP<STRING, STRING>') AS trace_metadata,
+    MAX(time_unix_nano) AS time_unix_nano
+  FROM (
+    SELECT
+      trace_id,
+      event_name,
+      time_unix_nano,
+      CASE WHEN event_name = 'genai.trace.tag' THEN get_json_object(body, '$.key') END AS tag_key,
+      CASE WHEN event_name = 'genai.trace.tag' THEN get_json_object(body, '$.value') END AS tag_value,
+      CASE
+        WHEN event_name = 'genai.trace.metadata' THEN get_json_object(body, '$.client_request_id')
+      END AS client_request_id,
+      CASE
+        WHEN event_name = 'genai.trace.metadata' THEN get_json_object(body, '$.trace_metadata')
+      END AS trace_metadata_json
+    FROM `dev_ai`.`agent_traces`.`mlflow_experiment_trace_otel_logs`
+    WHERE event_name IN ('genai.trace.metadata', 'genai.trace.tag')
+      AND time_unix_nano > :since_ns
+      AND time_unix_nano <= :until_ns
+  ) events
+  WHERE event_name = 'genai.trace.metadata' OR tag_key IS NOT NULL
+  GROUP BY trace_id, event_name, tag_key
+) s
+ON t.trace_id = s.trace_id AND t.event_name = s.event_name AND t.tag_key IS NOT DISTINCT FROM s.tag_key
+WHEN MATCHED AND s.time_unix_nano >= t.time_unix_nano THEN UPDATE SET
+  tag_value = s.tag_value,
+  client_request_id = s.client_request_id,
+  trace_metadata = s.trace_metadata,
+  time_unix_nano = s.time_unix_nano
+WHEN NOT MATCHED THEN INSERT (
+  trace_id, event_name, tag_key, tag_value, client_request_id, trace_metadata, time_unix_nano
+) VALUES (
+  s.trace_id, s.event_name, s.tag_key, s.tag_value, s.client_request_id, s.trace_metadata,
+  s.time_unix_nano
+);
@@ -0,0 +1,5 @@
+-- Last completed window end and the end of an unfinished refresh for one rollup (no row: never run).
+
+SELECT watermark_unix_nano, pending_until_unix_nano
+FROM `dev_ai`.`agent_traces`.`mlflow_experiment_trace_rollup_watermarks`
+WHERE rollup = :rollup;
@@ -0,0 +1 @@
+"""Component benchmarks (not collected by pytest; run ``python -m tests.benchmarks``)."""
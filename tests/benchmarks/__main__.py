@@ -0,0 +1,63 @@
+"""Run: ``python -m tests.benchmarks -o bench.json [--baseline old.json]`` from the repo root.
+
+Exits 1 when ``--baseline`` is given and any benchmark's median time regressed
+by more than ``--tolerance``.
+"""
+
+import argparse
+import json
+import sys
+import tempfile
+
+from tests.benchmarks.components import compare_results, run_all
+from tests.benchmarks.corpus import CorpusSpec
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Component benchmarks")
+    parser.add_argument("-o", "--output", default="benchmark_results.json")
+    parser.add_argument(
+        "--scale",
+        type=float,
+        default=1.0,
+        help="Corpus size factor (1.0 = 1000 small .md, 4x8MB logs, 2x300-page PDFs).",
+    )
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--baseline", help="Earlier results JSON to compare against.")
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    parser.add_argument("--workdir", help="Keep the generated corpus here (default: temp dir).")
+    args = parser.parse_args()
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as handle:
+            baseline = json.load(handle)
+
+    spec = CorpusSpec().scaled(args.scale)
+    if args.workdir:
+        results = run_all(args.workdir, spec, repeat=args.repeat)
+    else:
+        with tempfile.TemporaryDirectory(prefix="bench_corpus_") as workdir:
+            results = run_all(workdir, spec, repeat=args.repeat)
+
+    with open(args.output, "w", encoding="utf-8") as handle:
+        json.dump(results, handle, indent=2, sort_keys=True)
+    for name, row in sorted(results["results"].items()):
+        extra = ", ".join(
+            f"{k}={row[k]:.1f}" for k in ("files_per_s", "mb_per_s", "us_per_call") if k in row
+        )
+        print(f"{name:<36} median={row['median_s'] * 1e3:9.2f}ms  {extra}")
+    print(f"✓ Results written to {args.output}")
+
+    if baseline is not None:
+        regressions = compare_results(results, baseline, tolerance=args.tolerance)
+        for line in regressions:
+            print(f"❌ {line}", file=sys.stderr)
+        if regressions:
+            return 1
+        print(f"✓ No regressions beyond {args.tolerance:.0%} of {args.baseline}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
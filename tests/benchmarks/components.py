@@ -0,0 +1,242 @@
+"""Component benchmarks: reader throughput, state serialization, response text, step logging."""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import platform
+import statistics
+import sys
+import time
+from contextlib import contextmanager
+from types import SimpleNamespace
+from typing import Any, Callable, Iterator
+
+from google.adk.models.llm_response import LlmResponse
+from google.genai import types
+from opentelemetry.sdk._logs import LoggerProvider, LoggingHandler
+from opentelemetry.sdk._logs.export import (
+    BatchLogRecordProcessor,
+    LogExporter,
+    LogExportResult,
+)
+
+from agents.reader import DocumentReaderAgent
+from observability import session_logs
+from observability.session_logs import (
+    _maybe_truncate,
+    log_llm_step_completed,
+    max_response_log_chars,
+    split_model_visible_and_reasoning_text,
+)
+from observability.step_log_queue import StepLogQueue, StepLogQueueSettings
+from tests.benchmarks.corpus import CorpusSpec, generate_corpus
+
+RESULTS_SCHEMA_VERSION = 1
+
+
+def time_call(fn: Callable[[], Any], *, repeat: int = 5, warmup: int = 1) -> dict[str, float]:
+    """Wall-clock seconds for ``fn`` over ``repeat`` runs after ``warmup`` runs."""
+    for _ in range(warmup):
+        fn()
+    samples: list[float] = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return {
+        "min_s": min(samples),
+        "median_s": statistics.median(samples),
+        "mean_s": statistics.fmean(samples),
+        "max_s": max(samples),
+        "repeat": repeat,
+    }
+
+
+class _NullLogExporter(LogExporter):
+    """Accepts every batch; isolates SDK/handler cost from network export."""
+
+    def export(self, batch):
+        return LogExportResult.SUCCESS
+
+    def shutdown(self):
+        return None
+
+
+def bench_reader(
+    corpus_root: str, stats: dict[str, dict[str, int]], *, repeat: int
+) -> dict[str, dict[str, float]]:
+    """``DocumentReaderAgent.read_documents`` per corpus kind: files/s and MB/s."""
+    out: dict[str, dict[str, float]] = {}
+    for kind, kind_stats in stats.items():
+        reader = DocumentReaderAgent(documents_dir=os.path.join(corpus_root, kind))
+        timing = time_call(reader.read_documents, repeat=repeat)
+        timing["files_per_s"] = kind_stats["files"] / timing["median_s"]
+        timing["mb_per_s"] = kind_stats["bytes"] / 1e6 / timing["median_s"]
+        out[f"reader.{kind}"] = timing
+    return out
+
+
+def bench_state_serialization(corpus_root: str, *, repeat: int) -> dict[str, dict[str, float]]:
+    """Cost of turning reader output into session state (``documents_json`` etc.)."""
+    reader = DocumentReaderAgent(documents_dir=corpus_root)
+    documents = reader.read_documents()
+    payload = json.dumps(documents, ensure_ascii=True)
+    dumps = time_call(lambda: json.dumps(documents, ensure_ascii=True), repeat=repeat)
+    dumps["payload_bytes"] = len(payload)
+    dumps["mb_per_s"] = len(payload) / 1e6 / dumps["median_s"]
+    state = time_call(lambda: reader.build_corpus_state(documents), repeat=repeat)
+    state["documents"] = len(documents)
+    return {"state.documents_json_dumps": dumps, "state.build_corpus_state": state}
+
+
+def _large_response(visible_chars: int, reasoning_chars: int, n_parts: int = 64) -> LlmResponse:
+    parts: list[types.Part] = []
+    for i in range(n_parts):
+        parts.append(types.Part(text="r" * (reasoning_chars // n_parts), thought=True))
+        parts.append(types.Part(text=f"{i} " + "v" * (visible_chars // n_parts)))
+    return LlmResponse(
+        content=types.Content(role="model", parts=parts),
+        usage_metadata=types.GenerateContentResponseUsageMetadata(
+            prompt_token_count=50_000,
+            candidates_token_count=visible_chars // 4,
+            thoughts_token_count=reasoning_chars // 4,
+        ),
+        finish_reason=types.FinishReason.STOP,
+    )
+
+
+def bench_response_text(*, repeat: int, visible_chars: int = 1_000_000) -> dict[str, dict[str, float]]:
+    """``split_model_visible_and_reasoning_text`` and ``_maybe_truncate`` on big responses."""
+    response = _large_response(visible_chars, visible_chars // 4)
+    visible, _ = split_model_visible_and_reasoning_text(response.content)
+    limit = max_response_log_chars()
+    split = time_call(
+        lambda: split_model_visible_and_reasoning_text(response.content), repeat=repeat
+    )
+    split["chars"] = visible_chars + visible_chars // 4
+    truncate = time_call(lambda: _maybe_truncate(visible, limit), repeat=repeat)
+    truncate["chars"] = len(visible)
+    truncate["limit"] = limit
+    return {"response.split_visible_reasoning": split, "response.maybe_truncate": truncate}
+
+
+@contextmanager
+def _otel_step_logger() -> Iterator[None]:
+    """Route ``session_logs.logger`` through a real OTEL handler + batch processor."""
+    provider = LoggerProvider()
+    provider.add_log_record_processor(BatchLogRecordProcessor(_NullLogExporter()))
+    handler = LoggingHandler(level=logging.INFO, logger_provider=provider)
+    target = session_logs.logger
+    saved = (target.level, target.propagate)
+    target.addHandler(handler)
+    target.setLevel(logging.INFO)
+    target.propagate = False
+    try:
+        yield
+    finally:
+        target.removeHandler(handler)
+        target.setLevel(saved[0])
+        target.propagate = saved[1]
+        provider.shutdown()
+
+
+def _bench_ctx() -> SimpleNamespace:
+    return SimpleNamespace(
+        session=SimpleNamespace(id="bench-session"),
+        invocation_id="e-bench",
+        agent_name="Agent1_FileSummarizer",
+    )
+
+
+def bench_step_logging(
+    *, repeat: int, calls: int = 200, visible_chars: int = 300_000
+) -> dict[str, dict[str, float]]:
+    """``log_llm_step_completed`` through a real OTEL ``LoggingHandler`` + batch processor.
+
+    ``logging.llm_step_enqueue`` is the callback-side cost with the async
+    queue (``AGENT_LOG_ASYNC``); ``logging.llm_step_queue_drain`` is the
+    worker time to process what was enqueued.
+    """
+    ctx = _bench_ctx()
+    response = _large_response(visible_chars, visible_chars // 4)
+
+    def run_sync() -> None:
+        for _ in range(calls):
+            log_llm_step_completed("file_summaries", ctx, response)
+
+    step_queue = StepLogQueue(
+        session_logs._emit_llm_step,
+        StepLogQueueSettings(enabled=True, max_size=calls * (repeat + 2)),
+    )
+
+    def run_enqueue() -> None:
+        for _ in range(calls):
+            step_queue.submit(session_logs._capture_llm_step("file_summaries", ctx, response))
+
+    with _otel_step_logger():
+        sync = time_call(run_sync, repeat=repeat)
+        enqueue = time_call(run_enqueue, repeat=repeat)
+        started = time.perf_counter()
+        step_queue.flush(timeout=600)
+        drain_s = time.perf_counter() - started
+
+    out: dict[str, dict[str, float]] = {}
+    for name, timing in (("llm_step_completed", sync), ("llm_step_enqueue", enqueue)):
+        timing["calls"] = calls
+        timing["us_per_call"] = timing["median_s"] / calls * 1e6
+        out[f"logging.{name}"] = timing
+    out["logging.llm_step_queue_drain"] = {
+        "min_s": drain_s,
+        "median_s": drain_s,
+        "mean_s": drain_s,
+        "max_s": drain_s,
+        "repeat": 1,
+        "processed": step_queue.stats()["processed"],
+    }
+    return out
+
+
+def run_all(workdir: str, spec: CorpusSpec, *, repeat: int = 5) -> dict[str, Any]:
+    """Generate a corpus under ``workdir`` and run every component benchmark."""
+    corpus_root = os.path.join(workdir, "corpus")
+    started = time.perf_counter()
+    stats = generate_corpus(corpus_root, spec)
+    generate_s = time.perf_counter() - started
+
+    results: dict[str, dict[str, float]] = {}
+    results.update(bench_reader(corpus_root, stats, repeat=repeat))
+    results.update(bench_state_serialization(corpus_root, repeat=repeat))
+    results.update(bench_response_text(repeat=repeat))
+    results.update(bench_step_logging(repeat=repeat))
+    return {
+        "schema_version": RESULTS_SCHEMA_VERSION,
+        "meta": {
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "corpus": stats,
+            "corpus_generate_s": generate_s,
+            "repeat": repeat,
+        },
+        "results": results,
+    }
+
+
+def compare_results(
+    current: dict[str, Any], baseline: dict[str, Any], *, tolerance: float = 0.2
+) -> list[str]:
+    """Benchmarks whose ``median_s`` grew by more than ``tolerance`` versus baseline."""
+    regressions: list[str] = []
+    for name, now in current.get("results", {}).items():
+        before = baseline.get("results", {}).get(name)
+        if not before or not before.get("median_s"):
+            continue
+        ratio = now["median_s"] / before["median_s"]
+        if ratio > 1.0 + tolerance:
+            regressions.append(
+                f"{name}: median {now['median_s'] * 1e3:.2f}ms vs "
+                f"{before['median_s'] * 1e3:.2f}ms baseline ({ratio:.2f}x)"
+            )
+    return regressions
@@ -0,0 +1,142 @@
+"""Synthetic document corpora for reader benchmarks (markdown, large logs, text PDFs)."""
+
+from __future__ import annotations
+
+import os
+import random
+from dataclasses import dataclass, replace
+
+_WORDS = (
+    "migration rollout latency budget vendor pipeline incident review "
+    "lesson risk backlog timeline testing schema cluster capacity owner "
+    "decision outage retry cache deploy metric alert runbook scope"
+).split()
+
+
+@dataclass(frozen=True)
+class CorpusSpec:
+    small_md_files: int = 1000
+    small_md_bytes: int = 2_000
+    log_files: int = 4
+    log_bytes: int = 8_000_000
+    pdf_files: int = 2
+    pdf_pages: int = 300
+    seed: int = 0
+
+    def scaled(self, factor: float) -> "CorpusSpec":
+        """Scale file counts and sizes (page count included); never below one."""
+
+        def s(n: int) -> int:
+            return max(1, int(n * factor))
+
+        return replace(
+            self,
+            small_md_files=s(self.small_md_files),
+            log_files=s(self.log_files),
+            log_bytes=s(self.log_bytes),
+            pdf_files=s(self.pdf_files),
+            pdf_pages=s(self.pdf_pages),
+        )
+
+
+def _sentence(rng: random.Random, n_words: int = 12) -> str:
+    return " ".join(rng.choice(_WORDS) for _ in range(n_words)).capitalize() + "."
+
+
+def _pdf_escape(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def write_text_pdf(path: str, pages: list[list[str]]) -> None:
+    """Write a minimal uncompressed PDF (Helvetica text lines) that pypdf can extract."""
+    n = len(pages)
+    page_ids = [4 + 2 * i for i in range(n)]
+    bodies: dict[int, bytes] = {
+        1: b"<< /Type /Catalog /Pages 2 0 R >>",
+        2: (
+            "<< /Type /Pages /Kids ["
+            + " ".join(f"{pid} 0 R" for pid in page_ids)
+            + f"] /Count {n} >>"
+        ).encode("ascii"),
+        3: b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    }
+    for pid, lines in zip(page_ids, pages):
+        ops = "BT /F1 9 Tf 11 TL 40 770 Td " + " ".join(
+            f"({_pdf_escape(line)}) Tj T*" for line in lines
+        ) + " ET"
+        stream = ops.encode("latin-1", errors="replace")
+        bodies[pid] = (
+            "<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {pid + 1} 0 R >>"
+        ).encode("ascii")
+        bodies[pid + 1] = (
+            f"<< /Length {len(stream)} >>\nstream\n".encode("ascii")
+            + stream
+            + b"\nendstream"
+        )
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets: dict[int, int] = {}
+    for oid in sorted(bodies):
+        offsets[oid] = len(out)
+        out += f"{oid} 0 obj\n".encode("ascii") + bodies[oid] + b"\nendobj\n"
+    xref_at = len(out)
+    size = max(bodies) + 1
+    out += f"xref\n0 {size}\n0000000000 65535 f \n".encode("ascii")
+    for oid in range(1, size):
+        out += f"{offsets[oid]:010d} 00000 n \n".encode("ascii")
+    out += (
+        f"trailer\n<< /Size {size} /Root 1 0 R >>\nstartxref\n{xref_at}\n%%EOF\n"
+    ).encode("ascii")
+    with open(path, "wb") as handle:
+        handle.write(out)
+
+
+def generate_corpus(root: str, spec: CorpusSpec) -> dict[str, dict[str, int]]:
+    """Create ``small_md/``, ``logs/`` and ``pdfs/`` under ``root``; return file/byte counts."""
+    rng = random.Random(spec.seed)
+    stats: dict[str, dict[str, int]] = {}
+
+    md_dir = os.path.join(root, "small_md")
+    os.makedirs(md_dir, exist_ok=True)
+    total = 0
+    for i in range(spec.small_md_files):
+        body = [f"# Project note {i}", ""]
+        while sum(len(line) + 1 for line in body) < spec.small_md_bytes:
+            body.append(f"- {_sentence(rng)}")
+        text = "\n".join(body) + "\n"
+        with open(os.path.join(md_dir, f"note_{i:05d}.md"), "w", encoding="utf-8") as h:
+            h.write(text)
+        total += len(text.encode("utf-8"))
+    stats["small_md"] = {"files": spec.small_md_files, "bytes": total}
+
+    log_dir = os.path.join(root, "logs")
+    os.makedirs(log_dir, exist_ok=True)
+    total = 0
+    line_templates = [_sentence(rng, 10) for _ in range(64)]
+    for i in range(spec.log_files):
+        path = os.path.join(log_dir, f"service_{i:02d}.log")
+        written = 0
+        with open(path, "w", encoding="utf-8") as h:
+            seq = 0
+            while written < spec.log_bytes:
+                line = (
+                    f"2026-01-01T00:{seq // 3600 % 60:02d}:{seq % 60:02d}Z "
+                    f"INFO worker-{seq % 16} {line_templates[seq % 64]}\n"
+                )
+                h.write(line)
+                written += len(line)
+                seq += 1
+        total += written
+    stats["logs"] = {"files": spec.log_files, "bytes": total}
+
+    pdf_dir = os.path.join(root, "pdfs")
+    os.makedirs(pdf_dir, exist_ok=True)
+    total = 0
+    for i in range(spec.pdf_files):
+        pages = [[_sentence(rng) for _ in range(40)] for _ in range(spec.pdf_pages)]
+        path = os.path.join(pdf_dir, f"report_{i:02d}.pdf")
+        write_text_pdf(path, pages)
+        total += os.path.getsize(path)
+    stats["pdfs"] = {"files": spec.pdf_files, "bytes": total, "pages": spec.pdf_pages}
+    return stats
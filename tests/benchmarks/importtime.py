@@ -0,0 +1,165 @@
+"""Cold-start import benchmark from ``python -X importtime``.
+
+Imports a module (``agent`` by default) in fresh interpreters with telemetry
+export off. The report shows the total import time and the slowest modules by
+cumulative time. It fails (exit 1) when the fastest of ``--runs`` exceeds
+``--budget-ms``, or when any module in ``LAZY_MODULES`` was imported at
+startup: those must load on first use only.
+
+Run ``python -m tests.benchmarks.importtime --budget-ms 3500`` from the repo root.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+from dataclasses import dataclass, field
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Heavy modules that cold start must not import (loaded on first use instead).
+LAZY_MODULES = (
+    "pypdf",
+    "mlflow",
+    "litellm",
+    "opentelemetry.instrumentation.openai_v2",
+    "opentelemetry.exporter.otlp.proto.http.trace_exporter",
+    "opentelemetry.exporter.otlp.proto.http._log_exporter",
+    "opentelemetry.exporter.otlp.proto.http.metric_exporter",
+    "opentelemetry.sdk.metrics",
+)
+
+# No OTLP endpoint and no Databricks auto-setup: the path of CLI runs and tests.
+COLD_START_ENV = {
+    "OTEL_EXPORTER_OTLP_ENDPOINT": "",
+    "AUTO_CONFIGURE_DATABRICKS_TRACING": "false",
+    "PYTHONDONTWRITEBYTECODE": "1",
+}
+
+
+@dataclass(frozen=True)
+class ImportRecord:
+    name: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+@dataclass
+class ImportProfile:
+    module: str
+    records: list[ImportRecord] = field(default_factory=list)
+
+    @property
+    def total_ms(self) -> float:
+        return sum(r.cumulative_us for r in self.records if r.depth == 0) / 1000.0
+
+    @property
+    def modules(self) -> set[str]:
+        return {r.name for r in self.records}
+
+    def eager_lazy_modules(self, lazy: tuple[str, ...] = LAZY_MODULES) -> list[str]:
+        return [name for name in lazy if name in self.modules]
+
+    def slowest(self, n: int) -> list[ImportRecord]:
+        return sorted(self.records, key=lambda r: r.cumulative_us, reverse=True)[:n]
+
+
+def parse_importtime(stderr: str) -> list[ImportRecord]:
+    """Records from ``-X importtime`` output (other stderr lines are ignored)."""
+    records: list[ImportRecord] = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:") :].split("|")
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue  # the header line
+        raw_name = fields[2].rstrip()
+        name = raw_name.lstrip()
+        depth = (len(raw_name) - len(name) - 1) // 2
+        records.append(ImportRecord(name, int(fields[0]), int(fields[1]), depth))
+    return records
+
+
+def measure_import(module: str = "agent", env: dict[str, str] | None = None) -> ImportProfile:
+    """Import ``module`` in a fresh interpreter at the repo root."""
+    run_env = {**os.environ, **COLD_START_ENV, **(env or {})}
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=REPO_ROOT,
+        env=run_env,
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{proc.stderr[-2000:]}")
+    return ImportProfile(module, parse_importtime(proc.stderr))
+
+
+def format_import_report(profiles: list[ImportProfile], top: int = 15) -> str:
+    best = min(profiles, key=lambda p: p.total_ms)
+    lines = [
+        f"import {best.module}: best {best.total_ms:.0f} ms of {len(profiles)} "
+        f"(all: {', '.join(f'{p.total_ms:.0f}' for p in profiles)} ms)",
+        f"{'cumulative ms':>14}  {'self ms':>8}  module",
+    ]
+    for record in best.slowest(top):
+        lines.append(
+            f"{record.cumulative_us / 1000:>14.1f}  {record.self_us / 1000:>8.1f}  "
+            f"{'  ' * record.depth}{record.name}"
+        )
+    eager = best.eager_lazy_modules()
+    lines.append(f"eagerly imported lazy modules: {', '.join(eager) if eager else 'none'}")
+    return "\n".join(lines)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Cold-start import time benchmark")
+    parser.add_argument("--module", default="agent")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument(
+        "--budget-ms", type=float, default=None, help="Fail when the best run is slower."
+    )
+    parser.add_argument("-o", "--output", help="Write the best run's totals and top modules as JSON.")
+    args = parser.parse_args()
+
+    profiles = [measure_import(args.module) for _ in range(args.runs)]
+    print(format_import_report(profiles, args.top))
+    best = min(profiles, key=lambda p: p.total_ms)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as handle:
+            json.dump(
+                {
+                    "module": best.module,
+                    "total_ms": best.total_ms,
+                    "runs_ms": [p.total_ms for p in profiles],
+                    "eager_lazy_modules": best.eager_lazy_modules(),
+                    "slowest": [
+                        {"name": r.name, "cumulative_ms": r.cumulative_us / 1000}
+                        for r in best.slowest(args.top)
+                    ],
+                },
+                handle,
+                indent=2,
+            )
+    failed = False
+    if best.eager_lazy_modules():
+        print("FAIL: modules that must load lazily were imported at startup", file=sys.stderr)
+        failed = True
+    if args.budget_ms is not None and best.total_ms > args.budget_ms:
+        print(
+            f"FAIL: import {args.module} took {best.total_ms:.0f} ms "
+            f"(budget {args.budget_ms:.0f} ms)",
+            file=sys.stderr,
+        )
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,255 @@
+"""Concurrent-session load generator for the full workflow (in-process ADK runner).
+
+Drives an ``App`` (normally ``agent.app`` with ``MODEL=mock/synthetic``) with
+``sessions`` new sessions arriving at ``rate`` per second, and reports
+throughput, end-to-end and per-agent latency percentiles, event-loop lag and
+RSS growth per session.
+
+Per-agent latency is attributed from the event stream: the time between one
+event and the next is charged to the author of the later event, so in the
+sequential workflow each agent is charged from the end of its predecessor to
+its own last event.
+
+Run ``python -m tests.benchmarks.load --sessions 10,50,100 --rate 20`` from the
+repo root to step through concurrency levels.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+import uuid
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Any
+
+from google.adk.apps import App
+from google.adk.runners import InMemoryRunner, Runner
+from google.genai import types
+
+from batch.runner import percentile
+from observability.memory import rss_bytes
+
+LOAD_USER_ID = "load"
+DEFAULT_QUESTION = "What lessons were learned across these projects?"
+
+
+@dataclass
+class SessionTiming:
+    session_id: str
+    latency_ms: float
+    agent_ms: dict[str, float] = field(default_factory=dict)
+    error: str | None = None
+
+
+class LoopLagMonitor:
+    """Samples how late ``asyncio.sleep(interval)`` wakes up while the load runs."""
+
+    def __init__(self, interval_s: float = 0.01) -> None:
+        self.interval_s = interval_s
+        self.samples_ms: list[float] = []
+        self._task: asyncio.Task[None] | None = None
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            start = loop.time()
+            await asyncio.sleep(self.interval_s)
+            self.samples_ms.append(max(0.0, (loop.time() - start - self.interval_s) * 1000.0))
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+
+async def run_session(runner: Runner, question: str, *, user_id: str = LOAD_USER_ID) -> SessionTiming:
+    """One workflow turn in a fresh session, timing every event by author."""
+    session = await runner.session_service.create_session(
+        app_name=runner.app_name, user_id=user_id, session_id=uuid.uuid4().hex
+    )
+    message = types.Content(role="user", parts=[types.Part(text=question)])
+    agent_ms: dict[str, float] = defaultdict(float)
+    error: str | None = None
+    start = last = time.perf_counter()
+    try:
+        async for event in runner.run_async(
+            user_id=user_id, session_id=session.id, new_message=message
+        ):
+            now = time.perf_counter()
+            agent_ms[event.author] += (now - last) * 1000.0
+            last = now
+    except Exception as exc:
+        error = f"{type(exc).__name__}: {exc}"
+    return SessionTiming(
+        session_id=session.id,
+        latency_ms=(time.perf_counter() - start) * 1000.0,
+        agent_ms=dict(agent_ms),
+        error=error,
+    )
+
+
+def _summary(values: list[float]) -> dict[str, float]:
+    return {
+        "p50_ms": percentile(values, 50),
+        "p95_ms": percentile(values, 95),
+        "p99_ms": percentile(values, 99),
+        "max_ms": max(values, default=0.0),
+    }
+
+
+async def run_load(
+    app: App,
+    *,
+    sessions: int,
+    rate: float = 0.0,
+    question: str = DEFAULT_QUESTION,
+    poisson: bool = False,
+    seed: int = 0,
+) -> dict[str, Any]:
+    """Start ``sessions`` sessions at ``rate``/s (0 = all at once) and report latency stats.
+
+    Arrivals are open-loop: a new session starts on schedule whether or not
+    earlier ones have finished, so queueing shows up in the percentiles.
+    """
+    runner = InMemoryRunner(app=app)
+    monitor = LoopLagMonitor()
+    rng = random.Random(seed)
+    rss_start = rss_bytes()
+    monitor.start()
+    started = time.perf_counter()
+    tasks: list[asyncio.Task[SessionTiming]] = []
+    try:
+        for i in range(sessions):
+            tasks.append(asyncio.create_task(run_session(runner, question)))
+            if rate > 0 and i < sessions - 1:
+                gap = rng.expovariate(rate) if poisson else 1.0 / rate
+                await asyncio.sleep(gap)
+        timings = await asyncio.gather(*tasks)
+        wall_s = time.perf_counter() - started
+    finally:
+        await monitor.stop()
+        await runner.close()
+    rss_end = rss_bytes()
+
+    ok = [t for t in timings if t.error is None]
+    per_agent: dict[str, list[float]] = defaultdict(list)
+    for timing in ok:
+        for author, ms in timing.agent_ms.items():
+            per_agent[author].append(ms)
+    return {
+        "sessions": sessions,
+        "rate": rate,
+        "completed": len(ok),
+        "failed": len(timings) - len(ok),
+        "errors": sorted({t.error for t in timings if t.error})[:5],
+        "wall_s": wall_s,
+        "throughput_per_s": len(ok) / wall_s if wall_s > 0 else 0.0,
+        "end_to_end": _summary([t.latency_ms for t in ok]),
+        "per_agent": {name: _summary(values) for name, values in sorted(per_agent.items())},
+        "loop_lag": {**_summary(monitor.samples_ms), "samples": len(monitor.samples_ms)},
+        "rss_start_bytes": rss_start,
+        "rss_end_bytes": rss_end,
+        "rss_growth_per_session_bytes": (rss_end - rss_start) / max(1, sessions),
+    }
+
+
+def format_load_report(steps: list[dict[str, Any]]) -> str:
+    """One row per load step, then per-agent percentiles for the last step."""
+    lines = [
+        f"{'sessions':>8} {'rate':>6} {'ok':>5} {'fail':>5} {'thr/s':>8} "
+        f"{'p50_ms':>9} {'p95_ms':>9} {'p99_ms':>9} {'lag_p99':>8} {'rss/sess':>10}"
+    ]
+    for step in steps:
+        e2e = step["end_to_end"]
+        lines.append(
+            f"{step['sessions']:>8} {step['rate']:>6.1f} {step['completed']:>5} "
+            f"{step['failed']:>5} {step['throughput_per_s']:>8.2f} {e2e['p50_ms']:>9.1f} "
+            f"{e2e['p95_ms']:>9.1f} {e2e['p99_ms']:>9.1f} {step['loop_lag']['p99_ms']:>8.1f} "
+            f"{step['rss_growth_per_session_bytes'] / 1024:>8.1f}KB"
+        )
+    if steps:
+        lines.append("per-agent (last step):")
+        for name, stats in steps[-1]["per_agent"].items():
+            lines.append(
+                f"  {name:<32} p50={stats['p50_ms']:.1f}ms p95={stats['p95_ms']:.1f}ms "
+                f"p99={stats['p99_ms']:.1f}ms"
+            )
+    return "\n".join(lines)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Concurrent-session load test")
+    parser.add_argument(
+        "--sessions",
+        default="20",
+        help="Sessions per step; comma-separated for several steps (e.g. 10,50,100).",
+    )
+    parser.add_argument("--rate", type=float, default=0.0, help="Arrivals per second (0 = burst).")
+    parser.add_argument("--poisson", action="store_true", help="Exponential inter-arrival gaps.")
+    parser.add_argument("--question", default=DEFAULT_QUESTION)
+    parser.add_argument(
+        "--model-latency",
+        default="lognormal:200:0.5",
+        help="MOCK_LLM_LATENCY_MS when MODEL is unset or mock/ (default: %(default)s).",
+    )
+    parser.add_argument(
+        "--documents-dir",
+        help="Corpus to read (default: DOCUMENTS_DIR, else a generated synthetic corpus).",
+    )
+    parser.add_argument("--corpus-scale", type=float, default=0.01)
+    parser.add_argument("-o", "--output", help="Write all steps as JSON here.")
+    args = parser.parse_args()
+
+    os.environ.setdefault("MODEL", "mock/synthetic")
+    if os.environ["MODEL"].startswith("mock/"):
+        os.environ.setdefault("MOCK_LLM_LATENCY_MS", args.model_latency)
+
+    with tempfile.TemporaryDirectory(prefix="load_corpus_") as workdir:
+        documents_dir = args.documents_dir or os.environ.get("DOCUMENTS_DIR")
+        if not documents_dir:
+            from tests.benchmarks.corpus import CorpusSpec, generate_corpus
+
+            documents_dir = workdir
+            generate_corpus(documents_dir, CorpusSpec().scaled(args.corpus_scale))
+        os.environ["DOCUMENTS_DIR"] = os.path.abspath(documents_dir)
+
+        import agent
+
+        steps = []
+        for n in (int(s) for s in args.sessions.split(",") if s.strip()):
+            steps.append(
+                asyncio.run(
+                    run_load(
+                        agent.app,
+                        sessions=n,
+                        rate=args.rate,
+                        question=args.question,
+                        poisson=args.poisson,
+                    )
+                )
+            )
+            print(format_load_report(steps[-1:]).splitlines()[1], file=sys.stderr)
+
+    print(format_load_report(steps))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as handle:
+            json.dump({"model": os.environ["MODEL"], "steps": steps}, handle, indent=2)
+        print(f"✓ Results written to {args.output}")
+    return 0 if all(step["failed"] == 0 for step in steps) else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,299 @@
+"""Unified trace view benchmark: JSON parsed per read vs the ``rollup_trace_events`` table.
+
+Generates a trace dataset (root + child spans, one ``genai.trace.metadata``
+event and several rewritten ``genai.trace.tag`` events per trace, plus
+``agent.llm_step`` noise) as local Parquet files. It then times, with DuckDB:
+
+- ``trace_view.old``: the trace-level columns of ``mlflow_experiment_trace_unified``
+  as the captured view computes them: the log body parsed in every CTE that
+  reads it and a ``ROW_NUMBER`` over every tag event
+- ``trace_view.new``: the same columns from ``mlflow_experiment_trace_rollup_unified``'s
+  CTEs over the pre-parsed ``rollup_trace_events`` table
+- ``trace_view.refresh_full`` / ``trace_view.refresh_incremental``: building the
+  table, then folding in ``--increment`` of new traces (one run each)
+
+Both queries must return the same rows. The spans and assessments parts of the
+view are identical in the two versions and left out. ``PARSE_JSON(body):k::STRING``
+is written as ``get_json_object(body, '$.k')`` so the old plan runs under DuckDB.
+
+Run ``python -m tests.benchmarks.trace_views --traces 20000 [--explain]`` from the repo root
+(needs ``uv sync --extra local-traces``).
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from dataclasses import dataclass
+from typing import Any
+
+from observability.local_queries import connect, translate_query
+from observability.parquet_sink import ParquetWriter, log_schema, span_schema
+from observability.rollups import DuckDBRunner, refresh_rollups
+from tests.benchmarks.components import RESULTS_SCHEMA_VERSION, time_call
+
+T0_NS = 1_780_000_000 * 10**9
+
+_ROOT_SPAN = """
+root_span AS (
+  SELECT
+    trace_id,
+    TIMESTAMP_MILLIS(CAST(start_time_unix_nano / 1000000 AS BIGINT)) AS request_time,
+    (end_time_unix_nano - start_time_unix_nano) / 1000000.0 AS execution_duration_ms
+  FROM `dev_ai`.`agent_traces`.`mlflow_experiment_trace_otel_spans`
+  WHERE COALESCE(parent_span_id, '') = ''
+)
+"""
+
+OLD_UNIFIED_SQL = f"""
+WITH
+trace_metadata AS (
+  SELECT trace_id, body AS metadata_data
+  FROM `dev_ai`.`agent_traces`.`mlflow_experiment_trace_otel_logs`
+  WHERE event_name = 'genai.trace.metadata'
+),
+tags_agg AS (
+  SELECT trace_id, MAP_FROM_ENTRIES(COLLECT_LIST(STRUCT(key, value))) AS tags
+  FROM (
+    SELECT
+      trace_id,
+      get_json_object(body, '$.key') AS key,
+      get_json_object(body, '$.value') AS value,
+      ROW_NUMBER() OVER (
+        PARTITION BY trace_id, get_json_object(body, '$.key')
+        ORDER BY time_unix_nano DESC
+      ) AS rn
+    FROM `dev_ai`.`agent_traces`.`mlflow_experiment_trace_otel_logs`
+    WHERE event_name = 'genai.trace.tag'
+  ) tag_events
+  WHERE tag_events.rn = 1
+  GROUP BY tag_events.trace_id
+),
+{_ROOT_SPAN}
+SELECT
+  rs.trace_id,
+  get_json_object(tm.metadata_data, '$.client_request_id') AS client_request_id,
+  rs.request_time,
+  rs.execution_duration_ms,
+  COALESCE(
+    FROM_JSON(get_json_object(tm.metadata_data, '$.trace_metadata'), 'MAP<STRING, STRING>'),
+    MAP()
+  ) AS trace_metadata,
+  COALESCE(ta.tags, MAP()) AS tags
+FROM root_span rs
+  LEFT JOIN trace_metadata tm ON rs.trace_id = tm.trace_id
+  LEFT JOIN tags_agg ta ON rs.trace_id = ta.trace_id
+"""
+
+NEW_UNIFIED_SQL = f"""
+WITH
+trace_metadata AS (
+  SELECT trace_id, client_request_id, trace_metadata
+  FROM `dev_ai`.`agent_traces`.`mlflow_experiment_trace_rollup_trace_events`
+  WHERE event_name = 'genai.trace.metadata'
+),
+tags_agg AS (
+  SELECT trace_id, MAP_FROM_ENTRIES(COLLECT_LIST(STRUCT(tag_key, tag_value))) AS tags
+  FROM `dev_ai`.`agent_traces`.`mlflow_experiment_trace_rollup_trace_events`
+  WHERE event_name = 'genai.trace.tag'
+  GROUP BY trace_id
+),
+{_ROOT_SPAN}
+SELECT
+  rs.trace_id,
+  tm.client_request_id,
+  rs.request_time,
+  rs.execution_duration_ms,
+  COALESCE(tm.trace_metadata, MAP()) AS trace_metadata,
+  COALESCE(ta.tags, MAP()) AS tags
+FROM root_span rs
+  LEFT JOIN trace_metadata tm ON rs.trace_id = tm.trace_id
+  LEFT JOIN tags_agg ta ON rs.trace_id = ta.trace_id
+"""
+
+
+@dataclass(frozen=True)
+class TraceDatasetSpec:
+    traces: int = 20_000
+    child_spans: int = 4
+    tag_keys: int = 6
+    tag_rewrites: int = 2  # events per tag key; the latest wins
+    llm_steps: int = 3
+
+    def scaled(self, factor: float) -> "TraceDatasetSpec":
+        return TraceDatasetSpec(
+            max(1, int(self.traces * factor)),
+            self.child_spans,
+            self.tag_keys,
+            self.tag_rewrites,
+            self.llm_steps,
+        )
+
+
+def generate_trace_dataset(
+    directory: str, spec: TraceDatasetSpec, *, first_trace: int = 0
+) -> dict[str, int]:
+    """Write traces ``first_trace .. first_trace + spec.traces - 1`` under ``directory``."""
+    import pyarrow as pa
+
+    spans = ParquetWriter(directory, "spans", span_schema(pa), "start_time_unix_nano", "zstd")
+    logs = ParquetWriter(directory, "logs", log_schema(pa), "time_unix_nano", "zstd")
+    span_rows: list[dict[str, Any]] = []
+    log_rows: list[dict[str, Any]] = []
+    for n in range(first_trace, first_trace + spec.traces):
+        trace_id = f"{n:032x}"
+        start = T0_NS + n * 10**9
+
+        def log(event_name: str, body: str, offset_ms: int) -> None:
+            log_rows.append(
+                {
+                    "event_name": event_name,
+                    "trace_id": trace_id,
+                    "time_unix_nano": start + offset_ms * 10**6,
+                    "body": body,
+                    "attributes": [("event_type", event_name)],
+                }
+            )
+
+        span_rows.append(
+            {
+                "trace_id": trace_id,
+                "span_id": f"{n:012x}0000",
+                "parent_span_id": "",
+                "name": "invocation",
+                "start_time_unix_nano": start,
+                "end_time_unix_nano": start + (500 + n % 250) * 10**6,
+            }
+        )
+        for c in range(spec.child_spans):
+            span_rows.append(
+                {
+                    "trace_id": trace_id,
+                    "span_id": f"{n:012x}{c + 1:04x}",
+                    "parent_span_id": f"{n:012x}0000",
+                    "name": "call_llm",
+                    "start_time_unix_nano": start + c * 10**6,
+                    "end_time_unix_nano": start + (c + 100) * 10**6,
+                }
+            )
+        metadata = {
+            "client_request_id": f"req-{n}",
+            "trace_metadata": {"mlflow.user": f"user{n % 17}", "mlflow.source.name": "agent.py"},
+            "request_preview": "x" * 200,
+        }
+        log("genai.trace.metadata", json.dumps(metadata), 1)
+        for rewrite in range(spec.tag_rewrites):
+            for k in range(spec.tag_keys):
+                body = {"key": f"tag{k}", "value": f"v{rewrite}-{n % 5}"}
+                log("genai.trace.tag", json.dumps(body), 2 + rewrite * spec.tag_keys + k)
+        for step in range(spec.llm_steps):
+            log("agent.llm_step", json.dumps({"text": "y" * 100}), 100 + step)
+    spans.write(span_rows)
+    logs.write(log_rows)
+    return {"traces": spec.traces, "spans": len(span_rows), "logs": len(log_rows)}
+
+
+def _rows(con: Any, sql: str) -> list[tuple]:
+    rows = con.sql(translate_query(sql) + " ORDER BY 1").fetchall()
+    return [tuple(sorted(v.items()) if isinstance(v, dict) else v for v in row) for row in rows]
+
+
+def run_trace_view_benchmark(
+    workdir: str, spec: TraceDatasetSpec, *, repeat: int = 5, increment: float = 0.01
+) -> dict[str, Any]:
+    """Generate a dataset under ``workdir`` and time both plans and the refreshes."""
+    parquet_dir = os.path.join(workdir, "traces")
+    started = time.perf_counter()
+    stats = generate_trace_dataset(parquet_dir, spec)
+    generate_s = time.perf_counter() - started
+
+    con = connect(parquet_dir, os.path.join(workdir, "rollups.duckdb"))
+    runner = DuckDBRunner(con)  # generated data is complete: no lateness margin
+    results: dict[str, dict[str, float]] = {}
+    results["trace_view.refresh_full"] = time_call(
+        lambda: refresh_rollups(runner, ("trace_events",), allowed_lateness_seconds=0),
+        repeat=1,
+        warmup=0,
+    )
+    more = spec.scaled(increment)
+    generate_trace_dataset(parquet_dir, more, first_trace=spec.traces)
+    results["trace_view.refresh_incremental"] = time_call(
+        lambda: refresh_rollups(runner, ("trace_events",), allowed_lateness_seconds=0),
+        repeat=1,
+        warmup=0,
+    )
+
+    old_rows = _rows(con, OLD_UNIFIED_SQL)
+    if old_rows != _rows(con, NEW_UNIFIED_SQL):
+        raise AssertionError("old and new unified view plans returned different rows")
+    for name, sql in (("old", OLD_UNIFIED_SQL), ("new", NEW_UNIFIED_SQL)):
+        translated = translate_query(sql)
+        results[f"trace_view.{name}"] = time_call(
+            lambda: con.sql(translated).fetchall(), repeat=repeat
+        )
+    con.close()
+    return {
+        "schema_version": RESULTS_SCHEMA_VERSION,
+        "meta": {
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "dataset": stats,
+            "increment_traces": more.traces,
+            "dataset_generate_s": generate_s,
+            "rows": len(old_rows),
+            "speedup": results["trace_view.old"]["median_s"]
+            / results["trace_view.new"]["median_s"],
+            "repeat": repeat,
+        },
+        "results": results,
+    }
+
+
+def explain_plans(workdir: str) -> str:
+    """DuckDB physical plans of both queries over a benchmark ``workdir``."""
+    con = connect(os.path.join(workdir, "traces"), os.path.join(workdir, "rollups.duckdb"))
+    out = []
+    for name, sql in (("old", OLD_UNIFIED_SQL), ("new", NEW_UNIFIED_SQL)):
+        plan = con.sql("EXPLAIN " + translate_query(sql)).fetchall()
+        out.append(f"== {name} ==\n" + "\n".join(row[1] for row in plan))
+    con.close()
+    return "\n".join(out)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Unified trace view: old vs pre-parsed plan")
+    parser.add_argument("--traces", type=int, default=TraceDatasetSpec().traces)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--increment", type=float, default=0.01, help="New traces, as a fraction.")
+    parser.add_argument("--explain", action="store_true", help="Print both DuckDB plans.")
+    parser.add_argument("-o", "--output", help="Write results JSON here.")
+    parser.add_argument("--workdir", help="Keep the generated dataset here (default: temp dir).")
+    args = parser.parse_args()
+
+    spec = TraceDatasetSpec(traces=args.traces)
+    with tempfile.TemporaryDirectory(prefix="bench_traces_") as tmp:
+        workdir = args.workdir or tmp
+        results = run_trace_view_benchmark(
+            workdir, spec, repeat=args.repeat, increment=args.increment
+        )
+        if args.explain:
+            print(explain_plans(workdir))
+    for name, row in sorted(results["results"].items()):
+        print(f"{name:<32} median={row['median_s'] * 1e3:9.2f}ms")
+    meta = results["meta"]
+    print(f"{meta['rows']} traces, old/new speedup {meta['speedup']:.1f}x")
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as handle:
+            json.dump(results, handle, indent=2, sort_keys=True)
+        print(f"✓ Results written to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
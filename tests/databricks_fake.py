@@ -0,0 +1,122 @@
+"""In-process stand-in for a Databricks workspace, used as ``DatabricksRestClient(session=...)``.
+
+Serves the Unity Catalog list and get endpoints from a dict of
+``{catalog: {schema: [table, ...]}}``, paginated at ``page_size``. It can add
+per-call latency, inject failures with ``fail_next`` and record every call
+together with the peak number of calls in flight.
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+import time
+from typing import Any
+from urllib.parse import urlsplit
+
+UC = "/api/2.1/unity-catalog"
+
+
+class FakeResponse:
+    def __init__(self, status_code: int, payload: Any = None, headers: dict | None = None) -> None:
+        self.status_code = status_code
+        self.payload = payload if payload is not None else {}
+        self.headers = headers or {}
+        self.text = json.dumps(self.payload)
+
+    def json(self) -> Any:
+        return self.payload
+
+    def close(self) -> None:
+        pass
+
+
+class FakeWorkspace:
+    def __init__(
+        self,
+        catalogs: dict[str, dict[str, list[str]]],
+        *,
+        host: str = "https://fake.cloud.databricks.com",
+        token: str = "tok",
+        page_size: int = 50,
+        latency_s: float = 0.0,
+    ) -> None:
+        self.catalogs = catalogs
+        self.host = host
+        self.token = token
+        self.page_size = page_size
+        self.latency_s = latency_s
+        self.calls: list[tuple[str, str, dict[str, Any]]] = []
+        self.peak_in_flight = 0
+        self._in_flight = 0
+        self._failures: list[tuple[str, int, dict[str, str]]] = []
+        self._lock = threading.Lock()
+
+    def fail_next(self, path_prefix: str, status: int, times: int = 1, **headers: str) -> None:
+        """Answer the next ``times`` calls under ``path_prefix`` with ``status``."""
+        self._failures.extend([(path_prefix, status, headers)] * times)
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        headers: dict[str, str] | None = None,
+        params: dict[str, Any] | None = None,
+        timeout: float | None = None,
+        **kwargs: Any,
+    ) -> FakeResponse:
+        parts = urlsplit(url)
+        path = parts.path
+        with self._lock:
+            self.calls.append((method, path, dict(params or {})))
+            self._in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self._in_flight)
+            failure = next((f for f in self._failures if path.startswith(f[0])), None)
+            if failure:
+                self._failures.remove(failure)
+        try:
+            if self.latency_s:
+                time.sleep(self.latency_s)
+            if f"{parts.scheme}://{parts.netloc}" != self.host:
+                return FakeResponse(404, {"message": "unknown host"})
+            if (headers or {}).get("Authorization") != f"Bearer {self.token}":
+                return FakeResponse(401, {"error_code": "UNAUTHENTICATED"})
+            if failure:
+                return FakeResponse(failure[1], {"error_code": "INJECTED"}, failure[2])
+            return self._route(method, path, params or {})
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+
+    def _page(self, key: str, items: list[dict[str, Any]], params: dict[str, Any]) -> FakeResponse:
+        start = int(params.get("page_token") or 0)
+        body: dict[str, Any] = {key: items[start : start + self.page_size]}
+        if start + self.page_size < len(items):
+            body["next_page_token"] = str(start + self.page_size)
+        return FakeResponse(200, body)
+
+    def _route(self, method: str, path: str, params: dict[str, Any]) -> FakeResponse:
+        if method != "GET":
+            return FakeResponse(405)
+        if path == f"{UC}/catalogs":
+            return self._page("catalogs", [{"name": c} for c in self.catalogs], params)
+        catalog = self.catalogs.get(params.get("catalog_name", ""))
+        if path == f"{UC}/schemas":
+            if catalog is None:
+                return FakeResponse(404, {"error_code": "CATALOG_DOES_NOT_EXIST"})
+            return self._page("schemas", [{"name": s} for s in catalog], params)
+        if path == f"{UC}/tables":
+            tables = (catalog or {}).get(params.get("schema_name", ""))
+            if tables is None:
+                return FakeResponse(404, {"error_code": "SCHEMA_DOES_NOT_EXIST"})
+            return self._page("tables", [{"name": t} for t in tables], params)
+        if path.startswith(f"{UC}/tables/"):
+            name = path[len(f"{UC}/tables/") :]
+            c, s, t = (name.split(".") + ["", "", ""])[:3]
+            if t in self.catalogs.get(c, {}).get(s, []):
+                return FakeResponse(200, {"full_name": name, "table_type": "MANAGED"})
+            return FakeResponse(404, {"error_code": "TABLE_DOES_NOT_EXIST"})
+        return FakeResponse(404, {"error_code": "ENDPOINT_NOT_FOUND"})
+
+    def close(self) -> None:
+        pass
@@ -0,0 +1,91 @@
+"""Tests for batch/runner.py (JSONL input, shared corpus, concurrent runs)."""
+
+import io
+import json
+import sys
+from pathlib import Path
+from typing import AsyncGenerator
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from google.adk.agents import BaseAgent, SequentialAgent
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.apps import App
+from google.adk.events import Event, EventActions
+
+from agents.bootstrap import UserQuestionBootstrapAgent
+from agents.reader import DocumentReaderAgent
+from batch.runner import format_batch_report, load_questions, run_batch, share_corpus
+
+
+class EchoAnswerAgent(BaseAgent):
+    name: str = "EchoAnswer"
+
+    async def _run_async_impl(
+        self, ctx: InvocationContext
+    ) -> AsyncGenerator[Event, None]:
+        paths = ctx.session.state.get("document_paths", [])
+        answer = f"{ctx.session.state['user_question']} ({len(paths)} docs)"
+        yield Event(
+            author=self.name,
+            actions=EventActions(state_delta={"final_answer": answer}),
+        )
+
+
+@pytest.fixture
+def docs_dir(tmp_path):
+    d = tmp_path / "docs"
+    d.mkdir()
+    (d / "a.md").write_text("# A\nalpha")
+    (d / "b.txt").write_text("beta")
+    return str(d)
+
+
+def _app(docs_dir: str) -> App:
+    root = SequentialAgent(
+        name="BatchTestWorkflow",
+        sub_agents=[
+            UserQuestionBootstrapAgent(documents_dir=docs_dir),
+            DocumentReaderAgent(documents_dir=docs_dir),
+            EchoAnswerAgent(),
+        ],
+    )
+    return App(name="batch_test", root_agent=root)
+
+
+def test_load_questions_accepts_objects_and_strings():
+    lines = ['{"id": "x", "question": "Q1"}', "", '"Q2"']
+    questions = load_questions(lines)
+    assert [(q.id, q.question) for q in questions] == [("x", "Q1"), ("3", "Q2")]
+
+
+def test_load_questions_rejects_missing_question():
+    with pytest.raises(ValueError):
+        load_questions(['{"id": "x"}'])
+
+
+def test_share_corpus_pins_reader_state(docs_dir):
+    app = _app(docs_dir)
+    assert share_corpus(app.root_agent) == 2
+    reader = app.root_agent.sub_agents[1]
+    assert reader.corpus["document_paths"] == ["a.md", "b.txt"]
+
+
+async def test_run_batch_streams_jsonl_in_completion_and_returns_input_order(docs_dir):
+    app = _app(docs_dir)
+    share_corpus(app.root_agent)
+    (Path(docs_dir) / "c.md").write_text("added after the shared pass")
+    out = io.StringIO()
+    questions = load_questions([json.dumps({"id": str(i), "question": f"Q{i}"}) for i in range(5)])
+
+    results = await run_batch(app, questions, parallelism=2, output=out)
+
+    assert [r.id for r in results] == ["0", "1", "2", "3", "4"]
+    assert all(r.error is None for r in results)
+    assert results[0].final_answer == "Q0 (2 docs)"
+    streamed = [json.loads(line) for line in out.getvalue().splitlines()]
+    assert sorted(row["id"] for row in streamed) == ["0", "1", "2", "3", "4"]
+    report = format_batch_report(results)
+    assert "questions=5 failed=0" in report
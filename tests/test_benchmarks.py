@@ -0,0 +1,103 @@
+"""Smoke tests for tests/benchmarks (tiny corpora and loads so the suite stays fast)."""
+
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from google.adk.agents import SequentialAgent
+from google.adk.apps import App
+from pypdf import PdfReader
+
+from agents.bootstrap import UserQuestionBootstrapAgent
+from agents.reader import DocumentReaderAgent
+from tests.benchmarks.components import compare_results, run_all
+from tests.benchmarks.corpus import CorpusSpec, generate_corpus
+from tests.benchmarks.importtime import LAZY_MODULES, measure_import, parse_importtime
+from tests.benchmarks.load import format_load_report, run_load
+
+TINY = CorpusSpec(
+    small_md_files=5, small_md_bytes=300, log_files=1, log_bytes=20_000, pdf_files=1, pdf_pages=3
+)
+
+
+def test_generate_corpus_writes_readable_pdfs(tmp_path):
+    stats = generate_corpus(str(tmp_path), TINY)
+    assert stats["small_md"]["files"] == 5
+    assert stats["logs"]["bytes"] >= 20_000
+    reader = PdfReader(str(tmp_path / "pdfs" / "report_00.pdf"))
+    assert len(reader.pages) == 3
+    assert reader.pages[0].extract_text().strip()
+
+
+def test_run_all_reports_every_component(tmp_path):
+    results = run_all(str(tmp_path), TINY, repeat=1)
+    names = set(results["results"])
+    assert {"reader.small_md", "reader.logs", "reader.pdfs"} <= names
+    assert "state.documents_json_dumps" in names
+    assert "response.split_visible_reasoning" in names
+    assert results["results"]["logging.llm_step_completed"]["us_per_call"] > 0
+
+
+def test_compare_results_flags_slowdowns_only():
+    baseline = {"results": {"a": {"median_s": 1.0}, "b": {"median_s": 1.0}}}
+    current = {"results": {"a": {"median_s": 1.5}, "b": {"median_s": 0.5}, "c": {"median_s": 9.0}}}
+    regressions = compare_results(current, baseline, tolerance=0.2)
+    assert len(regressions) == 1 and regressions[0].startswith("a:")
+
+
+def test_run_load_reports_percentiles_per_agent(tmp_path):
+    (tmp_path / "a.md").write_text("# A\nalpha")
+    root = SequentialAgent(
+        name="LoadTestWorkflow",
+        sub_agents=[
+            UserQuestionBootstrapAgent(documents_dir=str(tmp_path)),
+            DocumentReaderAgent(documents_dir=str(tmp_path)),
+        ],
+    )
+    step = asyncio.run(run_load(App(name="load_test", root_agent=root), sessions=4, rate=200))
+    assert step["completed"] == 4 and step["failed"] == 0
+    assert step["end_to_end"]["p99_ms"] >= step["end_to_end"]["p50_ms"] > 0
+    assert set(step["per_agent"]) == {"Agent0_UserQuestionBootstrap", "Agent2_DocumentReader"}
+    assert "per-agent" in format_load_report([step])
+
+
+def test_parse_importtime_depth_and_totals():
+    stderr = (
+        "import time: self [us] | cumulative | imported package\n"
+        "import time:       100 |        100 |   json.decoder\n"
+        "import time:        50 |        150 | json\n"
+        "some warning\n"
+    )
+    records = parse_importtime(stderr)
+    assert [(r.name, r.depth, r.cumulative_us) for r in records] == [
+        ("json.decoder", 1, 100),
+        ("json", 0, 150),
+    ]
+
+
+def test_trace_view_plans_agree_on_generated_traces(tmp_path):
+    pytest.importorskip("duckdb")
+    from tests.benchmarks.trace_views import TraceDatasetSpec, run_trace_view_benchmark
+
+    results = run_trace_view_benchmark(str(tmp_path), TraceDatasetSpec(traces=50), repeat=1)
+    assert results["meta"]["rows"] == 51  # 50 traces plus a 1% (at least one) increment
+    assert {"trace_view.old", "trace_view.new", "trace_view.refresh_incremental"} <= set(
+        results["results"]
+    )
+
+
+def test_cold_start_keeps_heavy_modules_lazy():
+    agent = measure_import("agent")
+    assert agent.eager_lazy_modules() == []
+    assert "agent" in agent.modules and "pypdf" in LAZY_MODULES
+    # CLI entry points that only need header helpers must not pull in ADK.
+    assert "google.adk" not in measure_import("init").modules
+    # Settings live in ADK-free modules, so reading the config does not import ADK either.
+    assert "google.adk" not in measure_import("config").modules
+    # Generous: catches an eager heavy import (e.g. pypdf or ADK twice over), not noise.
+    assert agent.total_ms < 10000
+
@@ -0,0 +1,95 @@
+"""Tests for observability/blob_offload (content-addressed payload offload)."""
+
+import hashlib
+import logging
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from opentelemetry.sdk._logs import LoggerProvider, LoggingHandler
+from opentelemetry.sdk._logs.export import InMemoryLogExporter, SimpleLogRecordProcessor
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+
+from observability.blob_offload import (
+    BlobOffloader,
+    BlobOffloadExporter,
+    BlobOffloadSettings,
+    BlobStore,
+)
+
+
+def _offloader(tmp_path, **kwargs) -> BlobOffloader:
+    settings = BlobOffloadSettings(directory=str(tmp_path), **kwargs)
+    return BlobOffloader(BlobStore(settings.directory), settings)
+
+
+def test_settings_from_env(monkeypatch):
+    monkeypatch.delenv("TELEMETRY_BLOB_DIR", raising=False)
+    assert BlobOffloadSettings.from_env() is None
+    monkeypatch.setenv("TELEMETRY_BLOB_DIR", "/tmp/blobs")
+    monkeypatch.setenv("TELEMETRY_BLOB_MIN_CHARS", "100")
+    assert BlobOffloadSettings.from_env() == BlobOffloadSettings("/tmp/blobs", 100, 256)
+    monkeypatch.setenv("TELEMETRY_BLOB_MIN_CHARS", "8k")
+    assert BlobOffloadSettings.from_env() == BlobOffloadSettings("/tmp/blobs")
+
+
+def test_store_writes_each_payload_once(tmp_path):
+    store = BlobStore(str(tmp_path))
+    data = "é" * 5000
+    digest = store.put(data.encode())
+    assert digest == hashlib.sha256(data.encode()).hexdigest()
+    assert store.put(data.encode()) == digest
+    assert BlobStore(str(tmp_path)).put(data.encode()) == digest
+    assert store.get(digest) == data
+    assert len(list(tmp_path.rglob("*.gz"))) == 1
+    assert (store.written, store.deduplicated) == (1, 1)
+
+
+def test_spans_are_rewritten_before_export(tmp_path):
+    offloader = _offloader(tmp_path, min_chars=1000, preview_chars=10)
+    spans = InMemorySpanExporter()
+    provider = TracerProvider(shutdown_on_exit=False)
+    provider.add_span_processor(SimpleSpanProcessor(BlobOffloadExporter(spans, offloader)))
+    prompt = "system prompt " * 200
+    tracer = provider.get_tracer(__name__)
+    for _ in range(3):
+        with tracer.start_as_current_span("call_llm") as span:
+            span.set_attribute("gcp.vertex.agent.llm_request", prompt)
+            span.set_attribute("gen_ai.request.model", "m")
+
+    exported = spans.get_finished_spans()
+    assert len(exported) == 3
+    attrs = exported[0].attributes
+    assert attrs["gcp.vertex.agent.llm_request"] == prompt[:10] + "…"
+    assert attrs["gcp.vertex.agent.llm_request.size"] == len(prompt)
+    assert attrs["gen_ai.request.model"] == "m"
+    digest = attrs["gcp.vertex.agent.llm_request.sha256"]
+    assert offloader.store.get(digest) == prompt
+    stats = offloader.stats()
+    assert (stats["offloaded"], stats["written"], stats["deduplicated"]) == (3, 1, 2)
+
+
+def test_log_body_and_attributes_are_offloaded(tmp_path):
+    offloader = _offloader(tmp_path, min_chars=100)
+    logs = InMemoryLogExporter()
+    provider = LoggerProvider(shutdown_on_exit=False)
+    provider.add_log_record_processor(SimpleLogRecordProcessor(BlobOffloadExporter(logs, offloader)))
+    logger = logging.getLogger("blob_offload_test")
+    logger.propagate = False
+    logger.setLevel(logging.INFO)
+    logger.addHandler(LoggingHandler(logger_provider=provider))
+    response = "r" * 500
+    logger.info("b" * 300, extra={"model_response_text": response, "session_id": "s1"})
+    logger.info("short")
+
+    long_record, short_record = (d.log_record for d in logs.get_finished_logs())
+    assert long_record.body == "b" * 256 + "…"
+    assert long_record.attributes["log.body.size"] == 300
+    assert long_record.attributes["model_response_text.size"] == 500
+    assert long_record.attributes["session_id"] == "s1"
+    assert offloader.store.get(long_record.attributes["model_response_text.sha256"]) == response
+    assert short_record.body == "short"
+    assert "log.body.sha256" not in (short_record.attributes or {})
@@ -0,0 +1,106 @@
+"""Tests for observability/databricks_rest against the in-process FakeWorkspace."""
+
+import sys
+import time
+from pathlib import Path
+
+import pytest
+import requests
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from observability.databricks_rest import (
+    DatabricksApiError,
+    DatabricksRestClient,
+    list_catalogs,
+    list_schema_tables,
+)
+from tests.databricks_fake import UC, FakeWorkspace
+
+
+def _client(workspace, **kwargs):
+    kwargs.setdefault("sleep", lambda s: None)
+    kwargs.setdefault("session", workspace)
+    return DatabricksRestClient(workspace.host, workspace.token, **kwargs)
+
+
+def test_lists_large_catalog_concurrently_with_pagination():
+    catalog = {f"s{i:02d}": [f"t{j}" for j in range(120)] for i in range(40)}
+    workspace = FakeWorkspace({"main": catalog}, page_size=50, latency_s=0.01)
+    client = _client(workspace, max_workers=8)
+
+    started = time.perf_counter()
+    listed = list_schema_tables(client, "main")
+    elapsed = time.perf_counter() - started
+    client.close()
+
+    assert listed == catalog
+    table_calls = [c for c in workspace.calls if c[1] == f"{UC}/tables"]
+    assert len(table_calls) == 40 * 3  # 120 tables in pages of 50
+    assert table_calls[0][2]["omit_columns"] == "true"
+    assert 1 < workspace.peak_in_flight <= 8
+    assert elapsed < 0.01 * len(workspace.calls) / 2  # well under the serial time
+
+
+def test_retries_throttled_and_failed_gets_with_backoff():
+    workspace = FakeWorkspace({"main": {}, "dev": {}})
+    workspace.fail_next(f"{UC}/catalogs", 429, **{"Retry-After": "3"})
+    workspace.fail_next(f"{UC}/catalogs", 503)
+    delays = []
+    client = _client(workspace, backoff_s=0.5, sleep=delays.append)
+    assert list_catalogs(client) == ["main", "dev"]
+    assert delays == [3.0, 1.0]  # Retry-After, then exponential backoff for attempt 1
+
+    workspace.fail_next(f"{UC}/catalogs", 500, times=10)
+    with pytest.raises(DatabricksApiError) as excinfo:
+        list_catalogs(_client(workspace, retries=2))
+    assert excinfo.value.status == 500
+
+
+def test_post_is_not_retried_on_server_errors():
+    workspace = FakeWorkspace({})
+    workspace.fail_next("/api/2.0/sql/statements", 500, times=2)
+    client = _client(workspace)
+    with pytest.raises(DatabricksApiError):
+        client.api("POST", "/api/2.0/sql/statements", json={})
+    assert len(workspace.calls) == 1
+
+
+def test_connection_errors_are_retried_for_gets_only():
+    workspace = FakeWorkspace({"main": {}})
+
+    class Flaky:
+        failures = 1
+
+        def request(self, method, url, **kwargs):
+            if self.failures:
+                self.failures -= 1
+                raise requests.ConnectionError("reset")
+            return workspace.request(method, url, **kwargs)
+
+    assert list_catalogs(_client(workspace, session=Flaky())) == ["main"]
+    with pytest.raises(DatabricksApiError, match="reset"):
+        _client(workspace, session=Flaky()).api("POST", "/api/2.0/sql/statements")
+
+
+def test_request_returns_error_statuses_and_skips_auth_for_full_urls():
+    workspace = FakeWorkspace({"main": {"traces": ["spans"]}})
+    client = _client(workspace)
+    assert client.request("GET", f"{UC}/tables/main.traces.spans").status_code == 200
+    assert client.request("GET", f"{UC}/tables/main.traces.nope").status_code == 404
+    # Presigned URLs carry no workspace token.
+    assert client.request("GET", f"{workspace.host}{UC}/catalogs").status_code == 401
+
+
+def test_from_env_reads_host_and_otlp_bearer_token(monkeypatch):
+    monkeypatch.delenv("DATABRICKS_TOKEN", raising=False)
+    monkeypatch.setenv("DATABRICKS_HOST", "adb-1.azuredatabricks.net/")
+    monkeypatch.setenv("OTEL_EXPORTER_OTLP_HEADERS", "Authorization=Bearer abc,x-h=1")
+    client = DatabricksRestClient.from_env()
+    assert client.host == "https://adb-1.azuredatabricks.net"
+    assert client._auth == {"Authorization": "Bearer abc"}
+    client.close()
+
+    monkeypatch.delenv("DATABRICKS_HOST")
+    with pytest.raises(ValueError, match="DATABRICKS_HOST"):
+        DatabricksRestClient.from_env()
@@ -0,0 +1,120 @@
+"""Tests for init/cache.py and the cached path of init_and_connect."""
+
+import json
+import os
+import sys
+import threading
+from pathlib import Path
+
+import mlflow
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import init.databricks as databricks
+from init.cache import TraceInfraCache, trace_infrastructure_cache_key
+from init.databricks import TraceInfrastructureResult, init_and_connect
+
+RESULT = TraceInfrastructureResult(
+    experiment_id="123",
+    experiment_name="/Shared/agent_traces",
+    full_otel_spans_table_name="main.mlflow_traces.spans",
+    full_otel_logs_table_name="main.mlflow_traces.logs",
+)
+
+
+@pytest.fixture
+def ensure_calls(monkeypatch, tmp_path):
+    monkeypatch.setenv("TRACE_INFRA_CACHE", str(tmp_path / "cache.json"))
+    monkeypatch.setenv("DATABRICKS_HOST", "https://example.cloud.databricks.com/")
+    monkeypatch.setenv("DATABRICKS_TOKEN", "tok")
+    monkeypatch.setenv("MLFLOW_TRACING_SQL_WAREHOUSE_ID", "wh")
+    monkeypatch.setattr(mlflow, "set_tracking_uri", lambda uri: None)
+    for name in (
+        "TRACE_INFRA_CACHE_TTL_SECONDS",
+        "TRACE_INFRA_CACHE_REVALIDATE",
+        "DATABRICKS_CATALOG",
+        "DATABRICKS_SCHEMA",
+        "MLFLOW_EXPERIMENT_ID",
+        "MLFLOW_EXPERIMENT_NAME",
+    ):
+        monkeypatch.delenv(name, raising=False)
+    calls: list[dict] = []
+
+    def fake_ensure(**kwargs):
+        calls.append(kwargs)
+        return RESULT
+
+    monkeypatch.setattr(databricks, "ensure_trace_infrastructure", fake_ensure)
+    return calls
+
+
+def test_cache_get_put_and_ttl(tmp_path):
+    cache = TraceInfraCache(tmp_path / "sub" / "cache.json", ttl_seconds=60)
+    key = trace_infrastructure_cache_key("https://h/", "main", "s", "/Shared/x")
+    assert key == "https://h|main|s|/Shared/x"
+    assert cache.get(key) is None
+    cache.put(key, RESULT, now=1000.0)
+    assert cache.get(key, now=1059.0) == RESULT
+    assert cache.get(key, now=1061.0) is None
+    data = json.loads((tmp_path / "sub" / "cache.json").read_text())
+    assert "tok" not in json.dumps(data)
+
+
+def test_corrupt_cache_is_a_miss(tmp_path):
+    path = tmp_path / "cache.json"
+    path.write_text("{not json")
+    cache = TraceInfraCache(path, ttl_seconds=60)
+    assert cache.get("k") is None
+    cache.put("k", RESULT)
+    assert cache.get("k") == RESULT
+
+
+def test_warm_start_skips_mlflow(ensure_calls):
+    assert init_and_connect(verbose=False, update_environ=False) == RESULT
+    assert init_and_connect(verbose=False, update_environ=False) == RESULT
+    assert len(ensure_calls) == 1
+
+    # A different schema is a different key.
+    init_and_connect(schema="other", verbose=False, update_environ=False)
+    assert len(ensure_calls) == 2
+
+
+def test_warm_start_still_connects_mlflow(ensure_calls, monkeypatch):
+    init_and_connect(verbose=False, update_environ=False)
+    monkeypatch.delenv("MLFLOW_TRACING_SQL_WAREHOUSE_ID")
+    recorded: list[str] = []
+    monkeypatch.setattr(mlflow, "set_tracking_uri", recorded.append)
+    init_and_connect(warehouse_id="wh1", verbose=False, update_environ=False)
+    assert len(ensure_calls) == 1
+    assert os.environ["MLFLOW_TRACING_SQL_WAREHOUSE_ID"] == "wh1"
+    assert recorded == ["databricks"]
+
+
+def test_refresh_and_disabled_cache_resolve_again(ensure_calls, monkeypatch):
+    init_and_connect(verbose=False, update_environ=False)
+    init_and_connect(verbose=False, update_environ=False, refresh=True)
+    assert len(ensure_calls) == 2
+
+    monkeypatch.setenv("TRACE_INFRA_CACHE_TTL_SECONDS", "0")
+    init_and_connect(verbose=False, update_environ=False)
+    assert len(ensure_calls) == 3
+
+
+def test_background_revalidation_rewrites_entry(ensure_calls, monkeypatch):
+    init_and_connect(verbose=False, update_environ=False)
+    monkeypatch.setenv("TRACE_INFRA_CACHE_REVALIDATE", "true")
+    started: list[threading.Thread] = []
+    original_start = threading.Thread.start
+
+    def track_start(thread):
+        started.append(thread)
+        original_start(thread)
+
+    monkeypatch.setattr(threading.Thread, "start", track_start)
+    assert init_and_connect(verbose=False, update_environ=False) == RESULT
+    revalidators = [t for t in started if t.name == "trace-infra-revalidate"]
+    assert len(revalidators) == 1
+    revalidators[0].join(timeout=5)
+    assert len(ensure_calls) == 2
+    assert ensure_calls[1]["verbose"] is False
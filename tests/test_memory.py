@@ -0,0 +1,106 @@
+"""Tests for observability/memory (per-step tracemalloc peaks and state sizes)."""
+
+import logging
+import sys
+import tracemalloc
+from pathlib import Path
+from typing import AsyncGenerator
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from google.adk.agents import BaseAgent, SequentialAgent
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.apps import App
+from google.adk.events import Event
+from google.adk.runners import InMemoryRunner
+from google.genai import types
+
+import observability.memory as memory_mod
+from agents.reader import DocumentReaderAgent
+from mock_llm import register_mock_llm
+from observability.llm_callbacks import build_instrumented_llm_agent
+from observability.memory import MemoryTracePlugin, MemoryTraceSettings, state_value_bytes
+
+
+class AllocatingAgent(BaseAgent):
+    name: str = "Allocator"
+
+    async def _run_async_impl(self, ctx: InvocationContext) -> AsyncGenerator[Event, None]:
+        scratch = [bytes(1024) for _ in range(4096)]  # ~4 MiB, freed before the step ends
+        ctx.session.state["scratch_count"] = len(scratch)
+        del scratch
+        yield Event(author=self.name)
+
+
+@pytest.fixture
+def plugin(monkeypatch):
+    was_tracing = tracemalloc.is_tracing()
+    plugin = MemoryTracePlugin(MemoryTraceSettings(enabled=True))
+    yield plugin
+    monkeypatch.setattr(memory_mod, "_tracker", None)
+    if not was_tracing:
+        tracemalloc.stop()
+
+
+async def _run(app: App) -> None:
+    runner = InMemoryRunner(app=app)
+    session = await runner.session_service.create_session(app_name=app.name, user_id="u")
+    message = types.Content(role="user", parts=[types.Part(text="go")])
+    async for _ in runner.run_async(user_id="u", session_id=session.id, new_message=message):
+        pass
+
+
+def _records(caplog, event_type: str) -> dict[str, logging.LogRecord]:
+    return {
+        r.agent_name: r
+        for r in caplog.records
+        if getattr(r, "event_type", None) == event_type
+    }
+
+
+def test_settings_from_env(monkeypatch):
+    monkeypatch.delenv("AGENT_MEMORY_TRACE", raising=False)
+    assert MemoryTraceSettings.from_env() == MemoryTraceSettings()
+    monkeypatch.setenv("AGENT_MEMORY_TRACE", "true")
+    monkeypatch.setenv("AGENT_MEMORY_TRACE_FRAMES", "5")
+    assert MemoryTraceSettings.from_env() == MemoryTraceSettings(enabled=True, frames=5)
+
+
+def test_state_value_bytes():
+    assert state_value_bytes("é") == 2
+    assert state_value_bytes({"a": [1, 2]}) == len('{"a": [1, 2]}')
+
+
+async def test_memory_step_per_agent(plugin, caplog, tmp_path):
+    (tmp_path / "a.md").write_text("alpha " * 2000)
+    reader = DocumentReaderAgent(documents_dir=str(tmp_path))
+    root = SequentialAgent(name="MemoryWorkflow", sub_agents=[reader, AllocatingAgent()])
+    caplog.set_level(logging.INFO, logger="observability.session_logs")
+    await _run(App(name="memory_test", root_agent=root, plugins=[plugin]))
+
+    steps = _records(caplog, "agent.memory")
+    assert set(steps) == {"Agent2_DocumentReader", "Allocator", "MemoryWorkflow"}
+    reader_step = steps["Agent2_DocumentReader"]
+    assert reader_step.state_bytes_documents_json >= 12000
+    assert reader_step.state_bytes_written >= reader_step.state_bytes_documents_json
+    allocator = steps["Allocator"]
+    assert allocator.memory_traced_peak_bytes - allocator.memory_traced_delta_bytes > 0
+    assert allocator.memory_traced_peak_bytes >= 4 * 1024 * 1024
+    assert not hasattr(allocator, "state_bytes_documents_json")
+    # The root's peak covers its children even though each child reset the peak.
+    assert steps["MemoryWorkflow"].memory_traced_peak_bytes >= allocator.memory_traced_peak_bytes
+
+
+async def test_llm_step_record_carries_memory_fields(plugin, caplog):
+    register_mock_llm()
+    agent = build_instrumented_llm_agent(
+        name="Summarizer", model="mock/synthetic", instruction="Summarize.", output_key="summary"
+    )
+    caplog.set_level(logging.INFO, logger="observability.session_logs")
+    await _run(App(name="memory_llm_test", root_agent=agent, plugins=[plugin]))
+
+    (llm_step,) = _records(caplog, "agent.llm_step").values()
+    assert llm_step.memory_traced_peak_bytes > 0 and llm_step.memory_rss_bytes > 0
+    assert _records(caplog, "agent.memory")["Summarizer"].state_bytes_summary > 0
@@ -0,0 +1,101 @@
+"""Tests for observability/metrics (instruments, bucket views, span-derived durations)."""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from opentelemetry.sdk.metrics import MeterProvider
+from opentelemetry.sdk.metrics.export import InMemoryMetricReader
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.trace import Status, StatusCode
+
+import observability.metrics as metrics_mod
+from agents.reader import DocumentReaderAgent
+from observability.metrics import (
+    DURATION_BUCKETS_S,
+    AgentMetrics,
+    MetricsSettings,
+    MetricsSpanProcessor,
+    metric_views,
+)
+
+
+@pytest.fixture
+def collected(monkeypatch):
+    reader = InMemoryMetricReader()
+    provider = MeterProvider(metric_readers=[reader], views=metric_views(), shutdown_on_exit=False)
+    instruments = AgentMetrics(provider.get_meter("test"))
+    monkeypatch.setattr(metrics_mod, "_agent_metrics", instruments)
+
+    def points() -> dict[str, list]:
+        out: dict[str, list] = {}
+        data = reader.get_metrics_data()
+        for rm in data.resource_metrics if data else ():
+            for sm in rm.scope_metrics:
+                for metric in sm.metrics:
+                    out[metric.name] = list(metric.data.data_points)
+        return out
+
+    yield instruments, points
+    provider.shutdown()
+
+
+def test_settings_from_env(monkeypatch):
+    monkeypatch.delenv("OTEL_METRICS_EXPORTER", raising=False)
+    assert MetricsSettings.from_env() is None
+    monkeypatch.setenv("OTEL_METRICS_EXPORTER", "otlp")
+    monkeypatch.setenv("OTEL_METRIC_EXPORT_INTERVAL", "10000")
+    assert MetricsSettings.from_env() == MetricsSettings(export_interval_millis=10000.0)
+
+
+def test_invoke_agent_spans_feed_step_duration_histogram(collected):
+    instruments, points = collected
+    tracer_provider = TracerProvider(shutdown_on_exit=False)
+    tracer_provider.add_span_processor(MetricsSpanProcessor(instruments))
+    tracer = tracer_provider.get_tracer(__name__)
+    for failed in (False, True):
+        with tracer.start_as_current_span("invoke_agent Reader") as span:
+            span.set_attribute("gen_ai.operation.name", "invoke_agent")
+            span.set_attribute("gen_ai.agent.name", "Reader")
+            with tracer.start_as_current_span("call_llm") as llm:
+                llm.set_attribute("gen_ai.request.model", "mock/synthetic")
+            if failed:
+                span.set_status(Status(StatusCode.ERROR))
+
+    steps = points()["agent.step.duration"]
+    assert {(p.attributes["gen_ai.agent.name"], p.attributes["error"]) for p in steps} == {
+        ("Reader", False),
+        ("Reader", True),
+    }
+    assert tuple(steps[0].explicit_bounds) == DURATION_BUCKETS_S
+    (llm_point,) = points()["gen_ai.client.operation.duration"]
+    assert llm_point.count == 2
+    assert llm_point.attributes == {"gen_ai.request.model": "mock/synthetic"}
+
+
+def test_token_usage_by_type(collected):
+    instruments, points = collected
+    instruments.record_llm_tokens("Summarizer", input_tokens=1200, output_tokens=80, cached_tokens=1024)
+    usage = {p.attributes["gen_ai.token.type"]: p.sum for p in points()["gen_ai.client.token.usage"]}
+    assert usage == {"input": 1200, "output": 80, "cached": 1024}
+
+
+def test_reader_pass_and_cache_hits(collected, tmp_path):
+    instruments, points = collected
+    (tmp_path / "a.md").write_text("x" * 1000)
+    (tmp_path / "b.txt").write_text("y" * 500)
+    reader = DocumentReaderAgent(documents_dir=str(tmp_path))
+    reader.read_documents()
+
+    got = points()
+    assert got["reader.files"][0].value == 2
+    assert got["reader.bytes"][0].value == 1500
+    assert got["reader.throughput"][0].count == 1
+
+    for hit in (True, True, False):
+        instruments.record_cache("corpus", hit)
+    cache = {p.attributes["result"]: p.value for p in points()["agent.cache.requests"]}
+    assert cache == {"hit": 2, "miss": 1}
@@ -0,0 +1,108 @@
+"""Tests for mock_llm (synthetic responses, record/replay cassettes)."""
+
+import random
+import sys
+from pathlib import Path
+from typing import AsyncGenerator
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from google.adk.models.base_llm import BaseLlm
+from google.adk.models.llm_request import LlmRequest
+from google.adk.models.llm_response import LlmResponse
+from google.adk.models.registry import LLMRegistry
+from google.genai import types
+
+from agents.schemas import FileSummaries
+from mock_llm import Cassette, MockLlm, parse_distribution, register_mock_llm
+
+
+def _request(text: str, schema=None) -> LlmRequest:
+    request = LlmRequest(
+        contents=[types.Content(role="user", parts=[types.Part(text=text)])]
+    )
+    request.config.system_instruction = "You are a test agent."
+    if schema is not None:
+        request.set_output_schema(schema)
+    return request
+
+
+async def _one(llm: BaseLlm, request: LlmRequest) -> LlmResponse:
+    return [r async for r in llm.generate_content_async(request)][-1]
+
+
+class CannedLlm(BaseLlm):
+    calls: int = 0
+
+    @classmethod
+    def supported_models(cls) -> list[str]:
+        return [r"canned-.*"]
+
+    async def generate_content_async(
+        self, llm_request: LlmRequest, stream: bool = False
+    ) -> AsyncGenerator[LlmResponse, None]:
+        yield LlmResponse(
+            content=types.Content(role="model", parts=[types.Part(text="recorded answer")]),
+            usage_metadata=types.GenerateContentResponseUsageMetadata(
+                prompt_token_count=11, candidates_token_count=3
+            ),
+            finish_reason=types.FinishReason.STOP,
+        )
+
+
+def test_parse_distribution_specs():
+    rng = random.Random(0)
+    assert parse_distribution("250")(rng) == 250.0
+    assert 10 <= parse_distribution("uniform:10:20")(rng) <= 20
+    assert parse_distribution("lognormal:100:0.5")(rng) > 0
+    with pytest.raises(ValueError):
+        parse_distribution("poisson:3")
+
+
+def test_registry_resolves_mock_models():
+    register_mock_llm()
+    assert isinstance(LLMRegistry.new_llm("mock/synthetic"), MockLlm)
+
+
+def test_record_mode_requires_an_inner_model():
+    for model in ("mock/record", "mock/record/", "mock/record/ "):
+        with pytest.raises(ValueError, match="mock/record/<model>"):
+            MockLlm(model=model)
+    assert MockLlm(model="mock/record/canned-v1").mode == "record"
+
+
+async def test_synthetic_is_deterministic_and_schema_valid():
+    llm = MockLlm(model="mock/synthetic", output_tokens="40", reasoning_tokens="5", seed=7)
+    request = _request("summarize", FileSummaries)
+    first, second = await _one(llm, request), await _one(llm, request)
+    assert first.content == second.content
+    visible = [p.text for p in first.content.parts if not p.thought][0]
+    FileSummaries.model_validate_json(visible)
+    assert first.usage_metadata.candidates_token_count == 40
+    assert first.usage_metadata.thoughts_token_count == 5
+
+
+async def test_record_then_replay_roundtrip(tmp_path):
+    LLMRegistry.register(CannedLlm)
+    path = str(tmp_path / "cassette.jsonl")
+    recorder = MockLlm(model="mock/record/canned-v1", cassette_path=path)
+    recorded = await _one(recorder, _request("q1"))
+    assert len(Cassette(path)) == 1
+
+    player = MockLlm(model="mock/replay", cassette_path=path)
+    replayed = await _one(player, _request("q1"))
+    assert replayed.content.parts[0].text == recorded.content.parts[0].text
+    assert replayed.usage_metadata.prompt_token_count == 11
+
+
+async def test_replay_strict_miss_raises_and_lenient_falls_back(tmp_path):
+    LLMRegistry.register(CannedLlm)
+    path = str(tmp_path / "cassette.jsonl")
+    await _one(MockLlm(model="mock/record/canned-v1", cassette_path=path), _request("q1"))
+
+    with pytest.raises(LookupError):
+        await _one(MockLlm(model="mock/replay", cassette_path=path), _request("other"))
+    lenient = MockLlm(model="mock/replay", cassette_path=path, strict=False)
+    assert (await _one(lenient, _request("other"))).content.parts[0].text == "recorded answer"
@@ -1,16 +1,24 @@
-"""Tests for observability/otel_sdk and adk_defaults."""
+"""Tests for observability/otel_sdk, export_pipeline and adk_defaults."""
 
+import json
 import logging
 import os
 import subprocess
 import sys
 import textwrap
+import threading
 from pathlib import Path
 
+import pytest
+
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import SpanExporter, SpanExportResult
+
 from observability.adk_defaults import apply_adk_telemetry_defaults
-from observability.otel_sdk import configure_otel_from_env
+from observability.export_pipeline import BatchExportSettings, InstrumentedBatchSpanProcessor
+from observability.otel_sdk import configure_otel_from_env, otlp_export_diagnostics
 
 
 def test_apply_adk_telemetry_defaults_sets_capture_when_missing(monkeypatch):
@@ -51,3 +59,217 @@ def test_configure_otel_from_env_is_idempotent_for_noop_path():
         """
     ).strip()
     subprocess.run([sys.executable, "-c", code], check=True, cwd=str(root))
+
+
+class _SlowSpanExporter(SpanExporter):
+    def __init__(self, result=SpanExportResult.SUCCESS):
+        self.result = result
+        self.gate = threading.Event()
+        self.spans = []
+
+    def export(self, spans):
+        self.gate.wait(5)
+        self.spans.extend(spans)
+        return self.result
+
+    def shutdown(self):
+        self.gate.set()
+
+
+def test_batch_export_settings_from_env(monkeypatch):
+    monkeypatch.setenv("OTEL_BSP_MAX_QUEUE_SIZE", "100")
+    monkeypatch.setenv("OTEL_BSP_MAX_EXPORT_BATCH_SIZE", "10")
+    monkeypatch.setenv("OTEL_BLRP_SCHEDULE_DELAY", "250")
+    spans = BatchExportSettings.from_env("spans")
+    logs = BatchExportSettings.from_env("logs")
+    assert (spans.max_queue_size, spans.max_export_batch_size) == (100, 10)
+    assert spans.schedule_delay_millis == 5000.0
+    assert logs.schedule_delay_millis == 250.0
+    monkeypatch.setenv("OTEL_BSP_MAX_EXPORT_BATCH_SIZE", "1000")
+    assert BatchExportSettings.from_env("spans") == BatchExportSettings()  # batch > queue
+    monkeypatch.setenv("OTEL_BSP_MAX_EXPORT_BATCH_SIZE", "10")
+    monkeypatch.setenv("OTEL_BSP_MAX_QUEUE_SIZE", "abc")
+    spans = BatchExportSettings.from_env("spans")
+    assert (spans.max_queue_size, spans.max_export_batch_size) == (2048, 10)
+
+
+def test_malformed_otel_settings_do_not_stop_the_app(tmp_path):
+    """``load_config`` runs when ``workflow`` is imported: bad values are warned, not raised."""
+    root = Path(__file__).resolve().parent.parent
+    env = dict(
+        os.environ,
+        OTEL_BSP_MAX_QUEUE_SIZE="abc",
+        OTEL_BLRP_SCHEDULE_DELAY="-1",
+        OTEL_EXPORTER_OTLP_COMPRESSION="brotli",
+        OTLP_SPOOL_DIR=str(tmp_path),
+        OTLP_SPOOL_MAX_MB="lots",
+        TAIL_SAMPLING_RATE="half",
+        TELEMETRY_BLOB_DIR=str(tmp_path),
+        TELEMETRY_BLOB_MIN_CHARS="8k",
+    )
+    code = "import config; c = config.load_config(); print(c.span_export.max_queue_size)"
+    done = subprocess.run(
+        [sys.executable, "-c", code], cwd=str(root), env=env, capture_output=True, text=True
+    )
+    assert done.returncode == 0, done.stderr
+    assert done.stdout.strip() == "2048"
+    for name in (
+        "OTEL_BSP_MAX_QUEUE_SIZE",
+        "OTEL_BLRP_",
+        "OTEL_EXPORTER_OTLP_COMPRESSION",
+        "OTLP_SPOOL_MAX_MB",
+        "TAIL_SAMPLING_RATE",
+        "TELEMETRY_BLOB_MIN_CHARS",
+    ):
+        assert name in done.stderr
+
+
+def test_instrumented_span_processor_counts_exports_and_drops():
+    exporter = _SlowSpanExporter()
+    settings = BatchExportSettings(
+        max_queue_size=4, max_export_batch_size=4, schedule_delay_millis=60_000
+    )
+    processor = InstrumentedBatchSpanProcessor(exporter, settings)
+    provider = TracerProvider()
+    provider.add_span_processor(processor)
+    tracer = provider.get_tracer("test")
+    for i in range(10):
+        with tracer.start_as_current_span(f"s{i}"):
+            pass
+    exporter.gate.set()
+    processor.force_flush()
+    stats = processor.diagnostics()
+    assert stats["queued"] == 10
+    assert stats["exported"] + stats["dropped"] == 10
+    assert stats["exported"] == len(exporter.spans)
+    assert stats["dropped"] > 0 and stats["in_queue"] == 0
+    assert stats["settings"]["max_queue_size"] == 4
+    provider.shutdown()
+
+
+def test_instrumented_span_processor_counts_failed_batches():
+    exporter = _SlowSpanExporter(SpanExportResult.FAILURE)
+    exporter.gate.set()
+    processor = InstrumentedBatchSpanProcessor(exporter, BatchExportSettings())
+    provider = TracerProvider()
+    provider.add_span_processor(processor)
+    with provider.get_tracer("test").start_as_current_span("s"):
+        pass
+    processor.force_flush()
+    stats = processor.diagnostics()
+    assert (stats["failed"], stats["failed_batches"], stats["exported"]) == (1, 1, 0)
+    provider.shutdown()
+
+
+def test_otlp_export_diagnostics_before_setup(monkeypatch):
+    import observability.otel_sdk as otel_sdk_mod
+
+    monkeypatch.setattr(otel_sdk_mod, "_export_otel_configured", False)
+    monkeypatch.setattr(otel_sdk_mod, "_span_processor", None)
+    monkeypatch.setattr(otel_sdk_mod, "_log_processor", None)
+    monkeypatch.setattr(otel_sdk_mod, "_tail_sampler", None)
+    monkeypatch.setattr(otel_sdk_mod, "_blob_offloader", None)
+    monkeypatch.setattr(otel_sdk_mod, "_parquet_sink", None)
+    monkeypatch.setattr(otel_sdk_mod, "_span_slot", None)
+    assert otlp_export_diagnostics() == {
+        "initialized": False,
+        "spans": None,
+        "logs": None,
+        "tail_sampling": None,
+        "blob_offload": None,
+        "parquet_sink": None,
+        "process": None,
+    }
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="needs os.fork")
+def test_forked_child_stops_the_batch_workers_it_replaces(tmp_path):
+    """The SDK restarts every inherited batch worker in the child; the replaced ones exit."""
+    root = Path(__file__).resolve().parent.parent
+    code = textwrap.dedent(
+        f"""
+        import os
+        import sys
+        import threading
+        import time
+        sys.path.insert(0, {str(root)!r})
+        os.environ["OTEL_EXPORTER_OTLP_ENDPOINT"] = "http://127.0.0.1:9/v1/traces"
+        os.environ["TELEMETRY_PARQUET_DIR"] = {str(tmp_path)!r}
+        from observability.otel_sdk import configure_otel_from_env
+
+        def batch_workers():
+            return [t for t in threading.enumerate() if t.name.startswith("OtelBatch")]
+
+        configure_otel_from_env(use_print_status=False, shutdown_timeout_millis=500)
+        before = len(batch_workers())
+        pid = os.fork()
+        if pid == 0:
+            deadline = time.monotonic() + 5
+            while len(batch_workers()) > before and time.monotonic() < deadline:
+                time.sleep(0.01)
+            os._exit(0 if len(batch_workers()) == before == 4 else 1)
+        _, status = os.waitpid(pid, 0)
+        assert os.waitstatus_to_exitcode(status) == 0, status
+        """
+    ).strip()
+    subprocess.run([sys.executable, "-c", code], check=True, cwd=str(root), timeout=60)
+
+
+def test_forked_children_rebuild_the_pipeline_with_their_own_resource(tmp_path):
+    """Pool workers and bare forks export their spans with their own pid (subprocess)."""
+    pq = pytest.importorskip("pyarrow.parquet")
+    root = Path(__file__).resolve().parent.parent
+    code = textwrap.dedent(
+        f"""
+        import json
+        import multiprocessing
+        import os
+        import sys
+        sys.path.insert(0, {str(root)!r})
+        os.environ.pop("OTEL_EXPORTER_OTLP_ENDPOINT", None)
+        os.environ["TELEMETRY_PARQUET_DIR"] = {str(tmp_path)!r}
+        os.environ["TELEMETRY_WORKER_ID"] = "web"
+        from opentelemetry import trace
+        from observability.otel_sdk import configure_otel_from_env, otlp_export_diagnostics
+        configure_otel_from_env(use_print_status=False)
+        tracer = trace.get_tracer("fork-test")  # created before the fork, like ADK's
+
+        def work(i):
+            with tracer.start_as_current_span(f"pool-{{i}}"):
+                pass
+            return otlp_export_diagnostics()["process"]
+
+        with tracer.start_as_current_span("parent"):
+            pass
+        pool = multiprocessing.get_context("fork").Pool(2)
+        workers = pool.map(work, range(6))
+        pool.close()
+        pool.join()
+        child = os.fork()
+        if child == 0:
+            with tracer.start_as_current_span("forked"):
+                pass
+            sys.exit(0)
+        os.waitpid(child, 0)
+        print(json.dumps({{"parent": os.getpid(), "forked": child, "workers": workers}}))
+        """
+    ).strip()
+    out = subprocess.run(
+        [sys.executable, "-c", code], check=True, cwd=str(root), capture_output=True, text=True
+    )
+    pids = json.loads(out.stdout.strip().splitlines()[-1])
+    parent = pids["parent"]
+
+    rows = pq.read_table(str(tmp_path / "spans"), columns=["name", "resource"]).to_pylist()
+    resources = {row["name"]: dict(row["resource"]["attributes"]) for row in rows}
+    assert set(resources) == {"parent", "forked", *(f"pool-{i}" for i in range(6))}
+    assert resources["parent"]["process.pid"] == str(parent)
+    assert resources["parent"]["service.instance.id"] == "web"
+    assert "process.parent_pid" not in resources["parent"]
+    assert resources["forked"]["process.pid"] == str(pids["forked"])
+    for i, worker in enumerate(pids["workers"]):
+        attributes = resources[f"pool-{i}"]
+        assert worker["process.pid"] != parent and worker["process.parent_pid"] == parent
+        assert attributes["process.pid"] == str(worker["process.pid"])
+        assert attributes["process.parent_pid"] == str(parent)
+        assert attributes["service.instance.id"] == f"web-{worker['process.pid']}"
@@ -0,0 +1,104 @@
+"""Tests for observability/otlp_exporters (compression + payload byte accounting)."""
+
+import gzip
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from opentelemetry.sdk.trace import SpanProcessor, TracerProvider
+from opentelemetry.sdk.trace.export import SpanExportResult
+
+from observability.otlp_exporters import AccountingOTLPSpanExporter, otlp_compression_from_env
+from observability.otlp_headers import merge_otel_header_string, parse_otel_headers
+
+
+@pytest.fixture
+def collector():
+    received = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            body = self.rfile.read(int(self.headers["Content-Length"]))
+            received.append((dict(self.headers), body))
+            self.send_response(200)
+            self.end_headers()
+
+        def log_message(self, *args):
+            pass
+
+    server = HTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}/v1/traces", received
+    server.shutdown()
+
+
+def _export_spans(exporter, n=20):
+    results = []
+
+    class ExportEach(SpanProcessor):
+        def on_end(self, span):
+            results.append(exporter.export([span]))
+
+    provider = TracerProvider(shutdown_on_exit=False)
+    provider.add_span_processor(ExportEach())
+    tracer = provider.get_tracer("test")
+    for i in range(n):
+        with tracer.start_as_current_span("llm_call") as span:
+            span.set_attribute("gcp.vertex.agent.llm_request", "prompt text " * 500)
+    return results
+
+
+def test_compression_from_env(monkeypatch):
+    monkeypatch.delenv("OTEL_EXPORTER_OTLP_COMPRESSION", raising=False)
+    assert otlp_compression_from_env() == "none"
+    monkeypatch.setenv("OTEL_EXPORTER_OTLP_COMPRESSION", "GZIP")
+    assert otlp_compression_from_env() == "gzip"
+    monkeypatch.setenv("OTEL_EXPORTER_OTLP_COMPRESSION", "brotli")
+    assert otlp_compression_from_env() == "none"  # warned, not raised: load_config runs on import
+
+
+def test_gzip_with_init_merged_headers_counts_raw_and_wire_bytes(collector):
+    endpoint, received = collector
+    merged = merge_otel_header_string(
+        "x-custom=1",
+        {
+            "Authorization": "Bearer tok",
+            "x-mlflow-experiment-id": "123",
+            "X-Databricks-UC-Table-Name": "main.t.mlflow_experiment_trace_otel_spans",
+        },
+    )
+    exporter = AccountingOTLPSpanExporter(
+        endpoint=endpoint, headers=parse_otel_headers(merged), compression="gzip"
+    )
+    assert _export_spans(exporter, n=3) == [SpanExportResult.SUCCESS] * 3
+
+    headers, body = received[0]
+    assert headers["Content-Encoding"] == "gzip"
+    assert headers["x-mlflow-experiment-id"] == "123"
+    assert headers["Authorization"] == "Bearer tok"
+    raw = gzip.decompress(body)
+
+    stats = exporter.payload_stats.snapshot()
+    assert stats["requests"] == 3
+    assert stats["wire_last"] == len(received[-1][1])
+    assert stats["raw_bytes"] == sum(len(gzip.decompress(b)) for _, b in received)
+    assert stats["wire_bytes"] == sum(len(b) for _, b in received)
+    assert stats["compression_ratio"] < 0.2
+    assert len(raw) > len(body)
+    exporter.shutdown()
+
+
+def test_uncompressed_wire_bytes_equal_raw(collector):
+    endpoint, received = collector
+    exporter = AccountingOTLPSpanExporter(endpoint=endpoint, headers={})
+    _export_spans(exporter, n=2)
+    stats = exporter.payload_stats.snapshot()
+    assert "Content-Encoding" not in received[0][0]
+    assert stats["raw_bytes"] == stats["wire_bytes"] == sum(len(b) for _, b in received)
+    exporter.shutdown()
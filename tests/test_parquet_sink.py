@@ -0,0 +1,134 @@
+"""Tests for observability/parquet_sink and observability/local_queries."""
+
+import logging
+import re
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+pq = pytest.importorskip("pyarrow.parquet")
+
+from opentelemetry.sdk._logs import LoggerProvider, LoggingHandler
+from opentelemetry.sdk._logs.export import SimpleLogRecordProcessor
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+from opentelemetry.trace import Status, StatusCode
+
+from observability.local_queries import QUERIES_DIR, translate_query
+from observability.parquet_sink import (
+    ParquetLogExporter,
+    ParquetSinkSettings,
+    ParquetSpanExporter,
+)
+
+TABLES_DIR = Path(__file__).resolve().parent.parent / "sql" / "mlflow_trace_tables"
+
+
+def _ddl_columns(filename: str) -> list[str]:
+    """Top-level column names of a reference CREATE TABLE."""
+    body = (TABLES_DIR / filename).read_text().split("(", 1)[1]
+    return re.findall(r"^  (\w+) ", body, flags=re.MULTILINE)
+
+
+def _write_telemetry(tmp_path):
+    settings = ParquetSinkSettings(directory=str(tmp_path))
+    tracer_provider = TracerProvider()
+    tracer_provider.add_span_processor(SimpleSpanProcessor(ParquetSpanExporter(settings)))
+    logger_provider = LoggerProvider()
+    logger_provider.add_log_record_processor(SimpleLogRecordProcessor(ParquetLogExporter(settings)))
+    logger = logging.getLogger("parquet_sink_test")
+    handler = LoggingHandler(logger_provider=logger_provider)
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+    tracer = tracer_provider.get_tracer("test")
+    with tracer.start_as_current_span("invocation") as root:
+        root.set_attribute("tokens", 12)
+        with tracer.start_as_current_span("call_llm") as child:
+            child.set_attribute("gen_ai.request.model", "m")
+            child.add_event("profile", {"top": ("a", "b")})
+            child.set_status(Status(StatusCode.ERROR, "boom"))
+        logger.info(
+            "step done",
+            extra={
+                "event_type": "agent.llm_step",
+                "session_id": "s1",
+                "invocation_id": "i1",
+                "agent_name": "reader",
+                "input_tokens": 7,
+            },
+        )
+    logger.removeHandler(handler)
+    return root
+
+
+def test_rows_match_reference_layout(tmp_path):
+    root = _write_telemetry(tmp_path)
+    span_files = list((tmp_path / "spans").glob("date=*/part-*.parquet"))
+    log_files = list((tmp_path / "logs").glob("date=*/part-*.parquet"))
+    assert len(span_files) == 2 and len(log_files) == 1
+    assert not list(tmp_path.rglob("*.tmp"))
+
+    spans = pq.read_table(span_files[0].parent).to_pylist()
+    assert list(pq.read_schema(span_files[0]).names) == _ddl_columns(
+        "mlflow_experiment_trace_otel_spans.sql"
+    )
+    by_name = {s["name"]: s for s in spans}
+    trace_id = format(root.get_span_context().trace_id, "032x")
+    assert by_name["invocation"]["trace_id"] == trace_id
+    assert by_name["invocation"]["parent_span_id"] == ""
+    assert by_name["call_llm"]["parent_span_id"] == by_name["invocation"]["span_id"]
+    assert by_name["call_llm"]["status"] == {"message": "boom", "code": "STATUS_CODE_ERROR"}
+    assert by_name["invocation"]["status"]["code"] is None
+    assert by_name["invocation"]["kind"] == "SPAN_KIND_INTERNAL"
+    assert dict(by_name["invocation"]["attributes"]) == {"tokens": "12"}
+    assert dict(by_name["call_llm"]["events"][0]["attributes"]) == {"top": '["a", "b"]'}
+
+    logs = pq.read_table(log_files[0]).to_pylist()
+    assert list(pq.read_schema(log_files[0]).names) == _ddl_columns(
+        "mlflow_experiment_trace_otel_logs.sql"
+    )
+    attributes = dict(logs[0]["attributes"])
+    assert logs[0]["body"] == "step done"
+    assert logs[0]["trace_id"] == trace_id
+    assert logs[0]["severity_number"] == "SEVERITY_NUMBER_INFO"
+    assert (attributes["event_type"], attributes["input_tokens"]) == ("agent.llm_step", "7")
+
+
+def test_settings_from_env(monkeypatch):
+    monkeypatch.delenv("TELEMETRY_PARQUET_DIR", raising=False)
+    assert ParquetSinkSettings.from_env() is None
+    monkeypatch.setenv("TELEMETRY_PARQUET_DIR", "/tmp/traces")
+    assert ParquetSinkSettings.from_env() == ParquetSinkSettings("/tmp/traces", "zstd")
+
+
+def test_translate_query_rewrites_tables_and_functions():
+    sql = translate_query(
+        "-- uses `dev_ai`.`agent_traces`.`mlflow_experiment_trace_unified`\n"
+        "SELECT approx_percentile(x, 0.5), TIMESTAMP_MILLIS(t) AS `day`\n"
+        "FROM `dev_ai`.`agent_traces`.`mlflow_experiment_trace_otel_spans` s\n"
+        "JOIN main.mlflow_traces.mlflow_experiment_trace_otel_logs l ON 1 = 1"
+    )
+    assert "FROM otel_spans s" in sql
+    assert "JOIN otel_logs l" in sql
+    assert 'approx_quantile(x, 0.5), epoch_ms(t) AS "day"' in sql
+    assert "unified" not in sql
+
+    with pytest.raises(ValueError, match="mlflow_experiment_trace_unified"):
+        translate_query("SELECT * FROM `c`.`s`.`mlflow_experiment_trace_unified`")
+
+
+@pytest.mark.parametrize(
+    "query",
+    ["per_invocation_llm_tokens_raw", "span_latency_percentiles_by_name_raw", "error_spans"],
+)
+def test_bundled_queries_run_locally(tmp_path, query):
+    pytest.importorskip("duckdb")
+    from observability.local_queries import connect, run_query
+
+    _write_telemetry(tmp_path)
+    sql = (QUERIES_DIR / f"{query}.sql").read_text()
+    rows = run_query(connect(str(tmp_path)), sql).fetchall()
+    assert len(rows) == (2 if query.startswith("span_latency") else 1)
@@ -0,0 +1,115 @@
+"""Tests for observability/profiling (per-invocation profiler plugin)."""
+
+import asyncio
+import pstats
+import sys
+import time
+from pathlib import Path
+from typing import AsyncGenerator
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from google.adk.agents import BaseAgent
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.apps import App
+from google.adk.events import Event
+from google.adk.runners import InMemoryRunner
+from google.genai import types
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+
+from observability.profiling import InvocationProfilerPlugin, ProfilingSettings, _sampled
+
+
+def busy_work(seconds: float) -> int:
+    deadline = time.perf_counter() + seconds
+    n = 0
+    while time.perf_counter() < deadline:
+        n += 1
+    return n
+
+
+class BusyAgent(BaseAgent):
+    name: str = "Busy"
+
+    async def _run_async_impl(self, ctx: InvocationContext) -> AsyncGenerator[Event, None]:
+        busy_work(0.15)
+        await asyncio.sleep(0)
+        yield Event(author=self.name)
+
+
+@pytest.fixture
+def spans(monkeypatch):
+    import google.adk.runners as runners
+
+    exporter = InMemorySpanExporter()
+    provider = TracerProvider(shutdown_on_exit=False)
+    provider.add_span_processor(SimpleSpanProcessor(exporter))
+    monkeypatch.setattr(runners, "tracer", provider.get_tracer("gcp.vertex.agent"))
+    yield exporter
+    provider.shutdown()
+
+
+async def _invoke(plugin: InvocationProfilerPlugin) -> None:
+    runner = InMemoryRunner(app=App(name="profile_test", root_agent=BusyAgent(), plugins=[plugin]))
+    session = await runner.session_service.create_session(app_name="profile_test", user_id="u")
+    message = types.Content(role="user", parts=[types.Part(text="go")])
+    async for _ in runner.run_async(user_id="u", session_id=session.id, new_message=message):
+        pass
+
+
+def _profile_event(spans: InMemorySpanExporter):
+    (invocation,) = [s for s in spans.get_finished_spans() if s.name == "invocation"]
+    (event,) = [e for e in invocation.events if e.name == "profile"]
+    return event.attributes
+
+
+def test_settings_from_env(monkeypatch):
+    monkeypatch.delenv("PROFILE_INVOCATIONS", raising=False)
+    assert ProfilingSettings.from_env() is None
+    monkeypatch.setenv("PROFILE_INVOCATIONS", "0.1")
+    monkeypatch.setenv("PROFILE_MODE", "cprofile")
+    assert ProfilingSettings.from_env().mode == "cprofile"
+    with pytest.raises(ValueError):
+        ProfilingSettings(mode="perf")
+
+
+def test_sampling_is_deterministic():
+    ids = [f"e-{i}" for i in range(1000)]
+    picked = [i for i in ids if _sampled(i, 0.2)]
+    assert picked == [i for i in ids if _sampled(i, 0.2)]
+    assert 120 < len(picked) < 280
+
+
+async def test_stack_sampler_writes_folded_stacks(spans, tmp_path):
+    plugin = InvocationProfilerPlugin(ProfilingSettings(directory=str(tmp_path), interval_ms=1))
+    await _invoke(plugin)
+
+    attrs = _profile_event(spans)
+    assert attrs["profile.mode"] == "sample" and attrs["profile.samples"] > 10
+    assert attrs["session_id"] and attrs["invocation_id"]
+    assert any(line.startswith("busy_work") for line in attrs["profile.top"])
+    folded = Path(attrs["profile.path"]).read_text().splitlines()
+    assert Path(attrs["profile.path"]).name == f"{attrs['invocation_id']}.folded"
+    assert all(line.rsplit(" ", 1)[1].isdigit() for line in folded)
+    assert plugin.profiled == 1
+
+
+async def test_cprofile_writes_pstats(spans, tmp_path):
+    plugin = InvocationProfilerPlugin(ProfilingSettings(mode="cprofile", directory=str(tmp_path)))
+    await _invoke(plugin)
+
+    attrs = _profile_event(spans)
+    stats = pstats.Stats(attrs["profile.path"])
+    assert any(func == "busy_work" for (_, _, func) in stats.stats)
+    assert len(attrs["profile.top"]) == 15
+
+
+async def test_rate_zero_profiles_nothing(spans, tmp_path):
+    plugin = InvocationProfilerPlugin(ProfilingSettings(rate=0.0, directory=str(tmp_path)))
+    await _invoke(plugin)
+    (invocation,) = [s for s in spans.get_finished_spans() if s.name == "invocation"]
+    assert not invocation.events and not list(tmp_path.iterdir())
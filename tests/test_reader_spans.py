@@ -0,0 +1,96 @@
+"""Tests for observability/reader_spans (per-file reader spans, bounded cardinality)."""
+
+import json
+import logging
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+
+import observability.reader_spans as reader_spans
+from agents.reader import DocumentReaderAgent
+from config import load_config
+from observability.reader_spans import FileRead, path_hash, reader_pass_trace
+
+
+@pytest.fixture
+def spans(monkeypatch):
+    exporter = InMemorySpanExporter()
+    provider = TracerProvider(shutdown_on_exit=False)
+    provider.add_span_processor(SimpleSpanProcessor(exporter))
+    monkeypatch.setattr(reader_spans, "_tracer", provider.get_tracer(__name__))
+    yield exporter
+    provider.shutdown()
+
+
+def _corpus(tmp_path: Path, n: int) -> str:
+    for i in range(n):
+        (tmp_path / f"doc{i:03d}.md").write_text("lesson " * 50)
+    (tmp_path / "notes.txt").write_text("plain")
+    (tmp_path / "image.png").write_bytes(b"\x89PNG")
+    return str(tmp_path)
+
+
+def test_off_creates_no_spans(spans, tmp_path):
+    DocumentReaderAgent(documents_dir=_corpus(tmp_path, 3)).read_documents()
+    assert spans.get_finished_spans() == ()
+
+
+def test_unknown_mode_is_rejected_before_the_first_pass(monkeypatch, caplog, tmp_path):
+    monkeypatch.setenv("READER_TRACE_FILES", "Verbose")
+    with caplog.at_level(logging.WARNING, logger="observability.env_settings"):
+        assert load_config().reader_trace_files == "off"
+    assert "READER_TRACE_FILES" in caplog.text
+    monkeypatch.setenv("READER_TRACE_FILES", "Slow")
+    assert load_config().reader_trace_files == "slow"
+    with pytest.raises(ValueError):
+        DocumentReaderAgent(documents_dir=str(tmp_path), trace_files="verbose")
+
+
+def test_all_mode_is_capped_and_aggregates_the_rest(spans, tmp_path):
+    agent = DocumentReaderAgent(
+        documents_dir=_corpus(tmp_path, 10), trace_files="all", trace_max_file_spans=4
+    )
+    documents = agent.read_documents()
+
+    finished = spans.get_finished_spans()
+    file_spans = [s for s in finished if s.name == "reader.file"]
+    (pass_span,) = [s for s in finished if s.name == "reader.read_documents"]
+    assert len(file_spans) == 4
+    assert all(s.parent.span_id == pass_span.context.span_id for s in file_spans)
+    first = file_spans[0].attributes
+    assert first["reader.file.path_sha256"] == path_hash(documents[0]["path"])
+    assert first["reader.file.extension"] == ".md"
+    assert first["reader.file.bytes"] == len("lesson " * 50)
+    assert first["reader.file.chars"] == len("lesson " * 50)
+
+    summary = pass_span.attributes
+    assert summary["reader.files"] == 11  # the .png is skipped without a read
+    assert summary["reader.file_spans"] == 4
+    assert summary["reader.aggregated_files"] == 7
+    by_ext = json.loads(summary["reader.aggregated_by_extension"])
+    assert by_ext[".md"]["files"] == 6 and by_ext[".txt"]["files"] == 1
+
+
+def test_slow_mode_only_spans_files_over_threshold(spans):
+    with reader_pass_trace("slow", slow_ms=100.0) as pass_trace:
+        pass_trace.record(FileRead("fast.md", ".md", 0, 5_000_000, bytes_read=10))
+        pass_trace.record(FileRead("big.pdf", ".pdf", 0, 900_000_000, bytes_read=10, pages=40))
+
+    (file_span,) = [s for s in spans.get_finished_spans() if s.name == "reader.file"]
+    assert file_span.attributes["reader.file.pages"] == 40
+    assert file_span.end_time - file_span.start_time == 900_000_000
+    (pass_span,) = [s for s in spans.get_finished_spans() if s.name == "reader.read_documents"]
+    assert pass_span.attributes["reader.slowest.path_sha256"] == path_hash("big.pdf")
+
+
+def test_unknown_mode_rejected():
+    with pytest.raises(ValueError):
+        with reader_pass_trace("verbose"):
+            pass
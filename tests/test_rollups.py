@@ -0,0 +1,184 @@
+"""Tests for observability/rollups (refresh logic run offline with DuckDB)."""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+pa = pytest.importorskip("pyarrow")
+pytest.importorskip("pyarrow.parquet")
+pytest.importorskip("duckdb")
+
+from observability.local_queries import QUERIES_DIR, connect, run_query
+from observability.parquet_sink import ParquetWriter, log_schema, span_schema
+from observability.rollups import DuckDBRunner, refresh_rollups
+
+T0 = 1_780_000_000 * 10**9  # 2026-05-28
+
+
+def _write(tmp_path, start: int, count: int) -> None:
+    """``count`` spans of two names and ``count`` llm_step logs over three invocations."""
+    spans = ParquetWriter(str(tmp_path), "spans", span_schema(pa), "start_time_unix_nano", "zstd")
+    logs = ParquetWriter(str(tmp_path), "logs", log_schema(pa), "time_unix_nano", "zstd")
+    span_rows, log_rows = [], []
+    for i in range(start, start + count):
+        at = T0 + i * 600 * 10**9  # increasing; crosses midnight UTC at i = 22
+        name = "call_llm" if i % 4 else "execute_tool"
+        duration_ms = (200 if i % 4 else 20) + i % 7
+        span_rows.append(
+            {
+                "trace_id": f"t{i % 3}",
+                "span_id": f"s{i}",
+                "name": name,
+                "start_time_unix_nano": at,
+                "end_time_unix_nano": at + duration_ms * 10**6,
+            }
+        )
+        log_rows.append(
+            {
+                "time_unix_nano": at,
+                "trace_id": f"t{i % 3}",
+                "attributes": [
+                    ("event_type", "agent.llm_step"),
+                    ("session_id", "s1"),
+                    ("invocation_id", f"i{i % 3}"),
+                    ("agent_name", "reader"),
+                    ("input_tokens", str(i)),
+                    ("output_tokens", "2"),
+                ],
+            }
+        )
+    spans.write(span_rows)
+    logs.write(log_rows)
+
+
+def _refresh(runner, rollups=None, lateness_s: float = 0.0):
+    return refresh_rollups(runner, rollups, allowed_lateness_seconds=lateness_s)
+
+
+def _query(con, name: str) -> list[tuple]:
+    return sorted(run_query(con, (QUERIES_DIR / f"{name}.sql").read_text()).fetchall(), key=str)
+
+
+def _assert_rollups_match_raw(con) -> None:
+    assert _query(con, "per_invocation_llm_tokens") == _query(con, "per_invocation_llm_tokens_raw")
+    rollup = _query(con, "span_latency_percentiles_by_name")
+    raw = _query(con, "span_latency_percentiles_by_name_raw")
+    assert len(rollup) == len(raw) == 4
+    for got, want in zip(rollup, raw):
+        assert got[0] == want[0].date() and got[1:6] == want[1:6]  # day, name, exact stats
+        assert got[6:] == pytest.approx(want[6:], rel=0.06)  # bucketed p50 / p95
+
+
+def test_refresh_is_incremental(tmp_path):
+    _write(tmp_path, 0, 40)
+    con = connect(str(tmp_path), str(tmp_path / "rollups.duckdb"))
+    runner = DuckDBRunner(con)
+
+    first = _refresh(runner)
+    assert [(r.rollup, r.since_ns, r.refreshed) for r in first] == [
+        ("invocation_tokens", None, True),
+        ("span_latency", None, True),
+        ("trace_events", None, True),
+    ]
+    _assert_rollups_match_raw(con)
+    assert not any(r.refreshed for r in _refresh(runner))
+
+    _write(tmp_path, 40, 60)
+    second = _refresh(runner)
+    assert [r.since_ns for r in second] == [r.until_ns for r in first]
+    _assert_rollups_match_raw(con)
+    con.close()
+
+
+def test_interrupted_refresh_resumes_without_double_counting(tmp_path):
+    _write(tmp_path, 0, 30)
+    con = connect(str(tmp_path), str(tmp_path / "rollups.duckdb"))
+    _refresh(DuckDBRunner(con))
+    _write(tmp_path, 30, 30)
+
+    class FailingRunner(DuckDBRunner):
+        def execute(self, sql, parameters=None):
+            super().execute(sql, parameters)
+            if "MERGE INTO" in sql and "rollup_span_latency_daily` t" in sql:
+                raise RuntimeError("warehouse went away")
+
+    with pytest.raises(RuntimeError):
+        _refresh(FailingRunner(con), ("span_latency",))
+    pending = con.sql(
+        "SELECT pending_until_unix_nano FROM rollup_watermarks WHERE rollup = 'span_latency'"
+    ).fetchone()[0]
+    assert pending is not None
+
+    resumed = {r.rollup: r for r in _refresh(DuckDBRunner(con))}
+    assert resumed["span_latency"].resumed and resumed["span_latency"].until_ns == pending
+    assert not resumed["invocation_tokens"].resumed
+    _assert_rollups_match_raw(con)
+    con.close()
+
+
+def test_trace_events_keep_latest_parsed_event(tmp_path):
+    _write(tmp_path, 0, 1)
+    writer = ParquetWriter(str(tmp_path), "logs", log_schema(pa), "time_unix_nano", "zstd")
+
+    def event(at, name, body):
+        row = {"event_name": name, "trace_id": "t1", "time_unix_nano": T0 + at, "body": body}
+        writer.write([row])
+
+    event(1, "genai.trace.metadata", '{"client_request_id": "r1", "trace_metadata": {"a": "1"}}')
+    event(2, "genai.trace.tag", '{"key": "env", "value": "dev"}')
+    event(3, "genai.trace.tag", '{"key": "env", "value": "prod"}')
+    event(4, "genai.trace.tag", '{"key": "team", "value": "x"}')
+    con = connect(str(tmp_path), str(tmp_path / "rollups.duckdb"))
+    runner = DuckDBRunner(con)
+    _refresh(runner, ("trace_events",))
+    event(5, "genai.trace.tag", '{"key": "team", "value": "y"}')
+    _refresh(runner, ("trace_events",))
+
+    rows = runner.rows(
+        "SELECT event_name, tag_key, tag_value, client_request_id, trace_metadata "
+        "FROM rollup_trace_events ORDER BY event_name, tag_key"
+    )
+    assert [(r["event_name"], r["tag_key"], r["tag_value"]) for r in rows] == [
+        ("genai.trace.metadata", None, None),
+        ("genai.trace.tag", "env", "prod"),
+        ("genai.trace.tag", "team", "y"),
+    ]
+    assert (rows[0]["client_request_id"], rows[0]["trace_metadata"]) == ("r1", {"a": "1"})
+    con.close()
+
+
+def test_rows_arriving_within_the_lateness_margin_are_counted(tmp_path):
+    _write(tmp_path, 0, 40)
+    con = connect(str(tmp_path), str(tmp_path / "rollups.duckdb"))
+    runner = DuckDBRunner(con)
+    first = {r.rollup: r for r in _refresh(runner, lateness_s=1800)}
+    newest = T0 + 39 * 600 * 10**9
+    assert first["span_latency"].until_ns == newest - 1800 * 10**9
+
+    # The root span and the last step of an invocation that started before the
+    # newest row land after the refresh, as when the spool replays a batch.
+    late_at = newest - 1200 * 10**9
+    spans = ParquetWriter(str(tmp_path), "spans", span_schema(pa), "start_time_unix_nano", "zstd")
+    spans.write(
+        [
+            {
+                "trace_id": "t0",
+                "span_id": "late-root",
+                "name": "call_llm",
+                "start_time_unix_nano": late_at,
+                "end_time_unix_nano": late_at + 205 * 10**6,
+            }
+        ]
+    )
+    logs = ParquetWriter(str(tmp_path), "logs", log_schema(pa), "time_unix_nano", "zstd")
+    attributes = [("event_type", "agent.llm_step"), ("session_id", "s1"), ("invocation_id", "i0")]
+    logs.write([{"time_unix_nano": late_at, "trace_id": "t0", "attributes": attributes}])
+
+    _write(tmp_path, 40, 10)
+    _refresh(runner, lateness_s=1800)
+    _refresh(runner)  # catch up to the newest row so the totals compare with the raw tables
+    _assert_rollups_match_raw(con)
+    con.close()
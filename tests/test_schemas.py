@@ -0,0 +1,61 @@
+"""Tests for agents/schemas.py (compact structured output + prompt rendering)."""
+
+import json
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from agents.clarifier import build_clarifier_agent
+from agents.schemas import (
+    Clarification,
+    FileSummaries,
+    parse_file_summaries,
+    render_clarification,
+    render_file_summaries,
+    store_rendered_state,
+)
+from agents.summarizer import build_summarizer_agent
+
+
+def test_parse_file_summaries_from_json_text():
+    raw = json.dumps({"d": [{"f": "a.md", "s": "Alpha", "k": ["one", "two"]}]})
+    parsed = parse_file_summaries(raw)
+    assert parsed is not None
+    assert parsed.d[0].f == "a.md"
+    assert parsed.d[0].k == ["one", "two"]
+    assert parsed.d[0].u is False
+
+
+def test_render_file_summaries_is_compact():
+    value = {
+        "d": [
+            {"f": "a.md", "s": "Alpha", "k": ["one"]},
+            {"f": "b.pdf", "u": True},
+        ]
+    }
+    text = render_file_summaries(value)
+    assert text == "[a.md] Alpha\n- one\n[b.pdf] (content unavailable)"
+
+
+def test_render_falls_back_to_free_text():
+    assert render_file_summaries("plain model text") == "plain model text"
+    assert render_clarification("not json") == "not json"
+
+
+def test_render_clarification_omits_empty_fields():
+    assert render_clarification({"rq": "What failed?"}) == "Refined question: What failed?"
+
+
+def test_store_rendered_state_writes_target_key():
+    ctx = SimpleNamespace(state={"clarification": {"rq": "Q", "q": ["a", "b"]}})
+    cb = store_rendered_state("clarification", "clarification_text", render_clarification)
+    assert cb(callback_context=ctx) is None
+    assert ctx.state["clarification_text"] == "Refined question: Q\nOpen questions: a | b"
+
+
+def test_builders_attach_output_schema():
+    assert build_clarifier_agent("gemini-2.0-flash").output_schema is Clarification
+    assert build_summarizer_agent("gemini-2.0-flash").output_schema is FileSummaries
+    assert build_summarizer_agent("gemini-2.0-flash", structured_output=False).output_schema is None
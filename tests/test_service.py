@@ -0,0 +1,118 @@
+"""Tests for service/app.py (FastAPI wrapper around a warm ADK runner)."""
+
+import asyncio
+import signal
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import AsyncGenerator
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import httpx
+import uvicorn
+from fastapi.testclient import TestClient
+from google.adk.agents import BaseAgent
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.apps import App
+from google.adk.events import Event, EventActions
+
+from service.app import DrainingServer, build_service
+
+
+class CountingAnswerAgent(BaseAgent):
+    name: str = "CountingAnswer"
+
+    async def _run_async_impl(
+        self, ctx: InvocationContext
+    ) -> AsyncGenerator[Event, None]:
+        turns = ctx.session.state.get("turns", 0) + 1
+        yield Event(
+            author=self.name,
+            actions=EventActions(
+                state_delta={"turns": turns, "final_answer": f"turn {turns}"}
+            ),
+        )
+
+
+class SlowAnswerAgent(BaseAgent):
+    name: str = "SlowAnswer"
+
+    async def _run_async_impl(
+        self, ctx: InvocationContext
+    ) -> AsyncGenerator[Event, None]:
+        await asyncio.sleep(0.5)
+        yield Event(author=self.name, actions=EventActions(state_delta={"final_answer": "done"}))
+
+
+def _service():
+    app = App(name="service_test", root_agent=CountingAnswerAgent())
+    return build_service(app, max_concurrency=2, drain_seconds=1, pool_model_clients=False)
+
+
+def test_healthz_reports_ok():
+    with TestClient(_service()) as client:
+        response = client.get("/healthz")
+        assert response.status_code == 200
+        assert response.json()["status"] == "ok"
+
+
+def test_run_creates_and_continues_sessions():
+    with TestClient(_service()) as client:
+        first = client.post("/run", json={"question": "hi"}).json()
+        assert first["final_answer"] == "turn 1"
+        again = client.post(
+            "/run", json={"question": "more", "session_id": first["session_id"]}
+        ).json()
+        assert again["session_id"] == first["session_id"]
+        assert again["final_answer"] == "turn 2"
+
+
+def test_draining_rejects_new_work():
+    api = _service()
+    with TestClient(api) as client:
+        api.state.in_flight.draining = True
+        assert client.get("/healthz").status_code == 503
+        assert client.post("/run", json={"question": "hi"}).status_code == 503
+
+
+def test_signal_drains_while_the_listener_is_open():
+    app = App(name="service_test", root_agent=SlowAnswerAgent())
+    api = build_service(app, drain_seconds=5, pool_model_clients=False)
+    config = uvicorn.Config(api, host="127.0.0.1", port=0, log_level="warning")
+    server = DrainingServer(config, api)
+    serving = threading.Thread(target=server.run)  # off the main thread: no signal handlers
+    serving.start()
+    while not server.started:
+        time.sleep(0.01)
+    port = server.servers[0].sockets[0].getsockname()[1]
+
+    with httpx.Client(base_url=f"http://127.0.0.1:{port}", timeout=10) as client:
+        with ThreadPoolExecutor(1) as pool:
+            turn = pool.submit(client.post, "/run", json={"question": "hi"})
+            while not api.state.in_flight.count:
+                time.sleep(0.01)
+            server.handle_exit(signal.SIGTERM, None)
+            health = client.get("/healthz")
+            assert (health.status_code, health.json()["status"]) == (503, "draining")
+            assert client.post("/run", json={"question": "late"}).status_code == 503
+            assert not server.should_exit
+            response = turn.result()
+    assert response.status_code == 200 and response.json()["final_answer"] == "done"
+    serving.join(5)
+    assert not serving.is_alive()
+
+
+async def test_pooled_model_client_is_installed_once_and_detached():
+    import litellm
+
+    from service.clients import close_pooled_model_clients, configure_pooled_model_clients
+
+    client = configure_pooled_model_clients(max_connections=4)
+    assert configure_pooled_model_clients() is client
+    assert litellm.aclient_session is client
+    await close_pooled_model_clients()
+    assert litellm.aclient_session is None
+    assert client.is_closed
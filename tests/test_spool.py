@@ -0,0 +1,224 @@
+"""Tests for observability/spool (segment files, eviction, replay, restart, lanes)."""
+
+import os
+import subprocess
+import sys
+import textwrap
+import threading
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from opentelemetry.sdk.trace.export import SpanExportResult
+
+from observability.spool import SegmentSpool, SpoolExporter, SpoolSettings, retryable_status
+
+
+def _settings(tmp_path, **kw) -> SpoolSettings:
+    base = dict(directory=str(tmp_path), max_bytes=1024, segment_bytes=256, flush_seconds=60)
+    base.update(kw)
+    return SpoolSettings(**base)
+
+
+class _Endpoint:
+    def __init__(self, up: bool = True):
+        self.up = up
+        self.reject: set[bytes] = set()
+        self.received: list[bytes] = []
+        self.lock = threading.Lock()
+
+    def send(self, payload: bytes) -> int:
+        with self.lock:
+            if not self.up:
+                return 503
+            if payload in self.reject:
+                return 400
+            self.received.append(payload)
+            return 200
+
+
+def _exporter(tmp_path, endpoint, **kw) -> SpoolExporter:
+    return SpoolExporter(
+        encode=lambda batch: b"".join(batch),
+        send=endpoint.send,
+        settings=_settings(tmp_path, **kw),
+        name="spans",
+        result_type=SpanExportResult,
+    )
+
+
+def test_settings_from_env_fall_back_on_malformed_values(monkeypatch, tmp_path):
+    monkeypatch.setenv("OTLP_SPOOL_DIR", str(tmp_path))
+    monkeypatch.setenv("OTLP_SPOOL_CONCURRENCY", "two")
+    monkeypatch.setenv("OTLP_SPOOL_MAX_MB", "8")
+    settings = SpoolSettings.from_env()
+    assert (settings.concurrency, settings.max_bytes) == (2, 8 * 1024 * 1024)
+    monkeypatch.setenv("OTLP_SPOOL_SEGMENT_MB", "16")  # larger than the cap
+    assert SpoolSettings.from_env() == SpoolSettings(directory=str(tmp_path))
+
+
+def test_segment_spool_rotates_and_reads_back(tmp_path):
+    spool = SegmentSpool(str(tmp_path), max_bytes=10_000, segment_bytes=100)
+    for i in range(5):
+        assert spool.append(bytes([i]) * 60)
+    spool.seal()
+    leased = spool.lease(10)
+    assert len(leased) == 3
+    assert spool.read(leased[0]) == [b"\x00" * 60, b"\x01" * 60]
+    assert spool.read(leased[2]) == [b"\x04" * 60]
+
+
+def test_segment_spool_evicts_oldest_first(tmp_path):
+    spool = SegmentSpool(str(tmp_path), max_bytes=300, segment_bytes=100)
+    for i in range(6):
+        spool.append(bytes([i]) * 96)
+    assert spool.pending_bytes <= 300
+    assert spool.evicted_segments == 3
+    spool.seal()
+    first = spool.lease(1)[0]
+    assert spool.read(first) == [b"\x03" * 96]
+    assert not spool.append(b"x" * 400)
+    assert spool.dropped_oversize == 1
+
+
+def test_segment_spool_ignores_torn_tail(tmp_path):
+    spool = SegmentSpool(str(tmp_path), max_bytes=10_000, segment_bytes=10_000)
+    spool.append(b"whole")
+    spool.seal()
+    seq = spool.lease(1)[0]
+    with open(os.path.join(str(tmp_path), f"{seq:012d}.seg"), "ab") as handle:
+        handle.write(b"\x00\x00\x00\x09half")
+    assert spool.read(seq) == [b"whole"]
+    assert spool.corrupt_segments == 1
+
+
+def test_exporter_returns_immediately_and_replays_after_outage(tmp_path):
+    endpoint = _Endpoint(up=False)
+    exporter = _exporter(tmp_path, endpoint)
+    assert exporter.export([b"a", b"b"]) is SpanExportResult.SUCCESS
+    assert exporter.export([b"c"]) is SpanExportResult.SUCCESS
+    assert exporter.drain_once() is False
+    assert exporter.diagnostics()["send_failures"] == 1
+    endpoint.up = True
+    assert exporter.drain_once() is True
+    assert endpoint.received == [b"ab", b"c"]
+    assert exporter.diagnostics()["pending_segments"] == 0
+    exporter.shutdown()
+
+
+def test_exporter_resumes_spool_left_by_previous_process(tmp_path):
+    down = _Endpoint(up=False)
+    first = _exporter(tmp_path, down, drain_seconds=0.1)
+    first.export([b"survives"])
+    first.shutdown()
+    assert first.diagnostics()["pending_segments"] == 1
+
+    up = _Endpoint()
+    second = _exporter(tmp_path, up)
+    assert second.drain_once() is True
+    assert up.received == [b"survives"]
+    second.export([b"next"])
+    second.shutdown()
+    assert up.received == [b"survives", b"next"]
+
+
+def test_rejected_record_is_dropped_without_blocking_later_segments(tmp_path):
+    endpoint = _Endpoint()
+    endpoint.reject.add(b"bad")
+    exporter = _exporter(tmp_path, endpoint, segment_bytes=8)
+    for batch in ([b"bad"], [b"ok1"], [b"ok2"]):
+        exporter.export(batch)
+    assert exporter.drain_once() is True
+    assert sorted(endpoint.received) == [b"ok1", b"ok2"]  # segments are sent in parallel
+    stats = exporter.diagnostics()
+    assert (stats["rejected_records"], stats["last_rejected_status"]) == (1, 400)
+    assert (stats["send_failures"], stats["pending_segments"]) == (0, 0)
+    exporter.shutdown()
+
+
+def test_only_throttling_server_and_connection_errors_are_retried():
+    assert all(retryable_status(s) for s in (None, 429, 500, 502, 503))
+    assert not any(retryable_status(s) for s in (400, 401, 403, 404, 413))
+
+
+def test_live_exporters_sharing_a_directory_write_separate_lanes(tmp_path):
+    endpoint = _Endpoint(up=False)
+    first, second = _exporter(tmp_path, endpoint), _exporter(tmp_path, endpoint)
+    assert first.spool.directory != second.spool.directory
+    first.export([b"one"])
+    second.export([b"two"])
+    endpoint.up = True
+    assert first.drain_once() and second.drain_once()
+    assert sorted(endpoint.received) == [b"one", b"two"]
+    first.shutdown()
+    second.shutdown()
+    assert os.listdir(tmp_path / "spans") == []  # empty lanes are removed
+
+
+def test_segments_of_an_exited_process_are_adopted(tmp_path):
+    root = Path(__file__).resolve().parent.parent
+    code = textwrap.dedent(
+        f"""
+        import os
+        import sys
+        sys.path.insert(0, {str(root)!r})
+        from opentelemetry.sdk.trace.export import SpanExportResult
+        from observability.spool import SpoolExporter, SpoolSettings
+        exporter = SpoolExporter(
+            encode=lambda batch: b"".join(batch),
+            send=lambda payload: 503,
+            settings=SpoolSettings(directory={str(tmp_path)!r}, flush_seconds=60),
+            name="spans",
+            result_type=SpanExportResult,
+        )
+        exporter.export([b"from-a-dead-worker"])
+        os._exit(0)  # no shutdown: the process dies holding its lane
+        """
+    ).strip()
+    endpoint = _Endpoint()
+    running = _exporter(tmp_path, endpoint)  # started before the worker: holds the first lane
+    subprocess.run([sys.executable, "-c", code], check=True, timeout=60)
+    running.adopt_orphans()
+    assert running.drain_once() is True
+    assert endpoint.received == [b"from-a-dead-worker"]
+    assert running.diagnostics()["adopted_segments"] == 1
+    assert [p.name for p in (tmp_path / "spans").iterdir()] == [Path(running.spool.directory).name]
+    running.shutdown()
+
+
+def test_byte_cap_covers_every_lane(tmp_path):
+    endpoint = _Endpoint(up=False)
+    busy = _exporter(tmp_path, endpoint)
+    for i in range(3):
+        busy.export([bytes([i]) * 200])
+    busy.force_flush()
+    other = _exporter(tmp_path, endpoint)
+    assert other.diagnostics()["shared_bytes"] == busy.spool.pending_bytes
+    for i in range(4):
+        other.export([bytes([i]) * 200])
+    assert other.spool.pending_bytes + busy.spool.pending_bytes <= 1024
+    assert other.spool.evicted_segments > 0
+    busy.shutdown()
+    other.shutdown()
+
+
+def test_a_late_lane_keeps_its_share_when_peers_filled_the_cap(tmp_path):
+    endpoint = _Endpoint(up=False)
+    busy = _exporter(tmp_path, endpoint)
+    for i in range(5):
+        busy.export([bytes([i]) * 200])
+    busy.force_flush()
+    assert busy.spool.pending_bytes == 1020
+    late = _exporter(tmp_path, endpoint)
+    for i in range(4):
+        assert late.export([bytes([i]) * 100]) == SpanExportResult.SUCCESS
+    # Its even share (512 bytes) is kept, not just the newest segment.
+    assert late.spool.pending_bytes == 416
+    assert late.spool.evicted_segments == 0
+
+    busy.adopt_orphans()  # the busy lane notices and shrinks to make room
+    busy.export([b"x" * 200])
+    assert busy.spool.pending_bytes + late.spool.pending_bytes <= 1024
+    assert late.spool.pending_bytes == 416
+    busy.shutdown()
+    late.shutdown()
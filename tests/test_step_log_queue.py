@@ -0,0 +1,209 @@
+"""Tests for observability/step_log_queue and the async log_llm_step_completed path."""
+
+import logging
+import os
+import subprocess
+import sys
+import textwrap
+import threading
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from google.adk.models.llm_response import LlmResponse
+from google.genai import types
+from opentelemetry import trace
+from opentelemetry.sdk.trace import TracerProvider
+
+from observability import session_logs
+from observability.step_log_queue import StepLogQueue, StepLogQueueSettings
+
+
+class _Gate:
+    def __init__(self):
+        self.open = threading.Event()
+        self.seen = []
+
+    def __call__(self, item):
+        self.open.wait(5)
+        self.seen.append(item)
+
+
+def _blocked_queue(policy, size=2):
+    gate = _Gate()
+    q = StepLogQueue(gate, StepLogQueueSettings(enabled=True, max_size=size, overflow=policy, block_ms=10))
+    q.submit("busy")  # taken by the worker, which then waits on the gate
+    while q.stats()["queued"]:
+        pass
+    return gate, q
+
+
+def test_settings_reject_unknown_overflow():
+    with pytest.raises(ValueError):
+        StepLogQueueSettings(overflow="spill")
+
+
+def test_settings_from_env_fall_back_on_malformed_values(monkeypatch, caplog):
+    monkeypatch.setenv("AGENT_LOG_OVERFLOW", "dropnewest")
+    monkeypatch.setenv("AGENT_LOG_QUEUE_SIZE", "lots")
+    monkeypatch.setenv("AGENT_LOG_BLOCK_MS", "50")
+    monkeypatch.delenv("AGENT_LOG_ASYNC", raising=False)
+    with caplog.at_level(logging.WARNING):
+        assert StepLogQueueSettings.from_env() == StepLogQueueSettings()
+    assert not caplog.records  # off: the queue knobs are not read
+
+    monkeypatch.setenv("AGENT_LOG_ASYNC", "true")
+    with caplog.at_level(logging.WARNING):
+        assert StepLogQueueSettings.from_env() == StepLogQueueSettings(enabled=True)
+    assert len(caplog.records) == 2
+    monkeypatch.setenv("AGENT_LOG_QUEUE_SIZE", "0")
+    monkeypatch.setenv("AGENT_LOG_OVERFLOW", "block")
+    assert StepLogQueueSettings.from_env() == StepLogQueueSettings(enabled=True)
+
+
+@pytest.mark.parametrize(
+    "policy, expected_seen, dropped",
+    [
+        ("drop_newest", ["busy", 1, 2], 1),
+        ("drop_oldest", ["busy", 2, 3], 1),
+        ("block", ["busy", 1, 2], 1),
+    ],
+)
+def test_overflow_policies_are_counted(policy, expected_seen, dropped):
+    gate, q = _blocked_queue(policy)
+    for item in (1, 2, 3):
+        q.submit(item)
+    gate.open.set()
+    assert q.flush(5)
+    assert gate.seen == expected_seen
+    stats = q.stats()
+    assert stats["dropped"] == dropped
+    assert stats["submitted"] == 4
+
+
+def test_inline_overflow_runs_on_caller_thread():
+    seen = []
+    release = threading.Event()
+
+    def process(item):
+        if item == "busy":
+            release.wait(5)
+        seen.append((item, threading.current_thread().name))
+
+    q = StepLogQueue(process, StepLogQueueSettings(enabled=True, max_size=1, overflow="inline"))
+    q.submit("busy")
+    while q.stats()["queued"]:
+        pass
+    q.submit("queued")
+    q.submit("inline")
+    assert seen == [("inline", threading.current_thread().name)]
+    release.set()
+    assert q.flush(5)
+    assert q.stats()["inline"] == 1 and q.stats()["dropped"] == 0
+
+
+def test_async_llm_step_keeps_span_and_fields(monkeypatch):
+    records = []
+
+    class Capture(logging.Handler):
+        def emit(self, record):
+            records.append((record, trace.get_current_span().get_span_context()))
+
+    q = StepLogQueue(session_logs._emit_llm_step, StepLogQueueSettings(enabled=True))
+    monkeypatch.setattr(session_logs, "_step_queue", q)
+    monkeypatch.setattr(session_logs, "_step_queue_settings", q.settings)
+    handler = Capture()
+    saved_level = session_logs.logger.level
+    session_logs.logger.addHandler(handler)
+    session_logs.logger.setLevel(logging.INFO)
+
+    response = LlmResponse(
+        content=types.Content(
+            role="model",
+            parts=[types.Part(text="thinking", thought=True), types.Part(text="answer")],
+        ),
+        finish_reason=types.FinishReason.STOP,
+    )
+    ctx = SimpleNamespace(session=SimpleNamespace(id="s1"), invocation_id="e1", agent_name="A")
+    tracer = TracerProvider(shutdown_on_exit=False).get_tracer("test")
+    try:
+        with tracer.start_as_current_span("call_llm") as span:
+            session_logs.log_llm_step_completed("k", ctx, response)
+            expected = span.get_span_context()
+        assert session_logs.flush_step_logs(5)
+    finally:
+        session_logs.logger.removeHandler(handler)
+        session_logs.logger.setLevel(saved_level)
+
+    (record, span_context), = records
+    assert span_context.trace_id == expected.trace_id
+    assert span_context.span_id == expected.span_id
+    assert record.model_response_text == "answer"
+    assert record.model_reasoning_text == "thinking"
+    assert record.session_id == "s1"
+    assert session_logs.step_log_queue_stats()["processed"] == 1
+
+
+def test_malformed_queue_settings_still_log_llm_steps(monkeypatch):
+    records = []
+
+    class Capture(logging.Handler):
+        def emit(self, record):
+            records.append(record)
+
+    monkeypatch.delenv("AGENT_LOG_ASYNC", raising=False)
+    monkeypatch.setenv("AGENT_LOG_OVERFLOW", "dropnewest")
+    monkeypatch.setattr(session_logs, "_step_queue", None)
+    monkeypatch.setattr(session_logs, "_step_queue_settings", None)
+    handler = Capture()
+    saved_level = session_logs.logger.level
+    session_logs.logger.addHandler(handler)
+    session_logs.logger.setLevel(logging.INFO)
+    response = LlmResponse(
+        content=types.Content(role="model", parts=[types.Part(text="answer")]),
+        finish_reason=types.FinishReason.STOP,
+    )
+    ctx = SimpleNamespace(session=SimpleNamespace(id="s1"), invocation_id="e1", agent_name="A")
+    try:
+        for _ in range(2):
+            session_logs.log_llm_step_completed("k", ctx, response)
+    finally:
+        session_logs.logger.removeHandler(handler)
+        session_logs.logger.setLevel(saved_level)
+    assert [r.model_response_text for r in records] == ["answer", "answer"]
+    assert session_logs.step_log_queue_stats() is None
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="needs os.fork")
+def test_forked_child_gets_a_live_step_queue():
+    """The parent's worker thread does not survive ``fork``; the child builds its own."""
+    root = Path(__file__).resolve().parent.parent
+    code = textwrap.dedent(
+        f"""
+        import os
+        import sys
+        import time
+        sys.path.insert(0, {str(root)!r})
+        os.environ["AGENT_LOG_ASYNC"] = "true"
+        from observability import session_logs
+        session_logs._emit_llm_step = lambda step: time.sleep(0.05)
+        parent = session_logs._get_step_queue()
+        parent.submit("parent-1")
+        parent.submit("parent-2")
+        pid = os.fork()
+        if pid == 0:
+            child = session_logs._get_step_queue()
+            child.submit("child")
+            ok = child is not parent and session_logs.flush_step_logs(1.0)
+            ok = ok and session_logs.step_log_queue_stats()["processed"] == 1
+            os._exit(0 if ok else 1)
+        _, status = os.waitpid(pid, 0)
+        assert os.waitstatus_to_exitcode(status) == 0, status
+        assert session_logs.flush_step_logs(1.0)
+        assert session_logs.step_log_queue_stats()["processed"] == 2
+        """
+    ).strip()
+    subprocess.run([sys.executable, "-c", code], check=True, cwd=str(root), timeout=60)
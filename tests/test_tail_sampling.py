@@ -0,0 +1,136 @@
+"""Tests for observability/tail_sampling (trace decisions, logs follow traces)."""
+
+import logging
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from opentelemetry.sdk._logs import LoggerProvider, LoggingHandler
+from opentelemetry.sdk._logs.export import InMemoryLogExporter, SimpleLogRecordProcessor
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+from opentelemetry.trace import Status, StatusCode, set_span_in_context
+
+from observability.tail_sampling import (
+    TailSampler,
+    TailSamplingLogProcessor,
+    TailSamplingSettings,
+    TailSamplingSpanProcessor,
+)
+
+
+class Pipeline:
+    def __init__(self, settings: TailSamplingSettings):
+        self.spans = InMemorySpanExporter()
+        self.logs = InMemoryLogExporter()
+        self.sampler = TailSampler(
+            settings, SimpleSpanProcessor(self.spans), SimpleLogRecordProcessor(self.logs)
+        )
+        self.tracer_provider = TracerProvider(shutdown_on_exit=False)
+        self.tracer_provider.add_span_processor(TailSamplingSpanProcessor(self.sampler))
+        self.logger_provider = LoggerProvider(shutdown_on_exit=False)
+        self.logger_provider.add_log_record_processor(TailSamplingLogProcessor(self.sampler))
+        self.logger = logging.getLogger(f"tail_sampling_test.{id(self)}")
+        self.logger.setLevel(logging.INFO)
+        self.logger.propagate = False
+        self.logger.addHandler(LoggingHandler(logger_provider=self.logger_provider))
+        self.tracer = self.tracer_provider.get_tracer("test")
+
+    def invocation(self, *, agent="Workflow", finish="stop", error=False, sleep=0.0):
+        with self.tracer.start_as_current_span("invocation"):
+            with self.tracer.start_as_current_span(f"invoke_agent {agent}"):
+                with self.tracer.start_as_current_span("call_llm") as span:
+                    span.set_attribute("gen_ai.response.finish_reasons", [finish])
+                    self.logger.info("LLM step completed", extra={"session_id": "s1"})
+                    if error:
+                        span.set_status(Status(StatusCode.ERROR))
+                    time.sleep(sleep)
+
+    @property
+    def span_names(self):
+        return [s.name for s in self.spans.get_finished_spans()]
+
+
+def test_settings_from_env(monkeypatch):
+    monkeypatch.delenv("TAIL_SAMPLING_RATE", raising=False)
+    assert TailSamplingSettings.from_env() is None
+    monkeypatch.setenv("TAIL_SAMPLING_RATE", "0.1")
+    monkeypatch.setenv("TAIL_SAMPLING_AGENT_RATES", "A=1, B=0.5")
+    settings = TailSamplingSettings.from_env()
+    assert settings.rate == 0.1
+    assert settings.agent_rates == {"A": 1.0, "B": 0.5}
+
+    monkeypatch.setenv("TAIL_SAMPLING_RATE", "ten percent")
+    monkeypatch.setenv("TAIL_SAMPLING_AGENT_RATES", "A=all, B=0.5")
+    monkeypatch.setenv("TAIL_SAMPLING_MAX_TRACES", "1e3")
+    settings = TailSamplingSettings.from_env()
+    assert (settings.rate, settings.agent_rates, settings.max_traces) == (1.0, {"B": 0.5}, 1000)
+
+
+def test_unremarkable_trace_and_its_logs_are_dropped_at_rate_zero():
+    p = Pipeline(TailSamplingSettings(rate=0.0))
+    p.invocation()
+    p.logger.info("outside any trace")
+    assert p.span_names == []
+    bodies = [r.log_record.body for r in p.logs.get_finished_logs()]
+    assert bodies == ["outside any trace"]
+    diag = p.sampler.diagnostics()
+    assert (diag["dropped_traces"], diag["dropped_spans"], diag["dropped_logs"]) == (1, 3, 1)
+
+
+@pytest.mark.parametrize(
+    "kwargs, reason",
+    [
+        ({"error": True}, "error"),
+        ({"finish": "max_tokens"}, "finish_reason"),
+        ({"sleep": 0.03}, "slow"),
+    ],
+)
+def test_interesting_traces_are_always_kept(kwargs, reason):
+    p = Pipeline(TailSamplingSettings(rate=0.0, latency_threshold_ms=20))
+    p.invocation(**kwargs)
+    assert sorted(p.span_names) == ["call_llm", "invocation", "invoke_agent Workflow"]
+    logs = p.logs.get_finished_logs()
+    assert len(logs) == 1
+    assert logs[0].log_record.trace_id == p.spans.get_finished_spans()[0].context.trace_id
+    assert p.sampler.diagnostics()["kept_traces"] == {reason: 1}
+
+
+def test_per_agent_rate_overrides_default():
+    p = Pipeline(TailSamplingSettings(rate=0.0, agent_rates={"Keep": 1.0}))
+    p.invocation(agent="Keep")
+    p.invocation(agent="Other")
+    assert p.span_names.count("invocation") == 1
+    assert "invoke_agent Keep" in p.span_names
+    assert "invoke_agent Other" not in p.span_names
+
+
+def test_buffer_overflow_keeps_oldest_trace():
+    p = Pipeline(TailSamplingSettings(rate=0.0, max_traces=1))
+    root_a = p.tracer.start_span("invocation")
+    p.tracer.start_span("child_a", context=set_span_in_context(root_a)).end()
+    root_b = p.tracer.start_span("invocation")
+    p.tracer.start_span("child_b", context=set_span_in_context(root_b)).end()
+    assert p.span_names == ["child_a"]
+    assert p.sampler.diagnostics()["kept_traces"] == {"incomplete": 1}
+    root_a.end()
+    root_b.end()
+    assert p.span_names == ["child_a", "invocation"]
+
+
+def test_force_flush_leaves_in_flight_traces_to_their_root():
+    p = Pipeline(TailSamplingSettings(rate=0.0, decision_wait_seconds=0.05))
+    root = p.tracer.start_span("invocation")
+    p.tracer.start_span("child", context=set_span_in_context(root)).end()
+    assert p.tracer_provider.force_flush() and p.logger_provider.force_flush()
+    assert p.span_names == []  # a per-invocation flush does not decide for a running trace
+    time.sleep(0.06)
+    assert p.tracer_provider.force_flush()
+    assert p.span_names == ["child"]  # past the decision wait: kept as incomplete
+    assert p.sampler.diagnostics()["kept_traces"] == {"incomplete": 1}
+    root.end()
@@ -0,0 +1,239 @@
+"""Tests for the bounded flush/shutdown coordinator and observability/telemetry_flush."""
+
+import asyncio
+import logging
+import subprocess
+import sys
+import textwrap
+import threading
+import time
+from pathlib import Path
+from typing import AsyncGenerator
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from google.adk.agents import BaseAgent
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.apps import App
+from google.adk.events import Event
+from google.adk.runners import InMemoryRunner
+from google.genai import types
+from opentelemetry.sdk._logs import LoggerProvider, LoggingHandler
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import SpanExporter, SpanExportResult
+from opentelemetry.trace import set_span_in_context
+
+import observability.otel_sdk as otel_sdk
+from observability.export_pipeline import BatchExportSettings, InstrumentedBatchSpanProcessor
+from observability.tail_sampling import (
+    TailSampler,
+    TailSamplingLogProcessor,
+    TailSamplingSettings,
+    TailSamplingSpanProcessor,
+)
+from observability.telemetry_flush import TelemetryFlushPlugin, TelemetryFlushSettings
+
+
+class _Provider:
+    def __init__(self, delay_s: float) -> None:
+        self.delay_s = delay_s
+        self.flushed = self.shut_down = False
+
+    def force_flush(self, timeout_millis: int = 30000) -> bool:
+        time.sleep(self.delay_s)
+        self.flushed = True
+        return True
+
+    def shutdown(self) -> None:
+        self.shut_down = True
+
+
+class _BlockedExporter(SpanExporter):
+    def __init__(self) -> None:
+        self.gate = threading.Event()
+
+    def export(self, spans):
+        self.gate.wait(10)
+        return SpanExportResult.SUCCESS
+
+    def shutdown(self):
+        self.gate.set()
+
+
+def test_settings_from_env(monkeypatch):
+    for suffix in ("FLUSH_MODE", "FLUSH_TIMEOUT_MS", "SHUTDOWN_TIMEOUT_MS"):
+        monkeypatch.delenv(f"TELEMETRY_{suffix}", raising=False)
+    assert TelemetryFlushSettings.from_env() == TelemetryFlushSettings()
+    monkeypatch.setenv("TELEMETRY_FLUSH_MODE", "Invocation")
+    monkeypatch.setenv("TELEMETRY_FLUSH_TIMEOUT_MS", "500")
+    monkeypatch.setenv("TELEMETRY_SHUTDOWN_TIMEOUT_MS", "1500")
+    settings = TelemetryFlushSettings.from_env()
+    assert (settings.mode, settings.invocation_timeout_millis) == ("invocation", 500.0)
+    assert settings.shutdown_timeout_millis == 1500.0
+    monkeypatch.setenv("TELEMETRY_FLUSH_MODE", "always")
+    with pytest.raises(ValueError):
+        TelemetryFlushSettings.from_env()
+
+
+def test_providers_flush_in_parallel_and_shut_down():
+    providers = {"traces": _Provider(0.3), "logs": _Provider(0.3), "metrics": _Provider(0.0)}
+    started = time.perf_counter()
+    assert otel_sdk.flush_providers(providers, 5000, shutdown=True) is True
+    assert time.perf_counter() - started < 0.55  # not 0.6 s one after the other
+    assert all(p.flushed and p.shut_down for p in providers.values())
+
+
+def test_one_deadline_bounds_a_stuck_exporter():
+    exporter = _BlockedExporter()
+    provider = TracerProvider()
+    provider.add_span_processor(InstrumentedBatchSpanProcessor(exporter, BatchExportSettings()))
+    with provider.get_tracer("test").start_as_current_span("stuck"):
+        pass
+    logs = _Provider(0.0)
+
+    started = time.perf_counter()
+    # The SDK batch processor ignores its flush timeout; the coordinator does not wait.
+    assert otel_sdk.flush_providers({"traces": provider, "logs": logs}, 200) is False
+    assert time.perf_counter() - started < 1.0
+    assert logs.flushed
+    exporter.gate.set()
+    provider.shutdown()
+
+
+def test_shutdown_runs_once_and_stops_later_flushes(monkeypatch):
+    provider = _Provider(0.0)
+    monkeypatch.setattr(otel_sdk, "_providers", {"traces": provider})
+    monkeypatch.setattr(otel_sdk, "_shutdown_started", False)
+    assert otel_sdk.flush_telemetry(1000) is True
+    assert provider.flushed and not provider.shut_down
+    assert otel_sdk.shutdown_telemetry(1000) is True
+    assert provider.shut_down
+    provider.flushed = False
+    assert otel_sdk.shutdown_telemetry() is True
+    assert otel_sdk.flush_telemetry() is False
+    assert not provider.flushed
+
+
+class _Downstream:
+    """Counts what reaches one signal's pipeline before and after it started flushing."""
+
+    def __init__(self, flush_delay_s: float = 0.0) -> None:
+        self.flush_delay_s = flush_delay_s
+        self.before_flush = self.after_flush = 0
+        self.flushing = False
+
+    def on_start(self, span, parent_context=None) -> None:
+        pass
+
+    def on_end(self, span) -> None:
+        self._receive()
+
+    def on_emit(self, log_data) -> None:
+        self._receive()
+
+    def _receive(self) -> None:
+        if self.flushing:
+            self.after_flush += 1
+        else:
+            self.before_flush += 1
+
+    def force_flush(self, timeout_millis: int = 30000) -> bool:
+        self.flushing = True
+        time.sleep(self.flush_delay_s)
+        return True
+
+    def shutdown(self) -> None:
+        self.flushing = True
+
+
+def test_shutdown_releases_held_traces_before_the_parallel_flush(monkeypatch):
+    spans, logs = _Downstream(flush_delay_s=0.2), _Downstream()
+    sampler = TailSampler(TailSamplingSettings(rate=0.0), spans, logs)
+    tracer_provider = TracerProvider(shutdown_on_exit=False)
+    tracer_provider.add_span_processor(TailSamplingSpanProcessor(sampler))
+    logger_provider = LoggerProvider(shutdown_on_exit=False)
+    logger_provider.add_log_record_processor(TailSamplingLogProcessor(sampler))
+    logger = logging.getLogger("telemetry_flush_test")
+    logger.propagate = False
+    logger.addHandler(LoggingHandler(logger_provider=logger_provider))
+
+    tracer = tracer_provider.get_tracer("test")
+    root = tracer.start_span("invocation")  # still running at exit: the trace is undecided
+    with tracer.start_as_current_span("call_llm", context=set_span_in_context(root)):
+        logger.warning("LLM step completed")
+    assert sampler.diagnostics()["pending_traces"] == 1
+
+    providers = {"traces": tracer_provider, "logs": logger_provider}
+    monkeypatch.setattr(otel_sdk, "_providers", providers)
+    monkeypatch.setattr(otel_sdk, "_tail_sampler", sampler)
+    monkeypatch.setattr(otel_sdk, "_shutdown_started", False)
+    assert otel_sdk.shutdown_telemetry(2000) is True
+    # The held span and log are decided together, then both pipelines flush them;
+    # they are not released into one pipeline while the other is shutting down.
+    assert (spans.before_flush, logs.before_flush) == (1, 1)
+    assert (spans.after_flush, logs.after_flush) == (0, 0)
+
+
+def test_exit_is_bounded_with_an_unresponsive_endpoint():
+    """A collector that accepts connections but never answers cannot hold up exit."""
+    root = Path(__file__).resolve().parent.parent
+    code = textwrap.dedent(
+        f"""
+        import logging
+        import os
+        import socket
+        import sys
+        sys.path.insert(0, {str(root)!r})
+        server = socket.socket()
+        server.bind(("127.0.0.1", 0))
+        server.listen(16)
+        port = server.getsockname()[1]
+        os.environ["OTEL_EXPORTER_OTLP_ENDPOINT"] = f"http://127.0.0.1:{{port}}/v1/traces"
+        from opentelemetry import trace
+        from observability.otel_sdk import configure_otel_from_env
+        configure_otel_from_env(use_print_status=False, shutdown_timeout_millis=500)
+        with trace.get_tracer("exit-test").start_as_current_span("s"):
+            logging.getLogger("exit-test").warning("queued")
+        """
+    ).strip()
+    started = time.perf_counter()
+    subprocess.run([sys.executable, "-c", code], check=True, cwd=str(root), timeout=60)
+    assert time.perf_counter() - started < 15  # was over 2 minutes: serial, retrying exports
+
+
+class _Agent(BaseAgent):
+    name: str = "Step"
+
+    async def _run_async_impl(self, ctx: InvocationContext) -> AsyncGenerator[Event, None]:
+        yield Event(author=self.name)
+
+
+async def test_plugin_flushes_after_each_invocation_and_coalesces(monkeypatch):
+    calls = []
+
+    def slow_flush(timeout_millis):
+        calls.append(timeout_millis)
+        time.sleep(0.05)
+        return len(calls) != 2
+
+    monkeypatch.setattr(otel_sdk, "flush_telemetry", slow_flush)
+    settings = TelemetryFlushSettings(mode="invocation", invocation_timeout_millis=750)
+    plugin = TelemetryFlushPlugin(settings)
+    runner = InMemoryRunner(app=App(name="flush_test", root_agent=_Agent(), plugins=[plugin]))
+    session = await runner.session_service.create_session(app_name="flush_test", user_id="u")
+    message = types.Content(role="user", parts=[types.Part(text="go")])
+    async for _ in runner.run_async(user_id="u", session_id=session.id, new_message=message):
+        pass
+    await runner.close()
+    assert calls == [750]
+
+    # Invocations ending while a flush runs share one follow-up flush.
+    await plugin.after_run_callback(invocation_context=None)
+    await asyncio.sleep(0.01)
+    for _ in range(3):
+        await plugin.after_run_callback(invocation_context=None)
+    await plugin.close()
+    assert len(calls) == 3
+    assert plugin.stats() == {"flushes": 3, "late_flushes": 1}
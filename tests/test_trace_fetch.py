@@ -0,0 +1,242 @@
+"""Tests for observability/trace_fetch (Statement Execution API faked in-process)."""
+
+import io
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+pa = pytest.importorskip("pyarrow")
+pq = pytest.importorskip("pyarrow.parquet")
+
+from observability.databricks_rest import DatabricksRestClient
+from observability.trace_fetch import (
+    PullState,
+    SqlStatementClient,
+    StatementExecutionError,
+    TraceFilter,
+    build_fetch_query,
+    fetch_to_file,
+    incremental_pull,
+    qualify_query,
+)
+
+HOST = "https://ws.example.com"
+SPANS = [
+    {"span_id": f"s{i}", "start_time_unix_nano": 100 * i, "attributes": [("k", str(i))]}
+    for i in range(1, 6)
+]
+SPAN_SCHEMA = pa.schema(
+    [
+        ("span_id", pa.string()),
+        ("start_time_unix_nano", pa.int64()),
+        ("attributes", pa.map_(pa.string(), pa.string())),
+    ]
+)
+
+
+class _Response:
+    status_code = 200
+    headers: dict = {}
+
+    def __init__(self, payload=None, raw=None):
+        self.payload = payload
+        self.raw = raw
+
+    def json(self):
+        return self.payload
+
+    def close(self):
+        pass
+
+
+def _ipc(table) -> bytes:
+    sink = io.BytesIO()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        for batch in table.to_batches(max_chunksize=1):
+            writer.write_batch(batch)
+    return sink.getvalue()
+
+
+class FakeWarehouse:
+    """Answers statements over ``SPANS``: one pending poll, then two result chunks."""
+
+    def __init__(self, watermark: int):
+        self.watermark = watermark
+        self.spans = list(SPANS)
+        self.statements: list[dict] = []
+        self.chunks: dict[str, bytes] = {}
+
+    def _rows(self, body):
+        if "latest_span_start_unix_nano" in body["statement"]:
+            return pa.table(
+                {"latest_span_start_unix_nano": [self.watermark], "latest_log_unix_nano": [None]}
+            )
+        # Time bounds only: the filters are not applied.
+        params = {
+            p["name"]: int(p["value"]) for p in body["parameters"] if p["name"].endswith("_ns")
+        }
+        rows = [
+            r
+            for r in self.spans
+            if r["start_time_unix_nano"] > params.get("since_ns", -1)
+            and r["start_time_unix_nano"] <= params.get("until_ns", 10**18)
+        ]
+        return pa.Table.from_pylist(rows, schema=SPAN_SCHEMA)
+
+    def request(self, method, url, headers, timeout, json=None, stream=False):
+        if url.startswith("https://blob/"):
+            assert method == "GET" and stream and "Authorization" not in headers
+            return _Response(raw=io.BytesIO(self.chunks[url[len("https://blob/") :]]))
+        assert headers["Authorization"] == "Bearer tok"
+        path = url[len(HOST) :]
+        if method == "POST":
+            self.statements.append(json)
+            statement_id = f"st{len(self.statements)}"
+            table = self._rows(json)
+            half = max(1, table.num_rows // 2)
+            self.chunks[f"{statement_id}/0"] = _ipc(table.slice(0, half))
+            self.chunks[f"{statement_id}/1"] = _ipc(table.slice(half))
+            return _Response({"statement_id": statement_id, "status": {"state": "PENDING"}})
+        statement_id = path.split("/")[5]
+        if path.endswith("/result/chunks/1"):
+            return _Response({"external_links": [self._link(statement_id, 1, last=True)]})
+        return _Response(
+            {
+                "statement_id": statement_id,
+                "status": {"state": "SUCCEEDED"},
+                "result": {"external_links": [self._link(statement_id, 0, last=False)]},
+            }
+        )
+
+    def _link(self, statement_id, index, last):
+        link = {"chunk_index": index, "external_link": f"https://blob/{statement_id}/{index}"}
+        if not last:
+            link["next_chunk_internal_link"] = (
+                f"/api/2.0/sql/statements/{statement_id}/result/chunks/{index + 1}"
+            )
+        return link
+
+
+def _client(warehouse):
+    rest = DatabricksRestClient(HOST, "tok", session=warehouse)
+    return SqlStatementClient(rest, "wh", poll_interval_s=0)
+
+
+def test_build_fetch_query_uses_parameters():
+    sql, params = build_fetch_query(
+        TraceFilter(session_id="x' OR 1=1 --", span_name="call_llm", since_ns=5, limit=10),
+        "cat",
+        "sch",
+    )
+    assert "x' OR" not in sql
+    assert sql == (
+        "SELECT * FROM `cat`.`sch`.`mlflow_experiment_trace_otel_spans` WHERE "
+        "attributes['gen_ai.conversation.id'] = :session_id AND name = :span_name "
+        "AND start_time_unix_nano > :since_ns ORDER BY start_time_unix_nano LIMIT 10"
+    )
+    assert params[0] == {"name": "session_id", "value": "x' OR 1=1 --", "type": "STRING"}
+    assert params[-1] == {"name": "since_ns", "value": "5", "type": "BIGINT"}
+    with pytest.raises(ValueError):
+        TraceFilter(table="logs", span_name="x")
+
+
+def test_qualify_query():
+    sql = "FROM `dev_ai`.`agent_traces`.`mlflow_experiment_trace_otel_logs` l"
+    expected = "FROM `main`.`t`.`mlflow_experiment_trace_otel_logs` l"
+    assert qualify_query(sql, "main", "t") == expected
+
+
+def test_fetch_streams_all_chunks_to_parquet_and_jsonl(tmp_path):
+    warehouse = FakeWarehouse(watermark=500)
+    client = _client(warehouse)
+    out = tmp_path / "out.parquet"
+    result = fetch_to_file(client, TraceFilter(), out, catalog="c", schema="s")
+    assert (result.rows, result.batches) == (5, 5)
+    assert pq.read_table(out).column("span_id").to_pylist() == ["s1", "s2", "s3", "s4", "s5"]
+
+    out = tmp_path / "out.jsonl"
+    fetch_to_file(client, TraceFilter(since_ns=300), out, catalog="c", schema="s")
+    rows = [json.loads(line) for line in out.read_text().splitlines()]
+    assert rows == [
+        {"span_id": "s4", "start_time_unix_nano": 400, "attributes": {"k": "4"}},
+        {"span_id": "s5", "start_time_unix_nano": 500, "attributes": {"k": "5"}},
+    ]
+    assert not list(tmp_path.glob("*.tmp"))
+
+
+def _pull(client, state, output_dir, lateness_s=0.0):
+    return incremental_pull(
+        client,
+        TraceFilter(),
+        state,
+        output_dir,
+        catalog="c",
+        schema="s",
+        allowed_lateness_seconds=lateness_s,
+    )
+
+
+def test_incremental_pull_advances_watermark(tmp_path):
+    warehouse = FakeWarehouse(watermark=300)
+    client = _client(warehouse)
+    state = PullState(tmp_path / "state.json")
+    first = _pull(client, state, tmp_path)
+    assert (first.rows, first.path.name) == (3, "spans-0-300.parquet")
+    assert state.load() == {"spans": 300}
+
+    assert _pull(client, state, tmp_path) is None
+
+    warehouse.watermark = 500
+    second = _pull(client, state, tmp_path)
+    assert (second.rows, second.since_ns, second.until_ns) == (2, 300, 500)
+    assert state.load() == {"spans": 500}
+
+
+def test_filtered_pulls_write_separate_files(tmp_path):
+    client = _client(FakeWarehouse(watermark=300))
+    state = PullState(tmp_path / "state.json")
+    paths = []
+    for flt in (TraceFilter(session_id="a"), TraceFilter(span_name="call_llm"), TraceFilter()):
+        pulled = incremental_pull(
+            client, flt, state, tmp_path, catalog="c", schema="s", allowed_lateness_seconds=0
+        )
+        paths.append(pulled.path)
+    assert len(set(paths)) == 3 and all(path.exists() for path in paths)
+    assert paths[2].name == "spans-0-300.parquet"
+    assert set(state.load()) == {"spans,session_id=a", "spans,span_name=call_llm", "spans"}
+
+
+def test_failed_pull_keeps_watermark(tmp_path):
+    warehouse = FakeWarehouse(watermark=300)
+    state = PullState(tmp_path / "state.json")
+    state.save("spans", 100)
+
+    def failed(*args, **kwargs):
+        return _Response(
+            {"statement_id": "x", "status": {"state": "FAILED", "error": {"message": "boom"}}}
+        )
+
+    warehouse.request = failed
+    with pytest.raises(StatementExecutionError, match="boom"):
+        _pull(_client(warehouse), state, tmp_path)
+    assert state.load() == {"spans": 100}
+
+
+def test_incremental_pull_leaves_room_for_late_rows(tmp_path):
+    warehouse = FakeWarehouse(watermark=400)
+    late = warehouse.spans.pop(2)  # s3 (t=300), e.g. a root span exported after its children
+    warehouse.spans.pop()  # s5 not written yet
+    client = _client(warehouse)
+    state = PullState(tmp_path / "state.json")
+    first = _pull(client, state, tmp_path, lateness_s=150e-9)
+    assert (first.rows, first.until_ns) == (2, 250)
+
+    warehouse.spans = list(SPANS)
+    warehouse.watermark = 500
+    second = _pull(client, state, tmp_path, lateness_s=150e-9)
+    assert (second.since_ns, second.until_ns) == (250, 350)
+    assert pq.read_table(second.path).column("span_id").to_pylist() == [late["span_id"]]
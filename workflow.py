@@ -25,17 +25,28 @@ def build_root_agent() -> SequentialAgent:
     config = load_config()
 
     logger.info("Initializing agents with model: %s", config.model_name)
+    if config.model_name.startswith("mock/"):
+        from mock_llm import register_mock_llm
+
+        register_mock_llm()
     agent0_bootstrap = UserQuestionBootstrapAgent(
         documents_dir=config.documents_dir
     )
-    agent1_clarify = build_clarifier_agent(config.model_name)
+    agent1_clarify = build_clarifier_agent(
+        config.model_name, structured_output=config.structured_output
+    )
     agent2_reader = DocumentReaderAgent(
         documents_dir=config.documents_dir,
         max_file_chars=config.max_file_chars,
         preview_chars=config.preview_chars,
         prefer_previews=config.prefer_previews,
+        trace_files=config.reader_trace_files,
+        trace_slow_ms=config.reader_trace_slow_ms,
+        trace_max_file_spans=config.reader_trace_max_file_spans,
+    )
+    agent1_summarize = build_summarizer_agent(
+        config.model_name, structured_output=config.structured_output
     )
-    agent1_summarize = build_summarizer_agent(config.model_name)
     agent3_synthesize = build_synthesizer_agent(config.model_name)
 
     logger.info("Workflow agents initialized successfully")